@@ -0,0 +1,172 @@
+"""
+合成测试计划生成
+
+基于 data/test_plans/sample_user_api_plan.json 的端点生成任意规模的测试计划：
+由 create_user 开头的依赖链（查询、更新、按用户查文章、删除）与独立用例混合组成，
+断言与变量提取的密度可调。生成结果只取决于参数与随机种子。
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SAMPLE_PLAN = Path(__file__).resolve().parent.parent / "data" / "test_plans" / "sample_user_api_plan.json"
+
+# 断言/提取密度：(JSONPath 断言数, 额外提取数)
+DENSITIES = {
+    "light": (0, 0),
+    "medium": (3, 1),
+    "heavy": (8, 3),
+}
+
+# mixed 密度下各档的权重
+_MIXED_WEIGHTS = {"light": 3, "medium": 5, "heavy": 2}
+
+# 各类响应中必然存在的字段
+_USER_PATHS = ["$.id", "$.name", "$.email", "$.phone"]
+_USER_LIST_PATHS = ["$[0].id", "$[0].name", "$[0].email", "$[0].phone", "$[0].website", "$[1].id", "$[*].id", "$"]
+_POST_LIST_PATHS = ["$[0].id", "$[0].userId", "$[0].title", "$[0].body", "$[*].id", "$"]
+
+
+def generate_plan(size: int, density: str = "mixed", seed: int = 0, sample_plan: Optional[Path] = None) -> dict:
+    """
+    生成合成测试计划
+
+    Args:
+        size: 用例数
+        density: light / medium / heavy / mixed（按用例随机选档）
+        seed: 随机种子
+        sample_plan: 提供端点定义的样例计划，默认使用仓库自带的样例
+
+    Returns:
+        测试计划字典，全部用例在替身服务器上应当通过
+    """
+    if density != "mixed" and density not in DENSITIES:
+        raise ValueError(f"Unknown density: {density}, expected mixed or one of {tuple(DENSITIES)}")
+
+    with open(sample_plan or SAMPLE_PLAN, "r", encoding="utf-8") as f:
+        endpoints = json.load(f)["endpoints"]
+
+    rng = random.Random(seed)
+    test_cases: List[dict] = []
+    dependencies: Dict[str, dict] = {}
+
+    chain = 0
+    while len(test_cases) < size:
+        if rng.random() < 0.6:
+            _add_chain(chain, rng, density, test_cases, dependencies)
+            chain += 1
+        else:
+            _add_independent(len(test_cases), rng, density, test_cases)
+
+    test_cases = test_cases[:size]
+    kept = {tc["id"] for tc in test_cases}
+
+    return {
+        "meta": {"name": f"Synthetic plan ({size} cases, {density})", "version": "1.0", "seed": seed},
+        "endpoints": endpoints,
+        "test_cases": test_cases,
+        "execution_order": [tc["id"] for tc in test_cases],
+        "dependencies": {k: v for k, v in dependencies.items() if k in kept},
+    }
+
+
+def _pick_density(rng: random.Random, density: str) -> str:
+    if density != "mixed":
+        return density
+    names = list(_MIXED_WEIGHTS)
+    return rng.choices(names, weights=[_MIXED_WEIGHTS[n] for n in names])[0]
+
+
+def _case(
+    tc_id: str,
+    endpoint_id: str,
+    rng: random.Random,
+    density: str,
+    status: int,
+    paths: List[str],
+    path_params: Optional[dict] = None,
+    query_params: Optional[dict] = None,
+    body: Optional[dict] = None,
+    extract: Optional[List[dict]] = None,
+) -> dict:
+    """构造单个用例，按密度追加 JSONPath 断言与额外提取"""
+    json_path_count, extra_extracts = DENSITIES[_pick_density(rng, density)]
+
+    assertions = [{"type": "status_code", "expected": status}]
+    if paths:
+        for i in range(json_path_count):
+            assertions.append({"type": "json_path", "path": paths[i % len(paths)], "operator": "exists"})
+
+    extract = list(extract or [])
+    if paths:
+        for i in range(extra_extracts):
+            extract.append({"name": f"{tc_id}_v{i}", "from": paths[(i + 1) % len(paths)]})
+
+    return {
+        "id": tc_id,
+        "name": tc_id,
+        "endpoint_id": endpoint_id,
+        "category": "positive" if status < 400 else "negative",
+        "priority": "medium",
+        "inputs": {
+            "path_params": path_params or {},
+            "query_params": query_params or {},
+            "headers": {"Content-Type": "application/json"},
+            "body": body or {},
+        },
+        "assertions": assertions,
+        "extract": extract,
+    }
+
+
+def _add_chain(n: int, rng: random.Random, density: str, test_cases: List[dict], dependencies: Dict[str, dict]) -> None:
+    """create_user 开头的依赖链，后续用例通过变量引用创建出的用户"""
+    var = f"user_{n}_id"
+    create_id = f"chain{n}_create"
+    name = f"Bench User {n}"
+
+    create = _case(
+        create_id, "create_user", rng, density, 201, _USER_PATHS,
+        body={"name": name, "email": f"bench{n}@example.com", "phone": "13800138000"},
+        extract=[{"name": var, "from": "$.id"}],
+    )
+    # 创建的用户名总是可断言
+    create["assertions"].append({"type": "json_path", "path": "$.name", "operator": "equals", "expected": name})
+    test_cases.append(create)
+
+    followers = [
+        _case(f"chain{n}_get", "get_user_by_id", rng, density, 200, _USER_PATHS,
+              path_params={"id": f"{{{{{var}}}}}"}),
+        _case(f"chain{n}_update", "update_user", rng, density, 200, _USER_PATHS,
+              path_params={"id": f"{{{{{var}}}}}"}, body={"name": f"{name} (updated)"}),
+        _case(f"chain{n}_posts", "get_posts", rng, density, 200, []),
+        _case(f"chain{n}_delete", "delete_user", rng, density, 200, [],
+              path_params={"id": f"{{{{{var}}}}}"}),
+    ]
+    # 按用户查文章：通过显式依赖 + inject 注入查询参数
+    dependencies[f"chain{n}_posts"] = {"depends_on": create_id, "inject": {"params.userId": f"{{{{{var}}}}}"}}
+    dependencies[f"chain{n}_delete"] = {"depends_on": [f"chain{n}_get", f"chain{n}_update"]}
+
+    test_cases.extend(followers)
+
+
+def _add_independent(n: int, rng: random.Random, density: str, test_cases: List[dict]) -> None:
+    """不依赖其他用例的正向/反向用例"""
+    kind = rng.randrange(6)
+    tc_id = f"case{n}"
+
+    if kind == 0:
+        test_cases.append(_case(tc_id, "get_users", rng, density, 200, _USER_LIST_PATHS))
+    elif kind == 1:
+        test_cases.append(_case(tc_id, "get_posts", rng, density, 200, _POST_LIST_PATHS))
+    elif kind == 2:
+        test_cases.append(_case(tc_id, "get_user_by_id", rng, density, 200, _USER_PATHS,
+                                path_params={"id": str(rng.randint(1, 10))}))
+    elif kind == 3:
+        test_cases.append(_case(tc_id, "get_user_by_id", rng, density, 404, [], path_params={"id": "99999"}))
+    elif kind == 4:
+        test_cases.append(_case(tc_id, "create_user", rng, density, 400, [], body={"name": "no email"}))
+    else:
+        test_cases.append(_case(tc_id, "get_posts", rng, density, 400, [], query_params={"userId": "invalid_id"}))
@@ -0,0 +1,217 @@
+"""
+TestRunner 吞吐量基准测试
+
+每个规模在独立子进程中运行（峰值 RSS 互不干扰）：启动进程内替身服务器，
+生成合成计划，编译并执行，记录吞吐量、CPU 时间与峰值内存。
+结果写入 benchmarks/results/ 下的 JSON 文件，便于跨提交对比。
+
+用法：
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000,10000 --workers 8 --density heavy
+    python -m benchmarks.run --compare benchmarks/results/<上次结果>.json
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from src.executor import HttpClient, JsonlResultWriter, TestRunner, compile_plan
+from src.executor.jsonpath import jsonpath_cache
+
+from .plans import generate_plan
+from .server import StubServer
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+app = typer.Typer(add_completion=False, help="Benchmark TestRunner throughput against a local stand-in API")
+
+
+def _peak_rss_mb() -> float:
+    """当前进程的峰值 RSS（MB），ru_maxrss 在 Linux 上以 KB 计，在 macOS 上以字节计"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(size: int, density: str, workers: int, seed: int, in_memory: bool) -> dict:
+    """
+    在当前进程中执行一次基准测试
+
+    Args:
+        size: 用例数
+        density: 断言/提取密度
+        workers: TestRunner 并发数
+        seed: 计划生成的随机种子
+        in_memory: 结果保留在内存中（默认与 CLI 一样流式写入 JSONL）
+
+    Returns:
+        指标字典
+    """
+    plan = generate_plan(size, density, seed)
+    assertion_count = sum(len(tc["assertions"]) for tc in plan["test_cases"])
+    extract_count = sum(len(tc["extract"]) for tc in plan["test_cases"])
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        rss_before = _peak_rss_mb()
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+
+        start = time.perf_counter()
+        compiled = compile_plan(plan)
+        compile_s = time.perf_counter() - start
+
+        http_client = HttpClient(base_url=server.base_url)
+        sink = None if in_memory else JsonlResultWriter(Path(tmp) / "results.jsonl")
+        runner = TestRunner(http_client=http_client, workers=workers, result_sink=sink)
+
+        start = time.perf_counter()
+        result = runner.run(compiled)
+        run_s = time.perf_counter() - start
+
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+        http_client.close()
+        server_cpu_s = server.cpu_s
+
+    cpu_user_s = usage_after.ru_utime - usage_before.ru_utime
+    cpu_sys_s = usage_after.ru_stime - usage_before.ru_stime
+    runner_cpu_s = max(cpu_user_s + cpu_sys_s - server_cpu_s, 0.0)
+
+    return {
+        "size": size,
+        "density": density,
+        "workers": workers,
+        "in_memory": in_memory,
+        "assertions": assertion_count,
+        "extracts": extract_count,
+        "passed": result.passed,
+        "failed": result.failed,
+        "compile_s": round(compile_s, 4),
+        "run_s": round(run_s, 4),
+        "cases_per_sec": round(size / run_s, 1) if run_s > 0 else 0,
+        "cpu_user_s": round(cpu_user_s, 4),
+        "cpu_sys_s": round(cpu_sys_s, 4),
+        "server_cpu_s": round(server_cpu_s, 4),
+        "runner_cpu_s": round(runner_cpu_s, 4),
+        "runner_cpu_us_per_case": round(runner_cpu_s / size * 1_000_000, 1),
+        "rss_before_mb": round(rss_before, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "jsonpath_cache": jsonpath_cache.stats(),
+    }
+
+
+def _child(queue, kwargs: dict) -> None:
+    """子进程入口"""
+    try:
+        queue.put(run_benchmark(**kwargs))
+    except BaseException as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+        raise
+
+
+def _run_isolated(**kwargs) -> dict:
+    """在新的子进程中运行基准测试"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(queue, kwargs))
+    process.start()
+    metrics = queue.get()
+    process.join()
+    return metrics
+
+
+def _git_revision() -> str:
+    """当前提交的短哈希，工作区有改动时追加 -dirty"""
+    root = Path(__file__).resolve().parent.parent
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_comparison(results: List[dict], baseline_path: Path) -> None:
+    """与上一次结果对比吞吐量与单用例 CPU"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    previous = {(r["size"], r["density"], r["workers"]): r for r in baseline.get("results", []) if "error" not in r}
+
+    typer.echo(f"\nCompared with {baseline_path} ({baseline.get('revision', 'unknown')}):")
+    matched = 0
+    for r in results:
+        old = previous.get((r.get("size"), r.get("density"), r.get("workers")))
+        if old is None or "error" in r:
+            continue
+        matched += 1
+        throughput = (r["cases_per_sec"] / old["cases_per_sec"] - 1) * 100 if old["cases_per_sec"] else 0
+        cpu = (r["runner_cpu_us_per_case"] / old["runner_cpu_us_per_case"] - 1) * 100 if old["runner_cpu_us_per_case"] else 0
+        typer.echo(f"  {r['size']:>8} cases: throughput {throughput:+.1f}%  cpu/case {cpu:+.1f}%")
+    if not matched:
+        typer.echo("  no runs with the same size, density and workers")
+
+
+@app.command()
+def main(
+    sizes: str = typer.Option("1000,10000,100000", "--sizes", help="Comma-separated plan sizes"),
+    density: str = typer.Option("mixed", "--density", help="Assertion/extract density: light | medium | heavy | mixed"),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="TestRunner workers"),
+    seed: int = typer.Option(0, "--seed", help="Random seed for plan generation"),
+    in_memory: bool = typer.Option(False, "--in-memory", help="Keep results in memory instead of streaming JSONL"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output JSON path"),
+    compare: Optional[str] = typer.Option(None, "--compare", help="Previous result JSON to compare against"),
+):
+    """Run the benchmark for each plan size and save the results as JSON."""
+    revision = _git_revision()
+    results = []
+
+    typer.echo(f"{'Cases':>8}{'Cases/s':>10}{'CPU us/case':>13}{'Server CPU s':>14}{'Peak RSS MB':>13}{'Failed':>8}")
+    for size in [int(s) for s in sizes.split(",") if s.strip()]:
+        metrics = _run_isolated(size=size, density=density, workers=workers, seed=seed, in_memory=in_memory)
+        results.append(metrics)
+
+        if "error" in metrics:
+            typer.echo(f"{size:>8}  error: {metrics['error']}", err=True)
+            continue
+        typer.echo(
+            f"{size:>8}{metrics['cases_per_sec']:>10.1f}{metrics['runner_cpu_us_per_case']:>13.1f}"
+            f"{metrics['server_cpu_s']:>14.2f}{metrics['peak_rss_mb']:>13.1f}{metrics['failed']:>8}"
+        )
+
+    report = {
+        "revision": revision,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+    if output:
+        output_path = Path(output)
+    else:
+        output_path = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{revision}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    typer.echo(f"\nResults: {output_path}")
+
+    if compare:
+        _print_comparison(results, Path(compare))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,189 @@
+"""
+本地替身 API 服务器
+
+在进程内以后台线程实现 data/api_docs/sample_user_api.json 中的各个端点，
+行为与 JSONPlaceholder 一致（含 404/400 等错误分支），供基准测试使用。
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+_USER_PATH = re.compile(r"^/users/([^/]+)$")
+
+
+class _UserStore:
+    """内存中的用户与文章数据"""
+
+    def __init__(self, seed_users: int = 10):
+        self.lock = threading.Lock()
+        self.users = {
+            i: {
+                "id": i,
+                "name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "phone": f"1380013{i:04d}",
+                "website": f"user{i}.example.com",
+            }
+            for i in range(1, seed_users + 1)
+        }
+        self.posts = [
+            {"userId": user_id, "id": (user_id - 1) * 3 + n, "title": f"Post {n}", "body": "lorem ipsum"}
+            for user_id in self.users
+            for n in range(1, 4)
+        ]
+        self.next_id = seed_users + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """请求处理器，路由见 _route"""
+
+    protocol_version = "HTTP/1.1"
+    # 响应头与响应体分两次写出，不关闭 Nagle 时 keep-alive 连接上每个请求会多等一次延迟 ACK（约 40ms）
+    disable_nagle_algorithm = True
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        cpu_start = time.thread_time()
+
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        forced = self.headers.get("X-Force-Error")
+        if forced:
+            status, payload = int(forced), {"error": "forced error"}
+        else:
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                status, payload = 400, {"error": "invalid JSON"}
+            else:
+                status, payload = self._route(method, urlparse(self.path), body)
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+        self.server.record_cpu(time.thread_time() - cpu_start)
+
+    def _route(self, method: str, url, body: Any) -> Tuple[int, Any]:
+        """返回 (状态码, 响应体)"""
+        store = self.server.store
+
+        if url.path == "/users":
+            if method == "GET":
+                with store.lock:
+                    return 200, list(store.users.values())
+            if method == "POST":
+                if not isinstance(body, dict) or "name" not in body or "email" not in body:
+                    return 400, {"error": "name and email are required"}
+                with store.lock:
+                    user = {"id": store.next_id, **body}
+                    store.users[store.next_id] = user
+                    store.next_id += 1
+                return 201, user
+            return 405, {"error": "method not allowed"}
+
+        match = _USER_PATH.match(url.path)
+        if match:
+            user_id = _as_int(match.group(1))
+            with store.lock:
+                user = store.users.get(user_id)
+                if user is None:
+                    return 404, {}
+                if method == "GET":
+                    return 200, user
+                if method == "PUT":
+                    user = store.users[user_id] = {**user, **(body or {}), "id": user_id}
+                    return 200, user
+                if method == "DELETE":
+                    # 与 JSONPlaceholder 一致：删除不生效，重复执行的计划仍可访问该用户
+                    return 200, {}
+            return 405, {"error": "method not allowed"}
+
+        if url.path == "/posts" and method == "GET":
+            user_ids = parse_qs(url.query).get("userId")
+            if not user_ids:
+                return 200, store.posts
+            user_id = _as_int(user_ids[0])
+            if user_id is None:
+                return 400, {"error": "userId must be an integer"}
+            return 200, [post for post in store.posts if post["userId"] == user_id]
+
+        return 404, {"error": "not found"}
+
+
+def _as_int(text: str) -> Optional[int]:
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+class StubServer(ThreadingHTTPServer):
+    """在后台线程中运行的替身服务器"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        初始化服务器（port 为 0 时自动分配端口）
+
+        Args:
+            host: 监听地址
+            port: 监听端口
+        """
+        super().__init__((host, port), _Handler)
+        self.store = _UserStore()
+        self.cpu_s = 0.0
+        self._cpu_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_cpu(self, seconds: float) -> None:
+        """累计处理请求消耗的 CPU 时间，便于从进程 CPU 中扣除"""
+        with self._cpu_lock:
+            self.cpu_s += seconds
+
+    def start(self) -> "StubServer":
+        """在后台线程中开始服务"""
+        self._thread = threading.Thread(target=self.serve_forever, name="apiflow-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务"""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
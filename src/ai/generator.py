@@ -47,7 +47,8 @@ Output the complete test plan in JSON format:
       "assertions": [
         {"type": "status_code", "expected": 200},
         {"type": "json_path", "path": "$.field", "operator": "exists"},
-        {"type": "json_path", "path": "$.code", "operator": "equals", "expected": 0}
+        {"type": "json_path", "path": "$.code", "operator": "equals", "expected": 0},
+        {"type": "schema"}  // Only when the endpoint declares a response schema
       ],
       "extract": [
         {"name": "variable_name", "from": "$.json.path"}
@@ -7,19 +7,57 @@ ApiFlowAgent 命令行接口
 - generate: 解析 API 文档并生成测试计划（调用 AI）
 - execute:  执行已有的测试计划（不调用 AI）
 - run:      完整流程 = generate + execute
+- merge-results: 合并各分片的执行结果
+- load:     以目标请求速率重放测试计划（压测）
+- compile:  预编译测试计划并写入缓存
 """
 
-import json
 import os
+import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 import typer
 from dotenv import load_dotenv
 
+from . import codec
 from .ai import APIParser, TestGenerator
-from .executor import HttpClient, TestRunner
-from .reporter import AllureReporter
+from .config import (
+    baseline_options,
+    http_client_options,
+    latency_budget_options,
+    load_config,
+    throttle_options,
+)
+from .executor import (
+    AsyncCassetteHttpClient,
+    AsyncHostLimiter,
+    AsyncHttpClient,
+    AsyncTestRunner,
+    AsyncThrottledHttpClient,
+    Cassette,
+    CassetteHttpClient,
+    CompiledPlan,
+    HostLimiter,
+    HttpClient,
+    JsonlResultWriter,
+    LatencyBudgets,
+    LoadRunner,
+    ResultsCache,
+    RetentionPolicy,
+    TestCaseResult,
+    TestPlanResult,
+    TestRunner,
+    ThrottledHttpClient,
+    compare_latency,
+    load_compiled_plan,
+    parse_duration,
+    parse_shard,
+    results_cache_path,
+    select_shard,
+)
+from .executor.compiler import plan_cache_path
+from .reporter import AllureReporter, load_results, merge_results
 
 load_dotenv()
 
@@ -58,38 +96,148 @@ def _parse_and_generate(doc_path: Path, output_path: Optional[Path] = None) -> t
 
     # 保存测试计划
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(test_plan, f, indent=2, ensure_ascii=False)
+    with open(output_path, "wb") as f:
+        codec.dump(test_plan, f, indent=True)
     typer.echo(f"      Saved to: {output_path}")
 
     return parsed_api, test_plan, output_path
 
 
 def _execute_plan(
-    test_plan: dict,
+    test_plan: Union[dict, CompiledPlan],
     base_url: str,
     junit_output: Optional[Path] = None,
+    workers: int = 1,
+    engine: str = "sync",
+    concurrency: int = 100,
+    results_output: Optional[Path] = None,
+    retention: Optional[RetentionPolicy] = None,
+    trace_output: Optional[Path] = None,
+    skip_dependents: bool = True,
+    cached_results: Optional[Dict[str, TestCaseResult]] = None,
+    results_cache: Optional[ResultsCache] = None,
+    client_options: Optional[dict] = None,
+    stream_threshold: Optional[int] = None,
+    cassette: Optional[Cassette] = None,
+    replay_fallback: bool = False,
+    throttle: Optional[dict] = None,
+    latency_budgets: Optional[LatencyBudgets] = None,
+    baseline: Optional[TestPlanResult] = None,
+    baseline_config: Optional[dict] = None,
 ) -> int:
     """
     执行测试计划（内部函数）
 
+    Args:
+        client_options: HTTP 客户端参数（见 config.http_client_options），默认读取 config/config.yaml
+        stream_threshold: 流式断言的响应体大小阈值（字节），None 表示不开启
+        cassette: 录制/回放文件（可选），执行结束后关闭
+        replay_fallback: 回放未命中时改为实际请求
+        throttle: 限流参数（见 config.throttle_options），None 表示不限流
+        latency_budgets: 各端点的响应时间上限，默认读取 config/config.yaml
+        baseline: 基线执行的结果（可选），与本次的响应时间分布对比
+        baseline_config: 基线对比的判定条件（见 config.baseline_options）
+
     Returns:
-        失败用例数
+        失败用例数与响应时间退化的端点数之和
     """
+    if client_options is None or latency_budgets is None:
+        config = _load_config(None)
+        if client_options is None:
+            client_options = http_client_options(config)
+        if latency_budgets is None:
+            latency_budgets = LatencyBudgets(**(latency_budget_options(config) or {}))
+
     typer.echo(f"\n[1/2] Executing tests...")
     typer.echo(f"      Base URL: {base_url}")
+    if cassette is not None:
+        typer.echo(f"      Cassette: {cassette.mode} {cassette.path}")
+    # 纯回放不需要实际请求的客户端
+    live = cassette is None or cassette.mode == "record" or replay_fallback
+    if client_options.get("http2"):
+        typer.echo("      HTTP/2:   enabled")
+    if throttle is not None and live:
+        rate = f"{throttle['rate']:g} req/s" if throttle.get("rate") else "no rate limit"
+        adaptive = ", adaptive concurrency" if throttle.get("adaptive", True) else ""
+        typer.echo(f"      Throttle: {rate}{adaptive}")
 
-    http_client = HttpClient(base_url=base_url)
-    runner = TestRunner(http_client=http_client)
-    result = runner.run(test_plan)
+    reporter = AllureReporter()
+
+    # 用例结果边执行边写入 JSONL，报告从磁盘流式生成
+    if results_output is None:
+        results_output = reporter.results_dir / "test_results.json"
+    result_sink = JsonlResultWriter(Path(results_output).with_suffix(".jsonl"))
+
+    if engine == "async":
+        typer.echo(f"      Engine:   async (concurrency {concurrency})")
+        async_client = None
+        if live:
+            async_client = AsyncHttpClient(base_url=base_url, **{"max_connections": concurrency, **client_options})
+            if throttle is not None:
+                limiter = AsyncHostLimiter(base_url, max_concurrency=concurrency, **throttle)
+                async_client = AsyncThrottledHttpClient(async_client, limiter)
+        if cassette is not None:
+            async_client = AsyncCassetteHttpClient(cassette, async_client)
+        runner = AsyncTestRunner(
+            http_client=async_client,
+            concurrency=concurrency,
+            result_sink=result_sink,
+            retention=retention,
+            skip_dependents=skip_dependents,
+            stream_threshold=stream_threshold,
+            latency_budgets=latency_budgets,
+            close_client=True,
+        )
+    else:
+        if workers > 1:
+            typer.echo(f"      Workers:  {workers}")
+        http_client = HttpClient(base_url=base_url, **client_options) if live else None
+        if http_client is not None and throttle is not None:
+            http_client = ThrottledHttpClient(http_client, HostLimiter(base_url, max_concurrency=workers, **throttle))
+        if cassette is not None:
+            http_client = CassetteHttpClient(cassette, http_client)
+        runner = TestRunner(
+            http_client=http_client,
+            workers=workers,
+            result_sink=result_sink,
+            retention=retention,
+            skip_dependents=skip_dependents,
+            stream_threshold=stream_threshold,
+            latency_budgets=latency_budgets,
+        )
+
+    try:
+        result = runner.run(test_plan, cached_results)
+    finally:
+        # 关闭客户端时一并提交并关闭 cassette；异步运行器在事件循环结束前已自行关闭
+        if engine != "async":
+            runner.http_client.close()
+    typer.echo(f"      Results:  {result_sink.path}")
+    if cassette is not None:
+        summary = cassette.summary()
+        if cassette.mode == "record":
+            typer.echo(f"      Recorded: {summary['recorded']} responses")
+        else:
+            typer.echo(f"      Replayed: {summary['hits']} responses, {summary['misses']} unmatched")
+
+    # 记录本次结果，供下次 --only-changed 使用
+    if results_cache is not None and isinstance(test_plan, CompiledPlan):
+        results_cache.update(test_plan, result.results)
+        try:
+            results_cache.save()
+        except OSError as e:
+            typer.echo(f"      Warning: could not save results cache: {e}", err=True)
+
+    # 与基线执行对比各端点的响应时间分布
+    if baseline is not None:
+        result.latency = compare_latency(baseline.results, result.results, **(baseline_config or {}))
 
     # 生成报告
     typer.echo("\n[2/2] Generating report...")
-    reporter = AllureReporter()
     reporter.print_summary(result)
 
     # 保存 JSON 结果
-    results_path = reporter.save_results(result)
+    results_path = reporter.save_results(result, results_output)
     typer.echo(f"      JSON report: {results_path}")
 
     # 保存 JUnit XML（如果指定）
@@ -97,7 +245,38 @@ def _execute_plan(
         junit_path = reporter.save_junit_xml(result, junit_output)
         typer.echo(f"      JUnit XML:   {junit_path}")
 
-    return result.failed
+    # 保存阶段耗时 trace（如果指定）
+    if trace_output:
+        trace_path = reporter.save_trace(result, trace_output)
+        typer.echo(f"      Trace:       {trace_path}")
+
+    return result.failed + len(result.latency_regressions)
+
+
+def _load_config(config_path: Optional[str]) -> dict:
+    """读取配置文件，无法读取或格式错误时报错退出（内部函数）"""
+    try:
+        return load_config(config_path)
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: could not load config: {e}", err=True)
+        raise typer.Exit(1)
+
+
+def _client_options(
+    config: dict,
+    max_connections: Optional[int],
+    max_keepalive: Optional[int],
+    keepalive_expiry: Optional[float],
+    http2: Optional[bool],
+) -> dict:
+    """在配置文件的 HTTP 客户端参数上叠加命令行指定的连接池参数（内部函数）"""
+    return http_client_options(
+        config,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+    )
 
 
 @app.command()
@@ -142,6 +321,52 @@ def execute(
     plan: str = typer.Option(..., "--plan", "-p", help="Path to test plan JSON"),
     base_url: Optional[str] = typer.Option(None, "--base-url", "-b", help="API base URL"),
     junit: Optional[str] = typer.Option(None, "--junit", "-j", help="Output JUnit XML report path"),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Max test cases executed concurrently"),
+    engine: str = typer.Option("sync", "--engine", "-e", help="Execution engine: sync | async"),
+    concurrency: int = typer.Option(100, "--concurrency", min=1, help="Max in-flight requests (async engine)"),
+    shard: Optional[str] = typer.Option(None, "--shard", help="Run only shard i of N, e.g. 2/4"),
+    retain: str = typer.Option(
+        "full", "--retain", help="Response retention for passed cases: full | failures | truncate | hash"
+    ),
+    retain_bytes: int = typer.Option(1024, "--retain-bytes", min=0, help="Bytes kept per body with --retain truncate"),
+    trace: Optional[str] = typer.Option(
+        None, "--trace", help="Output per-phase timing as Chrome trace JSON (chrome://tracing, Perfetto)"
+    ),
+    skip_dependents: bool = typer.Option(
+        True, "--skip-dependents/--no-skip-dependents", help="Skip cases whose upstream dependency failed"
+    ),
+    only_changed: bool = typer.Option(
+        False, "--only-changed", help="Re-run only new, changed or previously failed cases (and their prerequisites)"
+    ),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file (default: config/config.yaml)"),
+    max_connections: Optional[int] = typer.Option(
+        None, "--max-connections", min=1, help="Connection pool size (default: config, async engine uses --concurrency)"
+    ),
+    max_keepalive: Optional[int] = typer.Option(None, "--max-keepalive", min=0, help="Max idle keep-alive connections"),
+    keepalive_expiry: Optional[float] = typer.Option(
+        None, "--keepalive-expiry", min=0, help="Seconds an idle connection is kept in the pool"
+    ),
+    http2: Optional[bool] = typer.Option(None, "--http2/--no-http2", help="Enable HTTP/2 (requires the h2 package)"),
+    stream_threshold: Optional[int] = typer.Option(
+        None, "--stream-threshold", min=0,
+        help="Evaluate simple JSONPaths while streaming responses of at least this many bytes (requires ijson)",
+    ),
+    record: Optional[str] = typer.Option(None, "--record", help="Record responses to a cassette file"),
+    replay: Optional[str] = typer.Option(None, "--replay", help="Serve responses from a cassette file (no network)"),
+    replay_fallback: bool = typer.Option(
+        False, "--replay-fallback", help="With --replay, send unmatched requests to the live API"
+    ),
+    throttle: Optional[bool] = typer.Option(
+        None, "--throttle/--no-throttle",
+        help="Adapt concurrency to 429/503 and latency, retrying throttled requests (default: config)",
+    ),
+    rate_limit: Optional[float] = typer.Option(
+        None, "--rate-limit", min=0.001, help="Max requests per second to the base URL (implies --throttle)"
+    ),
+    baseline: Optional[str] = typer.Option(
+        None, "--baseline",
+        help="Fail endpoints whose latency is significantly worse than in this earlier JSON/JUnit result",
+    ),
 ):
     """
     Execute an existing test plan (no AI calls).
@@ -151,6 +376,18 @@ def execute(
     Example:
         apiflow execute --plan plan.json --base-url https://api.example.com
         apiflow execute --plan plan.json --junit reports/junit.xml
+        apiflow execute --plan plan.json --workers 8
+        apiflow execute --plan plan.json --engine async --concurrency 200
+        apiflow execute --plan plan.json --shard 2/4 --junit reports/junit-2.xml
+        apiflow execute --plan plan.json --retain truncate --retain-bytes 512
+        apiflow execute --plan plan.json --trace reports/trace.json
+        apiflow execute --plan plan.json --only-changed
+        apiflow execute --plan plan.json --http2 --max-connections 20
+        apiflow execute --plan plan.json --stream-threshold 1048576 --retain failures
+        apiflow execute --plan plan.json --record cassettes/staging.db
+        apiflow execute --plan plan.json --replay cassettes/staging.db
+        apiflow execute --plan plan.json --workers 32 --throttle --rate-limit 50
+        apiflow execute --plan plan.json --baseline reports/main/test_results.json
     """
     typer.echo("=" * 60)
     typer.echo("ApiFlowAgent - Execute Test Plan")
@@ -161,24 +398,105 @@ def execute(
         typer.echo(f"Error: Test plan not found: {plan}", err=True)
         raise typer.Exit(1)
 
-    # 加载测试计划
+    # 加载测试计划（命中编译缓存时跳过解析与编译）
     typer.echo(f"\nLoading test plan: {plan_path}")
-    with open(plan_path, "r", encoding="utf-8") as f:
-        test_plan = json.load(f)
+    try:
+        test_plan = load_compiled_plan(plan_path)
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
 
-    test_case_count = len(test_plan.get("test_cases", []))
-    typer.echo(f"Found {test_case_count} test cases")
+    typer.echo(f"Found {len(test_plan.cases)} test cases")
 
-    # 确定 base_url
-    effective_base_url = base_url or os.getenv("API_BASE_URL")
-    if not effective_base_url:
-        typer.echo("Error: No base URL. Provide --base-url or set API_BASE_URL env var.", err=True)
+    # 按依赖连通分量分片
+    results_path = None
+    shard_tag = None
+    if shard:
+        try:
+            shard_index, shard_total = parse_shard(shard)
+        except ValueError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+        test_plan = test_plan.subset(select_shard(test_plan.graph, shard_index, shard_total))
+        typer.echo(f"Shard {shard_index}/{shard_total}: {len(test_plan.cases)} test cases")
+        shard_tag = f"{shard_index}-of-{shard_total}"
+        results_path = AllureReporter().results_dir / f"test_results.shard-{shard_tag}.json"
+
+    if record and replay:
+        typer.echo("Error: --record and --replay cannot be used together", err=True)
+        raise typer.Exit(1)
+    if replay_fallback and not replay:
+        typer.echo("Error: --replay-fallback requires --replay", err=True)
+        raise typer.Exit(1)
+
+    if engine not in ("sync", "async"):
+        typer.echo(f"Error: Unknown engine: {engine}. Use 'sync' or 'async'.", err=True)
+        raise typer.Exit(1)
+
+    try:
+        retention = RetentionPolicy(mode=retain, max_bytes=retain_bytes)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
     junit_path = Path(junit) if junit else None
+    trace_path = Path(trace) if trace else None
+    config_data = _load_config(config)
+    client_options = _client_options(config_data, max_connections, max_keepalive, keepalive_expiry, http2)
+    throttle_config = throttle_options(config_data, enabled=throttle, rate=rate_limit)
+    latency_budgets = LatencyBudgets(**(latency_budget_options(config_data) or {}))
+
+    # 加载基线执行的结果
+    baseline_result = None
+    if baseline:
+        try:
+            baseline_result = load_results(baseline)
+        except Exception as e:
+            typer.echo(f"Error: could not load baseline: {e}", err=True)
+            raise typer.Exit(1)
+        typer.echo(f"Baseline: {baseline} ({baseline_result.total} test cases)")
+
+    # 打开录制/回放文件（其余参数已校验完毕）
+    cassette = None
+    if record or replay:
+        try:
+            cassette = Cassette(record or replay, mode="record" if record else "replay")
+        except (OSError, sqlite3.Error) as e:
+            typer.echo(f"Error: could not open cassette: {e}", err=True)
+            raise typer.Exit(1)
 
     try:
-        failed_count = _execute_plan(test_plan, effective_base_url, junit_path)
+        # 确定 base_url（纯回放时不访问网络，沿用录制时的 base_url）
+        effective_base_url = base_url or os.getenv("API_BASE_URL")
+        if not effective_base_url and replay and not replay_fallback:
+            effective_base_url = cassette.base_url
+        if not effective_base_url:
+            typer.echo("Error: No base URL. Provide --base-url or set API_BASE_URL env var.", err=True)
+            raise typer.Exit(1)
+
+        # 与上次执行结果对比，只重跑变化的用例
+        results_cache = ResultsCache.load(results_cache_path(plan_path, shard_tag), effective_base_url)
+        cached_results = None
+        if only_changed:
+            cached_results = results_cache.reusable(test_plan)
+            rerun_count = len(test_plan.cases) - len(cached_results)
+            typer.echo(f"Only changed: {rerun_count} of {len(test_plan.cases)} test cases to run")
+
+        failed_count = _execute_plan(
+            test_plan, effective_base_url, junit_path, workers, engine, concurrency, results_path, retention,
+            trace_path, skip_dependents,
+            cached_results=cached_results,
+            # 回放结果不代表当前服务的状态，不写入结果缓存
+            results_cache=None if replay else results_cache,
+            client_options=client_options,
+            stream_threshold=stream_threshold,
+            cassette=cassette,
+            replay_fallback=replay_fallback,
+            throttle=throttle_config,
+            latency_budgets=latency_budgets,
+            baseline=baseline_result,
+            baseline_config=baseline_options(config_data),
+        )
         if failed_count > 0:
             raise typer.Exit(1)
     except typer.Exit:
@@ -186,6 +504,10 @@ def execute(
     except Exception as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
+    finally:
+        # 执行结束时客户端已提交并关闭 cassette；未执行到该处（参数错误等）时回滚，不改动录制文件
+        if cassette is not None:
+            cassette.close(commit=False)
 
 
 @app.command()
@@ -251,6 +573,174 @@ def run(
         raise typer.Exit(1)
 
 
+@app.command()
+def load(
+    plan: str = typer.Option(..., "--plan", "-p", help="Path to test plan JSON"),
+    rps: float = typer.Option(..., "--rps", min=0.001, help="Target request rate (requests per second)"),
+    duration: str = typer.Option("1m", "--duration", "-d", help="Load duration, e.g. 30s, 5m, 1h"),
+    base_url: Optional[str] = typer.Option(None, "--base-url", "-b", help="API base URL"),
+    max_in_flight: int = typer.Option(100, "--max-in-flight", min=1, help="Max dependency chains in flight"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output path for load report JSON"),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file (default: config/config.yaml)"),
+    max_connections: Optional[int] = typer.Option(
+        None, "--max-connections", min=1, help="Connection pool size (default: config)"
+    ),
+    max_keepalive: Optional[int] = typer.Option(None, "--max-keepalive", min=0, help="Max idle keep-alive connections"),
+    keepalive_expiry: Optional[float] = typer.Option(
+        None, "--keepalive-expiry", min=0, help="Seconds an idle connection is kept in the pool"
+    ),
+    http2: Optional[bool] = typer.Option(None, "--http2/--no-http2", help="Enable HTTP/2 (requires the h2 package)"),
+):
+    """
+    Replay a test plan as a load scenario at a target request rate.
+
+    Example:
+        apiflow load --plan plan.json --rps 500 --duration 5m
+        apiflow load --plan plan.json --rps 500 --max-connections 200 --max-keepalive 200
+    """
+    typer.echo("=" * 60)
+    typer.echo("ApiFlowAgent - Load Test")
+    typer.echo("=" * 60)
+
+    plan_path = Path(plan)
+    if not plan_path.exists():
+        typer.echo(f"Error: Test plan not found: {plan}", err=True)
+        raise typer.Exit(1)
+
+    effective_base_url = base_url or os.getenv("API_BASE_URL")
+    if not effective_base_url:
+        typer.echo("Error: No base URL. Provide --base-url or set API_BASE_URL env var.", err=True)
+        raise typer.Exit(1)
+
+    client_options = _client_options(_load_config(config), max_connections, max_keepalive, keepalive_expiry, http2)
+
+    try:
+        duration_s = parse_duration(duration)
+        test_plan = load_compiled_plan(plan_path)
+
+        typer.echo(f"\nTarget: {rps:g} req/s for {duration_s:g}s against {effective_base_url}")
+
+        http_client = HttpClient(base_url=effective_base_url, **client_options)
+        runner = LoadRunner(http_client=http_client, rps=rps, duration_s=duration_s, max_in_flight=max_in_flight)
+        try:
+            result = runner.run(test_plan)
+        finally:
+            http_client.close()
+        report = result.to_dict()
+
+        typer.echo("\n" + "-" * 60)
+        typer.echo(
+            f"Sent: {result.sent}  Dropped: {result.dropped}  "
+            f"Actual: {result.actual_rps:.1f} req/s  Elapsed: {result.elapsed_s:.1f}s"
+        )
+        if result.failed:
+            typer.echo(f"Failed: {result.failed} requests in chains that raised ({result.first_error})", err=True)
+        typer.echo("-" * 60)
+        typer.echo(f"{'Endpoint':<24}{'Reqs':>8}{'RPS':>9}{'Err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        for endpoint_id, stats in report["endpoints"].items():
+            latency = stats["latency_ms"]
+            typer.echo(
+                f"{endpoint_id:<24}{stats['requests']:>8}{stats['throughput_rps']:>9.1f}"
+                f"{stats['error_rate']:>7.1f}{latency['p50']:>9.1f}{latency['p95']:>9.1f}"
+                f"{latency['p99']:>9.1f}{latency['max']:>9.1f}"
+            )
+        typer.echo("-" * 60)
+        connections = report["connections"]
+        if connections and connections["requests"]:
+            typer.echo(
+                f"Connections: {connections['connections_opened']} opened, "
+                f"{connections['reuse_rate']:.1f}% of requests reused a pooled connection"
+            )
+
+        output_path = Path(output) if output else Path("reports/load_results.json")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "wb") as f:
+            codec.dump(report, f, indent=True)
+        typer.echo(f"Load report: {output_path}")
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+
+@app.command("merge-results")
+def merge_results_command(
+    inputs: List[str] = typer.Argument(..., help="Per-shard JSON or JUnit XML result files"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output path for merged JSON report"),
+    junit: Optional[str] = typer.Option(None, "--junit", "-j", help="Output merged JUnit XML report path"),
+    plan: Optional[str] = typer.Option(None, "--plan", "-p", help="Original test plan, used to restore case order"),
+):
+    """
+    Merge per-shard results into one report.
+
+    Example:
+        apiflow merge-results reports/shard-*.json --junit reports/junit.xml
+        apiflow merge-results junit-1.xml junit-2.xml --plan plan.json
+    """
+    typer.echo("=" * 60)
+    typer.echo("ApiFlowAgent - Merge Results")
+    typer.echo("=" * 60)
+
+    try:
+        execution_order = None
+        if plan:
+            with open(plan, "rb") as f:
+                test_plan = codec.load(f)
+            execution_order = test_plan.get(
+                "execution_order", [tc["id"] for tc in test_plan.get("test_cases", [])]
+            )
+
+        result = merge_results([load_results(path) for path in inputs], execution_order)
+        typer.echo(f"\nMerged {len(inputs)} result files")
+
+        reporter = AllureReporter()
+        reporter.print_summary(result)
+
+        results_path = reporter.save_results(result, output)
+        typer.echo(f"      JSON report: {results_path}")
+
+        if junit:
+            junit_path = reporter.save_junit_xml(result, junit)
+            typer.echo(f"      JUnit XML:   {junit_path}")
+
+        if result.failed > 0 or result.latency_regressions:
+            raise typer.Exit(1)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+
+@app.command("compile")
+def compile_(
+    plan: str = typer.Option(..., "--plan", "-p", help="Path to test plan JSON"),
+):
+    """
+    Compile a test plan ahead of time and cache the result.
+
+    'execute' and 'load' compile implicitly; this command warms the cache
+    and reports problems found in the plan without sending any requests.
+
+    Example:
+        apiflow compile --plan plan.json
+    """
+    plan_path = Path(plan)
+    if not plan_path.exists():
+        typer.echo(f"Error: Test plan not found: {plan}", err=True)
+        raise typer.Exit(1)
+
+    try:
+        compiled = load_compiled_plan(plan_path)
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    typer.echo(f"Compiled {len(compiled.cases)} test cases: {compiled.plan_name}")
+    for warning in compiled.warnings:
+        typer.echo(f"  Warning: {warning}")
+    typer.echo(f"Cache: {plan_cache_path(plan_path, compiled.plan_hash)}")
+
+
 @app.command()
 def version():
     """Show version information."""
@@ -264,3 +754,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+
@@ -0,0 +1,113 @@
+"""
+JSON 编解码模块
+
+安装了 orjson 时使用 orjson，否则回退到标准库 json。
+常见数据的输出与 json.dumps(ensure_ascii=False, separators=(",", ":")) 相同（indent 只支持 2），
+但 orjson 的浮点数写法（1e16，标准库为 1e+16）、NaN / Infinity（写为 null）、
+datetime / UUID 等类型（原生支持）与标准库不同，输出字节会随后端变化。
+需要与后端无关的字节时（如发送的请求体）使用 dumps_request。
+可通过环境变量 APIFLOW_JSON=json 强制使用标准库，便于对比或排查差异。
+"""
+
+import json
+import os
+from typing import IO, Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # 可选依赖：pip install 'apiflowagent[fast]'
+    orjson = None
+
+if os.getenv("APIFLOW_JSON", "").lower() in ("json", "stdlib"):
+    orjson = None
+
+# 当前使用的实现：orjson 或 json
+BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+    _INDENT_OPTIONS = _OPTIONS | orjson.OPT_INDENT_2
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    解析 JSON
+
+    Args:
+        data: JSON 字节或文本
+
+    Returns:
+        解析结果
+
+    Raises:
+        ValueError: 不是合法的 JSON（orjson 与 json 的解码异常都是 ValueError 的子类）
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson 更严格（如 NaN、超出 64 位的整数），交给标准库再试一次
+            pass
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+    """
+    序列化为 UTF-8 字节
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否以 2 空格缩进
+        default: 无法序列化的对象的转换函数，如 str
+
+    Returns:
+        UTF-8 编码的 JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_INDENT_OPTIONS if indent else _OPTIONS)
+        except TypeError:
+            # orjson 不支持的类型（如超出 64 位的整数），交给标准库
+            pass
+    return _stdlib_dumps(obj, indent, default).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> str:
+    """
+    序列化为文本，参数同 dumps_bytes
+
+    Returns:
+        JSON 文本
+    """
+    if orjson is not None:
+        return dumps_bytes(obj, indent, default).decode("utf-8")
+    return _stdlib_dumps(obj, indent, default)
+
+
+def dumps_request(obj: Any) -> bytes:
+    """
+    序列化请求体，输出与 httpx 的 json= 参数相同，不随后端变化
+
+    始终使用标准库（紧凑分隔符、不转义非 ASCII），请求字节与回放匹配不受是否安装 orjson 影响。
+
+    Raises:
+        ValueError: 含 NaN / Infinity（同 httpx）
+        TypeError: 含无法序列化的对象
+    """
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def load(fp: IO) -> Any:
+    """从文件读取 JSON（文本或二进制模式均可）"""
+    return loads(fp.read())
+
+
+def dump(obj: Any, fp: IO[bytes], indent: bool = False, default: Optional[Callable] = None) -> None:
+    """写入 JSON，fp 需以二进制模式打开"""
+    fp.write(dumps_bytes(obj, indent, default))
+
+
+def _stdlib_dumps(obj: Any, indent: bool, default: Optional[Callable]) -> str:
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default)
@@ -0,0 +1,134 @@
+"""
+配置加载模块
+
+读取 config/config.yaml，并转换为各组件的构造参数。
+命令行选项优先于配置文件，配置文件中未设置（null）的项使用组件的默认值。
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import yaml
+
+DEFAULT_CONFIG_PATH = Path("config/config.yaml")
+
+
+def load_config(path: Optional[Union[str, Path]] = None) -> dict:
+    """
+    读取配置文件
+
+    Args:
+        path: 配置文件路径，默认为 config/config.yaml；默认路径不存在时返回空配置
+
+    Returns:
+        配置字典
+
+    Raises:
+        OSError: 指定的配置文件无法读取
+        ValueError: 配置文件不是合法的 YAML，或顶层不是映射
+    """
+    if path is None:
+        path = DEFAULT_CONFIG_PATH
+        if not path.exists():
+            return {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            config = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"invalid YAML in {path}: {e}") from e
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: expected a mapping at the top level, got {type(config).__name__}")
+    return config
+
+
+def http_client_options(config: dict, **overrides) -> dict:
+    """
+    从配置中取出 HTTP 客户端参数（HttpClient / AsyncHttpClient 共用）
+
+    Args:
+        config: load_config 返回的配置
+        **overrides: 命令行指定的参数，值为 None 表示未指定
+
+    Returns:
+        可直接传给客户端构造函数的关键字参数，只包含已设置的项
+    """
+    http = config.get("http") or {}
+    pool = http.get("pool") or {}
+
+    options = {
+        "timeout": http.get("timeout"),
+        "max_connections": pool.get("max_connections"),
+        "max_keepalive_connections": pool.get("max_keepalive_connections"),
+        "keepalive_expiry": pool.get("keepalive_expiry"),
+        "http2": http.get("http2"),
+    }
+    options.update({k: v for k, v in overrides.items() if v is not None})
+    return {k: v for k, v in options.items() if v is not None}
+
+
+def throttle_options(config: dict, **overrides) -> Optional[dict]:
+    """
+    从配置中取出限流参数（见 executor.throttle.HostLimiter）
+
+    Args:
+        config: load_config 返回的配置
+        **overrides: 命令行指定的参数，值为 None 表示未指定；enabled=False 强制关闭，
+            enabled 之外的任一项被指定即开启限流
+
+    Returns:
+        HostLimiter 的关键字参数（不含 base_url 与 max_concurrency），未开启限流时为 None
+    """
+    throttle = dict((config.get("http") or {}).get("throttle") or {})
+    specified = {k: v for k, v in overrides.items() if v is not None}
+    throttle.update(specified)
+
+    enabled = throttle.pop("enabled", False)
+    if specified.get("enabled") is False or not (enabled or specified.keys() - {"enabled"}):
+        return None
+
+    options = {
+        "rate": throttle.get("rate"),
+        "burst": throttle.get("burst"),
+        "adaptive": throttle.get("adaptive", True),
+        "latency_tolerance": throttle.get("latency_tolerance", 2.0),
+        "max_retries": throttle.get("max_retries"),
+    }
+    return {k: v for k, v in options.items() if v is not None or k == "latency_tolerance"}
+
+
+def latency_budget_options(config: dict) -> Optional[dict]:
+    """
+    从配置中取出各端点的响应时间上限（见 executor.latency.LatencyBudgets）
+
+    Args:
+        config: load_config 返回的配置
+
+    Returns:
+        LatencyBudgets 的关键字参数，未设置任何上限时为 None
+    """
+    latency = config.get("latency") or {}
+    default = latency.get("budget")
+    endpoints = latency.get("endpoints") or {}
+    if default is None and not endpoints:
+        return None
+    return {"default": default, "endpoints": endpoints}
+
+
+def baseline_options(config: dict) -> dict:
+    """
+    从配置中取出基线对比的判定条件（见 executor.latency.compare_latency）
+
+    Args:
+        config: load_config 返回的配置
+
+    Returns:
+        compare_latency 的关键字参数，只包含已设置的项
+    """
+    baseline = (config.get("latency") or {}).get("baseline") or {}
+    options = {
+        "alpha": baseline.get("alpha"),
+        "min_samples": baseline.get("min_samples"),
+        "min_slowdown": baseline.get("min_slowdown"),
+    }
+    return {k: v for k, v in options.items() if v is not None}
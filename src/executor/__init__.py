@@ -1,18 +1,70 @@
-"""执行引擎层 - HTTP 客户端、断言引擎、变量管理、测试运行器"""
+"""执行引擎层 - HTTP 客户端、断言引擎、变量管理、测试运行器、调度器、计划编译"""
 
-from .http_client import HttpClient, HttpRequest, HttpResponse
+from .http_client import ConnectionStats, HttpClient, HttpRequest, HttpResponse
 from .assertion import AssertionEngine, AssertionResult
-from .variable import VariableManager
+from .variable import VariableManager, VariableScope
 from .runner import TestRunner, TestCaseResult, TestPlanResult
+from .scheduler import DagScheduler, ExecutionGraph
+from .async_http_client import AsyncHttpClient
+from .async_runner import AsyncTestRunner
+from .shard import parse_shard, select_shard, shard_plan
+from .load import LoadRunner, LoadResult, parse_duration
+from .result_stream import JsonlResultReader, JsonlResultWriter
+from .retention import RetentionPolicy
+from .compiler import CompiledCase, CompiledPlan, compile_plan, load_compiled_plan
+from .results_cache import ResultsCache, results_cache_path
+from .cassette import AsyncCassetteHttpClient, Cassette, CassetteHttpClient, CassetteMissError
+from .jsonpath import JsonPathCache, compile_path, jsonpath_cache
+from .schema import SchemaValidator, compile_response_schemas
+from .latency import LatencyBudgets, compare_latency
+from .dataset import Dataset
+from .throttle import AsyncHostLimiter, AsyncThrottledHttpClient, HostLimiter, ThrottledHttpClient
 
 __all__ = [
     "HttpClient",
     "HttpRequest",
     "HttpResponse",
+    "ConnectionStats",
     "AssertionEngine",
     "AssertionResult",
     "VariableManager",
+    "VariableScope",
     "TestRunner",
     "TestCaseResult",
     "TestPlanResult",
+    "DagScheduler",
+    "ExecutionGraph",
+    "AsyncHttpClient",
+    "AsyncTestRunner",
+    "parse_shard",
+    "select_shard",
+    "shard_plan",
+    "LoadRunner",
+    "LoadResult",
+    "parse_duration",
+    "JsonlResultReader",
+    "JsonlResultWriter",
+    "RetentionPolicy",
+    "CompiledCase",
+    "CompiledPlan",
+    "compile_plan",
+    "load_compiled_plan",
+    "ResultsCache",
+    "results_cache_path",
+    "Cassette",
+    "CassetteHttpClient",
+    "AsyncCassetteHttpClient",
+    "CassetteMissError",
+    "HostLimiter",
+    "AsyncHostLimiter",
+    "ThrottledHttpClient",
+    "AsyncThrottledHttpClient",
+    "JsonPathCache",
+    "compile_path",
+    "jsonpath_cache",
+    "SchemaValidator",
+    "compile_response_schemas",
+    "LatencyBudgets",
+    "compare_latency",
+    "Dataset",
 ]
@@ -5,14 +5,15 @@
 """
 
 from dataclasses import dataclass
-from typing import Any, List
-
-from jsonpath_ng import parse as jsonpath_parse
+from typing import Any, Dict, List, Optional
 
 from .http_client import HttpResponse
+from .jsonpath import compile_path
+from .schema import SchemaValidator, validator_for
+from .streaming import MISSING
 
 
-@dataclass
+@dataclass(slots=True)
 class AssertionResult:
     """断言结果"""
     passed: bool
@@ -25,13 +26,21 @@ class AssertionResult:
 class AssertionEngine:
     """断言引擎"""
 
-    def check(self, response: HttpResponse, assertion: dict) -> AssertionResult:
+    def check(
+        self,
+        response: HttpResponse,
+        assertion: dict,
+        json_paths: Optional[Dict[str, Any]] = None,
+        response_schemas: Optional[Dict[str, SchemaValidator]] = None,
+    ) -> AssertionResult:
         """
         执行单个断言
 
         Args:
             response: HTTP 响应
             assertion: 断言规则字典
+            json_paths: 预解析的 JSONPath（CompiledPath，可选），未命中时从共享缓存取得
+            response_schemas: 端点的响应 Schema 校验器（状态码 → SchemaValidator），schema 断言使用
 
         Returns:
             AssertionResult 对象
@@ -41,7 +50,11 @@ class AssertionEngine:
         if assertion_type == "status_code":
             return self._check_status_code(response, assertion)
         elif assertion_type == "json_path":
-            return self._check_json_path(response, assertion)
+            return self._check_json_path(response, assertion, json_paths)
+        elif assertion_type == "schema":
+            return self._check_schema(response, assertion, response_schemas)
+        elif assertion_type == "latency":
+            return self._check_latency(response, assertion)
         else:
             return AssertionResult(
                 passed=False,
@@ -51,18 +64,26 @@ class AssertionEngine:
                 message=f"Unknown assertion type: {assertion_type}",
             )
 
-    def check_all(self, response: HttpResponse, assertions: List[dict]) -> List[AssertionResult]:
+    def check_all(
+        self,
+        response: HttpResponse,
+        assertions: List[dict],
+        json_paths: Optional[Dict[str, Any]] = None,
+        response_schemas: Optional[Dict[str, SchemaValidator]] = None,
+    ) -> List[AssertionResult]:
         """
         执行所有断言
 
         Args:
             response: HTTP 响应
             assertions: 断言规则列表
+            json_paths: 预解析的 JSONPath 表达式（可选）
+            response_schemas: 端点的响应 Schema 校验器（可选）
 
         Returns:
             AssertionResult 列表
         """
-        return [self.check(response, assertion) for assertion in assertions]
+        return [self.check(response, assertion, json_paths, response_schemas) for assertion in assertions]
 
     def _check_status_code(self, response: HttpResponse, assertion: dict) -> AssertionResult:
         """检查 HTTP 状态码"""
@@ -79,23 +100,57 @@ class AssertionEngine:
             message=f"Status code: expected {expected}, got {actual}" if not passed else "Status code matched",
         )
 
-    def _check_json_path(self, response: HttpResponse, assertion: dict) -> AssertionResult:
+    def _check_latency(self, response: HttpResponse, assertion: dict) -> AssertionResult:
+        """检查响应时间（毫秒）"""
+        operator = assertion.get("operator", "less_than")
+        expected = assertion.get("expected")
+        actual = round(response.elapsed_ms, 2)
+
+        try:
+            if operator == "less_than":
+                passed = actual < float(expected)
+                message = f"Latency: expected < {expected}ms, got {actual:.0f}ms"
+            elif operator == "greater_than":
+                passed = actual > float(expected)
+                message = f"Latency: expected > {expected}ms, got {actual:.0f}ms"
+            else:
+                passed = False
+                message = f"Unknown operator: {operator}"
+        except (TypeError, ValueError):
+            passed = False
+            message = f"Latency: invalid budget {expected!r}"
+
+        return AssertionResult(
+            passed=passed,
+            assertion_type="latency",
+            expected=expected,
+            actual=actual,
+            message=message,
+        )
+
+    def _check_json_path(
+        self,
+        response: HttpResponse,
+        assertion: dict,
+        json_paths: Optional[Dict[str, Any]] = None,
+    ) -> AssertionResult:
         """检查 JSON 路径"""
         path = assertion.get("path")
         operator = assertion.get("operator", "exists")
         expected = assertion.get("expected")
 
-        # 使用 jsonpath-ng 提取值
+        # 提取值（流式读取的响应已在读取时求值）
         try:
-            jsonpath_expr = jsonpath_parse(path)
-            matches = jsonpath_expr.find(response.body)
-
-            if not matches:
-                actual = None
-                exists = False
+            if response.path_values is not None and path in response.path_values:
+                actual = response.path_values[path]
             else:
-                actual = matches[0].value
-                exists = True
+                compiled = json_paths.get(path) if json_paths else None
+                if compiled is None:
+                    compiled = compile_path(path)
+                actual = compiled.first(response.body)
+            exists = actual is not MISSING
+            if not exists:
+                actual = None
         except Exception as e:
             return AssertionResult(
                 passed=False,
@@ -153,3 +208,32 @@ class AssertionEngine:
             actual=actual,
             message=message,
         )
+
+    def _check_schema(
+        self,
+        response: HttpResponse,
+        assertion: dict,
+        response_schemas: Optional[Dict[str, SchemaValidator]] = None,
+    ) -> AssertionResult:
+        """按端点声明的响应 Schema 检查响应体（默认使用实际状态码对应的 Schema）"""
+        status = assertion.get("status", response.status_code)
+        expected = f"schema of response {status}"
+
+        validator = validator_for(response_schemas, status)
+        if validator is None:
+            return AssertionResult(
+                passed=False,
+                assertion_type="schema",
+                expected=expected,
+                actual=None,
+                message=f"Schema: no response schema declared for status {status}",
+            )
+
+        errors = validator.validate(response.body)
+        return AssertionResult(
+            passed=not errors,
+            assertion_type="schema",
+            expected=expected,
+            actual=errors or "valid",
+            message=f"Schema ({status}): " + "; ".join(errors) if errors else f"Schema ({status}) matched",
+        )
@@ -0,0 +1,151 @@
+"""
+异步 HTTP 客户端模块
+
+封装 httpx.AsyncClient，接口与 HttpClient 保持一致，
+便于在单个事件循环中同时发起大量请求。
+"""
+
+import os
+from typing import Any, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from .http_client import (
+    ConnectionStats,
+    HttpResponse,
+    _build_limits,
+    _build_request_kwargs,
+    _check_http2,
+    _to_http_response,
+    _to_streamed_response,
+)
+from .streaming import PathStreamEvaluator, StreamSpec
+from .timing import TRACE_EXTENSION, AsyncPhaseTimer, async_event_hooks
+
+
+class AsyncHttpClient:
+    """异步 HTTP 客户端"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        default_headers: Optional[dict] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: bool = False,
+    ):
+        """
+        初始化异步 HTTP 客户端
+
+        Args:
+            base_url: API 基础 URL，如不传则从环境变量读取
+            timeout: 请求超时时间（秒）
+            default_headers: 默认请求头
+            max_connections: 连接池最大连接数，应不小于并发数，否则请求会排队等待连接
+            max_keepalive_connections: 保持空闲的最大连接数，默认与 max_connections 相同
+            keepalive_expiry: 空闲连接保留时间（秒）
+            http2: 是否启用 HTTP/2（需要安装 httpx[http2]）
+        """
+        load_dotenv()
+
+        self.base_url = (base_url or os.getenv("API_BASE_URL", "")).rstrip("/")
+        self.timeout = timeout
+        self.default_headers = default_headers or {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+
+        _check_http2(http2)
+        self.http2 = http2
+        self.stats = ConnectionStats()
+
+        if max_keepalive_connections is None:
+            max_keepalive_connections = max_connections
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers=self.default_headers,
+            event_hooks=async_event_hooks(),
+            limits=_build_limits(max_connections, max_keepalive_connections, keepalive_expiry),
+            http2=http2,
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        body: Any = None,
+        stream: Optional[StreamSpec] = None,
+    ) -> HttpResponse:
+        """
+        发送 HTTP 请求
+
+        Args:
+            method: HTTP 方法 (GET, POST, PUT, DELETE 等)
+            path: 请求路径
+            headers: 请求头（会与默认请求头合并）
+            params: Query 参数
+            body: 请求体
+            stream: 流式求值参数（可选），同 HttpClient.request
+
+        Returns:
+            HttpResponse 对象
+        """
+        request_kwargs = _build_request_kwargs(self.default_headers, method, path, headers, params, body)
+
+        # 发送请求，计时器作为 trace 扩展随请求传入
+        timer = AsyncPhaseTimer()
+        if stream is None:
+            response = await self.client.request(**request_kwargs, extensions={TRACE_EXTENSION: timer})
+            timer.finish()
+            evaluator = None
+        else:
+            async with self.client.stream(**request_kwargs, extensions={TRACE_EXTENSION: timer}) as response:
+                evaluator = None
+                if stream.wants_stream(response.headers):
+                    evaluator = PathStreamEvaluator(stream.paths, stream.keep_bytes)
+                    async for chunk in response.aiter_bytes():
+                        if evaluator.feed(chunk):
+                            break
+                else:
+                    await response.aread()
+            timer.finish()
+
+        # 事件循环单线程，无需加锁
+        self.stats.record(response, timer)
+
+        if evaluator is not None:
+            return _to_streamed_response(response, timer, evaluator)
+        return _to_http_response(response, timer)
+
+    async def get(self, path: str, **kwargs) -> HttpResponse:
+        """发送 GET 请求"""
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> HttpResponse:
+        """发送 POST 请求"""
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> HttpResponse:
+        """发送 PUT 请求"""
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> HttpResponse:
+        """发送 DELETE 请求"""
+        return await self.request("DELETE", path, **kwargs)
+
+    async def close(self):
+        """关闭客户端"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,186 @@
+"""
+异步测试运行器模块
+
+基于 AsyncHttpClient 在单个事件循环中并发执行测试计划，
+产出与 TestRunner 相同的 TestPlanResult。
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+from .async_http_client import AsyncHttpClient
+from .compiler import CompiledCase, CompiledPlan
+from .latency import LatencyBudgets
+from .retention import RetentionPolicy
+from .runner import (
+    TestCaseResult,
+    TestPlanResult,
+    TestRunner,
+    _ResultCollector,
+    _snapshot_stats,
+    _stats_since,
+    _throttle_summary,
+)
+from .scheduler import DagScheduler
+from .timing import elapsed_ms
+from .variable import VariableScope
+
+if TYPE_CHECKING:
+    from .result_stream import JsonlResultWriter
+
+
+class AsyncTestRunner(TestRunner):
+    """异步测试运行器"""
+
+    def __init__(
+        self,
+        http_client: Optional[AsyncHttpClient] = None,
+        continue_on_failure: bool = True,
+        concurrency: int = 100,
+        result_sink: Optional["JsonlResultWriter"] = None,
+        retention: Optional[RetentionPolicy] = None,
+        skip_dependents: bool = True,
+        stream_threshold: Optional[int] = None,
+        latency_budgets: Optional[LatencyBudgets] = None,
+        dataset_limit: Optional[int] = None,
+        close_client: Optional[bool] = None,
+    ):
+        """
+        初始化异步测试运行器
+
+        Args:
+            http_client: 异步 HTTP 客户端，如不传则自动创建
+            continue_on_failure: 失败后是否继续执行
+            concurrency: 同时在途的最大请求数
+            result_sink: 结果流写入器（可选），同 TestRunner
+            retention: 响应保留策略，同 TestRunner
+            skip_dependents: 用例失败时跳过依赖它的所有下游用例，同 TestRunner
+            stream_threshold: 流式断言的响应体大小阈值，同 TestRunner
+            latency_budgets: 各端点的响应时间上限，同 TestRunner
+            dataset_limit: 数据驱动用例最多执行的行数，同 TestRunner
+            close_client: run 结束时是否关闭 http_client，默认只关闭自动创建的客户端；
+                客户端的连接池绑定在 run 新建的事件循环上，需在循环结束前关闭
+        """
+        super().__init__(
+            http_client=http_client or AsyncHttpClient(max_connections=concurrency),
+            continue_on_failure=continue_on_failure,
+            workers=concurrency,
+            result_sink=result_sink,
+            retention=retention,
+            skip_dependents=skip_dependents,
+            stream_threshold=stream_threshold,
+            latency_budgets=latency_budgets,
+            dataset_limit=dataset_limit,
+        )
+        self._owns_client = http_client is None
+        self.close_client = self._owns_client if close_client is None else close_client
+
+    def run(
+        self,
+        test_plan: Union[dict, CompiledPlan],
+        cached_results: Optional[Dict[str, TestCaseResult]] = None,
+    ) -> TestPlanResult:
+        """
+        执行测试计划（在新的事件循环中运行 run_async）
+
+        Args:
+            test_plan: 测试计划字典，或已编译的 CompiledPlan
+            cached_results: 沿用上次结论的用例，同 TestRunner.run
+
+        Returns:
+            TestPlanResult 对象
+        """
+        return asyncio.run(self._run_and_close(test_plan, cached_results))
+
+    async def _run_and_close(
+        self,
+        test_plan: Union[dict, CompiledPlan],
+        cached_results: Optional[Dict[str, TestCaseResult]],
+    ) -> TestPlanResult:
+        """执行测试计划，并在事件循环结束前按 close_client 关闭客户端"""
+        try:
+            return await self.run_async(test_plan, cached_results)
+        finally:
+            if self.close_client:
+                await self.http_client.close()
+                if self._owns_client:
+                    # 再次 run 时在新的事件循环中使用新的连接池
+                    self.http_client = AsyncHttpClient(max_connections=self.workers)
+
+    async def run_async(
+        self,
+        test_plan: Union[dict, CompiledPlan],
+        cached_results: Optional[Dict[str, TestCaseResult]] = None,
+    ) -> TestPlanResult:
+        """
+        在当前事件循环中执行测试计划
+
+        Args:
+            test_plan: 测试计划字典，或已编译的 CompiledPlan
+            cached_results: 沿用上次结论的用例，同 TestRunner.run
+
+        Returns:
+            TestPlanResult 对象
+        """
+        start_time = datetime.now()
+
+        plan_name, graph, execute, skip, expand = self._prepare_plan(test_plan, self._run_test_case_async)
+        scheduler = DagScheduler(graph, workers=self.workers)
+
+        stats_before = _snapshot_stats(self.http_client)
+
+        collector = _ResultCollector(plan_name, start_time, self.result_sink)
+        try:
+            async for _, result in scheduler.run_async(
+                execute, self._should_stop, self._is_failure, skip, cached_results, expand
+            ):
+                collector.add(result)
+            plan_result = collector.finish()
+        finally:
+            collector.close()
+        plan_result.connections = _stats_since(self.http_client, stats_before)
+        plan_result.throttle = _throttle_summary(self.http_client)
+        return plan_result
+
+    async def _run_test_case_async(
+        self,
+        case: CompiledCase,
+        variables: VariableScope,
+        row: Optional[Tuple[int, Any]] = None,
+    ) -> TestCaseResult:
+        """
+        执行单个测试用例
+
+        Args:
+            case: 编译后的测试用例
+            variables: 用例的变量作用域（继承上游用例提取的变量）
+            row: 数据驱动用例的 (行号, 行变量)，同 TestRunner._run_test_case
+
+        Returns:
+            TestCaseResult 对象
+        """
+        started_at = time.time()
+        row_index, variables, error = self._bind_row(case, variables, row, started_at)
+        if error is not None:
+            return error
+
+        start = time.perf_counter()
+        request_info = self._prepare_request(case, variables)
+        timings = {"substitute": elapsed_ms(start)}
+
+        try:
+            # 发送请求
+            response = await self.http_client.request(
+                method=request_info["method"],
+                path=request_info["path"],
+                headers=request_info["headers"] or None,
+                params=request_info["params"] or None,
+                body=request_info["body"],
+                stream=self._stream_spec(case),
+            )
+            return self._build_result(case, request_info, response, variables, started_at, timings, row_index)
+
+        except Exception as e:
+            return self._build_error_result(case, request_info, e, started_at, timings, row_index)
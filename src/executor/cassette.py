@@ -0,0 +1,309 @@
+"""
+录制/回放模块
+
+录制模式下把每个请求的响应写入本地 SQLite 文件（cassette），
+回放模式下直接从文件返回响应，不访问网络，适合调试断言与报告。
+
+请求以 (方法, 路径, Query 参数, 规范化请求体) 为键；同一请求多次出现时按出现顺序依次回放，
+超出录制次数后重复回放最后一次的响应。请求头不参与匹配（鉴权令牌等每次可能不同）。
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .. import codec
+from .async_http_client import AsyncHttpClient
+from .http_client import HttpClient, HttpResponse
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS interactions (
+    request_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    query TEXT NOT NULL,
+    request_body TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    encoding TEXT NOT NULL,
+    elapsed_ms REAL NOT NULL,
+    PRIMARY KEY (request_key, seq)
+);
+"""
+
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMissError(Exception):
+    """回放时 cassette 中没有匹配的请求"""
+
+
+def request_key(method: str, path: str, params: Optional[dict], body: Any) -> Tuple[str, str, str]:
+    """
+    计算请求的匹配键
+
+    Args:
+        method: HTTP 方法
+        path: 请求路径
+        params: Query 参数
+        body: 请求体
+
+    Returns:
+        (键, 规范化的 Query, 规范化的请求体)
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    normalized_body = "" if body is None else json.dumps(
+        body, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    raw = "\n".join((method.upper(), path, query, normalized_body))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest(), query, normalized_body
+
+
+class Cassette:
+    """录制文件"""
+
+    def __init__(self, path: Union[str, Path], mode: str = "replay"):
+        """
+        打开录制文件
+
+        Args:
+            path: SQLite 文件路径
+            mode: record（清空后重新录制）或 replay（只读回放，文件必须存在）
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}, expected one of {CASSETTE_MODES}")
+
+        self.path = Path(path)
+        self.mode = mode
+        if mode == "replay" and not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}  # 请求键 → 本次已出现的次数
+        self._replay_cache: Dict[str, List[tuple]] = {}  # 请求键 → 按顺序录制的响应
+
+        self._closed = False
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        if mode == "record":
+            self._conn.execute("DELETE FROM interactions")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('recorded_at', ?)", (datetime.now().isoformat(),)
+            )
+            # 与录制内容在同一事务中，close 时才提交，录制中断不会清空原有文件
+
+    @property
+    def base_url(self) -> Optional[str]:
+        """录制时的 API 基础 URL"""
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'base_url'").fetchone()
+        return row[0] if row else None
+
+    def set_base_url(self, base_url: str) -> None:
+        """记录录制时的 API 基础 URL（仅供参考，不参与匹配）"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('base_url', ?)", (base_url,))
+
+    def record(self, method: str, path: str, params: Optional[dict], body: Any, response: HttpResponse) -> None:
+        """
+        写入一次请求的响应
+
+        Args:
+            method: HTTP 方法
+            path: 请求路径
+            params: Query 参数
+            body: 请求体
+            response: 完整读取的响应
+        """
+        key, query, normalized_body = request_key(method, path, params, body)
+        with self._lock:
+            seq = self._seen.get(key, 0)
+            self._seen[key] = seq + 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, seq, method.upper(), path, query, normalized_body,
+                    response.status_code, codec.dumps(response.headers), response.content,
+                    response.encoding, response.elapsed_ms,
+                ),
+            )
+            self.recorded += 1
+
+    def replay(self, method: str, path: str, params: Optional[dict], body: Any) -> HttpResponse:
+        """
+        取出录制的响应
+
+        Args:
+            method: HTTP 方法
+            path: 请求路径
+            params: Query 参数
+            body: 请求体
+
+        Returns:
+            HttpResponse 对象
+
+        Raises:
+            CassetteMissError: 没有录制过该请求
+        """
+        key, query, _ = request_key(method, path, params, body)
+        with self._lock:
+            rows = self._replay_cache.get(key)
+            if rows is None:
+                rows = self._replay_cache[key] = self._conn.execute(
+                    "SELECT status_code, headers, content, encoding, elapsed_ms FROM interactions "
+                    "WHERE request_key = ? ORDER BY seq",
+                    (key,),
+                ).fetchall()
+
+            if not rows:
+                self.misses += 1
+                target = f"{method.upper()} {path}" + (f"?{query}" if query else "")
+                raise CassetteMissError(f"No recorded response for {target} in cassette {self.path}")
+
+            seq = self._seen.get(key, 0)
+            self._seen[key] = seq + 1
+            self.hits += 1
+
+        status_code, headers, content, encoding, elapsed_ms = rows[min(seq, len(rows) - 1)]
+        return HttpResponse(
+            status_code=status_code,
+            headers=codec.loads(headers),
+            elapsed_ms=elapsed_ms,
+            content=content,
+            encoding=encoding,
+        )
+
+    def summary(self) -> dict:
+        """录制/回放统计"""
+        return {"mode": self.mode, "recorded": self.recorded, "hits": self.hits, "misses": self.misses}
+
+    def close(self, commit: bool = True) -> None:
+        """
+        关闭文件，重复调用时不做任何操作
+
+        Args:
+            commit: 是否提交录制内容；为 False 时回滚，record 模式下原有文件内容保持不变
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if commit:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+            self._conn.close()
+
+
+class CassetteHttpClient:
+    """
+    带录制/回放的 HTTP 客户端，接口与 HttpClient.request 一致
+
+    - record: 请求发往 live 客户端，响应写入 cassette
+    - replay: 从 cassette 返回响应；未命中时抛出 CassetteMissError，提供 live 客户端则回退到实际请求
+    """
+
+    def __init__(self, cassette: Cassette, live: Optional[HttpClient] = None):
+        """
+        Args:
+            cassette: 录制文件
+            live: 实际发送请求的客户端，record 模式必需，replay 模式下作为未命中时的回退（可选）
+        """
+        if cassette.mode == "record" and live is None:
+            raise ValueError("Recording requires a live HTTP client")
+        self.cassette = cassette
+        self.live = live
+        if cassette.mode == "record":
+            cassette.set_base_url(live.base_url)
+
+    @property
+    def stats(self):
+        """实际请求的连接统计（纯回放时为 None）"""
+        return getattr(self.live, "stats", None)
+
+    @property
+    def limiter(self):
+        """实际请求的限流器（未开启限流或纯回放时为 None）"""
+        return getattr(self.live, "limiter", None)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        body: Any = None,
+        stream: Any = None,
+    ) -> HttpResponse:
+        """
+        发送（或回放）HTTP 请求，参数同 HttpClient.request
+
+        录制与回放都需要完整的响应体，stream 参数被忽略。
+        """
+        if self.cassette.mode == "replay":
+            try:
+                return self.cassette.replay(method, path, params, body)
+            except CassetteMissError:
+                if self.live is None:
+                    raise
+            return self.live.request(method, path, headers=headers, params=params, body=body)
+
+        response = self.live.request(method, path, headers=headers, params=params, body=body)
+        self.cassette.record(method, path, params, body, response)
+        return response
+
+    def close(self) -> None:
+        """关闭录制文件与实际请求的客户端"""
+        self.cassette.close()
+        if self.live is not None:
+            self.live.close()
+
+
+class AsyncCassetteHttpClient(CassetteHttpClient):
+    """带录制/回放的异步 HTTP 客户端，接口与 AsyncHttpClient.request 一致"""
+
+    def __init__(self, cassette: Cassette, live: Optional[AsyncHttpClient] = None):
+        super().__init__(cassette, live)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        body: Any = None,
+        stream: Any = None,
+    ) -> HttpResponse:
+        """发送（或回放）HTTP 请求，同 CassetteHttpClient.request"""
+        if self.cassette.mode == "replay":
+            try:
+                return self.cassette.replay(method, path, params, body)
+            except CassetteMissError:
+                if self.live is None:
+                    raise
+            return await self.live.request(method, path, headers=headers, params=params, body=body)
+
+        response = await self.live.request(method, path, headers=headers, params=params, body=body)
+        self.cassette.record(method, path, params, body, response)
+        return response
+
+    async def close(self) -> None:
+        """关闭录制文件与实际请求的客户端"""
+        self.cassette.close()
+        if self.live is not None:
+            await self.live.close()
@@ -0,0 +1,360 @@
+"""
+测试计划编译模块
+
+将测试计划字典编译为执行用的中间表示（IR）：端点已解析、JSONPath 已预解析、
+{{var}} 模板已切分、路径参数槽位已定位，依赖图也已构建完成。
+编译结果按计划内容哈希缓存在当前用户的缓存目录中，重复执行同一计划时跳过所有准备工作。
+
+编译缓存以 pickle 保存，加载时会执行其中的代码，因此只放在当前用户自己的目录下，
+不与计划文件一起分发；加载前还会确认文件属于当前用户且其他用户不可写。
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .. import codec
+from .dataset import Dataset
+from .jsonpath import PathTrie, compile_path
+from .scheduler import ExecutionGraph, _as_list
+from .schema import SchemaValidator, compile_response_schemas
+from .streaming import simple_paths
+from .template import Template, compile_tree
+
+# IR 结构变化时递增，旧缓存自动失效
+IR_VERSION = 9
+
+CACHE_DIR_NAME = ".apiflow-cache"  # 计划目录下的数据缓存（JSON 格式的结果缓存等）
+
+# 编译缓存目录的环境变量，未设置时为 $XDG_CACHE_HOME/apiflow 或 ~/.cache/apiflow
+COMPILE_CACHE_ENV = "APIFLOW_CACHE_DIR"
+
+# inject 规则中的 section → inputs 中的字段
+INJECT_SECTIONS = {
+    "headers": "headers",
+    "body": "body",
+    "params": "query_params",
+}
+
+
+@dataclass
+class CompiledCase:
+    """编译后的测试用例"""
+    id: str
+    name: str
+    endpoint_id: str
+    category: str
+    method: str
+    path: Template  # 端点路径，含 {{var}} 变量和 {param} 槽位
+    path_params: Any  # 以下为 compile_tree 的结果：不含占位符时即原始数据
+    query_params: Any
+    headers: Any
+    body: Any
+    injects: List[Tuple[str, str, Any]]  # (inputs 字段, 键, 编译后的值)
+    assertions: List[dict]
+    extracts: List[dict]
+    json_paths: Dict[str, Any]  # JSONPath 字符串 → 预解析的路径（jsonpath.CompiledPath）
+    fingerprint: str = ""  # 用例、端点、依赖配置及全部上游用例的内容哈希
+    stream_paths: Optional[Dict[str, Tuple]] = None  # 全部 JSONPath 都是简单路径时可流式求值，见 streaming.simple_paths
+    path_trie: Optional[PathTrie] = None  # 简单路径的前缀树，每个响应一次遍历求出全部取值
+    response_schemas: Optional[Dict[str, SchemaValidator]] = None  # 有 schema 断言时为端点的状态码 → 校验器（同端点共用）
+    dataset: Optional[Dataset] = None  # 数据驱动用例的数据集，按行展开执行
+
+
+@dataclass
+class CompiledPlan:
+    """编译后的测试计划"""
+    plan_hash: str
+    plan_name: str
+    cases: Dict[str, CompiledCase]
+    graph: ExecutionGraph
+    warnings: List[str] = field(default_factory=list)
+    base_dir: Optional[str] = None  # 计划文件所在目录，数据集的相对路径以此为基准（不参与缓存）
+
+    def subset(self, tc_ids: Iterable[str]) -> "CompiledPlan":
+        """
+        取出部分用例组成新的计划（用于分片、压测等场景）
+
+        Args:
+            tc_ids: 要保留的用例 ID
+
+        Returns:
+            CompiledPlan 对象，依赖图只保留所选用例之间的边
+        """
+        selected = set(tc_ids)
+        order = [tc_id for tc_id in self.graph.order if tc_id in selected]
+
+        return CompiledPlan(
+            plan_hash=self.plan_hash,
+            plan_name=self.plan_name,
+            cases={tc_id: self.cases[tc_id] for tc_id in order},
+            graph=ExecutionGraph(
+                order=order,
+                prerequisites={tc_id: self.graph.prerequisites[tc_id] & selected for tc_id in order},
+            ),
+            warnings=self.warnings,
+            base_dir=self.base_dir,
+        )
+
+
+def plan_hash(content: Union[bytes, dict]) -> str:
+    """
+    计算测试计划的内容哈希
+
+    Args:
+        content: 计划文件的原始字节，或计划字典（按键排序后序列化）
+
+    Returns:
+        十六进制 SHA-256，包含 IR_VERSION
+    """
+    # 规范化序列化固定使用标准库 json，哈希不随 codec 的实现变化
+    if isinstance(content, dict):
+        content = json.dumps(
+            content, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+    return hashlib.sha256(f"{IR_VERSION}:".encode("utf-8") + content).hexdigest()
+
+
+def compile_cache_dir() -> Path:
+    """当前用户的编译缓存目录：$APIFLOW_CACHE_DIR，或 $XDG_CACHE_HOME/apiflow，默认 ~/.cache/apiflow"""
+    configured = os.getenv(COMPILE_CACHE_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "apiflow"
+
+
+def plan_cache_path(plan_path: Union[str, Path], digest: str) -> Path:
+    """
+    编译缓存路径：<用户缓存目录>/<计划文件名>.<计划绝对路径哈希前 16 位>.<内容哈希前 16 位>.ir
+
+    Args:
+        plan_path: 测试计划 JSON 路径
+        digest: plan_hash 的结果
+
+    Returns:
+        缓存文件路径
+    """
+    plan_path = Path(plan_path)
+    location = hashlib.sha256(str(plan_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return compile_cache_dir() / f"{plan_path.name}.{location}.{digest[:16]}.ir"
+
+
+def _is_trusted_cache(path: Path) -> bool:
+    """缓存文件属于当前用户且其他用户不可写时才加载（非 POSIX 系统只依赖目录位置）"""
+    if not hasattr(os, "getuid"):
+        return True
+    info = path.stat()
+    return info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+
+def compile_plan(test_plan: dict, digest: Optional[str] = None) -> CompiledPlan:
+    """
+    编译测试计划
+
+    编译过程不会因计划中的问题而失败，发现的问题记录在 warnings 中，
+    执行时的行为与直接执行计划字典一致。
+
+    Args:
+        test_plan: 测试计划字典
+        digest: 计划内容哈希（可选），不传则根据字典计算
+
+    Returns:
+        CompiledPlan 对象
+    """
+    meta = test_plan.get("meta", {})
+    endpoints = {ep["id"]: ep for ep in test_plan.get("endpoints", [])}
+    dependencies = test_plan.get("dependencies", {})
+    graph = ExecutionGraph.from_plan(test_plan)
+    tc_map = {tc["id"]: tc for tc in test_plan.get("test_cases", [])}
+
+    warnings: List[str] = []
+    cases = {}
+    schemas: Dict[str, Dict[str, SchemaValidator]] = {}  # 端点 ID → 编译后的响应 Schema，每个端点只编译一次
+
+    for tc_id in graph.order:
+        case = _compile_case(tc_map[tc_id], endpoints, dependencies.get(tc_id), warnings, schemas)
+        # 前置用例在 order 中更靠前，指纹已计算完毕
+        case.fingerprint = _fingerprint(
+            tc_map[tc_id],
+            endpoints.get(case.endpoint_id),
+            dependencies.get(tc_id),
+            sorted(cases[prereq].fingerprint for prereq in graph.prerequisites[tc_id]),
+        )
+        cases[tc_id] = case
+
+    position = {tc_id: index for index, tc_id in enumerate(graph.order)}
+    for tc_id, dep_config in dependencies.items():
+        if tc_id not in tc_map:
+            warnings.append(f"dependencies: unknown test case {tc_id}")
+            continue
+        for dep_id in _as_list((dep_config or {}).get("depends_on")):
+            if dep_id not in tc_map:
+                warnings.append(f"{tc_id}: depends_on unknown test case {dep_id}")
+            elif dep_id == tc_id:
+                warnings.append(f"{tc_id}: depends_on itself (ignored)")
+            elif tc_id in position and dep_id in position and position[dep_id] > position[tc_id]:
+                # 依赖图只保留指向更靠前用例的边，反向边会构成环或与执行顺序矛盾
+                warnings.append(f"{tc_id}: depends_on {dep_id}, which runs later in execution_order (ignored)")
+
+    # 数据行提取的变量只在本行可见，下游用例读不到
+    dependents = graph.dependents()
+    for tc_id, case in cases.items():
+        if case.dataset is not None and case.extracts and dependents[tc_id]:
+            warnings.append(f"{tc_id}: variables extracted by dataset rows are not visible to dependent test cases")
+
+    return CompiledPlan(
+        plan_hash=digest or plan_hash(test_plan),
+        plan_name=meta.get("name", "Unnamed Test Plan"),
+        cases=cases,
+        graph=graph,
+        warnings=warnings,
+    )
+
+
+def load_compiled_plan(plan_path: Union[str, Path], use_cache: bool = True) -> CompiledPlan:
+    """
+    加载测试计划文件并编译，优先使用当前用户缓存目录中的编译缓存
+
+    缓存以计划文件路径与内容哈希为键，命中时连计划 JSON 都无需解析；
+    计划内容变化后旧缓存会被清理。缓存为 pickle 格式，只信任当前用户自己写入的文件，
+    见 _is_trusted_cache。
+
+    Args:
+        plan_path: 测试计划 JSON 路径
+        use_cache: 是否读写缓存
+
+    Returns:
+        CompiledPlan 对象
+    """
+    plan_path = Path(plan_path)
+    content = plan_path.read_bytes()
+    digest = plan_hash(content)
+    cache_path = plan_cache_path(plan_path, digest)
+
+    if use_cache and cache_path.exists():
+        try:
+            if _is_trusted_cache(cache_path):
+                with open(cache_path, "rb") as f:
+                    compiled = pickle.load(f)
+                if isinstance(compiled, CompiledPlan) and compiled.plan_hash == digest:
+                    compiled.base_dir = str(plan_path.parent)
+                    return compiled
+        except Exception:
+            # 缓存损坏或与当前代码不兼容时重新编译
+            pass
+
+    compiled = compile_plan(codec.loads(content), digest)
+
+    if use_cache:
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            prefix = cache_path.name.rsplit(".", 2)[0]  # <计划文件名>.<路径哈希>
+            for stale in cache_path.parent.glob(f"{glob.escape(prefix)}.*.ir"):
+                stale.unlink(missing_ok=True)
+            fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "wb") as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            # 缓存目录不可写时只是无法缓存，不影响执行
+            pass
+
+    compiled.base_dir = str(plan_path.parent)
+    return compiled
+
+
+def _fingerprint(test_case: dict, endpoint: Optional[dict], dep_config: Optional[dict], upstream: List[str]) -> str:
+    """用例指纹：任何一项变化（包括任一上游用例的指纹）都会使指纹变化"""
+    content = json.dumps(
+        [test_case, endpoint, dep_config, upstream],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _compile_case(
+    test_case: dict,
+    endpoints: dict,
+    dep_config: Optional[dict],
+    warnings: List[str],
+    schemas: Optional[Dict[str, Dict[str, SchemaValidator]]] = None,
+) -> CompiledCase:
+    """编译单个测试用例，schemas 为各端点已编译的响应 Schema（跨用例共用）"""
+    tc_id = test_case["id"]
+    endpoint_id = test_case.get("endpoint_id")
+    inputs = test_case.get("inputs", {})
+    assertions = test_case.get("assertions", [])
+    extracts = test_case.get("extract", [])
+
+    # 解析端点
+    endpoint = endpoints.get(endpoint_id)
+    if endpoint is None:
+        warnings.append(f"{tc_id}: unknown endpoint {endpoint_id}")
+        endpoint = {}
+
+    # 预处理依赖注入规则
+    injects = []
+    for key, value_template in ((dep_config or {}).get("inject") or {}).items():
+        parts = key.split(".")
+        if len(parts) == 2 and parts[0] in INJECT_SECTIONS:
+            injects.append((INJECT_SECTIONS[parts[0]], parts[1], compile_tree(value_template)))
+        else:
+            warnings.append(f"{tc_id}: unsupported inject target {key}")
+
+    # 预解析 JSONPath
+    json_paths = {}
+    paths = [a.get("path") for a in assertions if a.get("type") == "json_path"]
+    paths += [e.get("from") for e in extracts]
+    for path in paths:
+        if not path or path in json_paths:
+            continue
+        try:
+            # 经共享缓存解析：不同用例的同一路径只解析一次，并共用同一个表达式对象
+            json_paths[path] = compile_path(path)
+        except Exception as e:
+            # 保持运行时行为：断言报告 JSONPath 错误，提取跳过
+            warnings.append(f"{tc_id}: invalid JSONPath {path}: {e}")
+
+    # 编译端点的响应 Schema（同一端点的用例共用校验器）
+    response_schemas = None
+    if any(a.get("type") == "schema" for a in assertions):
+        if schemas is None:
+            schemas = {}
+        if endpoint_id not in schemas:
+            schemas[endpoint_id], errors = compile_response_schemas(endpoint)
+            warnings.extend(f"{endpoint_id}: invalid {error}" for error in errors)
+        response_schemas = schemas[endpoint_id]
+
+    # 数据驱动用例的数据集（执行时才读取）
+    dataset = None
+    if test_case.get("dataset") is not None:
+        try:
+            dataset = Dataset.from_spec(test_case["dataset"])
+        except ValueError as e:
+            warnings.append(f"{tc_id}: {e}")
+
+    return CompiledCase(
+        id=tc_id,
+        name=test_case.get("name", tc_id),
+        endpoint_id=endpoint_id,
+        category=test_case.get("category", "positive"),
+        method=endpoint.get("method", "GET"),
+        path=Template(endpoint.get("path", ""), path_slots=True),
+        path_params=compile_tree(inputs.get("path_params", {})),
+        query_params=compile_tree(inputs.get("query_params", {})),
+        headers=compile_tree(inputs.get("headers", {})),
+        body=compile_tree(inputs.get("body")),
+        injects=injects,
+        assertions=assertions,
+        extracts=extracts,
+        json_paths=json_paths,
+        # schema 断言需要完整的响应体，不能流式求值
+        stream_paths=None if response_schemas is not None else simple_paths(path for path in paths if path),
+        path_trie=PathTrie(json_paths.values()) or None,
+        response_schemas=response_schemas,
+        dataset=dataset,
+    )
@@ -0,0 +1,125 @@
+"""
+数据集模块
+
+数据驱动用例通过 dataset 引用外部数据文件（CSV 或 JSONL），每一行是一组变量，
+绑定到用例中的 {{var}} 占位符，用例按行展开执行。
+
+数据行在执行时从磁盘逐行读取（生成器），测试计划只记录文件路径，
+数万行的数据集也不会增大计划文件或编译缓存。
+
+每行在用例作用域下新建一层，行变量与该行 extract 提取的变量只在本行可见，
+下游用例读不到（编译时对此给出警告）；需要向下游传递的变量应由普通用例提取。
+"""
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .. import codec
+
+DATASET_FORMATS = ("csv", "jsonl")
+
+# 文件扩展名 → 格式
+_SUFFIX_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """用例引用的数据集"""
+    path: str  # 相对路径相对于测试计划文件所在目录
+    format: str = "csv"  # csv | jsonl
+    limit: Optional[int] = None  # 最多读取的行数
+
+    @classmethod
+    def from_spec(cls, spec: Union[str, dict]) -> "Dataset":
+        """
+        解析用例中的 dataset 字段
+
+        Args:
+            spec: 文件路径，或 {"path": ..., "format": "csv" | "jsonl", "limit": N}；
+                未指定 format 时按扩展名判断
+
+        Returns:
+            Dataset 对象
+
+        Raises:
+            ValueError: 缺少路径、格式无法识别或 limit 不合法
+        """
+        if isinstance(spec, str):
+            spec = {"path": spec}
+        if not isinstance(spec, dict) or not spec.get("path"):
+            raise ValueError("dataset must be a file path or an object with a path")
+
+        path = str(spec["path"])
+        data_format = spec.get("format") or _SUFFIX_FORMATS.get(Path(path).suffix.lower())
+        if data_format not in DATASET_FORMATS:
+            raise ValueError(f"Unknown dataset format for {path}, expected one of {DATASET_FORMATS}")
+
+        limit = spec.get("limit")
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise ValueError(f"Invalid dataset limit: {limit!r}")
+
+        return cls(path=path, format=data_format, limit=limit)
+
+    def resolve(self, base_dir: Optional[Union[str, Path]] = None) -> Path:
+        """数据文件的实际路径（相对路径相对于 base_dir，未提供时相对于当前目录）"""
+        path = Path(self.path)
+        if base_dir is not None and not path.is_absolute():
+            path = Path(base_dir) / path
+        return path
+
+    def rows(self, base_dir: Optional[Union[str, Path]] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐行读取数据集
+
+        Args:
+            base_dir: 相对路径的基准目录（测试计划文件所在目录）
+            limit: 额外的行数上限，与数据集自身的 limit 取较小值
+
+        Yields:
+            列名 → 值（CSV 的值均为字符串，JSONL 保留 JSON 类型）
+
+        Raises:
+            OSError: 文件无法读取
+            ValueError: 行格式不正确（含文件名与行号）
+        """
+        limits = [n for n in (self.limit, limit) if n is not None]
+        remaining = min(limits) if limits else None
+        if remaining == 0:
+            return
+
+        path = self.resolve(base_dir)
+        reader = self._read_csv(path) if self.format == "csv" else self._read_jsonl(path)
+        for row in reader:
+            yield row
+            if remaining is not None:
+                remaining -= 1
+                if remaining == 0:
+                    return
+
+    def _read_csv(self, path: Path) -> Iterator[Dict[str, Any]]:
+        """CSV：首行为列名，utf-8-sig 兼容 Excel 导出的 BOM"""
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            try:
+                for row in reader:
+                    if None in row:
+                        raise ValueError(f"{path}:{reader.line_num}: more values than columns")
+                    yield row
+            except csv.Error as e:
+                raise ValueError(f"{path}:{reader.line_num}: {e}") from e
+
+    def _read_jsonl(self, path: Path) -> Iterator[Dict[str, Any]]:
+        """JSONL：每行一个 JSON 对象，忽略空行"""
+        with open(path, "rb") as f:
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = codec.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_num}: invalid JSON: {e}") from e
+                if not isinstance(row, dict):
+                    raise ValueError(f"{path}:{line_num}: expected a JSON object, got {type(row).__name__}")
+                yield row
@@ -5,21 +5,122 @@ HTTP 客户端模块
 """
 
 import os
-from typing import Any, Optional
-from dataclasses import dataclass, field
+import threading
+from typing import Any, Dict, Optional
+from dataclasses import dataclass, field, replace
 
 import httpx
 from dotenv import load_dotenv
 
+from .. import codec
+from .streaming import PathStreamEvaluator, StreamSpec
+from .timing import TRACE_EXTENSION, PhaseTimer, event_hooks
+
+
+_UNSET = object()
+
+
+def decode_body(content: bytes, encoding: str = "utf-8") -> Any:
+    """
+    解码响应体
+
+    Args:
+        content: 原始响应字节
+        encoding: 文本编码
+
+    Returns:
+        JSON 解析结果，非 JSON 时为原始文本
+    """
+    try:
+        return codec.loads(content)
+    except ValueError:
+        return content.decode(encoding, errors="replace") if content else ""
+
 
-@dataclass
 class HttpResponse:
-    """HTTP 响应封装"""
-    status_code: int
-    headers: dict
-    body: Any  # 可能是 dict、list 或 str
-    elapsed_ms: float  # 响应时间（毫秒）
-    raw_text: str  # 原始响应文本
+    """
+    HTTP 响应封装
+
+    body 与 raw_text 在首次访问时才由原始字节 content 解码，
+    只断言状态码、响应头的用例不会解析响应体。
+    构造时直接传入 body / raw_text 则按原值保存，与普通字段一致。
+
+    流式读取的响应（见 streaming 模块）只保留响应体前缀（保留策略需要完整响应体时读到结束），
+    断言与提取用到的路径已在读取时求值，结果在 path_values 中；
+    其他响应由运行器用用例的 PathTrie 一次求出简单路径的值后写入 path_values。
+    """
+
+    __slots__ = (
+        "status_code", "headers", "elapsed_ms", "timings", "content", "encoding", "path_values",
+        "_body", "_raw_text",
+    )
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: dict,
+        body: Any = _UNSET,
+        elapsed_ms: float = 0.0,
+        raw_text: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+        content: bytes = b"",
+        encoding: str = "utf-8",
+        path_values: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            status_code: 状态码
+            headers: 响应头
+            body: 响应体（dict、list 或 str），不传则由 content 解码
+            elapsed_ms: 响应时间（毫秒）
+            raw_text: 原始响应文本，不传则由 content 解码
+            timings: 各阶段耗时（毫秒），见 timing.HTTP_PHASES
+            content: 原始响应字节
+            encoding: content 的文本编码
+            path_values: 已求值的路径，JSONPath → 取值（未命中为 streaming.MISSING）
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.elapsed_ms = elapsed_ms
+        self.timings = timings if timings is not None else {}
+        self.content = content
+        self.encoding = encoding
+        self.path_values = path_values
+        self._body = body
+        self._raw_text = raw_text
+
+    @property
+    def body(self) -> Any:
+        """响应体：JSON 解析结果，非 JSON 时为原始文本"""
+        if self._body is _UNSET:
+            try:
+                self._body = codec.loads(self.content)
+            except ValueError:
+                self._body = self.raw_text
+        return self._body
+
+    @property
+    def decoded(self) -> bool:
+        """body 是否已解码（或构造时直接传入）"""
+        return self._body is not _UNSET
+
+    @body.setter
+    def body(self, value: Any) -> None:
+        self._body = value
+
+    @property
+    def raw_text(self) -> str:
+        """原始响应文本"""
+        if self._raw_text is None:
+            self._raw_text = self.content.decode(self.encoding, errors="replace") if self.content else ""
+        return self._raw_text
+
+    @raw_text.setter
+    def raw_text(self, value: str) -> None:
+        self._raw_text = value
+
+    def __repr__(self) -> str:
+        return f"HttpResponse(status_code={self.status_code}, elapsed_ms={self.elapsed_ms}, size={len(self.content)})"
 
 
 @dataclass
@@ -32,6 +133,155 @@ class HttpRequest:
     body: Any = None  # 请求体
 
 
+@dataclass
+class ConnectionStats:
+    """连接复用统计"""
+    requests: int = 0  # 完成的请求数
+    connections_opened: int = 0  # 新建的连接数
+    tls_handshakes: int = 0  # TLS 握手次数
+    http_versions: Dict[str, int] = field(default_factory=dict)  # 协议版本 → 请求数，如 HTTP/1.1、HTTP/2
+
+    @property
+    def reused(self) -> int:
+        """复用已有连接的请求数（HTTP/2 多路复用的请求也计入）"""
+        return max(self.requests - self.connections_opened, 0)
+
+    @property
+    def reuse_rate(self) -> float:
+        """连接复用率（百分比）"""
+        return self.reused / self.requests * 100 if self.requests > 0 else 0
+
+    def record(self, response: httpx.Response, timer: PhaseTimer) -> None:
+        """记录一次请求"""
+        self.requests += 1
+        if timer.new_connection:
+            self.connections_opened += 1
+        if "tls" in timer.phases():
+            self.tls_handshakes += 1
+        self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+
+    def since(self, earlier: "ConnectionStats") -> "ConnectionStats":
+        """与之前的快照相比的增量"""
+        return ConnectionStats(
+            requests=self.requests - earlier.requests,
+            connections_opened=self.connections_opened - earlier.connections_opened,
+            tls_handshakes=self.tls_handshakes - earlier.tls_handshakes,
+            http_versions={
+                version: count - earlier.http_versions.get(version, 0)
+                for version, count in self.http_versions.items()
+                if count - earlier.http_versions.get(version, 0) > 0
+            },
+        )
+
+    def snapshot(self) -> "ConnectionStats":
+        """当前统计的副本"""
+        return replace(self, http_versions=dict(self.http_versions))
+
+    def to_dict(self) -> dict:
+        """转换为可序列化的字典"""
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused": self.reused,
+            "reuse_rate": round(self.reuse_rate, 2),
+            "tls_handshakes": self.tls_handshakes,
+            "http_versions": dict(self.http_versions),
+        }
+
+
+def _build_limits(
+    max_connections: Optional[int],
+    max_keepalive_connections: Optional[int],
+    keepalive_expiry: Optional[float],
+) -> httpx.Limits:
+    """构造连接池限制（同步与异步客户端共用），未指定的项使用 httpx 默认值"""
+    defaults = httpx.Limits()
+    return httpx.Limits(
+        max_connections=max_connections if max_connections is not None else defaults.max_connections,
+        max_keepalive_connections=(
+            max_keepalive_connections if max_keepalive_connections is not None
+            else defaults.max_keepalive_connections
+        ),
+        keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else defaults.keepalive_expiry,
+    )
+
+
+def _check_http2(http2: bool) -> None:
+    """HTTP/2 依赖可选的 h2 包"""
+    if not http2:
+        return
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError("HTTP/2 requires the optional h2 package: pip install 'httpx[http2]'") from None
+
+
+def _build_request_kwargs(
+    default_headers: dict,
+    method: str,
+    path: str,
+    headers: Optional[dict],
+    params: Optional[dict],
+    body: Any,
+) -> dict:
+    """构造 httpx 请求参数（同步与异步客户端共用）"""
+    # 合并请求头
+    merged_headers = {**default_headers}
+    if headers:
+        merged_headers.update(headers)
+
+    # 构造请求参数
+    request_kwargs = {
+        "method": method.upper(),
+        "url": path,
+        "headers": merged_headers,
+    }
+
+    if params:
+        request_kwargs["params"] = params
+
+    # 请求体与 httpx 的 json= 参数输出相同，不随 codec 后端变化
+    if body is not None:
+        request_kwargs["content"] = codec.dumps_request(body)
+        if not any(name.lower() == "content-type" for name in merged_headers):
+            merged_headers["Content-Type"] = "application/json"
+
+    return request_kwargs
+
+
+def _to_http_response(response: httpx.Response, timer: Optional[PhaseTimer] = None) -> HttpResponse:
+    """
+    将 httpx 响应转换为 HttpResponse（同步与异步客户端共用）
+
+    只保留原始字节的引用，响应体在首次访问 body / raw_text 时才解码。
+    """
+    return HttpResponse(
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        elapsed_ms=response.elapsed.total_seconds() * 1000,
+        timings=timer.phases() if timer is not None else {},
+        content=response.content,
+        encoding=response.encoding or "utf-8",
+    )
+
+
+def _to_streamed_response(
+    response: httpx.Response,
+    timer: PhaseTimer,
+    evaluator: PathStreamEvaluator,
+) -> HttpResponse:
+    """将流式读取的 httpx 响应转换为 HttpResponse（同步与异步客户端共用）"""
+    return HttpResponse(
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        elapsed_ms=response.elapsed.total_seconds() * 1000,
+        timings=timer.phases(),
+        content=bytes(evaluator.head),
+        encoding=response.encoding or "utf-8",
+        path_values=evaluator.close(),
+    )
+
+
 class HttpClient:
     """HTTP 客户端"""
 
@@ -40,6 +290,10 @@ class HttpClient:
         base_url: Optional[str] = None,
         timeout: float = 30.0,
         default_headers: Optional[dict] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: bool = False,
     ):
         """
         初始化 HTTP 客户端
@@ -48,6 +302,10 @@ class HttpClient:
             base_url: API 基础 URL，如不传则从环境变量读取
             timeout: 请求超时时间（秒）
             default_headers: 默认请求头
+            max_connections: 连接池最大连接数，默认使用 httpx 的默认值
+            max_keepalive_connections: 保持空闲的最大连接数
+            keepalive_expiry: 空闲连接保留时间（秒）
+            http2: 是否启用 HTTP/2（需要安装 httpx[http2]，由服务端协商决定最终协议）
         """
         load_dotenv()
 
@@ -58,10 +316,18 @@ class HttpClient:
             "Accept": "application/json",
         }
 
+        _check_http2(http2)
+        self.http2 = http2
+        self.stats = ConnectionStats()
+        self._stats_lock = threading.Lock()
+
         self.client = httpx.Client(
             base_url=self.base_url,
             timeout=timeout,
             headers=self.default_headers,
+            event_hooks=event_hooks(),
+            limits=_build_limits(max_connections, max_keepalive_connections, keepalive_expiry),
+            http2=http2,
         )
 
     def request(
@@ -71,6 +337,7 @@ class HttpClient:
         headers: Optional[dict] = None,
         params: Optional[dict] = None,
         body: Any = None,
+        stream: Optional[StreamSpec] = None,
     ) -> HttpResponse:
         """
         发送 HTTP 请求
@@ -81,44 +348,37 @@ class HttpClient:
             headers: 请求头（会与默认请求头合并）
             params: Query 参数
             body: 请求体
+            stream: 流式求值参数（可选），设置后边接收边对其中的路径求值，所有路径有结论即停止读取
 
         Returns:
             HttpResponse 对象
         """
-        # 合并请求头
-        merged_headers = {**self.default_headers}
-        if headers:
-            merged_headers.update(headers)
-
-        # 构造请求参数
-        request_kwargs = {
-            "method": method.upper(),
-            "url": path,
-            "headers": merged_headers,
-        }
+        request_kwargs = _build_request_kwargs(self.default_headers, method, path, headers, params, body)
 
-        if params:
-            request_kwargs["params"] = params
+        # 发送请求，计时器作为 trace 扩展随请求传入
+        timer = PhaseTimer()
+        if stream is None:
+            response = self.client.request(**request_kwargs, extensions={TRACE_EXTENSION: timer})
+            timer.finish()
+            evaluator = None
+        else:
+            with self.client.stream(**request_kwargs, extensions={TRACE_EXTENSION: timer}) as response:
+                evaluator = None
+                if stream.wants_stream(response.headers):
+                    evaluator = PathStreamEvaluator(stream.paths, stream.keep_bytes)
+                    for chunk in response.iter_bytes():
+                        if evaluator.feed(chunk):
+                            break
+                else:
+                    response.read()
+            timer.finish()
 
-        if body is not None:
-            request_kwargs["json"] = body
+        with self._stats_lock:
+            self.stats.record(response, timer)
 
-        # 发送请求
-        response = self.client.request(**request_kwargs)
-
-        # 解析响应体
-        try:
-            response_body = response.json()
-        except Exception:
-            response_body = response.text
-
-        return HttpResponse(
-            status_code=response.status_code,
-            headers=dict(response.headers),
-            body=response_body,
-            elapsed_ms=response.elapsed.total_seconds() * 1000,
-            raw_text=response.text,
-        )
+        if evaluator is not None:
+            return _to_streamed_response(response, timer, evaluator)
+        return _to_http_response(response, timer)
 
     def get(self, path: str, **kwargs) -> HttpResponse:
         """发送 GET 请求"""
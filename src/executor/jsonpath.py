@@ -0,0 +1,276 @@
+"""
+JSONPath 求值模块
+
+jsonpath-ng 基于 PLY 的解析器很慢，而断言与提取反复使用同一批路径（如 $.id、$.data.token）。
+所有组件通过 compile_path 取得解析后的路径，同一路径在进程内只解析一次。
+缓存有容量上限（LRU 淘汰），线程安全，命中/未命中计数可用于调整容量。
+
+生成器写出的路径几乎都只由字段名与下标组成，这类路径求值时直接遍历 dict / list，
+不构造 jsonpath-ng 的 DatumInContext；过滤器、通配符、切片、递归下降等仍交给 jsonpath-ng。
+简单路径由 jsonpath-ng 的语法树识别，取值规则与 jsonpath-ng 一致。
+同一用例的简单路径编译为前缀树（PathTrie），每个响应只遍历一次。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from jsonpath_ng import jsonpath as jsonpath_ast
+from jsonpath_ng import parse as jsonpath_parse
+
+from .streaming import MISSING
+
+# 默认缓存的路径数
+DEFAULT_MAXSIZE = 4096
+
+
+def _simple_steps(expr: Any) -> Optional[Tuple[Union[str, int], ...]]:
+    """
+    从 jsonpath-ng 语法树中取出简单路径的步骤
+
+    Returns:
+        字段名（str）与下标（int）组成的元组；含其他节点时返回 None
+    """
+    nodes = []
+    while type(expr) is jsonpath_ast.Child:
+        nodes.append(expr.right)
+        expr = expr.left
+    nodes.append(expr)
+    nodes.reverse()
+
+    if type(nodes[0]) is jsonpath_ast.Root:
+        nodes = nodes[1:]
+
+    steps = []
+    for node in nodes:
+        if type(node) is jsonpath_ast.Fields and len(node.fields) == 1:
+            field = node.fields[0]
+            if field == "*" or field == jsonpath_ast.auto_id_field:
+                return None
+            steps.append(field)
+        elif type(node) is jsonpath_ast.Index and len(node.indices) == 1:
+            steps.append(node.indices[0])
+        else:
+            return None
+    return tuple(steps)
+
+
+class CompiledPath:
+    """
+    解析后的 JSONPath
+
+    first 返回第一个匹配的值（与 expr.find(data)[0].value 相同），未命中时返回 MISSING。
+    """
+
+    __slots__ = ("path", "expr", "steps")
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSONPath 字符串
+
+        Raises:
+            Exception: 路径不合法（jsonpath-ng 的解析异常）
+        """
+        self.path = path
+        self.expr = jsonpath_parse(path)
+        self.steps = _simple_steps(self.expr)  # 简单路径的步骤，None 表示交给 jsonpath-ng
+
+    def find(self, data: Any) -> list:
+        """全部匹配（jsonpath-ng 的 DatumInContext 列表）"""
+        return self.expr.find(data)
+
+    def first(self, data: Any) -> Any:
+        """
+        第一个匹配的值
+
+        Raises:
+            TypeError: 与 jsonpath-ng 相同，对数字等没有长度的值取下标时抛出
+        """
+        if self.steps is None:
+            matches = self.expr.find(data)
+            return matches[0].value if matches else MISSING
+
+        value = data
+        for step in self.steps:
+            if type(step) is int:
+                # 同 jsonpath_ng.Index：dict 不按下标取值，越界视为未命中
+                if isinstance(value, dict) or not (value and -len(value) <= step < len(value)):
+                    return MISSING
+                value = value[step]
+            else:
+                # 同 jsonpath_ng.Fields：没有 get 方法的值视为未命中
+                try:
+                    value = value.get(step, MISSING)
+                except (TypeError, AttributeError):
+                    return MISSING
+                if value is MISSING:
+                    return MISSING
+        return value
+
+    def __repr__(self) -> str:
+        return f"CompiledPath({self.path!r})"
+
+
+# PathTrie 求值出错（如对数字取下标）的节点
+_ERROR = object()
+
+
+class PathTrie:
+    """
+    同一用例全部简单路径的前缀树
+
+    构造时把前缀树按深度优先展开为线性的取值步骤（共同前缀只出现一次），
+    evaluate 按顺序执行这些步骤，遍历响应体一次即得到每个路径的值。取值规则同 CompiledPath.first。
+    """
+
+    __slots__ = ("ops", "root_paths")
+
+    def __init__(self, paths: Iterable[CompiledPath]):
+        """
+        Args:
+            paths: 解析后的路径，非简单路径被忽略
+        """
+        self.root_paths: List[str] = []  # 路径 $ 本身
+        # (父节点序号, 步骤, 在此结束的路径)，父节点序号 0 为根；第 i 个步骤的结果存放在序号 i + 1
+        self.ops: List[Tuple[int, Union[str, int], List[str]]] = []
+
+        nodes: Dict[Tuple, int] = {(): 0}
+        for compiled in paths:
+            steps = compiled.steps
+            if steps is None:
+                continue
+            if not steps:
+                self.root_paths.append(compiled.path)
+                continue
+            for depth in range(1, len(steps) + 1):
+                prefix = steps[:depth]
+                if prefix not in nodes:
+                    nodes[prefix] = len(self.ops) + 1
+                    self.ops.append((nodes[steps[:depth - 1]], prefix[-1], []))
+            self.ops[nodes[steps] - 1][2].append(compiled.path)
+
+    def __bool__(self) -> bool:
+        return bool(self.ops or self.root_paths)
+
+    def evaluate(self, data: Any) -> Dict[str, Any]:
+        """
+        求出所有路径的值
+
+        Args:
+            data: 响应体
+
+        Returns:
+            路径 → 取值，未命中为 MISSING；求值出错（如对数字取下标）的路径不在结果中，
+            由调用方单独求值以得到与 CompiledPath.first 相同的异常
+        """
+        values = dict.fromkeys(self.root_paths, data)
+        slots = [data]
+        append = slots.append
+
+        for parent, step, paths in self.ops:
+            value = slots[parent]
+            # 常见情况内联：对象按字段名取值、数组按下标取值
+            if type(value) is dict:
+                item = MISSING if type(step) is int else value.get(step, MISSING)
+            elif type(value) is list and type(step) is int:
+                item = value[step] if -len(value) <= step < len(value) else MISSING
+            else:
+                item = _step(value, step)
+
+            append(item)
+            if paths and item is not _ERROR:
+                for path in paths:
+                    values[path] = item
+        return values
+
+
+def _step(value: Any, step: Union[str, int]) -> Any:
+    """PathTrie 中的一步取值（非常见情况），规则同 CompiledPath.first，出错时返回 _ERROR"""
+    if value is MISSING or value is _ERROR:
+        return value
+    if type(step) is int:
+        try:
+            found = not isinstance(value, dict) and value and -len(value) <= step < len(value)
+        except TypeError:
+            return _ERROR
+        return value[step] if found else MISSING
+    try:
+        return value.get(step, MISSING)
+    except (TypeError, AttributeError):
+        return MISSING
+
+
+class JsonPathCache:
+    """解析后的 JSONPath 的 LRU 缓存（线程安全）"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Args:
+            maxsize: 最多缓存的路径数
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CompiledPath]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> CompiledPath:
+        """
+        取得解析后的路径，未缓存时解析并缓存
+
+        Args:
+            path: JSONPath 字符串
+
+        Returns:
+            CompiledPath 对象
+
+        Raises:
+            Exception: 路径不合法（jsonpath-ng 的解析异常，不缓存）
+        """
+        with self._lock:
+            compiled = self._entries.get(path)
+            if compiled is not None:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # 在锁外解析，并发未命中同一路径时可能重复解析，结果相同
+        compiled = CompiledPath(path)
+        with self._lock:
+            self._entries[path] = compiled
+            self._entries.move_to_end(path)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计：容量、当前条目数、命中与未命中次数、命中率（%）"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "maxsize": self.maxsize,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """清空缓存与计数"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# 进程内共享的缓存（AssertionEngine、VariableManager 与计划编译共用）
+jsonpath_cache = JsonPathCache()
+
+
+def compile_path(path: str) -> CompiledPath:
+    """从共享缓存取得解析后的 JSONPath，见 JsonPathCache.get"""
+    return jsonpath_cache.get(path)
@@ -0,0 +1,185 @@
+"""
+响应时间模块
+
+- 延迟预算：config/config.yaml 中按端点设置响应时间上限，执行时为该端点的每个用例追加 latency 断言
+- 基线对比：与基线执行（execute --baseline）的结果比较各端点的响应时间分布，
+  单侧 Mann-Whitney U 检验显著变慢、且中位数变慢超过阈值时判定为退化
+
+Mann-Whitney U 检验不假设延迟服从正态分布，只比较两组样本的排序：
+样本无并列且规模不大时计算精确 p 值，否则使用带并列校正的正态近似。
+"""
+
+import math
+from collections import defaultdict
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 精确计算 p 值的样本规模上限（两组样本数之积）
+EXACT_MAX_PAIRS = 2500
+
+
+class LatencyBudgets:
+    """各端点的响应时间上限（毫秒）"""
+
+    def __init__(self, default: Optional[float] = None, endpoints: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            default: 所有端点默认的上限，None 表示不限制
+            endpoints: 端点 ID → 上限，优先于 default
+        """
+        self.default = default
+        self.endpoints = dict(endpoints or {})
+        self._assertions: Dict[str, Optional[dict]] = {}  # 端点 ID → 预算断言
+
+    def __bool__(self) -> bool:
+        return self.default is not None or bool(self.endpoints)
+
+    def budget(self, endpoint_id: str) -> Optional[float]:
+        """端点的上限，未设置时为 None"""
+        return self.endpoints.get(endpoint_id, self.default)
+
+    def apply(self, endpoint_id: str, assertions: List[dict]) -> List[dict]:
+        """
+        为用例追加预算断言
+
+        Args:
+            endpoint_id: 用例所属端点
+            assertions: 用例的断言规则
+
+        Returns:
+            追加 latency 断言后的列表；端点没有预算或用例自带 latency 断言时原样返回
+        """
+        if endpoint_id not in self._assertions:
+            budget = self.budget(endpoint_id)
+            self._assertions[endpoint_id] = (
+                None if budget is None else {"type": "latency", "operator": "less_than", "expected": budget}
+            )
+        assertion = self._assertions[endpoint_id]
+        if assertion is None or any(a.get("type") == "latency" for a in assertions):
+            return assertions
+        return [*assertions, assertion]
+
+
+def mann_whitney_u(baseline: List[float], current: List[float]) -> Tuple[float, float]:
+    """
+    单侧 Mann-Whitney U 检验（备择假设：current 倾向于大于 baseline）
+
+    Args:
+        baseline: 基线样本
+        current: 本次样本
+
+    Returns:
+        (U 统计量（current 大于 baseline 的样本对数，并列计 0.5）, p 值)
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        raise ValueError("Both samples must be non-empty")
+
+    # 合并排序，并列取平均秩
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in current])
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1])
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+
+    if not tie_term and n1 * n2 <= EXACT_MAX_PAIRS:
+        return u, _exact_upper_tail(int(u), n1, n2)
+
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        # 全部样本相同
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _exact_upper_tail(u: int, n1: int, n2: int) -> float:
+    """
+    无并列时 P(U >= u) 的精确值
+
+    U 的分布计数是高斯二项式系数 [n1+n2, n1]_q 的各项系数，
+    按 prod (1 - q^(n2+i)) / (1 - q^i) 逐项展开（整数运算，无精度损失）。
+    """
+    size = n1 * n2
+    counts = [1] + [0] * size
+    for i in range(1, n1 + 1):
+        shift = n2 + i
+        for k in range(size, shift - 1, -1):
+            counts[k] -= counts[k - shift]
+        for k in range(i, size + 1):
+            counts[k] += counts[k - i]
+    return sum(counts[u:]) / sum(counts)
+
+
+def _latency_samples(results: Iterable) -> Dict[str, List[float]]:
+    """按端点收集实际执行且收到响应的用例的响应时间"""
+    samples: Dict[str, List[float]] = defaultdict(list)
+    for result in results:
+        if result.skipped or result.cached or result.error or not result.elapsed_ms:
+            continue
+        samples[result.endpoint_id].append(result.elapsed_ms)
+    return samples
+
+
+def compare_latency(
+    baseline: Iterable,
+    current: Iterable,
+    alpha: float = 0.05,
+    min_samples: int = 3,
+    min_slowdown: float = 1.2,
+) -> dict:
+    """
+    比较两次执行各端点的响应时间分布
+
+    Args:
+        baseline: 基线执行的用例结果（TestCaseResult）
+        current: 本次执行的用例结果
+        alpha: 显著性水平
+        min_samples: 两次执行中端点都至少有这么多样本才参与比较
+        min_slowdown: 中位数至少变慢到基线的倍数，过滤统计显著但幅度很小的变化
+
+    Returns:
+        {"alpha", "min_samples", "min_slowdown", "endpoints": [各端点的比较结果], "regressions": [退化的端点 ID]}
+    """
+    baseline_samples = _latency_samples(baseline)
+    current_samples = _latency_samples(current)
+
+    endpoints = []
+    for endpoint_id, samples in current_samples.items():
+        reference = baseline_samples.get(endpoint_id)
+        if not reference or len(reference) < min_samples or len(samples) < min_samples:
+            continue
+
+        baseline_median = median(reference)
+        current_median = median(samples)
+        slowdown = current_median / baseline_median if baseline_median else math.inf
+        _, p_value = mann_whitney_u(reference, samples)
+        endpoints.append({
+            "endpoint_id": endpoint_id,
+            "baseline_samples": len(reference),
+            "samples": len(samples),
+            "baseline_median_ms": round(baseline_median, 2),
+            "median_ms": round(current_median, 2),
+            "slowdown": round(slowdown, 3),
+            "p_value": round(p_value, 6),
+            "regressed": p_value < alpha and slowdown >= min_slowdown,
+        })
+
+    return {
+        "alpha": alpha,
+        "min_samples": min_samples,
+        "min_slowdown": min_slowdown,
+        "endpoints": endpoints,
+        "regressions": [e["endpoint_id"] for e in endpoints if e["regressed"]],
+    }
@@ -0,0 +1,320 @@
+"""
+压测模块
+
+以开环到达模型按目标请求速率重放测试计划，统计各端点的吞吐量、错误率与延迟分布。
+
+每次到达执行一条完整的依赖链（依赖连通分量），链内用例按顺序执行，
+并使用独立的变量作用域，保证依赖关系正确；链与链之间按固定间隔发起，
+不等待前一条链完成。所有到达共用一个 TestRunner，同一条链的并发执行各自持有变量作用域，互不覆盖。
+"""
+
+import math
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+from .compiler import CompiledPlan, compile_plan
+from .http_client import HttpClient
+from .retention import RetentionPolicy
+from .runner import TestRunner, _snapshot_stats, _stats_since
+from .shard import connected_components
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(text: str) -> float:
+    """
+    解析时长字符串
+
+    Args:
+        text: 如 "30s"、"5m"、"1h30m"，纯数字按秒处理
+
+    Returns:
+        秒数
+    """
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+
+    matches = list(_DURATION_PATTERN.finditer(text))
+    if not matches or "".join(m.group(0) for m in matches) != text:
+        raise ValueError(f"Invalid duration: {text!r}, expected e.g. 30s, 5m, 1h")
+
+    return sum(float(m.group(1)) * _DURATION_UNITS[m.group(2)] for m in matches)
+
+
+class LatencyHistogram:
+    """对数分桶的延迟直方图，相对误差约 1%，内存占用与样本数无关"""
+
+    _MIN_MS = 0.01
+    _LOG_GROWTH = math.log(1.01)
+
+    def __init__(self):
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        """记录一个样本"""
+        if value_ms <= self._MIN_MS:
+            index = 0
+        else:
+            index = int(math.log(value_ms / self._MIN_MS) / self._LOG_GROWTH) + 1
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, p: float) -> float:
+        """
+        计算分位数
+
+        Args:
+            p: 百分位，如 95
+
+        Returns:
+            分位数对应的延迟（毫秒），无样本时返回 0
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean(self) -> float:
+        """平均延迟"""
+        return self.total_ms / self.count if self.count else 0.0
+
+    def buckets(self) -> List[List[float]]:
+        """非空分桶列表：[[桶上界毫秒, 样本数], ...]"""
+        return [
+            [round(self._upper_bound(index), 3), self._buckets[index]]
+            for index in sorted(self._buckets)
+        ]
+
+    def _upper_bound(self, index: int) -> float:
+        """分桶上界"""
+        return self._MIN_MS * math.exp(index * self._LOG_GROWTH)
+
+
+@dataclass
+class EndpointStats:
+    """单个端点的压测统计"""
+    endpoint_id: str
+    requests: int = 0
+    errors: int = 0
+    skipped: int = 0  # 因同一链上游失败而未发送的请求
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def error_rate(self) -> float:
+        """错误率（百分比）"""
+        return self.errors / self.requests * 100 if self.requests > 0 else 0
+
+
+@dataclass
+class LoadResult:
+    """压测结果"""
+    plan_name: str
+    target_rps: float
+    duration_s: float
+    elapsed_s: float
+    sent: int
+    dropped: int
+    endpoints: Dict[str, EndpointStats]
+    connections: Optional[dict] = None  # 连接复用统计（ConnectionStats.to_dict）
+    failed: int = 0  # 执行时抛出异常的依赖链中的请求数，不计入各端点统计
+    first_error: Optional[str] = None  # 第一个此类异常
+
+    @property
+    def actual_rps(self) -> float:
+        """实际完成的请求速率"""
+        completed = sum(s.requests for s in self.endpoints.values())
+        return completed / self.elapsed_s if self.elapsed_s > 0 else 0
+
+    def to_dict(self) -> dict:
+        """转换为可序列化的字典"""
+        return {
+            "plan_name": self.plan_name,
+            "target_rps": self.target_rps,
+            "actual_rps": round(self.actual_rps, 2),
+            "duration_s": self.duration_s,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "first_error": self.first_error,
+            "endpoints": {
+                endpoint_id: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "skipped": stats.skipped,
+                    "error_rate": round(stats.error_rate, 2),
+                    "throughput_rps": round(stats.requests / self.elapsed_s, 2) if self.elapsed_s > 0 else 0,
+                    "latency_ms": {
+                        "mean": round(stats.latency.mean, 3),
+                        "p50": round(stats.latency.percentile(50), 3),
+                        "p95": round(stats.latency.percentile(95), 3),
+                        "p99": round(stats.latency.percentile(99), 3),
+                        "max": round(stats.latency.max_ms, 3),
+                    },
+                    "histogram": stats.latency.buckets(),
+                }
+                for endpoint_id, stats in self.endpoints.items()
+            },
+            "connections": self.connections,
+        }
+
+
+class LoadRunner:
+    """压测运行器"""
+
+    def __init__(
+        self,
+        http_client: Optional[HttpClient] = None,
+        rps: float = 10.0,
+        duration_s: float = 60.0,
+        max_in_flight: int = 100,
+    ):
+        """
+        初始化压测运行器
+
+        Args:
+            http_client: HTTP 客户端，如不传则自动创建
+            rps: 目标请求速率（每秒请求数）
+            duration_s: 发压时长（秒）
+            max_in_flight: 同时在途的最大依赖链数，超出时本次到达记为丢弃
+        """
+        if rps <= 0:
+            raise ValueError("rps must be positive")
+
+        self.http_client = http_client or HttpClient()
+        self.rps = rps
+        self.duration_s = duration_s
+        self.max_in_flight = max_in_flight
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, EndpointStats] = {}
+
+        # 压测只统计状态与延迟，通过用例不保留（也不解码）响应体；
+        # 数据驱动用例每次到达只执行第一行，与按用例数计算的到达间隔一致
+        self._runner = TestRunner(
+            http_client=self.http_client, retention=RetentionPolicy(mode="failures"), dataset_limit=1
+        )
+
+    def run(self, test_plan: Union[dict, CompiledPlan]) -> LoadResult:
+        """
+        执行压测
+
+        Args:
+            test_plan: 测试计划字典或编译后的计划
+
+        Returns:
+            LoadResult 对象
+        """
+        if not isinstance(test_plan, CompiledPlan):
+            test_plan = compile_plan(test_plan)
+
+        plan_name = test_plan.plan_name
+        chains = self._build_chains(test_plan)
+        if not chains:
+            raise ValueError("Test plan has no test cases")
+
+        self._stats = {}
+        sent = 0
+        dropped = 0
+        failures = {"failed": 0, "first_error": None}
+        in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+        def run_chain(chain_plan: CompiledPlan) -> None:
+            try:
+                self._run_chain(chain_plan)
+            finally:
+                in_flight.release()
+
+        def chain_done(future: Future, chain_size: int) -> None:
+            # 异常不能随 future 丢弃，否则这些请求既不在 dropped 也不在端点统计中
+            error = future.exception()
+            if error is None:
+                return
+            with self._lock:
+                failures["failed"] += chain_size
+                if failures["first_error"] is None:
+                    failures["first_error"] = f"{type(error).__name__}: {error}"
+
+        stats_before = _snapshot_stats(self.http_client)
+        start = time.perf_counter()
+        next_at = start
+        arrival = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="apiflow-load") as pool:
+            while next_at - start < self.duration_s:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+                chain_plan = chains[arrival % len(chains)]
+                chain_size = len(chain_plan.cases)
+
+                # 开环模型：到达时刻固定，不等待在途请求完成
+                if in_flight.acquire(blocking=False):
+                    future = pool.submit(run_chain, chain_plan)
+                    future.add_done_callback(lambda f, size=chain_size: chain_done(f, size))
+                    sent += chain_size
+                else:
+                    dropped += chain_size
+
+                arrival += 1
+                next_at += chain_size / self.rps
+
+        elapsed_s = time.perf_counter() - start
+
+        return LoadResult(
+            plan_name=plan_name,
+            target_rps=self.rps,
+            duration_s=self.duration_s,
+            elapsed_s=elapsed_s,
+            sent=sent,
+            dropped=dropped,
+            endpoints=dict(sorted(self._stats.items())),
+            connections=_stats_since(self.http_client, stats_before),
+            failed=failures["failed"],
+            first_error=failures["first_error"],
+        )
+
+    def _build_chains(self, compiled: CompiledPlan) -> List[CompiledPlan]:
+        """把编译后的计划按依赖连通分量拆成多个只包含单条依赖链的子计划"""
+        return [compiled.subset(component) for component in connected_components(compiled.graph)]
+
+    def _run_chain(self, chain_plan: CompiledPlan) -> None:
+        """执行一条依赖链并记录统计，每次执行使用独立的变量作用域（TestRunner.run 内创建）"""
+        result = self._runner.run(chain_plan)
+
+        with self._lock:
+            for case_result in result.results:
+                stats = self._stats.get(case_result.endpoint_id)
+                if stats is None:
+                    stats = self._stats[case_result.endpoint_id] = EndpointStats(case_result.endpoint_id)
+
+                if case_result.skipped:
+                    stats.skipped += 1
+                    continue
+
+                stats.requests += 1
+                if not case_result.passed:
+                    stats.errors += 1
+                if case_result.response is not None:
+                    stats.latency.record(case_result.elapsed_ms)
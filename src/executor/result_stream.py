@@ -0,0 +1,70 @@
+"""
+结果流模块
+
+用例执行完成后立即以 JSONL 格式写入磁盘，报告阶段再从磁盘逐条读回，
+内存占用与测试计划规模无关。
+"""
+
+from pathlib import Path
+from typing import Iterator, Union
+
+from .. import codec
+from .runner import TestCaseResult
+
+
+class JsonlResultWriter:
+    """JSONL 结果写入器"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        初始化写入器（会覆盖已有文件）
+
+        Args:
+            path: JSONL 文件路径
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+
+    def write(self, result: TestCaseResult) -> None:
+        """
+        写入一条用例结果
+
+        Args:
+            result: 测试用例执行结果
+        """
+        self._file.write(codec.dumps_bytes(result.to_dict(), default=str))
+        self._file.write(b"\n")
+
+    def close(self) -> None:
+        """关闭文件"""
+        self._file.close()
+
+    def results(self) -> "JsonlResultReader":
+        """返回读取已写入结果的读取器"""
+        return JsonlResultReader(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class JsonlResultReader:
+    """JSONL 结果读取器，每次迭代都重新从磁盘逐行读取"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        初始化读取器
+
+        Args:
+            path: JSONL 文件路径
+        """
+        self.path = Path(path)
+
+    def __iter__(self) -> Iterator[TestCaseResult]:
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield TestCaseResult.from_dict(codec.loads(line))
@@ -0,0 +1,139 @@
+"""
+结果缓存模块
+
+记录每个用例最近一次执行的结果及其指纹（见 CompiledCase.fingerprint），
+下次执行时只重跑新增、变更或上次未通过的用例及其前置用例，其余用例沿用缓存的结论。
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+from .. import codec
+from .compiler import CACHE_DIR_NAME, CompiledPlan
+from .runner import TestCaseResult
+
+# 缓存文件格式变化时递增
+_CACHE_VERSION = 1
+
+
+def results_cache_path(plan_path: Union[str, Path], shard: Optional[str] = None) -> Path:
+    """
+    结果缓存路径：<计划目录>/.apiflow-cache/<计划文件名>[.shard-i-of-N].results.json
+
+    Args:
+        plan_path: 测试计划 JSON 路径
+        shard: 分片标识（可选），如 "2-of-4"，各分片分别缓存
+
+    Returns:
+        缓存文件路径
+    """
+    plan_path = Path(plan_path)
+    suffix = f".shard-{shard}" if shard else ""
+    return plan_path.parent / CACHE_DIR_NAME / f"{plan_path.name}{suffix}.results.json"
+
+
+class ResultsCache:
+    """用例结果缓存"""
+
+    def __init__(self, path: Union[str, Path], base_url: str):
+        """
+        初始化缓存（不读取文件，见 load）
+
+        Args:
+            path: 缓存文件路径
+            base_url: 本次执行的 API 基础 URL，与缓存记录的不同时缓存整体失效
+        """
+        self.path = Path(path)
+        self.base_url = base_url
+        self.entries: Dict[str, dict] = {}  # 用例 ID → {"fingerprint": ..., "result": TestCaseResult.to_dict()}
+
+    @classmethod
+    def load(cls, path: Union[str, Path], base_url: str) -> "ResultsCache":
+        """
+        读取缓存文件，文件不存在、损坏或 base_url 不同时返回空缓存
+
+        Args:
+            path: 缓存文件路径
+            base_url: 本次执行的 API 基础 URL
+
+        Returns:
+            ResultsCache 对象
+        """
+        cache = cls(path, base_url)
+        try:
+            with open(cache.path, "rb") as f:
+                data = codec.load(f)
+        except (OSError, ValueError):
+            return cache
+
+        if data.get("version") == _CACHE_VERSION and data.get("base_url") == base_url:
+            cache.entries = data.get("entries", {})
+        return cache
+
+    def reusable(self, compiled: CompiledPlan) -> Dict[str, TestCaseResult]:
+        """
+        计算可以沿用缓存结论的用例
+
+        新增、变更（指纹不同）或上次未通过的用例需要重跑，
+        它们的全部前置用例也要重跑以重新产生变量；其余用例沿用缓存结果。
+
+        Args:
+            compiled: 编译后的测试计划
+
+        Returns:
+            用例 ID → 缓存的结果（cached 为 True），可直接传给 TestRunner.run
+        """
+        stale = [
+            tc_id for tc_id, case in compiled.cases.items()
+            if not self._is_fresh(tc_id, case.fingerprint)
+        ]
+
+        rerun: Set[str] = set()
+        while stale:
+            tc_id = stale.pop()
+            if tc_id not in rerun:
+                rerun.add(tc_id)
+                stale.extend(compiled.graph.prerequisites[tc_id])
+
+        reusable = {}
+        for tc_id in compiled.graph.order:
+            if tc_id not in rerun:
+                result = TestCaseResult.from_dict(self.entries[tc_id]["result"])
+                result.cached = True
+                reusable[tc_id] = result
+        return reusable
+
+    def _is_fresh(self, tc_id: str, fingerprint: str) -> bool:
+        entry = self.entries.get(tc_id)
+        return (
+            entry is not None
+            and entry.get("fingerprint") == fingerprint
+            and entry.get("result", {}).get("passed", False)
+        )
+
+    def update(self, compiled: CompiledPlan, results: Iterable[TestCaseResult]) -> None:
+        """
+        用本次执行的结果替换缓存内容（不在本次计划中的用例被移除）
+
+        Args:
+            compiled: 本次执行的编译计划
+            results: 本次执行的全部用例结果（含沿用缓存的结果）
+        """
+        entries = {}
+        for result in results:
+            case = compiled.cases.get(result.test_case_id)
+            if case is None:
+                continue
+            data = result.to_dict()
+            data["cached"] = False
+            entries[result.test_case_id] = {"fingerprint": case.fingerprint, "result": data}
+        self.entries = entries
+
+    def save(self) -> None:
+        """写入缓存文件"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "wb") as f:
+            codec.dump(
+                {"version": _CACHE_VERSION, "base_url": self.base_url, "entries": self.entries},
+                f, default=str,
+            )
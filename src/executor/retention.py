@@ -0,0 +1,126 @@
+"""
+响应保留策略模块
+
+决定用例结果中保留多少响应内容。失败用例始终保留完整响应，
+通过用例可以截断、丢弃响应体或只保留摘要，以降低大规模执行时的内存与磁盘占用。
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+from .http_client import HttpResponse, decode_body
+
+RETENTION_MODES = ("full", "failures", "truncate", "hash")
+
+
+class LazyBody:
+    """
+    尚未解码的响应体
+
+    通过用例的响应体在断言时往往不需要解析，保留原始字节，
+    到结果序列化（TestCaseResult.to_dict、报告附件）时才解码。
+    """
+
+    __slots__ = ("content", "encoding")
+
+    def __init__(self, content: bytes, encoding: str = "utf-8"):
+        self.content = content
+        self.encoding = encoding
+
+    def decode(self) -> Any:
+        """解码结果，同 HttpResponse.body"""
+        return decode_body(self.content, self.encoding)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyBody):
+            return self.content == other.content and self.encoding == other.encoding
+        return self.decode() == other
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo: dict) -> "LazyBody":
+        # 内容不可变，dataclasses.asdict 复制结果时无需复制字节
+        return self
+
+    def __repr__(self) -> str:
+        return f"LazyBody(size={len(self.content)})"
+
+
+def resolve_body(value: Any) -> Any:
+    """LazyBody 解码后返回，其他值原样返回"""
+    return value.decode() if isinstance(value, LazyBody) else value
+
+
+def json_default(obj: Any) -> Any:
+    """codec 序列化时的 default：解码 LazyBody，其他对象转为字符串"""
+    return obj.decode() if isinstance(obj, LazyBody) else str(obj)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """响应保留策略"""
+    mode: str = "full"  # full / failures / truncate / hash
+    max_bytes: int = 1024  # truncate 模式下保留的最大字节数
+
+    def __post_init__(self):
+        if self.mode not in RETENTION_MODES:
+            raise ValueError(f"Unknown retention mode: {self.mode}, expected one of {RETENTION_MODES}")
+
+    @property
+    def keeps_full_body(self) -> bool:
+        """通过用例也需要完整响应体（full 保留原文，hash 对完整内容求摘要）"""
+        return self.mode in ("full", "hash")
+
+    def response_info(self, response: HttpResponse, passed: bool) -> dict:
+        """
+        构造用于报告的响应信息
+
+        - full: 所有用例保留完整响应；通过用例的响应体尚未解码时保留为 LazyBody，序列化时才解码
+        - failures: 通过用例只保留状态码和耗时
+        - truncate: 通过用例的响应体截断为 max_bytes 字节
+        - hash: 通过用例的响应体只保留 SHA-256 摘要和长度
+
+        Args:
+            response: HTTP 响应
+            passed: 用例是否通过
+
+        Returns:
+            响应信息字典
+        """
+        if passed and self.mode == "failures":
+            return {
+                "status_code": response.status_code,
+                "elapsed_ms": response.elapsed_ms,
+            }
+
+        # truncate / hash 直接处理原始字节，不解析响应体
+        if passed and self.mode == "truncate":
+            body = self._truncate(response.content, response.encoding)
+        elif passed and self.mode == "hash":
+            body = self._digest(response.content)
+        elif passed and not response.decoded:
+            body = LazyBody(response.content, response.encoding)
+        else:
+            body = response.body
+
+        return {
+            "status_code": response.status_code,
+            "headers": response.headers,
+            "body": body,
+            "elapsed_ms": response.elapsed_ms,
+        }
+
+    def _truncate(self, data: bytes, encoding: str) -> str:
+        """按字节数截断后解码"""
+        if len(data) <= self.max_bytes:
+            return data.decode(encoding, errors="replace")
+        kept = data[: self.max_bytes].decode(encoding, errors="ignore")
+        return f"{kept}...[truncated, {len(data)} bytes total]"
+
+    def _digest(self, data: bytes) -> dict:
+        """响应体摘要（原始字节）"""
+        return {
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+        }
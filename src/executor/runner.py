@@ -4,16 +4,27 @@
 编排测试用例的执行流程。
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 
-from .http_client import HttpClient, HttpResponse
+from .http_client import ConnectionStats, HttpClient, HttpResponse
 from .assertion import AssertionEngine, AssertionResult
-from .variable import VariableManager
+from .variable import VariableManager, VariableScope, variable_providers
+from .compiler import CompiledCase, CompiledPlan, compile_plan
+from .latency import LatencyBudgets
+from .retention import RetentionPolicy, resolve_body
+from .scheduler import DagScheduler, ExecutionGraph
+from .streaming import StreamSpec, require_ijson
+from .template import render_tree
+from .timing import elapsed_ms
 
+if TYPE_CHECKING:
+    from .result_stream import JsonlResultWriter
 
-@dataclass
+
+@dataclass(slots=True)
 class TestCaseResult:
     """测试用例执行结果"""
     test_case_id: str
@@ -27,7 +38,27 @@ class TestCaseResult:
     extracted_variables: Dict[str, Any]
     elapsed_ms: float
     error: Optional[str] = None
+    skipped: bool = False  # 因上游用例失败而未执行
+    skip_reason: Optional[str] = None
+    cached: bool = False  # 未重新执行，沿用上次执行的结果
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[float] = None  # 开始执行的 Unix 时间戳（秒）
+    timings: Dict[str, float] = field(default_factory=dict)  # 各阶段耗时（毫秒），见 timing 模块
+
+    def to_dict(self) -> dict:
+        """转换为可序列化的字典（保留策略中延迟解码的响应体在此解码）"""
+        data = asdict(self)
+        response = data["response"]
+        if response is not None and "body" in response:
+            response["body"] = resolve_body(response["body"])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TestCaseResult":
+        """从 to_dict 的输出重建结果"""
+        data = dict(data)
+        data["assertions"] = [AssertionResult(**a) for a in data.get("assertions", [])]
+        return cls(**data)
 
 
 @dataclass
@@ -37,9 +68,19 @@ class TestPlanResult:
     total: int
     passed: int
     failed: int
-    results: List[TestCaseResult]
+    results: Iterable[TestCaseResult]  # 内存列表，或流式执行时的 JsonlResultReader
     elapsed_ms: float
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    skipped: int = 0  # 因上游失败而跳过的用例数，不计入 failed
+    cached: int = 0  # 沿用上次结果、未重新执行的用例数（已计入 passed）
+    connections: Optional[dict] = None  # 本次执行的连接复用统计（ConnectionStats.to_dict）
+    throttle: Optional[dict] = None  # 限流状态与限流事件（HostLimiter.summary），未开启限流时为 None
+    latency: Optional[dict] = None  # 与基线执行的响应时间对比（latency.compare_latency），未指定基线时为 None
+
+    @property
+    def latency_regressions(self) -> List[str]:
+        """响应时间相对基线退化的端点"""
+        return self.latency["regressions"] if self.latency else []
 
     @property
     def pass_rate(self) -> float:
@@ -47,6 +88,79 @@ class TestPlanResult:
         return self.passed / self.total * 100 if self.total > 0 else 0
 
 
+class _ResultCollector:
+    """汇总调度器产出的用例结果，可选地边执行边写入结果流"""
+
+    def __init__(self, plan_name: str, start_time: datetime, sink: Optional["JsonlResultWriter"] = None):
+        self.plan_name = plan_name
+        self.start_time = start_time
+        self.sink = sink
+        self.results: List[TestCaseResult] = []
+        self.total = 0
+        self.passed = 0
+        self.skipped = 0
+        self.cached = 0
+
+    def add(self, result: TestCaseResult) -> None:
+        """记录一条用例结果"""
+        self.total += 1
+        if result.cached:
+            self.cached += 1
+        if result.passed:
+            self.passed += 1
+        elif result.skipped:
+            self.skipped += 1
+
+        if self.sink is not None:
+            self.sink.write(result)
+        else:
+            self.results.append(result)
+
+    def finish(self) -> TestPlanResult:
+        """构造 TestPlanResult"""
+        elapsed_ms = (datetime.now() - self.start_time).total_seconds() * 1000
+
+        results: Iterable[TestCaseResult] = self.results
+        if self.sink is not None:
+            self.sink.close()
+            results = self.sink.results()
+
+        return TestPlanResult(
+            plan_name=self.plan_name,
+            total=self.total,
+            passed=self.passed,
+            failed=self.total - self.passed - self.skipped,
+            results=results,
+            elapsed_ms=elapsed_ms,
+            skipped=self.skipped,
+            cached=self.cached,
+        )
+
+    def close(self) -> None:
+        """关闭结果流（执行中途出错时也要关闭，finish 之后再次调用不做任何操作）"""
+        if self.sink is not None:
+            self.sink.close()
+
+
+def _snapshot_stats(http_client) -> Optional[ConnectionStats]:
+    """执行前的连接统计快照，客户端不提供统计时为 None"""
+    stats = getattr(http_client, "stats", None)
+    return stats.snapshot() if isinstance(stats, ConnectionStats) else None
+
+
+def _stats_since(http_client, before: Optional[ConnectionStats]) -> Optional[dict]:
+    """本次执行期间的连接统计（同一客户端可能被多次执行复用）"""
+    if before is None:
+        return None
+    return http_client.stats.since(before).to_dict()
+
+
+def _throttle_summary(http_client) -> Optional[dict]:
+    """客户端限流器的状态，未开启限流时为 None"""
+    limiter = getattr(http_client, "limiter", None)
+    return limiter.summary() if limiter is not None else None
+
+
 class TestRunner:
     """测试运行器"""
 
@@ -54,6 +168,13 @@ class TestRunner:
         self,
         http_client: Optional[HttpClient] = None,
         continue_on_failure: bool = True,
+        workers: int = 1,
+        result_sink: Optional["JsonlResultWriter"] = None,
+        retention: Optional[RetentionPolicy] = None,
+        skip_dependents: bool = True,
+        stream_threshold: Optional[int] = None,
+        latency_budgets: Optional[LatencyBudgets] = None,
+        dataset_limit: Optional[int] = None,
     ):
         """
         初始化测试运行器
@@ -61,171 +182,399 @@ class TestRunner:
         Args:
             http_client: HTTP 客户端，如不传则自动创建
             continue_on_failure: 失败后是否继续执行
+            workers: 并发执行的最大用例数，1 表示按顺序执行
+            result_sink: 结果流写入器（可选）。设置后每个用例完成即写入磁盘，
+                结果不再保留在内存中，run 结束时关闭写入器
+            retention: 响应保留策略，默认保留完整响应
+            skip_dependents: 用例失败时跳过依赖它的所有下游用例（不发送请求）
+            stream_threshold: 设置后开启流式断言（需要 ijson）：JSONPath 都是简单路径的用例，
+                响应体不小于该字节数（或长度未知）时边接收边求值，不完整解析响应体
+            latency_budgets: 各端点的响应时间上限（可选），为端点的用例追加 latency 断言
+            dataset_limit: 数据驱动用例最多执行的行数（可选），与数据集自身的 limit 取较小值
         """
         self.http_client = http_client or HttpClient()
         self.assertion_engine = AssertionEngine()
         self.variable_manager = VariableManager()
         self.continue_on_failure = continue_on_failure
-
-    def run(self, test_plan: dict) -> TestPlanResult:
+        self.workers = workers
+        self.result_sink = result_sink
+        self.retention = retention or RetentionPolicy()
+        self.skip_dependents = skip_dependents
+        self.stream_threshold = stream_threshold
+        self.latency_budgets = latency_budgets or None
+        self.dataset_limit = dataset_limit
+        if stream_threshold is not None:
+            require_ijson()
+
+    def run(
+        self,
+        test_plan: Union[dict, CompiledPlan],
+        cached_results: Optional[Dict[str, TestCaseResult]] = None,
+    ) -> TestPlanResult:
         """
         执行测试计划
 
         Args:
-            test_plan: 测试计划字典
+            test_plan: 测试计划字典，或已编译的 CompiledPlan
+            cached_results: 沿用上次结论的用例（可选，见 ResultsCache.reusable），这些用例不再执行
 
         Returns:
             TestPlanResult 对象
         """
         start_time = datetime.now()
 
-        # 提取测试计划信息
-        meta = test_plan.get("meta", {})
-        plan_name = meta.get("name", "Unnamed Test Plan")
-        endpoints = {ep["id"]: ep for ep in test_plan.get("endpoints", [])}
-        test_cases = test_plan.get("test_cases", [])
-        execution_order = test_plan.get("execution_order", [tc["id"] for tc in test_cases])
-        dependencies = test_plan.get("dependencies", {})
+        plan_name, graph, execute, skip, expand = self._prepare_plan(test_plan, self._run_test_case)
+        scheduler = DagScheduler(graph, workers=self.workers)
 
-        # 按执行顺序构建用例映射
-        tc_map = {tc["id"]: tc for tc in test_cases}
+        stats_before = _snapshot_stats(self.http_client)
 
-        results = []
-        passed_count = 0
-        failed_count = 0
+        collector = _ResultCollector(plan_name, start_time, self.result_sink)
+        try:
+            for _, result in scheduler.run(execute, self._should_stop, self._is_failure, skip, cached_results, expand):
+                collector.add(result)
+            plan_result = collector.finish()
+        finally:
+            collector.close()
+        plan_result.connections = _stats_since(self.http_client, stats_before)
+        plan_result.throttle = _throttle_summary(self.http_client)
+        return plan_result
+
+    def _prepare_plan(
+        self,
+        test_plan: Union[dict, CompiledPlan],
+        run_case: Callable,
+    ) -> Tuple[str, ExecutionGraph, Callable, Optional[Callable], Callable]:
+        """
+        编译测试计划（同步与异步运行器共用）
 
-        for tc_id in execution_order:
-            test_case = tc_map.get(tc_id)
-            if not test_case:
-                continue
+        Args:
+            test_plan: 测试计划字典或 CompiledPlan
+            run_case: 执行单个用例的函数，签名与 _run_test_case 相同
 
-            # 注入依赖变量
-            test_case = self.variable_manager.inject_dependencies(test_case, dependencies)
+        Returns:
+            (计划名称, 依赖图, 按用例 ID（及数据行）执行的函数, 按用例 ID 构造跳过结果的函数,
+            按用例 ID 展开数据行的函数)，未开启 skip_dependents 时第四项为 None
+        """
+        compiled = test_plan if isinstance(test_plan, CompiledPlan) else compile_plan(test_plan)
+        cases = compiled.cases
+
+        # 每个用例使用独立的变量作用域（每次执行重新创建），只继承其上游用例提取的变量
+        graph = compiled.graph
+        # 数据驱动用例的各行把提取的变量写入行作用域，不向下游提供变量
+        providers = variable_providers(
+            graph.order,
+            graph.prerequisites,
+            {
+                tc_id: [e["name"] for e in case.extracts if e.get("name")]
+                for tc_id, case in cases.items()
+                if case.dataset is None
+            },
+        )
+        scopes: Dict[str, VariableScope] = {}
+        for tc_id in graph.order:
+            scopes[tc_id] = self.variable_manager.scope(
+                inherited={
+                    name: [scopes[source].variables for source in sources]
+                    for name, sources in providers[tc_id].items()
+                }
+            )
 
-            # 执行测试用例
-            result = self._run_test_case(test_case, endpoints)
-            results.append(result)
+        def execute(tc_id: str, row: Optional[Tuple[int, Any]] = None):
+            return run_case(cases[tc_id], scopes[tc_id], row)
 
-            if result.passed:
-                passed_count += 1
-            else:
-                failed_count += 1
-                if not self.continue_on_failure:
-                    break
+        def skip(tc_id: str, upstream_id: str) -> TestCaseResult:
+            return self._build_skipped_result(cases[tc_id], upstream_id)
 
-        elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
+        def expand(tc_id: str) -> Optional[Iterator[Tuple[int, Any]]]:
+            case = cases[tc_id]
+            return self._dataset_rows(case, compiled.base_dir) if case.dataset is not None else None
 
-        return TestPlanResult(
-            plan_name=plan_name,
-            total=len(results),
-            passed=passed_count,
-            failed=failed_count,
-            results=results,
-            elapsed_ms=elapsed_ms,
-        )
+        return compiled.plan_name, compiled.graph, execute, skip if self.skip_dependents else None, expand
+
+    def _dataset_rows(self, case: CompiledCase, base_dir: Optional[str]) -> Iterator[Tuple[int, Any]]:
+        """
+        逐行读取数据驱动用例的数据集
 
-    def _run_test_case(self, test_case: dict, endpoints: dict) -> TestCaseResult:
+        Yields:
+            (行号, 行变量)；数据集无法读取或为空时产出 (行号, 异常)，记为一条失败结果
+        """
+        index = -1
+        try:
+            for index, row in enumerate(case.dataset.rows(base_dir, self.dataset_limit)):
+                yield index, row
+        except (OSError, ValueError) as e:
+            yield index + 1, e
+            return
+        if index < 0 and self.dataset_limit != 0:
+            yield 0, ValueError(f"Dataset has no rows: {case.dataset.resolve(base_dir)}")
+
+    def _should_stop(self, result: TestCaseResult) -> bool:
+        """失败且不继续执行时停止调度"""
+        return not result.passed and not result.skipped and not self.continue_on_failure
+
+    def _is_failure(self, result: TestCaseResult) -> bool:
+        """用例失败或被跳过时，其下游用例都应跳过"""
+        return not result.passed
+
+    def _run_test_case(
+        self,
+        case: CompiledCase,
+        variables: VariableScope,
+        row: Optional[Tuple[int, Any]] = None,
+    ) -> TestCaseResult:
         """
         执行单个测试用例
 
         Args:
-            test_case: 测试用例字典
-            endpoints: 端点定义映射
+            case: 编译后的测试用例
+            variables: 用例的变量作用域（继承上游用例提取的变量）
+            row: 数据驱动用例的 (行号, 行变量)，见 _dataset_rows
 
         Returns:
             TestCaseResult 对象
         """
-        tc_id = test_case.get("id")
-        tc_name = test_case.get("name", tc_id)
-        endpoint_id = test_case.get("endpoint_id")
-        category = test_case.get("category", "positive")
-        inputs = test_case.get("inputs", {})
-        assertions = test_case.get("assertions", [])
-        extracts = test_case.get("extract", [])
+        started_at = time.time()
+        row_index, variables, error = self._bind_row(case, variables, row, started_at)
+        if error is not None:
+            return error
+
+        start = time.perf_counter()
+        request_info = self._prepare_request(case, variables)
+        timings = {"substitute": elapsed_ms(start)}
+
+        try:
+            # 发送请求
+            response = self.http_client.request(
+                method=request_info["method"],
+                path=request_info["path"],
+                headers=request_info["headers"] or None,
+                params=request_info["params"] or None,
+                body=request_info["body"],
+                stream=self._stream_spec(case),
+            )
+            return self._build_result(case, request_info, response, variables, started_at, timings, row_index)
 
-        # 获取端点定义
-        endpoint = endpoints.get(endpoint_id, {})
-        method = endpoint.get("method", "GET")
-        path = endpoint.get("path", "")
+        except Exception as e:
+            return self._build_error_result(case, request_info, e, started_at, timings, row_index)
 
-        # 替换路径中的变量
-        path = self.variable_manager.substitute(path)
+    def _bind_row(
+        self,
+        case: CompiledCase,
+        variables: VariableScope,
+        row: Optional[Tuple[int, Any]],
+        started_at: float,
+    ) -> Tuple[Optional[int], VariableScope, Optional[TestCaseResult]]:
+        """
+        将数据行绑定到用例作用域
 
-        # 处理路径参数
-        path_params = inputs.get("path_params", {})
-        path_params = self.variable_manager.substitute(path_params)
-        for param_name, param_value in path_params.items():
-            path = path.replace(f"{{{param_name}}}", str(param_value))
+        Args:
+            case: 编译后的测试用例
+            variables: 用例的变量作用域
+            row: 数据驱动用例的 (行号, 行变量)，见 _dataset_rows；普通用例为 None
+            started_at: 用例开始时间
 
-        # 处理请求参数
-        query_params = inputs.get("query_params", {})
-        query_params = self.variable_manager.substitute(query_params)
+        Returns:
+            (行号, 本行的变量作用域, 错误结果)；数据集无法读取时错误结果不为 None，应直接返回
+        """
+        if row is None:
+            return None, variables, None
+        row_index, row_vars = row
+        if isinstance(row_vars, Exception):
+            # 数据集无法读取
+            request_info = self._prepare_request(case, variables)
+            return row_index, variables, self._build_error_result(case, request_info, row_vars, started_at, {}, row_index)
+        # 行变量与本行提取的变量写入新的一层，只在本行可见
+        return row_index, variables.child(dict(row_vars)), None
+
+    def _stream_spec(self, case: CompiledCase) -> Optional[StreamSpec]:
+        """
+        用例的流式求值参数，未开启流式断言或用例含复杂 JSONPath 时为 None
+
+        保留策略需要完整响应体（full / hash）时读到响应结束，否则只保留前 max_bytes 字节。
+        """
+        if self.stream_threshold is None or case.stream_paths is None:
+            return None
+        keep_bytes = None if self.retention.keeps_full_body else self.retention.max_bytes
+        return StreamSpec(case.stream_paths, self.stream_threshold, keep_bytes)
+
+    def _prepare_request(self, case: CompiledCase, variables: VariableScope) -> dict:
+        """
+        渲染模板、注入依赖变量并构造请求信息
+
+        Args:
+            case: 编译后的测试用例
+            variables: 用例的变量作用域
+
+        Returns:
+            请求信息字典（同时用于发送请求和报告）
+        """
+        lookup = variables.get
+
+        # 替换路径中的变量并填充路径参数
+        path_params = render_tree(case.path_params, lookup)
+        path = case.path.render(lookup, path_params)
 
-        headers = inputs.get("headers", {})
-        headers = self.variable_manager.substitute(headers)
+        # 处理请求参数
+        query_params = render_tree(case.query_params, lookup)
+        headers = render_tree(case.headers, lookup)
 
-        body = inputs.get("body")
+        body = case.body
         if body:
-            body = self.variable_manager.substitute(body)
+            body = render_tree(body, lookup)
+
+        # 注入依赖变量
+        for section, key, value in case.injects:
+            value = render_tree(value, lookup)
+            if section == "headers":
+                headers = {**headers, key: value}
+            elif section == "query_params":
+                query_params = {**query_params, key: value}
+            else:
+                body = {**(body or {}), key: value}
 
         # 构造请求信息（用于报告）
-        request_info = {
-            "method": method,
+        return {
+            "method": case.method,
             "path": path,
             "headers": headers,
             "params": query_params,
             "body": body,
         }
 
-        try:
-            # 发送请求
-            response = self.http_client.request(
-                method=method,
-                path=path,
-                headers=headers if headers else None,
-                params=query_params if query_params else None,
-                body=body,
-            )
+    def _build_result(
+        self,
+        case: CompiledCase,
+        request_info: dict,
+        response: HttpResponse,
+        variables: VariableScope,
+        started_at: Optional[float] = None,
+        timings: Optional[Dict[str, float]] = None,
+        row_index: Optional[int] = None,
+    ) -> TestCaseResult:
+        """
+        执行断言、提取变量并构造用例结果
 
-            # 执行断言
-            assertion_results = self.assertion_engine.check_all(response, assertions)
-            all_passed = all(r.passed for r in assertion_results)
-
-            # 提取变量
-            extracted = self.variable_manager.extract(response, extracts)
-
-            # 构造响应信息（用于报告）
-            response_info = {
-                "status_code": response.status_code,
-                "headers": response.headers,
-                "body": response.body,
-                "elapsed_ms": response.elapsed_ms,
-            }
-
-            return TestCaseResult(
-                test_case_id=tc_id,
-                test_case_name=tc_name,
-                endpoint_id=endpoint_id,
-                category=category,
-                passed=all_passed,
-                request=request_info,
-                response=response_info,
-                assertions=assertion_results,
-                extracted_variables=extracted,
-                elapsed_ms=response.elapsed_ms,
-            )
+        Args:
+            case: 编译后的测试用例
+            request_info: 请求信息
+            response: HTTP 响应
+            variables: 用例的变量作用域，提取的变量写入该作用域
+            started_at: 用例开始执行的 Unix 时间戳
+            timings: 请求前已记录的阶段耗时，会补充 HTTP、断言与提取阶段
+            row_index: 数据驱动用例的行号（可选）
 
-        except Exception as e:
-            return TestCaseResult(
-                test_case_id=tc_id,
-                test_case_name=tc_name,
-                endpoint_id=endpoint_id,
-                category=category,
-                passed=False,
-                request=request_info,
-                response=None,
-                assertions=[],
-                extracted_variables={},
-                elapsed_ms=0,
-                error=str(e),
-            )
+        Returns:
+            TestCaseResult 对象
+        """
+        timings = {**(timings or {}), **response.timings}
+
+        # 执行断言（简单路径先一次遍历响应体全部求值，断言与提取直接取用）
+        start = time.perf_counter()
+        if case.path_trie is not None and response.path_values is None:
+            response.path_values = case.path_trie.evaluate(response.body)
+        assertions = case.assertions
+        if self.latency_budgets is not None:
+            assertions = self.latency_budgets.apply(case.endpoint_id, assertions)
+        assertion_results = self.assertion_engine.check_all(
+            response, assertions, case.json_paths, case.response_schemas
+        )
+        all_passed = all(r.passed for r in assertion_results)
+        timings["assert"] = elapsed_ms(start)
+
+        # 提取变量（数据驱动用例的各行写入本行的作用域，只记录在结果中）
+        start = time.perf_counter()
+        extracted = self.variable_manager.extract(response, case.extracts, case.json_paths, variables)
+        timings["extract"] = elapsed_ms(start)
+
+        # 构造响应信息（用于报告），按保留策略裁剪
+        response_info = self.retention.response_info(response, all_passed)
+
+        tc_id, tc_name = _case_label(case, row_index)
+        return TestCaseResult(
+            test_case_id=tc_id,
+            test_case_name=tc_name,
+            endpoint_id=case.endpoint_id,
+            category=case.category,
+            passed=all_passed,
+            request=request_info,
+            response=response_info,
+            assertions=assertion_results,
+            extracted_variables=extracted,
+            elapsed_ms=response.elapsed_ms,
+            started_at=started_at,
+            timings=timings,
+        )
+
+    def _build_error_result(
+        self,
+        case: CompiledCase,
+        request_info: dict,
+        error: Exception,
+        started_at: Optional[float] = None,
+        timings: Optional[Dict[str, float]] = None,
+        row_index: Optional[int] = None,
+    ) -> TestCaseResult:
+        """
+        构造请求异常时的用例结果
+
+        Args:
+            case: 编译后的测试用例
+            request_info: 请求信息
+            error: 请求过程中抛出的异常
+            started_at: 用例开始执行的 Unix 时间戳
+            timings: 已记录的阶段耗时
+            row_index: 数据驱动用例的行号（可选）
+
+        Returns:
+            TestCaseResult 对象
+        """
+        tc_id, tc_name = _case_label(case, row_index)
+        return TestCaseResult(
+            test_case_id=tc_id,
+            test_case_name=tc_name,
+            endpoint_id=case.endpoint_id,
+            category=case.category,
+            passed=False,
+            request=request_info,
+            response=None,
+            assertions=[],
+            extracted_variables={},
+            elapsed_ms=0,
+            error=str(error),
+            started_at=started_at,
+            timings=dict(timings or {}),
+        )
+
+    def _build_skipped_result(self, case: CompiledCase, upstream_id: str) -> TestCaseResult:
+        """
+        构造因上游失败而跳过的用例结果（不渲染模板，不发送请求）
+
+        Args:
+            case: 编译后的测试用例
+            upstream_id: 最初失败的上游用例 ID
+
+        Returns:
+            TestCaseResult 对象
+        """
+        return TestCaseResult(
+            test_case_id=case.id,
+            test_case_name=case.name,
+            endpoint_id=case.endpoint_id,
+            category=case.category,
+            passed=False,
+            request={"method": case.method, "path": case.path.source},
+            response=None,
+            assertions=[],
+            extracted_variables={},
+            elapsed_ms=0,
+            skipped=True,
+            skip_reason=f"skipped (upstream failed: {upstream_id})",
+            started_at=time.time(),
+        )
+
+
+def _case_label(case: CompiledCase, row_index: Optional[int]) -> Tuple[str, str]:
+    """结果中的用例 ID 与名称，数据驱动用例的各行加上行号（从 0 开始），如 tc_login[3]"""
+    if row_index is None:
+        return case.id, case.name
+    return f"{case.id}[{row_index}]", f"{case.name} [{row_index}]"
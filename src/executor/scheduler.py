@@ -0,0 +1,486 @@
+"""
+调度器模块
+
+根据 dependencies 与 execution_order 构建用例依赖图（DAG），
+并在有界线程池或事件循环上并发执行相互独立的用例；
+可选地沿依赖图传播失败，跳过注定失败的下游用例。
+"""
+
+import asyncio
+import heapq
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .template import PLACEHOLDER_PATTERN  # 依赖推断与模板渲染共用同一占位符格式
+
+# 用例需要执行（_NodeControl.start 的返回值），也用作数据行耗尽的标记
+_RUN = object()
+
+
+def _collect_placeholders(data: Any, names: Set[str]) -> None:
+    """递归收集数据中引用的变量名"""
+    if isinstance(data, str):
+        names.update(PLACEHOLDER_PATTERN.findall(data))
+    elif isinstance(data, dict):
+        for value in data.values():
+            _collect_placeholders(value, names)
+    elif isinstance(data, list):
+        for item in data:
+            _collect_placeholders(item, names)
+
+
+def _as_list(value: Any) -> List[str]:
+    """depends_on 既可以是单个 ID，也可以是 ID 列表"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+@dataclass
+class ExecutionGraph:
+    """用例依赖图"""
+    order: List[str]  # 执行顺序（已去除不存在和重复的用例）
+    prerequisites: Dict[str, Set[str]]  # 用例 ID → 前置用例 ID 集合
+
+    @classmethod
+    def from_plan(cls, test_plan: dict) -> "ExecutionGraph":
+        """
+        从测试计划构建依赖图
+
+        边的来源：
+        - dependencies 中声明的 depends_on
+        - 隐式变量依赖：用例引用了 {{var}}，则依赖 execution_order 中
+          在它之前、最后一个提取 var 的用例
+
+        只保留指向 execution_order 中更靠前用例的边，
+        因此依赖图必然无环，且顺序执行时的语义保持不变。
+
+        Args:
+            test_plan: 测试计划字典
+
+        Returns:
+            ExecutionGraph 对象
+        """
+        test_cases = test_plan.get("test_cases", [])
+        tc_map = {tc["id"]: tc for tc in test_cases}
+        endpoints = {ep["id"]: ep for ep in test_plan.get("endpoints", [])}
+        execution_order = test_plan.get("execution_order", [tc["id"] for tc in test_cases])
+        dependencies = test_plan.get("dependencies", {})
+
+        order = []
+        position = {}
+        for tc_id in execution_order:
+            if tc_id in tc_map and tc_id not in position:
+                position[tc_id] = len(order)
+                order.append(tc_id)
+
+        prerequisites: Dict[str, Set[str]] = {}
+        last_extractor: Dict[str, str] = {}
+
+        for tc_id in order:
+            test_case = tc_map[tc_id]
+            dep_config = dependencies.get(tc_id) or {}
+            prereqs = set()
+
+            # 显式依赖
+            for dep_id in _as_list(dep_config.get("depends_on")):
+                if dep_id in position and position[dep_id] < position[tc_id]:
+                    prereqs.add(dep_id)
+
+            # 隐式变量依赖
+            names: Set[str] = set()
+            _collect_placeholders(test_case.get("inputs", {}), names)
+            _collect_placeholders(dep_config.get("inject", {}), names)
+            endpoint = endpoints.get(test_case.get("endpoint_id"), {})
+            _collect_placeholders(endpoint.get("path", ""), names)
+            for name in names:
+                if name in last_extractor:
+                    prereqs.add(last_extractor[name])
+
+            prerequisites[tc_id] = prereqs
+
+            for extract in test_case.get("extract", []):
+                if extract.get("name"):
+                    last_extractor[extract["name"]] = tc_id
+
+        return cls(order=order, prerequisites=prerequisites)
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """反向邻接表：用例 ID → 直接依赖它的用例 ID 列表"""
+        result: Dict[str, List[str]] = {tc_id: [] for tc_id in self.order}
+        for tc_id in self.order:
+            for prereq in self.prerequisites[tc_id]:
+                result[prereq].append(tc_id)
+        return result
+
+
+class _NodeControl:
+    """
+    用例开始与结束时的处理（只在调度线程或事件循环中调用）
+
+    - 有前置用例失败或被跳过时不再执行，直接构造跳过结果
+    - 已有结果的用例直接产出该结果
+    - 数据驱动用例展开为数据行
+    """
+
+    def __init__(
+        self,
+        scheduler: "DagScheduler",
+        is_failure: Optional[Callable[[Any], bool]],
+        skip: Optional[Callable[[str, str], Any]],
+        known: Optional[Dict[str, Any]],
+        expand: Optional[Callable[[str], Optional[Iterable[Any]]]],
+    ):
+        self.scheduler = scheduler
+        self.prune = is_failure is not None and skip is not None
+        self.is_failure = is_failure
+        self.skip = skip
+        self.known = known
+        self.expand = expand
+        # 失败或被跳过的用例 → 最初失败的上游用例
+        self.failed_roots: Dict[str, str] = {}
+
+    def start(self, tc_id: str) -> Tuple[Any, Optional[Iterator[Any]]]:
+        """
+        用例开始
+
+        Returns:
+            (结果, 数据行)：结果为 _RUN 时需要执行用例，此时数据行不为 None 表示按行执行
+        """
+        if self.prune:
+            root = self.scheduler._failed_root(tc_id, self.failed_roots)
+            if root is not None:
+                self.failed_roots[tc_id] = root
+                return self.skip(tc_id, root), None
+
+        if self.known and tc_id in self.known:
+            result = self.known.pop(tc_id)
+            self.finish(tc_id, self.failed(result))
+            return result, None
+
+        rows = self.expand(tc_id) if self.expand is not None else None
+        return _RUN, iter(rows) if rows is not None else None
+
+    def failed(self, result: Any) -> bool:
+        """结果是否使下游用例被跳过"""
+        return self.prune and self.is_failure(result)
+
+    def finish(self, tc_id: str, failed: bool) -> None:
+        """用例（数据驱动用例的全部行）执行完毕"""
+        if failed:
+            self.failed_roots[tc_id] = tc_id
+
+
+class _Node:
+    """线程池调度中已开始的用例：已提交的任务数、在途数与按提交顺序编号的结果"""
+
+    __slots__ = ("tc_id", "rows", "submitted", "pending", "results", "yielded", "failed")
+
+    def __init__(self, tc_id: str, rows: Optional[Iterator[Any]] = None):
+        self.tc_id = tc_id
+        self.rows = rows  # 尚未提交完的数据行，None 表示不再有新任务
+        self.submitted = 0
+        self.pending = 0
+        self.results: Dict[int, Any] = {}
+        self.yielded = 0
+        self.failed = False
+
+    @property
+    def done(self) -> bool:
+        return self.rows is None and not self.pending
+
+
+class _Dispatch:
+    """
+    并发调度的状态（线程池与事件循环共用）
+
+    只有前置用例（含数据驱动用例的全部行）完成后才开始后续用例，在途任务数由调用方限制，
+    因此任务对象的数量与并发数相关，而与计划规模无关。乱序完成的结果暂存，按 graph.order 的顺序产出。
+    """
+
+    def __init__(self, scheduler: "DagScheduler", control: _NodeControl, should_stop: Optional[Callable[[Any], bool]]):
+        graph = scheduler.graph
+        self.order = graph.order
+        self.position = scheduler._position
+        self.dependents = graph.dependents()
+        self.remaining = {tc_id: set(prereqs) for tc_id, prereqs in graph.prerequisites.items()}
+        self.control = control
+        self.should_stop = should_stop
+        self.stopped = False
+
+        # 就绪队列按执行顺序排序，使调度尽量贴近原顺序
+        self.ready = [self.position[tc_id] for tc_id in self.order if not self.remaining[tc_id]]
+        heapq.heapify(self.ready)
+        self.expanding: List[int] = []  # 还有数据行未提交的用例位置（堆）
+
+        # 已开始的用例，乱序完成的结果暂存其中，按顺序产出
+        self.nodes: Dict[int, _Node] = {}
+        self.next_index = 0
+
+    @property
+    def idle(self) -> bool:
+        """没有可以开始的任务（已停止，或剩余用例都在等待前置用例）"""
+        return self.stopped or not (self.ready or self.expanding)
+
+    def next_task(self) -> Optional[Tuple[Tuple[int, int], str, Any]]:
+        """
+        在就绪用例与未提交完的数据行中，取执行顺序最靠前的一个任务
+
+        Returns:
+            ((用例位置, 任务序号), 用例 ID, 数据行)，普通用例的数据行为 _RUN；没有可开始的任务时返回 None
+        """
+        while not self.idle:
+            if self.expanding and (not self.ready or self.expanding[0] < self.ready[0]):
+                index = self.expanding[0]
+                node = self.nodes[index]
+                row = next(node.rows, _RUN)
+                if row is _RUN:
+                    node.rows = None
+                    heapq.heappop(self.expanding)
+                    if node.done:
+                        self._complete(index)
+                    continue
+            else:
+                index = heapq.heappop(self.ready)
+                result, rows = self.control.start(self.order[index])
+                node = self.nodes[index] = _Node(self.order[index], rows)
+                if result is not _RUN:
+                    node.results[0] = result
+                    node.submitted = 1
+                    self._complete(index)
+                    continue
+                if rows is not None:
+                    heapq.heappush(self.expanding, index)
+                    continue
+                row = _RUN
+
+            key = (index, node.submitted)
+            node.submitted += 1
+            node.pending += 1
+            return key, node.tc_id, row
+        return None
+
+    def finish_task(self, key: Tuple[int, int], result: Any) -> None:
+        """记录任务结果"""
+        index, seq = key
+        node = self.nodes[index]
+        node.results[seq] = result
+        node.pending -= 1
+        node.failed = node.failed or self.control.failed(result)
+
+        if self.should_stop and self.should_stop(result):
+            self.stopped = True
+        if node.done:
+            self._complete(index)
+
+    def drain(self) -> Iterator[Tuple[str, Any]]:
+        """按执行顺序产出已完成的结果"""
+        while self.next_index in self.nodes:
+            node = self.nodes[self.next_index]
+            while node.yielded in node.results:
+                yield node.tc_id, node.results.pop(node.yielded)
+                node.yielded += 1
+            if not node.done:
+                break
+            del self.nodes[self.next_index]
+            self.next_index += 1
+
+    def leftovers(self) -> Iterator[Tuple[str, Any]]:
+        """提前停止时，未执行用例留下的空位之后可能还有已完成的结果"""
+        for index in sorted(self.nodes):
+            node = self.nodes[index]
+            for seq in sorted(node.results):
+                yield node.tc_id, node.results[seq]
+
+    def _complete(self, index: int) -> None:
+        """用例（含全部数据行）完成，使依赖它的用例可能就绪"""
+        node = self.nodes[index]
+        self.control.finish(node.tc_id, node.failed)
+        for dependent in self.dependents[node.tc_id]:
+            self.remaining[dependent].discard(node.tc_id)
+            if not self.remaining[dependent]:
+                heapq.heappush(self.ready, self.position[dependent])
+
+
+class DagScheduler:
+    """DAG 调度器"""
+
+    def __init__(self, graph: ExecutionGraph, workers: int = 1):
+        """
+        初始化调度器
+
+        Args:
+            graph: 用例依赖图
+            workers: 并发执行的最大用例数（数据驱动用例的每一行各占一个），1 表示按顺序执行
+        """
+        self.graph = graph
+        self.workers = max(1, workers)
+        self._position = {tc_id: i for i, tc_id in enumerate(graph.order)}
+
+    def run(
+        self,
+        execute: Callable[..., Any],
+        should_stop: Optional[Callable[[Any], bool]] = None,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        skip: Optional[Callable[[str, str], Any]] = None,
+        known: Optional[Dict[str, Any]] = None,
+        expand: Optional[Callable[[str], Optional[Iterable[Any]]]] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        执行所有用例
+
+        无论并发度多少，结果都按 graph.order 的顺序产出（数据驱动用例按行的顺序），保证报告顺序稳定。
+
+        Args:
+            execute: 执行单个用例的函数，接收用例 ID，返回结果；数据驱动用例的每一行调用 execute(用例 ID, 行)
+            should_stop: 根据结果判断是否停止调度后续用例（可选）
+            is_failure: 根据结果判断用例是否失败（可选）。与 skip 同时提供时，
+                失败用例（数据驱动用例任一行失败）沿依赖图的所有下游用例都不再执行
+            skip: 构造被跳过用例的结果，接收 (用例 ID, 最初失败的上游用例 ID)
+            known: 已有结果的用例（可选），不再执行，直接产出给定结果（会被逐个取出）
+            expand: 数据驱动用例的展开函数（可选），接收用例 ID，返回数据行的可迭代对象，
+                普通用例返回 None。数据行在有空闲并发时才逐个取出，可以是惰性读取的生成器
+
+        Yields:
+            (用例 ID, 执行结果)，数据驱动用例每行产出一项
+        """
+        control = _NodeControl(self, is_failure, skip, known, expand)
+
+        if self.workers == 1:
+            yield from self._run_sequential(execute, control, should_stop)
+            return
+
+        yield from self._run_parallel(execute, control, should_stop)
+
+    def _run_sequential(
+        self,
+        execute: Callable[..., Any],
+        control: _NodeControl,
+        should_stop: Optional[Callable[[Any], bool]],
+    ) -> Iterator[Tuple[str, Any]]:
+        """按顺序执行"""
+        for tc_id in self.graph.order:
+            result, rows = control.start(tc_id)
+            if result is _RUN and rows is not None:
+                failed = False
+                for row in rows:
+                    result = execute(tc_id, row)
+                    failed = failed or control.failed(result)
+                    yield tc_id, result
+                    if should_stop and should_stop(result):
+                        return
+                control.finish(tc_id, failed)
+                continue
+
+            if result is _RUN:
+                result = execute(tc_id)
+                control.finish(tc_id, control.failed(result))
+            yield tc_id, result
+            if should_stop and should_stop(result):
+                return
+
+    def _run_parallel(
+        self,
+        execute: Callable[..., Any],
+        control: _NodeControl,
+        should_stop: Optional[Callable[[Any], bool]],
+    ) -> Iterator[Tuple[str, Any]]:
+        """在线程池中执行，前置用例（含数据驱动用例的全部行）完成后才提交后续用例"""
+        dispatch = _Dispatch(self, control, should_stop)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="apiflow") as pool:
+            running = {}  # future → (用例位置, 任务序号)
+
+            while True:
+                while len(running) < self.workers:
+                    task = dispatch.next_task()
+                    if task is None:
+                        break
+                    key, tc_id, row = task
+                    future = pool.submit(execute, tc_id) if row is _RUN else pool.submit(execute, tc_id, row)
+                    running[future] = key
+
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        dispatch.finish_task(running.pop(future), future.result())
+
+                yield from dispatch.drain()
+
+                # 刚完成的用例可能使后续用例就绪
+                if not running and dispatch.idle:
+                    break
+
+        yield from dispatch.leftovers()
+
+    async def run_async(
+        self,
+        execute: Callable[..., Awaitable[Any]],
+        should_stop: Optional[Callable[[Any], bool]] = None,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        skip: Optional[Callable[[str, str], Any]] = None,
+        known: Optional[Dict[str, Any]] = None,
+        expand: Optional[Callable[[str], Optional[Iterable[Any]]]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        在事件循环中执行所有用例，workers 为同时在途的最大用例数（数据驱动用例的每一行各占一个）
+
+        与线程池调度相同，用例就绪且有空闲名额时才创建任务；结果同样按 graph.order 的顺序产出。
+        某个用例抛出异常时取消其余在途任务并向上抛出。
+
+        Args:
+            execute: 执行单个用例的协程函数，接收用例 ID（数据驱动用例另接收数据行），返回结果
+            should_stop: 根据结果判断是否停止调度后续用例（可选）
+            is_failure: 同 run
+            skip: 同 run（普通函数）
+            known: 同 run
+            expand: 同 run
+
+        Yields:
+            (用例 ID, 执行结果)
+        """
+        dispatch = _Dispatch(self, _NodeControl(self, is_failure, skip, known, expand), should_stop)
+        running: Dict[asyncio.Future, Tuple[int, int]] = {}  # 任务 → (用例位置, 任务序号)
+
+        try:
+            while True:
+                while len(running) < self.workers:
+                    task = dispatch.next_task()
+                    if task is None:
+                        break
+                    key, tc_id, row = task
+                    running[asyncio.ensure_future(execute(tc_id) if row is _RUN else execute(tc_id, row))] = key
+
+                if running:
+                    done, _ = await asyncio.wait(set(running), return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        dispatch.finish_task(running.pop(task), task.result())
+
+                for item in dispatch.drain():
+                    yield item
+
+                if not running and dispatch.idle:
+                    break
+
+            for item in dispatch.leftovers():
+                yield item
+        finally:
+            for task in running:
+                task.cancel()
+
+    def _failed_root(self, tc_id: str, failed_roots: Dict[str, str]) -> Optional[str]:
+        """
+        查找用例的失败上游
+
+        前置用例总是先于用例本身完成，因此检查直接前置即可覆盖整条上游链路。
+
+        Returns:
+            执行顺序上第一个失败前置用例的根因用例 ID，没有则返回 None
+        """
+        failed = [prereq for prereq in self.graph.prerequisites[tc_id] if prereq in failed_roots]
+        if not failed:
+            return None
+        return failed_roots[min(failed, key=self._position.__getitem__)]
@@ -0,0 +1,335 @@
+"""
+响应体 Schema 校验模块
+
+把端点声明的响应 Schema（JSON Schema / OpenAPI Schema 的常用子集）编译为校验器：
+关键字在编译时解析一次（类型判断、必填字段、正则、枚举等预先处理），
+校验时只执行 Schema 中出现的检查，不再解释 Schema 字典。
+
+校验器是普通对象，可随编译后的计划一起缓存；同一端点、同一状态码的校验器在整个执行中只编译一次。
+
+支持的关键字：type（含类型列表）、nullable、enum、const、properties、required、
+additionalProperties、items、minItems、maxItems、uniqueItems、minLength、maxLength、pattern、
+minimum、maximum、exclusiveMinimum、exclusiveMaximum、multipleOf、allOf、anyOf、oneOf、not。
+format、$ref 等其他关键字被忽略。
+"""
+
+import math
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+# 报告中最多列出的错误数
+MAX_ERRORS = 5
+
+_TYPE_NAMES = {
+    dict: "object",
+    list: "array",
+    str: "string",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    type(None): "null",
+}
+
+
+def _type_name(value: Any) -> str:
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON 语义的相等：true / false 与 1 / 0 不相等，1 与 1.0 相等"""
+    if type(a) is bool or type(b) is bool:
+        return type(a) is type(b) and a == b
+    if type(a) is list and type(b) is list:
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if type(a) is dict and type(b) is dict:
+        return a.keys() == b.keys() and all(_json_equal(a[key], b[key]) for key in a)
+    return a == b
+
+
+# 类型判断函数（模块级函数，编译后的校验器可以 pickle）；bool 不是 integer / number
+def _is_object(value: Any) -> bool:
+    return type(value) is dict
+
+
+def _is_array(value: Any) -> bool:
+    return type(value) is list
+
+
+def _is_string(value: Any) -> bool:
+    return type(value) is str
+
+
+def _is_boolean(value: Any) -> bool:
+    return type(value) is bool
+
+
+def _is_integer(value: Any) -> bool:
+    return type(value) is int or (type(value) is float and value.is_integer())
+
+
+def _is_number(value: Any) -> bool:
+    return type(value) is int or type(value) is float
+
+
+def _is_null(value: Any) -> bool:
+    return value is None
+
+
+_TYPE_CHECKS = {
+    "object": _is_object,
+    "array": _is_array,
+    "string": _is_string,
+    "boolean": _is_boolean,
+    "integer": _is_integer,
+    "number": _is_number,
+    "null": _is_null,
+}
+
+
+class SchemaValidator:
+    """编译后的 Schema 校验器（一个节点对应 Schema 中的一层）"""
+
+    __slots__ = (
+        "types", "type_label", "enum", "const", "has_const",
+        "properties", "required", "additional", "items", "min_items", "max_items", "unique_items",
+        "min_length", "max_length", "pattern", "minimum", "maximum",
+        "exclusive_minimum", "exclusive_maximum", "multiple_of", "multiple_of_decimal",
+        "all_of", "any_of", "one_of", "not_",
+    )
+
+    def __init__(self, schema: Any):
+        """
+        Args:
+            schema: Schema 字典；True / 空字典表示接受任意值，False 表示拒绝任意值
+        """
+        if schema is True or schema is None:
+            schema = {}
+        elif schema is False:
+            schema = {"not": {}}
+        if not isinstance(schema, dict):
+            raise ValueError(f"Schema must be an object, got {_type_name(schema)}")
+
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        if types is not None and schema.get("nullable") and "null" not in types:
+            types = list(types) + ["null"]
+        unknown = [t for t in types or () if t not in _TYPE_CHECKS]
+        if unknown:
+            raise ValueError(f"Unknown schema type: {', '.join(map(str, unknown))}")
+        self.types = tuple(_TYPE_CHECKS[t] for t in types) if types else None
+        self.type_label = " or ".join(types) if types else ""
+
+        self.enum = list(schema["enum"]) if "enum" in schema else None
+        self.has_const = "const" in schema
+        self.const = schema.get("const")
+
+        properties = schema.get("properties")
+        self.properties = {name: SchemaValidator(s) for name, s in properties.items()} if properties else None
+        self.required = tuple(schema.get("required") or ())
+        additional = schema.get("additionalProperties", True)
+        # True：不限制；False：不允许；字典：按该 Schema 校验
+        self.additional = additional if isinstance(additional, bool) else SchemaValidator(additional)
+
+        items = schema.get("items")
+        self.items = SchemaValidator(items) if isinstance(items, dict) else None
+        self.min_items = schema.get("minItems")
+        self.max_items = schema.get("maxItems")
+        self.unique_items = bool(schema.get("uniqueItems"))
+
+        self.min_length = schema.get("minLength")
+        self.max_length = schema.get("maxLength")
+        self.pattern = re.compile(schema["pattern"]) if schema.get("pattern") else None
+
+        self.minimum = schema.get("minimum")
+        self.maximum = schema.get("maximum")
+        # OpenAPI 3.0 中 exclusiveMinimum/exclusiveMaximum 为布尔值，修饰 minimum/maximum
+        exclusive_minimum = schema.get("exclusiveMinimum")
+        exclusive_maximum = schema.get("exclusiveMaximum")
+        if exclusive_minimum is True:
+            self.minimum, exclusive_minimum = None, self.minimum
+        if exclusive_maximum is True:
+            self.maximum, exclusive_maximum = None, self.maximum
+        self.exclusive_minimum = exclusive_minimum if not isinstance(exclusive_minimum, bool) else None
+        self.exclusive_maximum = exclusive_maximum if not isinstance(exclusive_maximum, bool) else None
+        self.multiple_of = schema.get("multipleOf")
+        # 非整数的除数按十进制计算，避免 0.3 / 0.1 这类浮点误差
+        self.multiple_of_decimal = (
+            Decimal(str(self.multiple_of)) if self.multiple_of and type(self.multiple_of) is not int else None
+        )
+
+        self.all_of = tuple(SchemaValidator(s) for s in schema.get("allOf") or ()) or None
+        self.any_of = tuple(SchemaValidator(s) for s in schema.get("anyOf") or ()) or None
+        self.one_of = tuple(SchemaValidator(s) for s in schema.get("oneOf") or ()) or None
+        self.not_ = SchemaValidator(schema["not"]) if "not" in schema else None
+
+    def validate(self, value: Any, limit: int = MAX_ERRORS) -> List[str]:
+        """
+        校验值
+
+        Args:
+            value: 响应体
+            limit: 最多收集的错误数
+
+        Returns:
+            错误描述列表（形如 "$.data.id: expected integer, got string"），通过时为空列表
+        """
+        errors: List[str] = []
+        self._check(value, "$", errors, limit)
+        return errors
+
+    def is_valid(self, value: Any) -> bool:
+        """值是否通过校验（遇到第一个错误即停止）"""
+        return not self.validate(value, limit=1)
+
+    def _check(self, value: Any, path: str, errors: List[str], limit: int) -> None:
+        if self.types is not None and not any(check(value) for check in self.types):
+            errors.append(f"{path}: expected {self.type_label}, got {_type_name(value)}")
+            return
+
+        if self.enum is not None and not any(_json_equal(value, option) for option in self.enum):
+            errors.append(f"{path}: {value!r} is not one of {self.enum!r}")
+        if self.has_const and not _json_equal(value, self.const):
+            errors.append(f"{path}: expected {self.const!r}, got {value!r}")
+
+        value_type = type(value)
+        if value_type is dict:
+            self._check_object(value, path, errors, limit)
+        elif value_type is list:
+            self._check_array(value, path, errors, limit)
+        elif value_type is str:
+            self._check_string(value, path, errors)
+        elif value_type in (int, float):
+            self._check_number(value, path, errors)
+
+        if self.all_of is not None:
+            for sub in self.all_of:
+                sub._check(value, path, errors, limit)
+        if self.any_of is not None and not any(sub.is_valid(value) for sub in self.any_of):
+            errors.append(f"{path}: does not match any schema in anyOf")
+        if self.one_of is not None:
+            matched = sum(1 for sub in self.one_of if sub.is_valid(value))
+            if matched != 1:
+                errors.append(f"{path}: matches {matched} schemas in oneOf, expected exactly 1")
+        if self.not_ is not None and self.not_.is_valid(value):
+            errors.append(f"{path}: must not match the schema in not")
+
+        if len(errors) > limit:
+            del errors[limit:]
+
+    def _check_object(self, value: dict, path: str, errors: List[str], limit: int) -> None:
+        for name in self.required:
+            if name not in value:
+                errors.append(f"{path}: missing required property {name!r}")
+
+        properties = self.properties
+        additional = self.additional
+        if properties is None and additional is True:
+            return
+
+        for name, item in value.items():
+            if len(errors) >= limit:
+                return
+            sub = properties.get(name) if properties is not None else None
+            if sub is not None:
+                sub._check(item, f"{path}.{name}", errors, limit)
+            elif additional is False:
+                errors.append(f"{path}: unexpected property {name!r}")
+            elif additional is not True:
+                additional._check(item, f"{path}.{name}", errors, limit)
+
+    def _check_array(self, value: list, path: str, errors: List[str], limit: int) -> None:
+        if self.min_items is not None and len(value) < self.min_items:
+            errors.append(f"{path}: expected at least {self.min_items} items, got {len(value)}")
+        if self.max_items is not None and len(value) > self.max_items:
+            errors.append(f"{path}: expected at most {self.max_items} items, got {len(value)}")
+        if self.unique_items and not _all_unique(value):
+            errors.append(f"{path}: items are not unique")
+
+        items = self.items
+        if items is not None:
+            for index, item in enumerate(value):
+                if len(errors) >= limit:
+                    return
+                items._check(item, f"{path}[{index}]", errors, limit)
+
+    def _check_string(self, value: str, path: str, errors: List[str]) -> None:
+        if self.min_length is not None and len(value) < self.min_length:
+            errors.append(f"{path}: expected at least {self.min_length} characters, got {len(value)}")
+        if self.max_length is not None and len(value) > self.max_length:
+            errors.append(f"{path}: expected at most {self.max_length} characters, got {len(value)}")
+        if self.pattern is not None and not self.pattern.search(value):
+            errors.append(f"{path}: {value!r} does not match pattern {self.pattern.pattern!r}")
+
+    def _check_number(self, value: float, path: str, errors: List[str]) -> None:
+        if self.minimum is not None and value < self.minimum:
+            errors.append(f"{path}: {value} is less than minimum {self.minimum}")
+        if self.maximum is not None and value > self.maximum:
+            errors.append(f"{path}: {value} is greater than maximum {self.maximum}")
+        if self.exclusive_minimum is not None and value <= self.exclusive_minimum:
+            errors.append(f"{path}: {value} is not greater than {self.exclusive_minimum}")
+        if self.exclusive_maximum is not None and value >= self.exclusive_maximum:
+            errors.append(f"{path}: {value} is not less than {self.exclusive_maximum}")
+        if self.multiple_of and not self._is_multiple(value):
+            errors.append(f"{path}: {value} is not a multiple of {self.multiple_of}")
+
+    def _is_multiple(self, value: float) -> bool:
+        if self.multiple_of_decimal is None and type(value) is int:
+            return value % self.multiple_of == 0
+        if not math.isfinite(value):
+            return False
+        try:
+            return Decimal(str(value)) % (self.multiple_of_decimal or Decimal(self.multiple_of)) == 0
+        except InvalidOperation:
+            # 商超出十进制精度，按相对误差判断
+            quotient = value / self.multiple_of
+            return abs(quotient - round(quotient)) <= 1e-9 * abs(quotient)
+
+
+def _all_unique(items: list) -> bool:
+    # bool 与数字在 JSON Schema 中是不同的值
+    for index, item in enumerate(items):
+        if any(_json_equal(item, other) for other in items[index + 1:]):
+            return False
+    return True
+
+
+def compile_response_schemas(endpoint: dict) -> Tuple[Dict[str, SchemaValidator], List[str]]:
+    """
+    编译端点声明的全部响应 Schema
+
+    Args:
+        endpoint: 计划中的端点定义，responses 形如 {"200": {"schema": {...}}}
+
+    Returns:
+        (状态码（字符串，含 default）→ 校验器, 不合法 Schema 的错误描述)，不合法的状态码被跳过
+    """
+    validators: Dict[str, SchemaValidator] = {}
+    errors: List[str] = []
+    for status, response in (endpoint.get("responses") or {}).items():
+        schema = response.get("schema") if isinstance(response, dict) else None
+        if schema is None:
+            continue
+        try:
+            validators[str(status)] = SchemaValidator(schema)
+        except (ValueError, TypeError, AttributeError, re.error) as e:
+            errors.append(f"response {status}: {e}")
+    return validators, errors
+
+
+def validator_for(validators: Optional[Dict[str, SchemaValidator]], status: Any) -> Optional[SchemaValidator]:
+    """
+    取得状态码对应的校验器
+
+    Args:
+        validators: compile_response_schemas 的结果
+        status: 状态码，如 200、"200"
+
+    Returns:
+        精确匹配的状态码，其次 2XX 形式的范围，最后 default；都没有时为 None
+    """
+    if not validators:
+        return None
+    status = str(status)
+    return validators.get(status) or validators.get(f"{status[:1]}XX") or validators.get("default")
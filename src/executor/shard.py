@@ -0,0 +1,132 @@
+"""
+分片模块
+
+按依赖连通分量把测试计划拆分为多个分片，便于多进程/多机器并行执行。
+同一条依赖链上的用例总是落在同一个分片中。
+"""
+
+from typing import Dict, List, Tuple
+
+from .scheduler import ExecutionGraph
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    解析分片参数
+
+    Args:
+        spec: 形如 "2/4" 的字符串，表示 4 个分片中的第 2 个（从 1 开始）
+
+    Returns:
+        (分片序号, 分片总数)
+    """
+    try:
+        index_str, total_str = spec.split("/")
+        index, total = int(index_str), int(total_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec: {spec!r}, expected 'i/N'") from None
+
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Invalid shard spec: {spec!r}, expected 1 <= i <= N")
+
+    return index, total
+
+
+def connected_components(graph: ExecutionGraph) -> List[List[str]]:
+    """
+    计算依赖图的弱连通分量
+
+    Args:
+        graph: 用例依赖图
+
+    Returns:
+        连通分量列表，分量之间以及分量内部均保持 graph.order 的顺序
+    """
+    parent = {tc_id: tc_id for tc_id in graph.order}
+
+    def find(tc_id: str) -> str:
+        while parent[tc_id] != tc_id:
+            parent[tc_id] = parent[parent[tc_id]]
+            tc_id = parent[tc_id]
+        return tc_id
+
+    for tc_id in graph.order:
+        for prereq in graph.prerequisites[tc_id]:
+            root_a, root_b = find(tc_id), find(prereq)
+            if root_a != root_b:
+                parent[root_a] = root_b
+
+    components: Dict[str, List[str]] = {}
+    for tc_id in graph.order:
+        components.setdefault(find(tc_id), []).append(tc_id)
+
+    return list(components.values())
+
+
+def assign_shards(components: List[List[str]], total: int) -> List[List[str]]:
+    """
+    将连通分量分配到各分片，尽量使每个分片的用例数均衡
+
+    分配结果只取决于分量本身，各台机器独立计算也能得到相同的划分。
+
+    Args:
+        components: 连通分量列表
+        total: 分片总数
+
+    Returns:
+        每个分片包含的用例 ID 列表
+    """
+    shards: List[List[str]] = [[] for _ in range(total)]
+
+    # 先放大的分量，再把每个分量放进当前用例最少的分片
+    ranked = sorted(enumerate(components), key=lambda item: (-len(item[1]), item[0]))
+    for _, component in ranked:
+        target = min(range(total), key=lambda i: (len(shards[i]), i))
+        shards[target].extend(component)
+
+    return shards
+
+
+def select_shard(graph: ExecutionGraph, index: int, total: int) -> List[str]:
+    """
+    计算指定分片包含的用例
+
+    Args:
+        graph: 用例依赖图
+        index: 分片序号（从 1 开始）
+        total: 分片总数
+
+    Returns:
+        该分片的用例 ID 列表，保持 graph.order 的顺序
+    """
+    selected = set(assign_shards(connected_components(graph), total)[index - 1])
+    return [tc_id for tc_id in graph.order if tc_id in selected]
+
+
+def shard_plan(test_plan: dict, index: int, total: int) -> dict:
+    """
+    从测试计划中取出指定分片
+
+    Args:
+        test_plan: 测试计划字典
+        index: 分片序号（从 1 开始）
+        total: 分片总数
+
+    Returns:
+        只包含该分片用例的测试计划字典
+    """
+    order = select_shard(ExecutionGraph.from_plan(test_plan), index, total)
+    selected = set(order)
+
+    meta = dict(test_plan.get("meta", {}))
+    meta["shard"] = f"{index}/{total}"
+
+    dependencies = test_plan.get("dependencies", {})
+
+    return {
+        **test_plan,
+        "meta": meta,
+        "test_cases": [tc for tc in test_plan.get("test_cases", []) if tc["id"] in selected],
+        "execution_order": order,
+        "dependencies": {k: v for k, v in dependencies.items() if k in selected},
+    }
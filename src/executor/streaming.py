@@ -0,0 +1,298 @@
+"""
+流式断言模块
+
+用 ijson 增量解析响应体，在数据到达时对简单 JSONPath（只含字段名与数组下标，
+如 $.data[0].id、$['total']）求值，不在内存中构造完整的响应体。
+所有路径都有了结论后即停止读取，位于文档前部的 exists / equals 断言无需等待整个响应。
+报告需要完整响应体时（keep_bytes 为 None）照常读到响应结束，只省去构造完整响应体的开销。
+
+ijson 为可选依赖（pip install 'apiflowagent[stream]'），未安装时不能开启流式模式。
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+# 路径未命中（与值为 null 区分）
+MISSING = object()
+
+_STEP = re.compile(r"\.([A-Za-z_][\w-]*)|\[(\d+)\]|\['([^'\]]*)'\]|\[\"([^\"\]]*)\"\]")
+
+PathSteps = Tuple[Union[str, int], ...]
+
+
+def parse_simple_path(path: str) -> Optional[PathSteps]:
+    """
+    解析简单 JSONPath
+
+    Args:
+        path: JSONPath 字符串
+
+    Returns:
+        字段名（str）与下标（int）组成的元组，$ 为空元组；含通配符、过滤器、切片等时返回 None
+    """
+    if not path or not path.startswith("$"):
+        return None
+
+    steps: List[Union[str, int]] = []
+    pos = 1
+    while pos < len(path):
+        match = _STEP.match(path, pos)
+        if match is None:
+            return None
+        name, index, quoted, double_quoted = match.groups()
+        if index is not None:
+            steps.append(int(index))
+        else:
+            steps.append(next(s for s in (name, quoted, double_quoted) if s is not None))
+        pos = match.end()
+    return tuple(steps)
+
+
+def simple_paths(paths: Iterable[str]) -> Optional[Dict[str, PathSteps]]:
+    """
+    全部路径都是简单路径时返回 {路径: 步骤}，否则返回 None（该用例不能流式求值）
+
+    Args:
+        paths: 用例断言与提取用到的 JSONPath
+    """
+    parsed = {}
+    for path in paths:
+        steps = parse_simple_path(path)
+        if steps is None:
+            return None
+        parsed[path] = steps
+    return parsed
+
+
+@dataclass(frozen=True)
+class StreamSpec:
+    """单个请求的流式求值参数"""
+    paths: Dict[str, PathSteps]  # 需要求值的路径（见 simple_paths）
+    threshold: int = 0  # Content-Length 已知且小于该字节数的响应照常完整读取
+    keep_bytes: Optional[int] = 1024  # 为报告保留的响应体前缀字节数，None 表示读到结束并保留完整响应体
+
+    def wants_stream(self, headers) -> bool:
+        """根据响应头决定是否流式读取（分块传输等未知长度的响应一律流式读取）"""
+        length = headers.get("content-length")
+        return not (length and length.isdigit() and int(length) < self.threshold)
+
+
+def require_ijson() -> None:
+    """流式模式依赖可选的 ijson 包"""
+    if ijson is None:
+        raise ImportError("Streaming assertions require the optional ijson package: pip install ijson")
+
+
+class PathStreamEvaluator:
+    """
+    简单 JSONPath 的增量求值器
+
+    逐块 feed 响应体，values 中记录每个路径的取值（未命中为 MISSING）。
+    同时保留响应体的前 keep_bytes 字节（None 为完整响应体），供报告使用。
+
+    取值规则同 CompiledPath.first。以下路径不在 values 中，由调用方对响应体单独求值：
+    求值出错的路径（如对数字取下标，同 PathTrie.evaluate），以及响应体不是 JSON 时的所有路径
+    （完整解析时响应体为文本，$ 与下标路径按文本取值）。
+    所有路径有结论后不再解析剩余部分，其后出现的非法内容（如 JSON 之后的多余字符）不会被发现。
+    """
+
+    def __init__(self, paths: Dict[str, PathSteps], keep_bytes: Optional[int] = 1024):
+        """
+        Args:
+            paths: 路径字符串 → 步骤（见 simple_paths）
+            keep_bytes: 保留的响应体前缀字节数，None 表示保留完整响应体（此时 done 始终为 False，读到结束）
+        """
+        require_ijson()
+        self.values: Dict[str, Any] = {}
+        self.head = bytearray()
+        self.keep_bytes = keep_bytes
+        self.bytes_read = 0
+
+        self._pending: Dict[str, PathSteps] = dict(paths)
+        self._path: List[Union[str, int, None]] = []  # 各层容器中当前的键或下标
+        self._arrays: List[bool] = []  # 各层容器是否为数组
+        self._builders: List[Tuple[str, int, "ObjectBuilder"]] = []  # (路径, 所在层数, 构造器)
+        self._skip_depth = 0  # 正在跳过的无关容器的嵌套层数
+        self._events = ijson.sendable_list()
+        self._parser = ijson.basic_parse_coro(self._events, use_float=True)  # 不需要 ijson 计算的 prefix
+        self._finished = False
+
+    @property
+    def done(self) -> bool:
+        """所有路径都有结论，且报告所需的前缀已经读满"""
+        if self.keep_bytes is None:
+            return False
+        return self._finished or (
+            not self._pending and not self._builders and len(self.head) >= self.keep_bytes
+        )
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        输入一块响应体
+
+        Returns:
+            是否可以停止读取
+        """
+        self.bytes_read += len(chunk)
+        if self.keep_bytes is None:
+            self.head += chunk
+        elif len(self.head) < self.keep_bytes:
+            self.head += chunk[: self.keep_bytes - len(self.head)]
+
+        if self._pending or self._builders:
+            try:
+                self._parser.send(chunk)
+            except ijson.JSONError:
+                self._abandon()
+                return self.done
+            self._consume()
+        return self.done
+
+    def close(self) -> Dict[str, Any]:
+        """
+        响应体读取结束（读完或提前停止）
+
+        Returns:
+            路径 → 取值，未命中为 MISSING；不含需要调用方单独求值的路径（见类说明）
+        """
+        if not self._finished and (self._pending or self._builders):
+            try:
+                self._parser.close()
+                self._consume()
+            except ijson.JSONError:
+                self._abandon()
+        self._finish()
+        return self.values
+
+    def _abandon(self) -> None:
+        """响应体不是 JSON（或不完整）：放弃已求出的值，全部路径交给调用方按文本求值"""
+        self.values.clear()
+        self._pending.clear()
+        self._builders.clear()
+        self._finished = True
+
+    def _finish(self) -> None:
+        for path in list(self._pending) + [path for path, _, _ in self._builders]:
+            self.values.setdefault(path, MISSING)
+        self._pending.clear()
+        self._builders.clear()
+        self._finished = True
+
+    def _consume(self) -> None:
+        for event, value in self._events:
+            # 不包含任何待求值路径的容器只数层数，不跟踪键与下标
+            if self._skip_depth:
+                if event == "start_map" or event == "start_array":
+                    self._skip_depth += 1
+                elif event == "end_map" or event == "end_array":
+                    self._skip_depth -= 1
+                continue
+
+            self._on_event(event, value)
+            if not self._pending and not self._builders:
+                break
+        del self._events[:]
+
+    def _on_event(self, event: str, value: Any) -> None:
+        if event == "map_key":
+            self._path[-1] = value
+            for _, _, builder in self._builders:
+                builder.event(event, value)
+            return
+
+        if event in ("end_map", "end_array"):
+            for _, _, builder in self._builders:
+                builder.event(event, value)
+            self._path.pop()
+            self._arrays.pop()
+            self._close_container(tuple(self._path))
+            return
+
+        # 值开始：标量、start_map 或 start_array
+        if self._arrays and self._arrays[-1]:
+            self._path[-1] += 1
+        position = tuple(self._path)
+
+        for _, _, builder in self._builders:
+            builder.event(event, value)
+
+        container = event in ("start_map", "start_array")
+        depth = len(position)
+        for path, steps in list(self._pending.items()):
+            if steps == position:
+                del self._pending[path]
+                if container:
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                    self._builders.append((path, depth, builder))
+                else:
+                    self.values[path] = value
+            elif not container and len(steps) > depth and steps[:depth] == position:
+                # 路径经过标量（如对字符串取下标）：在标量上继续取值
+                del self._pending[path]
+                try:
+                    self.values[path] = _walk(value, steps[depth:])
+                except TypeError:
+                    pass
+
+        if container and not self._builders and not self._leads_to_pending(position):
+            self._skip_depth = 1
+            return
+
+        if event == "start_map":
+            self._path.append(None)
+            self._arrays.append(False)
+        elif event == "start_array":
+            self._path.append(-1)
+            self._arrays.append(True)
+
+    def _leads_to_pending(self, position: tuple) -> bool:
+        """是否有待求值路径位于 position 处的容器之内"""
+        depth = len(position)
+        return any(len(steps) > depth and steps[:depth] == position for steps in self._pending.values())
+
+    def _close_container(self, position: tuple) -> None:
+        """位于 position 的容器结束：完成对应的构造器，其中未出现的路径确定未命中"""
+        depth = len(position)
+
+        remaining = []
+        for path, level, builder in self._builders:
+            if level == depth:
+                self.values[path] = builder.value
+            else:
+                remaining.append((path, level, builder))
+        self._builders = remaining
+
+        for path, steps in list(self._pending.items()):
+            if len(steps) > depth and steps[:depth] == position:
+                del self._pending[path]
+                self.values[path] = MISSING
+
+
+def _walk(value: Any, steps: PathSteps) -> Any:
+    """
+    从标量继续按步骤取值，规则同 CompiledPath.first
+
+    Raises:
+        TypeError: 对数字等没有长度的值取下标
+    """
+    for step in steps:
+        if type(step) is int:
+            if isinstance(value, dict) or not (value and -len(value) <= step < len(value)):
+                return MISSING
+            value = value[step]
+        else:
+            try:
+                value = value.get(step, MISSING)
+            except (TypeError, AttributeError):
+                return MISSING
+            if value is MISSING:
+                return MISSING
+    return value
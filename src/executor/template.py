@@ -0,0 +1,174 @@
+"""
+模板模块
+
+将包含 {{variable}} 占位符的字符串预先切分为字面量/变量片段，
+渲染时直接拼接，无需每次重新扫描正则。
+
+编译数据结构时预先找出不含占位符的子树：这些子树保持原对象，渲染时直接复用，
+只有含占位符的分支才会重新构造 dict / list。
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# 与 VariableManager 一致的占位符格式：{{variable_name}}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+# 路径参数格式：{param_name}（不含 {{ }} 变量）
+_PATH_SLOT_PATTERN = re.compile(r"(?<!\{)\{(\w+)\}(?!\})")
+
+# 片段类型
+LITERAL = 0
+VARIABLE = 1
+SLOT = 2
+
+
+class Template:
+    """预编译的字符串模板"""
+
+    __slots__ = ("source", "segments", "names")
+
+    def __init__(self, source: str, path_slots: bool = False):
+        """
+        编译模板
+
+        Args:
+            source: 模板字符串
+            path_slots: 是否同时识别 {param} 形式的路径参数槽位
+        """
+        self.source = source
+        self.segments: List[Tuple[int, str]] = []
+
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self._add_literal(source[position:match.start()], path_slots)
+            self.segments.append((VARIABLE, match.group(1)))
+            position = match.end()
+        self._add_literal(source[position:], path_slots)
+
+        self.names = frozenset(name for kind, name in self.segments if kind == VARIABLE)
+
+    def _add_literal(self, text: str, path_slots: bool) -> None:
+        """添加字面量片段，必要时拆出路径参数槽位"""
+        if not text:
+            return
+        if not path_slots:
+            self.segments.append((LITERAL, text))
+            return
+
+        position = 0
+        for match in _PATH_SLOT_PATTERN.finditer(text):
+            if match.start() > position:
+                self.segments.append((LITERAL, text[position:match.start()]))
+            self.segments.append((SLOT, match.group(1)))
+            position = match.end()
+        if position < len(text):
+            self.segments.append((LITERAL, text[position:]))
+
+    def render(self, lookup: Callable[[str], Any], slots: Optional[Dict[str, Any]] = None) -> str:
+        """
+        渲染模板
+
+        未找到的变量（值为 None）保留原占位符；
+        未提供值的路径参数槽位保留 {param} 原样。
+
+        Args:
+            lookup: 变量查找函数
+            slots: 路径参数值（可选）
+
+        Returns:
+            渲染后的字符串
+        """
+        parts = []
+        for kind, text in self.segments:
+            if kind == LITERAL:
+                parts.append(text)
+            elif kind == VARIABLE:
+                value = lookup(text)
+                parts.append(str(value) if value is not None else f"{{{{{text}}}}}")
+            elif slots is not None and text in slots:
+                parts.append(str(slots[text]))
+            else:
+                parts.append(f"{{{text}}}")
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> Template:
+    """编译字符串模板（按内容缓存，相同的字符串共用同一个 Template）"""
+    return Template(source)
+
+
+class TemplateTree:
+    """含占位符的 dict / list，不含占位符的子节点保持原值"""
+
+    __slots__ = ("is_list", "items")
+
+    def __init__(self, is_list: bool, items: List[Tuple[Any, Any, bool]]):
+        """
+        Args:
+            is_list: 是否为 list（否则为 dict）
+            items: (键或下标, 子节点, 子节点是否需要渲染)
+        """
+        self.is_list = is_list
+        self.items = items
+
+    def render(self, lookup: Callable[[str], Any]) -> Union[dict, list]:
+        """渲染含占位符的子节点，其余子节点原样复用"""
+        if self.is_list:
+            return [node.render(lookup) if dynamic else node for _, node, dynamic in self.items]
+        return {key: node.render(lookup) if dynamic else node for key, node, dynamic in self.items}
+
+    def __repr__(self) -> str:
+        return f"TemplateTree({self.items!r})"
+
+
+def compile_tree(data: Any) -> Any:
+    """
+    将数据中含占位符的字符串编译为 Template
+
+    Args:
+        data: 待编译的数据（可以是 str、dict、list）
+
+    Returns:
+        不含占位符时返回 data 本身；否则为 Template（字符串）或 TemplateTree（dict / list）
+    """
+    if isinstance(data, str):
+        return compile_template(data) if "{{" in data and PLACEHOLDER_PATTERN.search(data) else data
+    if isinstance(data, dict):
+        pairs = data.items()
+    elif isinstance(data, list):
+        pairs = enumerate(data)
+    else:
+        return data
+
+    items = []
+    dynamic = False
+    for key, value in pairs:
+        node = compile_tree(value)
+        items.append((key, node, node is not value))
+        dynamic = dynamic or node is not value
+    return TemplateTree(isinstance(data, list), items) if dynamic else data
+
+
+def render_tree(node: Any, lookup: Callable[[str], Any]) -> Any:
+    """
+    渲染 compile_tree 的输出
+
+    不含占位符的子树原样返回（与编译前的数据是同一对象），调用方不应修改渲染结果。
+
+    Args:
+        node: 编译后的数据
+        lookup: 变量查找函数
+
+    Returns:
+        渲染后的数据
+    """
+    if type(node) is Template or type(node) is TemplateTree:
+        return node.render(lookup)
+    return node
+
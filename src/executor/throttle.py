@@ -0,0 +1,507 @@
+"""
+自适应限流模块
+
+在 HTTP 客户端前按 base URL 限流，避免提高并发后被网关以 429/503 拒绝、误报为用例失败：
+
+- 令牌桶：限制每秒发出的请求数（可选）
+- AIMD 并发控制：从 1 开始慢启动（每轮翻倍），之后响应正常时每轮（约 limit 个响应）并发上限加 1；
+  收到 429/503，或短期平均延迟超过长期基线的 latency_tolerance 倍时乘性减小，
+  从而自动逼近目标服务能承受的最大吞吐
+- 429/503 自动重试：遵循 Retry-After（期间该 base URL 的所有请求暂停），没有时指数退避；
+  503 不保证源站未处理请求，只重试幂等方法，POST / PATCH 等只在 429 时重试
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+from .http_client import HttpResponse
+
+# 视为限流的状态码
+THROTTLE_STATUS = (429, 503)
+
+# 收到 503 时可以安全重发的方法（网关返回 503 时源站可能已经处理了请求）
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+# Retry-After 的最长等待（秒），避免网关返回过大的值时长时间挂起
+MAX_RETRY_AFTER = 60.0
+
+# 没有 Retry-After 时的退避：BACKOFF_BASE * 2^重试次数，不超过 BACKOFF_MAX（秒）
+BACKOFF_BASE = 0.1
+BACKOFF_MAX = 5.0
+
+# 汇总中保留的最近限流事件数
+MAX_EVENTS = 20
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 秒数或 HTTP 日期
+
+    Returns:
+        需要等待的秒数（不超过 MAX_RETRY_AFTER），无法解析时为 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return min(max((at - datetime.now(timezone.utc)).total_seconds(), 0.0), MAX_RETRY_AFTER)
+
+
+def is_retryable(method: str, status_code: int) -> bool:
+    """
+    被限流的请求能否重发
+
+    429 表示请求未被处理，任何方法都可以重试；503 只重试幂等方法，
+    避免 POST 等在源站已处理的情况下重复创建资源。
+    """
+    return status_code == 429 or method.upper() in IDEMPOTENT_METHODS
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    reserve 预支一个令牌并返回需要等待的时间，调用方自行 sleep，同步与异步客户端共用。
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate: 每秒补充的令牌数（即稳定后的请求速率）
+            burst: 桶容量，允许的瞬时突发请求数，默认为 max(1, rate)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = float(burst or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """取一个令牌，返回需要等待的秒数（令牌不足时预支，等待结束即可发送）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class AimdController:
+    """
+    AIMD 并发上限
+
+    只维护状态，不做等待；on_response 由持锁的调用方调用。
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: Optional[float] = 2.0,
+        warmup: int = 20,
+    ):
+        """
+        Args:
+            max_limit: 并发上限的最大值（通常为 workers / concurrency）
+            min_limit: 并发上限的最小值
+            initial: 初始并发上限，默认为 min_limit；在第一次减小前每轮翻倍（慢启动），之后每轮加 1
+            decrease_factor: 收到 429/503 时的乘性减小系数；延迟升高时减小得更温和（取其平方根）
+            latency_tolerance: 短期平均延迟超过长期基线的倍数时减小并发，None 表示不根据延迟调整
+            warmup: 建立延迟基线所需的响应数，之前不根据延迟调整
+        """
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(min(initial if initial is not None else self.min_limit, max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.warmup = warmup
+
+        self._samples = 0
+        self._short_ms: Optional[float] = None  # 短期延迟 EWMA
+        self._long_ms: Optional[float] = None  # 延迟基线
+        self._since_decrease = max_limit  # 距上次减小的响应数，一轮内只减小一次
+        self._slow_start = True
+
+    def on_response(self, latency_ms: Optional[float], throttled: bool) -> Optional[str]:
+        """
+        记录一个响应
+
+        Args:
+            latency_ms: 请求耗时，请求失败（无响应）时为 None
+            throttled: 是否为 429/503
+
+        Returns:
+            触发减小时的原因（throttled / latency），否则为 None
+        """
+        self._since_decrease += 1
+        cooled_down = self._since_decrease >= self.limit
+
+        if throttled:
+            if cooled_down:
+                self._decrease(self.decrease_factor)
+                return "throttled"
+            return None
+
+        if latency_ms is None:
+            return None
+
+        if self.latency_tolerance is not None and self._observe_latency(latency_ms):
+            if cooled_down:
+                self._decrease(self.decrease_factor ** 0.5)
+                return "latency"
+            return None
+
+        if self.limit < self.max_limit:
+            step = 1.0 if self._slow_start else 1 / self.limit
+            self.limit = min(float(self.max_limit), self.limit + step)
+        return None
+
+    def _observe_latency(self, latency_ms: float) -> bool:
+        """更新延迟均值，返回短期延迟是否明显高于基线"""
+        self._samples += 1
+        if self._short_ms is None:
+            self._short_ms = self._long_ms = latency_ms
+            return False
+        self._short_ms += (latency_ms - self._short_ms) * 0.1
+        # 基线取短期均值的最小值（并发较低时的延迟），不随拥塞逐步抬高
+        self._long_ms = min(self._long_ms, self._short_ms)
+        congested = self._short_ms > self._long_ms * self.latency_tolerance
+        if congested and self.limit <= self.min_limit:
+            # 并发已降到最低仍然偏慢：服务本身变慢了，以当前延迟为新的基线
+            self._long_ms = self._short_ms
+            return False
+        return congested and self._samples >= self.warmup
+
+    def _decrease(self, factor: float) -> None:
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self._since_decrease = 0
+        self._slow_start = False
+
+
+class HostLimiter:
+    """
+    单个 base URL 的限流器（同步客户端，线程安全）
+
+    acquire 在发送前等待令牌与并发名额，release 在收到响应后归还名额并更新并发上限。
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        min_concurrency: int = 1,
+        adaptive: bool = True,
+        latency_tolerance: Optional[float] = 2.0,
+        max_retries: int = 3,
+    ):
+        """
+        Args:
+            base_url: 限流的 base URL（用于汇总）
+            rate: 每秒最多发出的请求数，None 表示不限速
+            burst: 令牌桶容量，默认为 rate
+            max_concurrency: 并发上限的最大值，None 表示不控制并发
+            min_concurrency: 并发上限的最小值
+            adaptive: 是否按 AIMD 调整并发上限（需要 max_concurrency）
+            latency_tolerance: 见 AimdController，None 表示只根据 429/503 调整
+            max_retries: 429/503 的最大重试次数
+        """
+        self.base_url = base_url
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.aimd = None
+        if adaptive and max_concurrency:
+            self.aimd = AimdController(
+                max_concurrency, min_limit=min_concurrency, latency_tolerance=latency_tolerance
+            )
+        self.max_retries = max_retries
+
+        self.in_flight = 0
+        self.throttled = 0  # 收到的 429/503 响应数
+        self.retries = 0
+        self.waited_s = 0.0  # 在限流器中等待的总时间
+        self._min_limit: Optional[float] = None  # 减小后到达过的最低并发上限
+        self._events: deque = deque(maxlen=MAX_EVENTS)
+        self._started = time.monotonic()
+        self._paused_until = 0.0  # Retry-After 暂停的截止时刻
+        self._lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        """当前并发上限，不控制并发时为 None"""
+        return int(self.aimd.limit) if self.aimd else None
+
+    def _has_slot(self) -> bool:
+        return self.aimd is None or self.in_flight < int(self.aimd.limit)
+
+    def _reserve_delay(self) -> float:
+        """令牌桶与 Retry-After 暂停所需的等待时间（秒）"""
+        delay = self.bucket.reserve() if self.bucket else 0.0
+        return max(delay, self._paused_until - time.monotonic())
+
+    def acquire(self) -> float:
+        """
+        等待发送许可
+
+        Returns:
+            等待的秒数
+        """
+        start = time.monotonic()
+        with self._slots:
+            while not self._has_slot():
+                self._slots.wait()
+            self.in_flight += 1
+
+        delay = self._reserve_delay()
+        if delay > 0:
+            time.sleep(delay)
+        waited = time.monotonic() - start
+        with self._lock:
+            self.waited_s += waited
+        return waited
+
+    def release(self, response: Optional[HttpResponse]) -> Optional[float]:
+        """
+        归还并发名额并根据响应调整限流
+
+        Args:
+            response: 收到的响应，请求异常时为 None
+
+        Returns:
+            响应为 429/503 时重试前应等待的秒数（来自 Retry-After，没有时为 0），否则为 None
+        """
+        throttled = response is not None and response.status_code in THROTTLE_STATUS
+        retry_after = None
+        with self._slots:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if retry_after:
+                    # 网关要求暂停：该 base URL 的后续请求都等到暂停结束
+                    now = time.monotonic()
+                    new_pause = now >= self._paused_until
+                    self._paused_until = max(self._paused_until, now + retry_after)
+
+            reason = None
+            if self.aimd is not None:
+                reason = self.aimd.on_response(response.elapsed_ms if response else None, throttled)
+                if reason:
+                    self._min_limit = min(self._min_limit or self.aimd.limit, self.aimd.limit)
+            if reason or (retry_after and new_pause):
+                self._events.append({
+                    "at_s": round(time.monotonic() - self._started, 3),
+                    "reason": reason or "retry-after",
+                    "status": response.status_code,
+                    "limit": self.concurrency_limit,
+                    "retry_after_s": retry_after,
+                })
+            self._slots.notify_all()
+
+        if not throttled:
+            return None
+        return retry_after or 0.0
+
+    def backoff(self, attempt: int, retry_after: float) -> float:
+        """第 attempt 次重试前在请求自身上等待的秒数（Retry-After 暂停由 acquire 统一等待）"""
+        with self._lock:
+            self.retries += 1
+        if retry_after:
+            return 0.0
+        return min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX)
+
+    def summary(self) -> dict:
+        """当前限流状态与限流事件（写入运行汇总）"""
+        with self._lock:
+            return {
+                "base_url": self.base_url,
+                "rate": self.bucket.rate if self.bucket else None,
+                "concurrency_limit": self.concurrency_limit,
+                "max_concurrency": self.aimd.max_limit if self.aimd else None,
+                "min_concurrency_reached": int(self._min_limit) if self._min_limit is not None else None,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "waited_ms": round(self.waited_s * 1000, 3),
+                "events": list(self._events),
+            }
+
+
+class AsyncHostLimiter(HostLimiter):
+    """单个 base URL 的限流器（异步客户端，在同一事件循环中使用）"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_slots: Optional[asyncio.Condition] = None
+        self._loop = None
+
+    def _condition(self) -> asyncio.Condition:
+        # 每次 asyncio.run 都是新的事件循环，Condition 需随之重建
+        loop = asyncio.get_running_loop()
+        if self._async_slots is None or self._loop is not loop:
+            self._async_slots = asyncio.Condition()
+            self._loop = loop
+        return self._async_slots
+
+    async def acquire(self) -> float:
+        """等待发送许可，返回等待的秒数"""
+        start = time.monotonic()
+        slots = self._condition()
+        async with slots:
+            while not self._has_slot():
+                await slots.wait()
+            self.in_flight += 1
+
+        delay = self._reserve_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        waited = time.monotonic() - start
+        self.waited_s += waited
+        return waited
+
+    async def release(self, response: Optional[HttpResponse]) -> Optional[float]:
+        """归还并发名额并根据响应调整限流，同 HostLimiter.release"""
+        retry_after = HostLimiter.release(self, response)
+        slots = self._condition()
+        async with slots:
+            slots.notify_all()
+        return retry_after
+
+
+class ThrottledHttpClient:
+    """带限流与 429/503 重试的 HTTP 客户端，接口与 HttpClient.request 一致"""
+
+    def __init__(self, client, limiter: HostLimiter):
+        """
+        Args:
+            client: 实际发送请求的客户端
+            limiter: 该客户端 base URL 的限流器
+        """
+        self.client = client
+        self.limiter = limiter
+        self.base_url = client.base_url
+
+    @property
+    def stats(self):
+        """连接统计"""
+        return self.client.stats
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        body: Any = None,
+        stream: Any = None,
+    ) -> HttpResponse:
+        """
+        发送 HTTP 请求，参数同 HttpClient.request
+
+        429/503 最多重试 limiter.max_retries 次（503 只重试幂等方法，见 is_retryable），
+        仍被限流或不能重试时返回最后一次的响应。
+        等待时间（含被限流的请求耗时）记入 response.timings["throttle"]。
+        """
+        waited = 0.0
+        attempt = 0
+        while True:
+            waited += self.limiter.acquire()
+            try:
+                response = self.client.request(method, path, headers=headers, params=params, body=body, stream=stream)
+            except BaseException:
+                self.limiter.release(None)
+                raise
+
+            retry_after = self.limiter.release(response)
+            if (
+                retry_after is None
+                or attempt >= self.limiter.max_retries
+                or not is_retryable(method, response.status_code)
+            ):
+                break
+            # 被限流的请求耗时也计入限流等待
+            waited += response.elapsed_ms / 1000
+            delay = self.limiter.backoff(attempt, retry_after)
+            if delay:
+                time.sleep(delay)
+                waited += delay
+            attempt += 1
+
+        if waited:
+            response.timings["throttle"] = round(waited * 1000, 3)
+        return response
+
+    def close(self) -> None:
+        """关闭实际请求的客户端"""
+        self.client.close()
+
+
+class AsyncThrottledHttpClient(ThrottledHttpClient):
+    """带限流与 429/503 重试的异步 HTTP 客户端，接口与 AsyncHttpClient.request 一致"""
+
+    def __init__(self, client, limiter: AsyncHostLimiter):
+        super().__init__(client, limiter)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        body: Any = None,
+        stream: Any = None,
+    ) -> HttpResponse:
+        """发送 HTTP 请求，同 ThrottledHttpClient.request"""
+        waited = 0.0
+        attempt = 0
+        while True:
+            waited += await self.limiter.acquire()
+            try:
+                response = await self.client.request(
+                    method, path, headers=headers, params=params, body=body, stream=stream
+                )
+            except BaseException:
+                await self.limiter.release(None)
+                raise
+
+            retry_after = await self.limiter.release(response)
+            if (
+                retry_after is None
+                or attempt >= self.limiter.max_retries
+                or not is_retryable(method, response.status_code)
+            ):
+                break
+            # 被限流的请求耗时也计入限流等待
+            waited += response.elapsed_ms / 1000
+            delay = self.limiter.backoff(attempt, retry_after)
+            if delay:
+                await asyncio.sleep(delay)
+                waited += delay
+            attempt += 1
+
+        if waited:
+            response.timings["throttle"] = round(waited * 1000, 3)
+        return response
+
+    async def close(self) -> None:
+        """关闭实际请求的客户端"""
+        await self.client.close()
@@ -0,0 +1,157 @@
+"""
+阶段计时模块
+
+通过 httpx 事件钩子与 httpcore trace 扩展记录单个请求各阶段的耗时：
+排队（等待连接池）、建连、TLS 握手、发送请求、首字节（TTFB）、下载响应体。
+"""
+
+import time
+from typing import Dict, Optional
+
+import httpx
+
+# 按发生顺序排列的 HTTP 阶段
+HTTP_PHASES = ("queue", "connect", "tls", "send", "ttfb", "download")
+
+# 测试运行器在请求前后记录的阶段
+RUNNER_PHASES = ("substitute", "assert", "extract")
+
+# httpcore trace 事件 → 阶段（同一阶段的多个事件时间累加）
+_TRACE_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http2.send_connection_init": "send",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http11.receive_response_headers": "ttfb",
+    "http2.receive_response_headers": "ttfb",
+    "http11.receive_response_body": "download",
+    "http2.receive_response_body": "download",
+}
+
+# trace 扩展在 request.extensions 中的键
+TRACE_EXTENSION = "trace"
+
+
+def elapsed_ms(start: float) -> float:
+    """从 perf_counter 时刻 start 到现在的毫秒数"""
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+class PhaseTimer:
+    """
+    单个请求的阶段计时器
+
+    作为 trace 扩展随请求传入 httpx，客户端级事件钩子通过
+    request.extensions 找到它并记录请求发出与响应头到达的时刻。
+    非 httpcore 传输层（不产生 trace 事件）时，退化为由钩子时刻计算 ttfb/download。
+    """
+
+    def __init__(self):
+        self.start: Optional[float] = None
+        self.headers_at: Optional[float] = None
+        self.end: Optional[float] = None
+        self._first_event: Optional[float] = None
+        self._open: Dict[str, float] = {}
+        self._phases: Dict[str, float] = {}
+        self.new_connection = False  # 本次请求新建了连接（未复用连接池中的连接）
+
+    def __call__(self, name: str, info: dict) -> None:
+        """httpcore trace 回调（同步接口）"""
+        self.record(name)
+
+    def record(self, name: str) -> None:
+        """记录一个 trace 事件，如 http11.send_request_headers.started"""
+        now = time.perf_counter()
+        if self._first_event is None:
+            self._first_event = now
+
+        event, _, stage = name.rpartition(".")
+        phase = _TRACE_PHASES.get(event)
+        if phase is None:
+            return
+
+        if stage == "started":
+            self._open[event] = now
+            if phase == "connect":
+                self.new_connection = True
+        elif event in self._open:
+            self._phases[phase] = self._phases.get(phase, 0.0) + now - self._open.pop(event)
+
+    def finish(self) -> None:
+        """响应体读取完成"""
+        self.end = time.perf_counter()
+
+    def phases(self) -> Dict[str, float]:
+        """
+        各阶段耗时（毫秒），按 HTTP_PHASES 顺序，只包含实际发生的阶段
+
+        Returns:
+            {阶段名: 毫秒}，另含 total 表示从请求发出到响应体读取完成的总耗时
+        """
+        phases = dict(self._phases)
+
+        if self.start is not None and self._first_event is not None:
+            phases["queue"] = self._first_event - self.start
+        elif self.start is not None and self.headers_at is not None:
+            # 没有 trace 事件：以事件钩子时刻近似
+            phases["ttfb"] = self.headers_at - self.start
+            if self.end is not None:
+                phases["download"] = self.end - self.headers_at
+
+        timings = {name: round(phases[name] * 1000, 3) for name in HTTP_PHASES if name in phases}
+        if self.start is not None and self.end is not None:
+            timings["total"] = round((self.end - self.start) * 1000, 3)
+        return timings
+
+
+class AsyncPhaseTimer(PhaseTimer):
+    """单个请求的阶段计时器（异步接口，httpcore 要求异步客户端使用协程回调）"""
+
+    async def __call__(self, name: str, info: dict) -> None:
+        """httpcore trace 回调（异步接口）"""
+        self.record(name)
+
+
+def _timer_of(message) -> Optional[PhaseTimer]:
+    """取出随请求传入的计时器"""
+    request = message if isinstance(message, httpx.Request) else message.request
+    timer = request.extensions.get(TRACE_EXTENSION)
+    return timer if isinstance(timer, PhaseTimer) else None
+
+
+def on_request(request: httpx.Request) -> None:
+    """事件钩子：请求交给传输层（开始等待连接）"""
+    timer = _timer_of(request)
+    if timer is not None:
+        timer.start = time.perf_counter()
+
+
+def on_response(response: httpx.Response) -> None:
+    """事件钩子：响应头已到达，响应体尚未读取"""
+    timer = _timer_of(response)
+    if timer is not None:
+        timer.headers_at = time.perf_counter()
+
+
+async def on_request_async(request: httpx.Request) -> None:
+    """事件钩子（异步客户端）"""
+    on_request(request)
+
+
+async def on_response_async(response: httpx.Response) -> None:
+    """事件钩子（异步客户端）"""
+    on_response(response)
+
+
+def event_hooks() -> dict:
+    """同步客户端的事件钩子配置"""
+    return {"request": [on_request], "response": [on_response]}
+
+
+def async_event_hooks() -> dict:
+    """异步客户端的事件钩子配置"""
+    return {"request": [on_request_async], "response": [on_response_async]}
@@ -2,22 +2,149 @@
 变量管理模块
 
 负责从响应中提取变量，以及将变量注入到请求中。
-"""
 
-import re
-from typing import Any, Dict, List, Optional
+变量按作用域分层：计划全局 → 用例 → 数据行（数据驱动用例）。
+每个用例提取的变量写入自己的作用域，只有它的（直接或间接）下游用例能看到；
+并行的兄弟分支提取同名变量、以及同一依赖链的多次执行都各自持有变量表，互不覆盖，无需加锁。
+"""
 
-from jsonpath_ng import parse as jsonpath_parse
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+from .compiler import INJECT_SECTIONS
 from .http_client import HttpResponse
+from .jsonpath import compile_path
+from .streaming import MISSING
+from .template import compile_template, compile_tree, render_tree
+
+
+class VariableScope:
+    """变量作用域：先查本层，再逐层查上层作用域"""
+
+    __slots__ = ("variables", "parent", "inherited", "_levels")
+
+    def __init__(
+        self,
+        variables: Optional[Dict[str, Any]] = None,
+        parent: Optional["VariableScope"] = None,
+        inherited: Optional[Dict[str, Sequence[Dict[str, Any]]]] = None,
+    ):
+        """
+        Args:
+            variables: 本层的变量表（直接持有，不复制），默认为空
+            parent: 上层作用域
+            inherited: 变量名 → 提取该变量的前置用例的变量表（执行顺序靠后的在前），
+                在本层之后、上层之前依次查找，取第一个实际提取到该变量的
+        """
+        self.variables: Dict[str, Any] = variables if variables is not None else {}
+        self.parent = parent
+        self.inherited: Dict[str, Sequence[Dict[str, Any]]] = inherited or {}
+        # 由内向外的各层 (变量表, 继承的变量表)，查找时不必沿 parent 逐层跳转
+        self._levels: Tuple[Tuple[Dict[str, Any], Dict[str, Sequence[Dict[str, Any]]]], ...] = (
+            ((self.variables, self.inherited),) + (parent._levels if parent is not None else ())
+        )
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """查找变量，内层优先"""
+        for variables, inherited in self._levels:
+            if name in variables:
+                return variables[name]
+            for source in inherited.get(name, ()):
+                if name in source:
+                    return source[name]
+        return default
+
+    def set(self, name: str, value: Any) -> None:
+        """在本层设置变量"""
+        self.variables[name] = value
+
+    def child(
+        self,
+        variables: Optional[Dict[str, Any]] = None,
+        inherited: Optional[Dict[str, Sequence[Dict[str, Any]]]] = None,
+    ) -> "VariableScope":
+        """新建下层作用域"""
+        return VariableScope(variables, self, inherited)
+
+    def flatten(self) -> Dict[str, Any]:
+        """本层可见的全部变量（内层覆盖外层）"""
+        merged: Dict[str, Any] = {}
+        for variables, inherited in reversed(self._levels):
+            for name, sources in inherited.items():
+                source = next((source for source in sources if name in source), None)
+                if source is not None:
+                    merged[name] = source[name]
+            merged.update(variables)
+        return merged
+
+
+def variable_providers(
+    order: List[str],
+    prerequisites: Dict[str, Any],
+    extract_names: Dict[str, List[str]],
+) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+    """
+    计算每个用例可见的提取变量来自哪些上游用例
+
+    用例只能看到其（直接或间接）前置用例提取的变量；多个上游提取同名变量时，
+    按执行顺序从后往前排列：取最靠后的一个，它未提取到时（如 JSONPath 无结果）
+    依次退回更早的上游，与顺序执行时的结果一致。不是前置用例的同名提取不可见。
+
+    Args:
+        order: 执行顺序（依赖图的拓扑序）
+        prerequisites: 用例 ID → 直接前置用例 ID 集合
+        extract_names: 用例 ID → 提取的变量名
+
+    Returns:
+        用例 ID → {变量名: 提取该变量的上游用例 ID（执行顺序靠后的在前）}
+    """
+    position = {tc_id: index for index, tc_id in enumerate(order)}
+    providers: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    for tc_id in order:
+        prereqs = prerequisites[tc_id]
+        if len(prereqs) == 1:
+            (prereq,) = prereqs
+            if not extract_names.get(prereq):
+                # 单一前置且其不提取变量：与前置用例共用同一张表（只读）
+                providers[tc_id] = providers[prereq]
+                continue
+
+        merged: Dict[str, Set[str]] = {}
+        for prereq in prereqs:
+            for name, sources in providers[prereq].items():
+                merged.setdefault(name, set()).update(sources)
+            for name in extract_names.get(prereq, ()):
+                merged.setdefault(name, set()).add(prereq)
+        providers[tc_id] = {
+            name: tuple(sorted(sources, key=position.__getitem__, reverse=True))
+            for name, sources in merged.items()
+        }
+    return providers
 
 
 class VariableManager:
-    """变量管理器"""
+    """变量管理器，get / set 操作计划全局作用域"""
 
     def __init__(self):
         """初始化变量管理器"""
         self._variables: Dict[str, Any] = {}
+        self.root = VariableScope(self._variables)  # 计划全局作用域
+
+    def scope(
+        self,
+        variables: Optional[Dict[str, Any]] = None,
+        inherited: Optional[Dict[str, Sequence[Dict[str, Any]]]] = None,
+    ) -> VariableScope:
+        """
+        新建用例作用域
+
+        Args:
+            variables: 初始变量（可选）
+            inherited: 从上游用例继承的变量，变量名 → 上游用例的变量表（靠后的在前，可选）
+
+        Returns:
+            上层为全局作用域的 VariableScope
+        """
+        return self.root.child(variables, inherited)
 
     @property
     def variables(self) -> Dict[str, Any]:
@@ -51,18 +178,27 @@ class VariableManager:
         """清空所有变量"""
         self._variables.clear()
 
-    def extract(self, response: HttpResponse, extracts: List[dict]) -> Dict[str, Any]:
+    def extract(
+        self,
+        response: HttpResponse,
+        extracts: List[dict],
+        json_paths: Optional[Dict[str, Any]] = None,
+        scope: Optional[VariableScope] = None,
+    ) -> Dict[str, Any]:
         """
         从响应中提取变量
 
         Args:
             response: HTTP 响应
             extracts: 提取规则列表，格式：[{"name": "var_name", "from": "$.json.path"}]
+            json_paths: 预解析的 JSONPath（CompiledPath，可选），未命中时从共享缓存取得
+            scope: 写入的作用域，默认为全局作用域
 
         Returns:
             提取的变量字典
         """
         extracted = {}
+        variables = (scope if scope is not None else self.root).variables
 
         for extract in extracts:
             name = extract.get("name")
@@ -71,13 +207,22 @@ class VariableManager:
             if not name or not json_path:
                 continue
 
+            # 流式读取的响应已在读取时求值
+            if response.path_values is not None and json_path in response.path_values:
+                value = response.path_values[json_path]
+                if value is not MISSING:
+                    variables[name] = value
+                    extracted[name] = value
+                continue
+
             try:
-                jsonpath_expr = jsonpath_parse(json_path)
-                matches = jsonpath_expr.find(response.body)
+                compiled = json_paths.get(json_path) if json_paths else None
+                if compiled is None:
+                    compiled = compile_path(json_path)
+                value = compiled.first(response.body)
 
-                if matches:
-                    value = matches[0].value
-                    self._variables[name] = value
+                if value is not MISSING:
+                    variables[name] = value
                     extracted[name] = value
             except Exception:
                 # 提取失败时跳过
@@ -85,47 +230,43 @@ class VariableManager:
 
         return extracted
 
-    def substitute(self, data: Any) -> Any:
+    def substitute(self, data: Any, scope: Optional[VariableScope] = None) -> Any:
         """
         替换数据中的变量占位符
 
-        支持 {{variable_name}} 格式的占位符
+        支持 {{variable_name}} 格式的占位符。不含占位符的子树原样返回（不复制），
+        调用方不应修改返回值。
+
+        每次调用都会遍历 data 重新执行 compile_tree（字符串模板由 compile_template 缓存，
+        dict / list 的结构不缓存）。同一数据需反复渲染时，应预先 compile_tree 后直接调用
+        render_tree，编译后的计划（CompiledPlan）即是如此。
 
         Args:
             data: 待替换的数据（可以是 str、dict、list）
+            scope: 查找变量的作用域，默认为全局作用域
 
         Returns:
             替换后的数据
         """
-        if isinstance(data, str):
-            return self._substitute_string(data)
-        elif isinstance(data, dict):
-            return {k: self.substitute(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self.substitute(item) for item in data]
-        else:
-            return data
-
-    def _substitute_string(self, text: str) -> str:
-        """替换字符串中的变量占位符"""
-        pattern = r"\{\{(\w+)\}\}"
-
-        def replacer(match):
-            var_name = match.group(1)
-            value = self._variables.get(var_name)
-            if value is not None:
-                return str(value)
-            return match.group(0)  # 未找到变量时保留原样
-
-        return re.sub(pattern, replacer, text)
-
-    def inject_dependencies(self, test_case: dict, dependencies: dict) -> dict:
+        return render_tree(compile_tree(data), (scope if scope is not None else self.root).get)
+
+    def _substitute_string(self, text: str, scope: Optional[VariableScope] = None) -> str:
+        """替换字符串中的变量占位符（未找到的变量保留原样）"""
+        return compile_template(text).render((scope if scope is not None else self.root).get)
+
+    def inject_dependencies(
+        self,
+        test_case: dict,
+        dependencies: dict,
+        scope: Optional[VariableScope] = None,
+    ) -> dict:
         """
         根据依赖配置注入变量到测试用例
 
         Args:
             test_case: 测试用例字典
             dependencies: 依赖配置
+            scope: 查找变量的作用域，默认为全局作用域
 
         Returns:
             注入后的测试用例
@@ -138,40 +279,26 @@ class VariableManager:
 
         inject_rules = dep_config.get("inject", {})
 
-        # 深拷贝测试用例以避免修改原数据
-        import copy
-        test_case = copy.deepcopy(test_case)
+        # 写时复制：只复制被注入的部分，其余部分与原用例共用
+        inputs = None
+        copied = set()
 
         # 处理注入规则
         for key, value_template in inject_rules.items():
-            # 替换模板中的变量
-            value = self.substitute(value_template)
-
             # 解析 key 路径，例如 "headers.Authorization"
             parts = key.split(".")
+            if len(parts) != 2 or parts[0] not in INJECT_SECTIONS:
+                continue
+            section, field = INJECT_SECTIONS[parts[0]], parts[1]
+
+            if inputs is None:
+                inputs = dict(test_case.get("inputs") or {})
+                test_case = {**test_case, "inputs": inputs}
+            if section not in copied:
+                inputs[section] = dict(inputs.get(section) or {})
+                copied.add(section)
 
-            if len(parts) == 2:
-                section, field = parts
-
-                if section == "headers":
-                    if "inputs" not in test_case:
-                        test_case["inputs"] = {}
-                    if "headers" not in test_case["inputs"]:
-                        test_case["inputs"]["headers"] = {}
-                    test_case["inputs"]["headers"][field] = value
-
-                elif section == "body":
-                    if "inputs" not in test_case:
-                        test_case["inputs"] = {}
-                    if "body" not in test_case["inputs"]:
-                        test_case["inputs"]["body"] = {}
-                    test_case["inputs"]["body"][field] = value
-
-                elif section == "params":
-                    if "inputs" not in test_case:
-                        test_case["inputs"] = {}
-                    if "query_params" not in test_case["inputs"]:
-                        test_case["inputs"]["query_params"] = {}
-                    test_case["inputs"]["query_params"][field] = value
+            # 替换模板中的变量
+            inputs[section][field] = self.substitute(value_template, scope)
 
         return test_case
@@ -1,5 +1,6 @@
-"""报告层 - Allure 报告适配器"""
+"""报告层 - Allure 报告适配器、分片结果合并"""
 
 from .allure_adapter import AllureReporter
+from .merge import load_results, merge_results
 
-__all__ = ["AllureReporter"]
+__all__ = ["AllureReporter", "load_results", "merge_results"]
@@ -1,19 +1,29 @@
 """
 Allure 报告适配器模块
 
-将测试结果转换为 Allure 报告格式和 JUnit XML 格式。
+将测试结果转换为 Allure 报告格式、JUnit XML 格式和 Chrome trace 格式。
 """
 
-import json
+import textwrap
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import allure
+import pytest
 from allure_commons.types import AttachmentType
 
+from .. import codec
+from ..executor.retention import json_default
 from ..executor.runner import TestCaseResult, TestPlanResult
+from ..executor.timing import HTTP_PHASES
+
+# JUnit 中响应时间退化的 testcase 的 failure type，读回结果时据此排除
+LATENCY_REGRESSION_TYPE = "LatencyRegression"
+
+# Chrome trace 中用例内各阶段的先后顺序
+_TRACE_PHASES = ("substitute", "throttle") + HTTP_PHASES + ("assert", "extract")
 
 
 class AllureReporter:
@@ -33,7 +43,8 @@ class AllureReporter:
         """
         报告单个测试用例结果
 
-        在 pytest 测试函数中调用此方法来记录 Allure 信息
+        在 pytest 测试函数中调用此方法来记录 Allure 信息。因上游失败而跳过的用例
+        记录完附件后调用 pytest.skip，在 pytest 与 Allure 中均记为 skipped，调用方的测试函数不再继续
 
         Args:
             result: 测试用例执行结果
@@ -49,10 +60,12 @@ class AllureReporter:
         # 添加标签
         allure.dynamic.tag(result.category)
         allure.dynamic.tag(result.endpoint_id)
+        if result.cached:
+            allure.dynamic.tag("cached")
 
         # 添加请求详情
         allure.attach(
-            json.dumps(result.request, indent=2, ensure_ascii=False),
+            codec.dumps(result.request, indent=True),
             name="Request",
             attachment_type=AttachmentType.JSON,
         )
@@ -60,7 +73,7 @@ class AllureReporter:
         # 添加响应详情
         if result.response:
             allure.attach(
-                json.dumps(result.response, indent=2, ensure_ascii=False),
+                codec.dumps(result.response, indent=True, default=json_default),
                 name="Response",
                 attachment_type=AttachmentType.JSON,
             )
@@ -77,15 +90,23 @@ class AllureReporter:
             })
 
         allure.attach(
-            json.dumps(assertions_info, indent=2, ensure_ascii=False),
+            codec.dumps(assertions_info, indent=True),
             name="Assertions",
             attachment_type=AttachmentType.JSON,
         )
 
+        # 添加阶段耗时
+        if result.timings:
+            allure.attach(
+                codec.dumps(result.timings, indent=True),
+                name="Timings",
+                attachment_type=AttachmentType.JSON,
+            )
+
         # 添加提取的变量
         if result.extracted_variables:
             allure.attach(
-                json.dumps(result.extracted_variables, indent=2, ensure_ascii=False),
+                codec.dumps(result.extracted_variables, indent=True),
                 name="Extracted Variables",
                 attachment_type=AttachmentType.JSON,
             )
@@ -98,6 +119,11 @@ class AllureReporter:
                 attachment_type=AttachmentType.TEXT,
             )
 
+        # 因上游失败而跳过的用例在 Allure 中显示为 skipped
+        if result.skipped:
+            allure.dynamic.tag("skipped")
+            pytest.skip(result.skip_reason or "skipped (upstream failed)")
+
     def generate_summary(self, plan_result: TestPlanResult) -> dict:
         """
         生成测试摘要
@@ -108,32 +134,60 @@ class AllureReporter:
         Returns:
             摘要字典
         """
-        summary = {
+        summary = self._summary_header(plan_result)
+        summary["results"] = [self._summary_entry(result) for result in plan_result.results]
+
+        return summary
+
+    def _summary_header(self, plan_result: TestPlanResult) -> dict:
+        """摘要中除 results 以外的字段"""
+        return {
             "plan_name": plan_result.plan_name,
             "total": plan_result.total,
             "passed": plan_result.passed,
             "failed": plan_result.failed,
+            "skipped": plan_result.skipped,
+            "cached": plan_result.cached,
             "pass_rate": f"{plan_result.pass_rate:.1f}%",
             "elapsed_ms": plan_result.elapsed_ms,
             "timestamp": plan_result.timestamp,
-            "results": [],
+            "connections": plan_result.connections,
+            "throttle": plan_result.throttle,
+            "latency": plan_result.latency,
         }
 
-        for result in plan_result.results:
-            summary["results"].append({
-                "id": result.test_case_id,
-                "name": result.test_case_name,
-                "passed": result.passed,
-                "elapsed_ms": result.elapsed_ms,
-                "error": result.error,
-            })
-
-        return summary
+    def _summary_entry(self, result: TestCaseResult) -> dict:
+        """单个用例的摘要"""
+        return {
+            "id": result.test_case_id,
+            "name": result.test_case_name,
+            "endpoint_id": result.endpoint_id,
+            "category": result.category,
+            "passed": result.passed,
+            "skipped": result.skipped,
+            "skip_reason": result.skip_reason,
+            "cached": result.cached,
+            "elapsed_ms": result.elapsed_ms,
+            "timings": result.timings,
+            "error": result.error,
+            "failed_assertions": [
+                {
+                    "type": a.assertion_type,
+                    "expected": a.expected,
+                    "actual": a.actual,
+                    "message": a.message,
+                }
+                for a in result.assertions
+                if not a.passed
+            ],
+        }
 
     def save_results(self, plan_result: TestPlanResult, output_path: Optional[str] = None) -> str:
         """
         保存测试结果到 JSON 文件
 
+        逐条写入用例摘要，不在内存中构造完整的摘要字典。
+
         Args:
             plan_result: 测试计划执行结果
             output_path: 输出文件路径（可选）
@@ -144,10 +198,21 @@ class AllureReporter:
         if output_path is None:
             output_path = self.results_dir / "test_results.json"
 
-        summary = self.generate_summary(plan_result)
+        # 输出格式与 json.dump(summary, indent=2, ensure_ascii=False) 一致
+        header = codec.dumps(self._summary_header(plan_result), indent=True)
 
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+            f.write(header[:-2])
+            f.write(',\n  "results": [')
+
+            first = True
+            for result in plan_result.results:
+                entry = codec.dumps(self._summary_entry(result), indent=True)
+                f.write("\n" if first else ",\n")
+                f.write(textwrap.indent(entry, "    "))
+                first = False
+
+            f.write("]\n}" if first else "\n  ]\n}")
 
         return str(output_path)
 
@@ -169,46 +234,155 @@ class AllureReporter:
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # 响应时间相对基线退化的端点各记为一个失败的 testcase
+        regressions = [e for e in (plan_result.latency or {}).get("endpoints", []) if e["regressed"]]
+
         # 创建 testsuite 元素
         testsuite = ET.Element("testsuite")
         testsuite.set("name", plan_result.plan_name)
-        testsuite.set("tests", str(plan_result.total))
-        testsuite.set("failures", str(plan_result.failed))
+        testsuite.set("tests", str(plan_result.total + len(regressions)))
+        testsuite.set("failures", str(plan_result.failed + len(regressions)))
         testsuite.set("errors", "0")
+        testsuite.set("skipped", str(plan_result.skipped))
         testsuite.set("time", f"{plan_result.elapsed_ms / 1000:.3f}")
         testsuite.set("timestamp", plan_result.timestamp)
 
-        # 添加每个测试用例
-        for result in plan_result.results:
-            testcase = ET.SubElement(testsuite, "testcase")
-            testcase.set("name", result.test_case_name)
-            testcase.set("classname", result.endpoint_id)
-            testcase.set("time", f"{result.elapsed_ms / 1000:.3f}")
+        # 逐个写入 testcase 元素，不在内存中构造完整的 XML 树
+        opening = ET.tostring(testsuite, encoding="unicode", short_empty_elements=False)
+        opening = opening[: -len("</testsuite>")]
 
-            if not result.passed:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+            f.write(opening)
+
+            for result in plan_result.results:
+                testcase = self._junit_testcase(result)
+                ET.indent(testcase, space="  ", level=1)
+                f.write("\n  ")
+                f.write(ET.tostring(testcase, encoding="unicode"))
+
+            for entry in regressions:
+                testcase = ET.Element("testcase")
+                testcase.set("name", f"latency regression: {entry['endpoint_id']}")
+                testcase.set("classname", entry["endpoint_id"])
+                testcase.set("time", f"{entry['median_ms'] / 1000:.3f}")
                 failure = ET.SubElement(testcase, "failure")
-                failure.set("type", "AssertionError")
-
-                # 收集失败的断言信息
-                failed_assertions = [
-                    a for a in result.assertions if not a.passed
-                ]
-                if failed_assertions:
-                    messages = []
-                    for a in failed_assertions:
-                        messages.append(
-                            f"{a.assertion_type}: expected {a.expected}, got {a.actual}"
-                        )
-                    failure.set("message", "; ".join(messages))
-                    failure.text = "\n".join(messages)
-                elif result.error:
-                    failure.set("message", result.error)
-                    failure.text = result.error
-
-        # 写入文件
-        tree = ET.ElementTree(testsuite)
-        ET.indent(tree, space="  ")
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
+                failure.set("type", LATENCY_REGRESSION_TYPE)
+                failure.set("message", _latency_regression_message(entry))
+                ET.indent(testcase, space="  ", level=1)
+                f.write("\n  ")
+                f.write(ET.tostring(testcase, encoding="unicode"))
+
+            f.write("\n</testsuite>")
+
+        return str(output_path)
+
+    def _junit_testcase(self, result: TestCaseResult) -> ET.Element:
+        """构造单个 testcase 元素"""
+        testcase = ET.Element("testcase")
+        testcase.set("name", result.test_case_name)
+        testcase.set("classname", result.endpoint_id)
+        testcase.set("time", f"{result.elapsed_ms / 1000:.3f}")
+
+        if result.skipped:
+            skipped = ET.SubElement(testcase, "skipped")
+            skipped.set("message", result.skip_reason or "skipped (upstream failed)")
+        elif not result.passed:
+            failure = ET.SubElement(testcase, "failure")
+            failure.set("type", "AssertionError")
+
+            # 收集失败的断言信息
+            failed_assertions = [
+                a for a in result.assertions if not a.passed
+            ]
+            if failed_assertions:
+                messages = []
+                for a in failed_assertions:
+                    messages.append(
+                        f"{a.assertion_type}: expected {a.expected}, got {a.actual}"
+                    )
+                failure.set("message", "; ".join(messages))
+                failure.text = "\n".join(messages)
+            elif result.error:
+                failure.set("message", result.error)
+                failure.text = result.error
+
+        return testcase
+
+    def save_trace(self, plan_result: TestPlanResult, output_path: Optional[str] = None) -> str:
+        """
+        保存各用例的阶段耗时为 Chrome trace 格式（可用 chrome://tracing 或 Perfetto 打开）
+
+        每个用例是一个区间，其下按顺序排列 substitute、HTTP 各阶段、assert、extract；
+        时间上重叠的用例分配到不同的行。
+
+        Args:
+            plan_result: 测试计划执行结果
+            output_path: 输出文件路径（可选）
+
+        Returns:
+            输出文件路径
+        """
+        if output_path is None:
+            output_path = self.results_dir / "trace.json"
+        else:
+            output_path = Path(output_path)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 每行最后一个用例的结束时间（微秒）
+        lane_ends: List[float] = []
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+            f.write(codec.dumps({
+                "name": "process_name", "ph": "M", "pid": 1, "tid": 0,
+                "args": {"name": plan_result.plan_name},
+            }))
+
+            for result in plan_result.results:
+                # 沿用缓存的结果不属于本次执行的时间线
+                if result.started_at is None or result.cached:
+                    continue
+
+                start_us = result.started_at * 1_000_000
+                phases = [(name, result.timings[name] * 1000) for name in _TRACE_PHASES if name in result.timings]
+                duration_us = sum(d for name, d in phases if name not in HTTP_PHASES)
+                if "total" in result.timings:
+                    duration_us += result.timings["total"] * 1000
+                else:
+                    duration_us += sum(d for name, d in phases if name in HTTP_PHASES)
+
+                # 放到第一个空闲的行
+                lane = next((i for i, end in enumerate(lane_ends) if end <= start_us), len(lane_ends))
+                if lane == len(lane_ends):
+                    lane_ends.append(0.0)
+                lane_ends[lane] = start_us + duration_us
+
+                events = [{
+                    "name": result.test_case_name, "cat": "case", "ph": "X",
+                    "ts": round(start_us, 3), "dur": round(duration_us, 3), "pid": 1, "tid": lane + 1,
+                    "args": {
+                        "id": result.test_case_id,
+                        "endpoint_id": result.endpoint_id,
+                        "passed": result.passed,
+                        "status_code": (result.response or {}).get("status_code"),
+                        "error": result.error,
+                    },
+                }]
+                offset_us = start_us
+                for name, phase_us in phases:
+                    events.append({
+                        "name": name, "cat": "phase", "ph": "X",
+                        "ts": round(offset_us, 3), "dur": round(phase_us, 3), "pid": 1, "tid": lane + 1,
+                    })
+                    offset_us += phase_us
+
+                for event in events:
+                    f.write(",\n")
+                    f.write(codec.dumps(event, default=str))
+
+            f.write("\n]}\n")
 
         return str(output_path)
 
@@ -225,14 +399,66 @@ class AllureReporter:
         print(f"Total: {plan_result.total}")
         print(f"Passed: {plan_result.passed}")
         print(f"Failed: {plan_result.failed}")
+        if plan_result.skipped:
+            print(f"Skipped: {plan_result.skipped}")
+        if plan_result.cached:
+            print(f"Cached: {plan_result.cached} (not re-run)")
         print(f"Pass Rate: {plan_result.pass_rate:.1f}%")
         print(f"Elapsed: {plan_result.elapsed_ms:.2f}ms")
+        connections = plan_result.connections
+        if connections and connections["requests"]:
+            versions = ", ".join(f"{v} {n}" for v, n in connections["http_versions"].items())
+            print(
+                f"Connections: {connections['connections_opened']} opened, "
+                f"{connections['reused']}/{connections['requests']} requests reused "
+                f"({connections['reuse_rate']:.1f}%) [{versions}]"
+            )
+        throttle = plan_result.throttle
+        if throttle:
+            limits = []
+            if throttle["rate"]:
+                limits.append(f"rate {throttle['rate']:g}/s")
+            if throttle["concurrency_limit"] is not None:
+                lowest = throttle["min_concurrency_reached"]
+                limits.append(
+                    f"concurrency {throttle['concurrency_limit']}/{throttle['max_concurrency']}"
+                    + (f" (lowest {lowest})" if lowest is not None else "")
+                )
+            print(
+                f"Throttle: {', '.join(limits) or 'retries only'}; {throttle['throttled']} throttled responses, "
+                f"{throttle['retries']} retries, waited {throttle['waited_ms']:.0f}ms"
+            )
+            for event in throttle["events"][-5:]:
+                retry_after = f", Retry-After {event['retry_after_s']:g}s" if event["retry_after_s"] else ""
+                limit = f" → limit {event['limit']}" if event["limit"] is not None else ""
+                print(f"  @{event['at_s']:.1f}s {event['reason']} (HTTP {event['status']}){limit}{retry_after}")
+        latency = plan_result.latency
+        if latency:
+            print(
+                f"Latency vs baseline: {len(latency['endpoints'])} endpoints compared, "
+                f"{len(latency['regressions'])} regressed"
+            )
+            for entry in latency["endpoints"]:
+                if entry["regressed"]:
+                    print(f"  ✗ {_latency_regression_message(entry)}")
         print("-" * 60)
 
         for result in plan_result.results:
+            if result.skipped:
+                print(f"  - {result.test_case_name} [{result.skip_reason}]")
+                continue
             status = "✓" if result.passed else "✗"
-            print(f"  {status} {result.test_case_name} ({result.elapsed_ms:.0f}ms)")
+            cached = ", cached" if result.cached else ""
+            print(f"  {status} {result.test_case_name} ({result.elapsed_ms:.0f}ms{cached})")
             if result.error:
                 print(f"      Error: {result.error}")
 
         print("=" * 60 + "\n")
+
+
+def _latency_regression_message(entry: dict) -> str:
+    """基线对比中退化端点的描述"""
+    return (
+        f"{entry['endpoint_id']}: median {entry['baseline_median_ms']:.0f}ms → {entry['median_ms']:.0f}ms "
+        f"(x{entry['slowdown']:.2f}, p={entry['p_value']:.4f}, n={entry['baseline_samples']}/{entry['samples']})"
+    )
@@ -0,0 +1,240 @@
+"""
+结果合并模块
+
+读取各分片输出的 JSON / JUnit XML 结果，合并为一个 TestPlanResult。
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .. import codec
+from ..executor.assertion import AssertionResult
+from ..executor.http_client import ConnectionStats
+from ..executor.runner import TestCaseResult, TestPlanResult
+from .allure_adapter import LATENCY_REGRESSION_TYPE
+
+
+def load_results(path: Union[str, Path]) -> TestPlanResult:
+    """
+    加载单个结果文件
+
+    支持 AllureReporter.save_results 输出的 JSON 和 save_junit_xml 输出的 XML。
+    重建的结果只包含报告所需的字段，不含请求/响应详情。
+
+    Args:
+        path: 结果文件路径
+
+    Returns:
+        TestPlanResult 对象
+    """
+    path = Path(path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"Result file not found: {path}")
+
+    if path.suffix == ".xml":
+        return _load_junit_xml(path)
+    return _load_json(path)
+
+
+def merge_results(
+    plan_results: List[TestPlanResult],
+    execution_order: Optional[List[str]] = None,
+) -> TestPlanResult:
+    """
+    合并多个分片的执行结果
+
+    Args:
+        plan_results: 各分片的执行结果
+        execution_order: 原测试计划的执行顺序（可选），用于恢复用例在报告中的顺序
+
+    Returns:
+        合并后的 TestPlanResult 对象
+    """
+    if not plan_results:
+        raise ValueError("No results to merge")
+
+    results = [r for plan_result in plan_results for r in plan_result.results]
+
+    if execution_order:
+        position = {tc_id: i for i, tc_id in enumerate(execution_order)}
+        results.sort(key=lambda r: position.get(r.test_case_id, len(position)))
+
+    passed = sum(1 for r in results if r.passed)
+    skipped = sum(1 for r in results if r.skipped)
+
+    return TestPlanResult(
+        plan_name=plan_results[0].plan_name,
+        total=len(results),
+        passed=passed,
+        failed=len(results) - passed - skipped,
+        results=results,
+        # 分片并行执行，整体耗时取最慢的分片
+        elapsed_ms=max(r.elapsed_ms for r in plan_results),
+        timestamp=min(r.timestamp for r in plan_results),
+        skipped=skipped,
+        cached=sum(1 for r in results if r.cached),
+        connections=_merge_connections([r.connections for r in plan_results]),
+        throttle=_merge_throttle([r.throttle for r in plan_results]),
+        latency=_merge_latency([r.latency for r in plan_results]),
+    )
+
+
+def _merge_connections(stats: List[Optional[dict]]) -> Optional[dict]:
+    """合并各分片的连接统计（各分片使用独立的连接池，计数直接相加）"""
+    stats = [s for s in stats if s]
+    if not stats:
+        return None
+
+    merged = ConnectionStats()
+    for s in stats:
+        merged.requests += s.get("requests", 0)
+        merged.connections_opened += s.get("connections_opened", 0)
+        merged.tls_handshakes += s.get("tls_handshakes", 0)
+        for version, count in s.get("http_versions", {}).items():
+            merged.http_versions[version] = merged.http_versions.get(version, 0) + count
+    return merged.to_dict()
+
+
+def _merge_throttle(summaries: List[Optional[dict]]) -> Optional[dict]:
+    """合并各分片的限流汇总（计数相加，并发上限取各分片之和，事件按分片顺序保留）"""
+    summaries = [s for s in summaries if s]
+    if not summaries:
+        return None
+    if len(summaries) == 1:
+        return summaries[0]
+
+    def total(key: str) -> Optional[int]:
+        values = [s.get(key) for s in summaries if s.get(key) is not None]
+        return sum(values) if values else None
+
+    return {
+        "base_url": summaries[0].get("base_url"),
+        "rate": total("rate"),
+        "concurrency_limit": total("concurrency_limit"),
+        "max_concurrency": total("max_concurrency"),
+        "min_concurrency_reached": total("min_concurrency_reached"),
+        "throttled": total("throttled") or 0,
+        "retries": total("retries") or 0,
+        "waited_ms": total("waited_ms") or 0,
+        "events": [event for s in summaries for event in s.get("events", [])],
+    }
+
+
+def _merge_latency(comparisons: List[Optional[dict]]) -> Optional[dict]:
+    """合并各分片与基线的对比（各分片执行不同的端点，判定条件相同）"""
+    comparisons = [c for c in comparisons if c]
+    if not comparisons:
+        return None
+    merged = {k: v for k, v in comparisons[0].items() if k not in ("endpoints", "regressions")}
+    merged["endpoints"] = [e for c in comparisons for e in c["endpoints"]]
+    merged["regressions"] = [e for c in comparisons for e in c["regressions"]]
+    return merged
+
+
+def _load_json(path: Path) -> TestPlanResult:
+    """加载 JSON 摘要"""
+    with open(path, "rb") as f:
+        summary = codec.load(f)
+
+    results = []
+    for item in summary.get("results", []):
+        assertions = [
+            AssertionResult(
+                passed=False,
+                assertion_type=a.get("type"),
+                expected=a.get("expected"),
+                actual=a.get("actual"),
+                message=a.get("message", ""),
+            )
+            for a in item.get("failed_assertions", [])
+        ]
+        results.append(TestCaseResult(
+            test_case_id=item["id"],
+            test_case_name=item.get("name", item["id"]),
+            endpoint_id=item.get("endpoint_id"),
+            category=item.get("category", "positive"),
+            passed=item["passed"],
+            request={},
+            response=None,
+            assertions=assertions,
+            extracted_variables={},
+            elapsed_ms=item.get("elapsed_ms", 0),
+            error=item.get("error"),
+            skipped=item.get("skipped", False),
+            skip_reason=item.get("skip_reason"),
+            cached=item.get("cached", False),
+            timings=item.get("timings") or {},
+        ))
+
+    skipped = summary.get("skipped", sum(1 for r in results if r.skipped))
+
+    return TestPlanResult(
+        plan_name=summary.get("plan_name", "Unnamed Test Plan"),
+        total=summary.get("total", len(results)),
+        passed=summary.get("passed", sum(1 for r in results if r.passed)),
+        failed=summary.get("failed", sum(1 for r in results if not r.passed) - skipped),
+        results=results,
+        elapsed_ms=summary.get("elapsed_ms", 0),
+        timestamp=summary.get("timestamp", ""),
+        skipped=skipped,
+        cached=summary.get("cached", sum(1 for r in results if r.cached)),
+        connections=summary.get("connections"),
+        throttle=summary.get("throttle"),
+        latency=summary.get("latency"),
+    )
+
+
+def _load_junit_xml(path: Path) -> TestPlanResult:
+    """
+    加载 JUnit XML（JUnit 中没有用例 ID，以用例名称代替）
+
+    save_junit_xml 为响应时间退化的端点追加的 testcase 不是用例结果，读取时跳过，
+    以免作为基线时被当作该端点的响应时间样本。
+    """
+    root = ET.parse(path).getroot()
+    testsuite = root if root.tag == "testsuite" else root.find("testsuite")
+    if testsuite is None:
+        raise ValueError(f"No testsuite found in {path}")
+
+    results = []
+    for testcase in testsuite.iter("testcase"):
+        name = testcase.get("name", "")
+        failure = testcase.find("failure")
+        if failure is not None and failure.get("type") == LATENCY_REGRESSION_TYPE:
+            continue
+        skipped = testcase.find("skipped")
+        error = None
+        if failure is not None:
+            error = failure.get("message") or failure.text
+
+        results.append(TestCaseResult(
+            test_case_id=name,
+            test_case_name=name,
+            endpoint_id=testcase.get("classname"),
+            category="positive",
+            passed=failure is None and skipped is None,
+            request={},
+            response=None,
+            assertions=[],
+            extracted_variables={},
+            elapsed_ms=float(testcase.get("time", 0)) * 1000,
+            error=error,
+            skipped=skipped is not None,
+            skip_reason=skipped.get("message") if skipped is not None else None,
+        ))
+
+    passed = sum(1 for r in results if r.passed)
+    skipped_count = sum(1 for r in results if r.skipped)
+
+    return TestPlanResult(
+        plan_name=testsuite.get("name", "Unnamed Test Plan"),
+        total=len(results),
+        passed=passed,
+        failed=len(results) - passed - skipped_count,
+        results=results,
+        elapsed_ms=float(testsuite.get("time", 0)) * 1000,
+        timestamp=testsuite.get("timestamp", ""),
+        skipped=skipped_count,
+    )
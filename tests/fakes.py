@@ -0,0 +1,225 @@
+"""
+测试替身
+
+FakeHttpClient / FakeAsyncHttpClient 实现 HttpClient.request 的接口，在内存中模拟样例用户 API，
+不发送网络请求；可按请求设置延迟，用于构造并发执行时的时序。
+LocalServer 是本地回环地址上的真实 HTTP/1.1 服务器，用于需要经过 httpx 传输层的测试。
+"""
+
+import asyncio
+import copy
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src import codec
+from src.executor.http_client import HttpResponse
+from src.executor.runner import TestCaseResult
+
+_USER_PATH = re.compile(r"^/users/(\w+)$")
+
+ENDPOINTS = [
+    {"id": "get_users", "method": "GET", "path": "/users"},
+    {"id": "create_user", "method": "POST", "path": "/users"},
+    {"id": "get_user_by_id", "method": "GET", "path": "/users/{id}"},
+    {"id": "update_user", "method": "PUT", "path": "/users/{id}"},
+]
+
+
+class UserApi:
+    """内存中的用户 API"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users: Dict[int, dict] = {1: {"id": 1, "name": "User 1", "email": "user1@example.com"}}
+        self.next_id = 2
+
+    def handle(self, method: str, path: str, params: Optional[dict], body: Any) -> Tuple[int, Any]:
+        """返回 (状态码, 响应体)"""
+        if path == "/users":
+            if method == "GET":
+                return 200, list(self.users.values())
+            if not isinstance(body, dict) or "email" not in body:
+                return 400, {"error": "email is required"}
+            with self.lock:
+                user = {**body, "id": self.next_id}
+                self.users[self.next_id] = user
+                self.next_id += 1
+            return 201, user
+
+        match = _USER_PATH.match(path)
+        if match:
+            user = self.users.get(int(match.group(1))) if match.group(1).isdigit() else None
+            if user is None:
+                return 404, {}
+            if method == "PUT":
+                user = {**user, **(body or {})}
+            return 200, user
+
+        return 404, {}
+
+
+def make_response(status: int, body: Any) -> HttpResponse:
+    """按响应体构造 HttpResponse（原始字节，惰性解码）"""
+    return HttpResponse(
+        status_code=status,
+        headers={"content-type": "application/json"},
+        elapsed_ms=1.0,
+        content=codec.dumps_bytes(body),
+    )
+
+
+class FakeHttpClient:
+    """同步替身客户端，接口同 HttpClient.request"""
+
+    def __init__(self, api: Optional[UserApi] = None, delay: Optional[Callable[[str, str, Any], float]] = None):
+        """
+        Args:
+            api: 处理请求的替身 API，默认新建 UserApi
+            delay: (method, path, body) → 响应前等待的秒数（可选）
+        """
+        self.api = api or UserApi()
+        self.delay = delay
+        self.requests: List[Tuple[str, str, Any]] = []
+        self.closed = False
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        body: Any = None,
+        stream: Any = None,
+    ) -> HttpResponse:
+        self.requests.append((method, path, body))
+        if self.delay is not None:
+            time.sleep(self.delay(method, path, body))
+        return make_response(*self.api.handle(method, path, params, body))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeAsyncHttpClient(FakeHttpClient):
+    """异步替身客户端，接口同 AsyncHttpClient.request"""
+
+    async def request(self, method, path, headers=None, params=None, body=None, stream=None) -> HttpResponse:
+        self.requests.append((method, path, body))
+        if self.delay is not None:
+            await asyncio.sleep(self.delay(method, path, body))
+        return make_response(*self.api.handle(method, path, params, body))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def make_plan(test_cases: List[dict], dependencies: Optional[dict] = None, **extra: Any) -> dict:
+    """以样例端点构造测试计划，execution_order 为用例顺序"""
+    return {
+        "meta": {"name": "test"},
+        "endpoints": copy.deepcopy(ENDPOINTS),
+        "test_cases": test_cases,
+        "execution_order": [tc["id"] for tc in test_cases],
+        "dependencies": dependencies or {},
+        **extra,
+    }
+
+
+def make_result(tc_id: str, endpoint_id: str = "get_users", passed: bool = True, elapsed_ms: float = 10.0, **extra: Any) -> TestCaseResult:
+    """构造用例结果"""
+    return TestCaseResult(
+        test_case_id=tc_id,
+        test_case_name=extra.pop("test_case_name", tc_id),
+        endpoint_id=endpoint_id,
+        category=extra.pop("category", "positive"),
+        passed=passed,
+        request=extra.pop("request", {}),
+        response=extra.pop("response", None),
+        assertions=extra.pop("assertions", []),
+        extracted_variables=extra.pop("extracted_variables", {}),
+        elapsed_ms=elapsed_ms,
+        **extra,
+    )
+
+
+class LocalServer:
+    """
+    本地 HTTP/1.1 服务器（支持 keep-alive），按路径返回预设的响应体
+
+    路由值为 bytes 时带 Content-Length 返回，为 bytes 列表时按分块传输逐块发送。
+    未配置的路径返回 404。connections 记录服务端接受的 TCP 连接数。
+    """
+
+    def __init__(self, routes: Dict[str, Union[bytes, List[bytes]]], delay: float = 0.0):
+        """
+        Args:
+            routes: 路径 → 响应体
+            delay: 每个请求返回响应前等待的秒数
+        """
+        self.routes = routes
+        self.delay = delay
+        self.connections = 0
+        self.requests: List[Tuple[str, str, bytes]] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("content-length") or 0)
+                body = self.rfile.read(length) if length else b""
+                path = self.path.split("?")[0]
+                with server._lock:
+                    server.requests.append((self.command, self.path, body))
+                if server.delay:
+                    time.sleep(server.delay)
+
+                content = server.routes.get(path, b"{}")
+                self.send_response(200 if path in server.routes else 404)
+                self.send_header("Content-Type", "application/json")
+                if isinstance(content, list):
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    try:
+                        for chunk in content:
+                            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self.wfile.write(b"0\r\n\r\n")
+                    except (BrokenPipeError, ConnectionResetError):
+                        # 客户端提前停止读取并关闭了连接
+                        self.close_connection = True
+                else:
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+    def __enter__(self) -> "LocalServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
@@ -0,0 +1,70 @@
+"""Allure 报告适配器"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("allure_pytest")
+
+from src.reporter import AllureReporter  # noqa: E402
+
+from .fakes import make_result  # noqa: E402
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+_TEST_FILE = '''
+from src.executor.runner import TestCaseResult
+from src.reporter import AllureReporter
+
+
+def _result(skipped):
+    return TestCaseResult(
+        test_case_id="tc", test_case_name="tc", endpoint_id="get_users", category="positive",
+        passed=not skipped, request={}, response=None, assertions=[], extracted_variables={},
+        elapsed_ms=0, skipped=skipped, skip_reason="skipped (upstream failed: login)" if skipped else None,
+    )
+
+
+def test_skipped(tmp_path):
+    AllureReporter(str(tmp_path)).report_test_case(_result(True))
+
+
+def test_passed(tmp_path):
+    AllureReporter(str(tmp_path)).report_test_case(_result(False))
+'''
+
+
+def test_skipped_result_is_recorded_as_allure_status(tmp_path):
+    (tmp_path / "test_report.py").write_text(_TEST_FILE, encoding="utf-8")
+    results_dir = tmp_path / "allure-results"
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", f"--alluredir={results_dir}",
+         f"--rootdir={tmp_path}", str(tmp_path / "test_report.py")],
+        cwd=_ROOT, capture_output=True, text=True,
+    )
+    # 通过 pytest.skip 记为跳过，不依赖 allure-pytest 的内部对象
+    assert "1 passed, 1 skipped" in completed.stdout, completed.stdout + completed.stderr
+
+    results = {}
+    for path in results_dir.glob("*-result.json"):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        # 名称已被 allure.dynamic.title 替换为用例名
+        results[data["fullName"].rsplit("#", 1)[-1]] = data
+
+    assert results["test_skipped"]["status"] == "skipped"
+    assert results["test_skipped"]["statusDetails"]["message"] == "Skipped: skipped (upstream failed: login)"
+    assert {"name": "tag", "value": "skipped"} in results["test_skipped"]["labels"]
+    # 跳过前已记录请求与断言附件
+    assert {a["name"] for a in results["test_skipped"]["attachments"]} >= {"Request", "Assertions"}
+    assert results["test_passed"]["status"] == "passed"
+
+
+def test_skipped_result_skips_the_calling_test(tmp_path):
+    result = make_result("tc", passed=False, skipped=True)
+
+    with pytest.raises(pytest.skip.Exception, match=r"skipped \(upstream failed\)"):
+        AllureReporter(str(tmp_path)).report_test_case(result)
@@ -0,0 +1,139 @@
+"""异步运行器：客户端生命周期、结果顺序、依赖与失败处理"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.executor import AsyncHttpClient, AsyncTestRunner, JsonlResultWriter
+
+from .fakes import FakeAsyncHttpClient, make_plan
+
+_PLAN = make_plan([{"id": "list", "name": "list", "endpoint_id": "get_users", "inputs": {}, "assertions": []}])
+
+
+class TestClientLifecycle:
+    def test_owned_client_is_closed_after_run(self):
+        runner = AsyncTestRunner(concurrency=4)
+        first = runner.http_client
+        runner.run(make_plan([]))
+
+        assert first.client.is_closed
+        # 再次执行时使用新的客户端
+        assert isinstance(runner.http_client, AsyncHttpClient)
+        assert runner.http_client is not first
+        assert not runner.http_client.client.is_closed
+        runner.run(make_plan([]))
+
+    def test_given_client_is_left_open(self):
+        client = FakeAsyncHttpClient()
+        runner = AsyncTestRunner(http_client=client)
+
+        assert runner.run(_PLAN).passed == 1
+        assert not client.closed
+        assert runner.run(_PLAN).passed == 1
+
+    def test_close_client(self):
+        client = FakeAsyncHttpClient()
+        runner = AsyncTestRunner(http_client=client, close_client=True)
+        runner.run(_PLAN)
+
+        assert client.closed
+        assert runner.http_client is client
+
+
+def _case(tc_id, endpoint_id="get_users", inputs=None, extract=None, assertions=None):
+    return {
+        "id": tc_id,
+        "name": tc_id,
+        "endpoint_id": endpoint_id,
+        "inputs": inputs or {},
+        "assertions": assertions or [],
+        "extract": extract or [],
+    }
+
+
+def _chain_plan():
+    """create → check（隐式依赖 {{uid}}），missing 失败 → after_missing，独立的 list"""
+    return make_plan(
+        [
+            _case("create", "create_user", {"body": {"name": "A", "email": "a@example.com"}},
+                  extract=[{"name": "uid", "from": "$.id"}]),
+            _case("missing", "get_user_by_id", {"path_params": {"id": 999}},
+                  assertions=[{"type": "status_code", "expected": 200}]),
+            _case("check", "get_user_by_id", {"path_params": {"id": "{{uid}}"}},
+                  assertions=[{"type": "json_path", "path": "$.name", "operator": "equals", "expected": "A"}]),
+            _case("after_missing"),
+            _case("list"),
+        ],
+        {"after_missing": {"depends_on": "missing"}},
+    )
+
+
+class TestScheduling:
+    def test_results_follow_execution_order(self):
+        random.seed(3)
+        plan = make_plan([_case(f"tc{i}") for i in range(40)])
+        client = FakeAsyncHttpClient(delay=lambda method, path, body: random.uniform(0, 0.01))
+
+        result = AsyncTestRunner(http_client=client, concurrency=8).run(plan)
+
+        assert [r.test_case_id for r in result.results] == plan["execution_order"]
+        assert result.passed == 40
+
+    def test_tasks_are_bounded_by_concurrency(self):
+        in_flight = []
+
+        def delay(method, path, body):
+            # 请求执行时存在的任务数（含运行器自身的任务）
+            in_flight.append(len(asyncio.all_tasks()))
+            return 0.001
+
+        plan = make_plan([_case(f"tc{i}") for i in range(200)])
+        result = AsyncTestRunner(http_client=FakeAsyncHttpClient(delay=delay), concurrency=4).run(plan)
+
+        assert result.passed == 200
+        assert max(in_flight) <= 4 + 1
+
+    def test_dependency_waits_for_upstream(self):
+        order = []
+
+        def delay(method, path, body):
+            order.append((method, path))
+            # create 比其他请求慢，check 仍在它之后才发出
+            return 0.05 if method == "POST" else 0.0
+
+        result = AsyncTestRunner(http_client=FakeAsyncHttpClient(delay=delay), concurrency=4).run(_chain_plan())
+
+        assert order.index(("GET", "/users/2")) > order.index(("POST", "/users"))
+        assert {r.test_case_id: r.passed for r in result.results}["check"]
+
+    def test_failure_skips_dependents(self):
+        client = FakeAsyncHttpClient()
+        result = AsyncTestRunner(http_client=client, concurrency=4).run(_chain_plan())
+
+        outcomes = {r.test_case_id: r for r in result.results}
+        assert [r.test_case_id for r in result.results] == _chain_plan()["execution_order"]
+        assert not outcomes["missing"].passed
+        assert outcomes["after_missing"].skipped
+        assert outcomes["list"].passed and outcomes["check"].passed
+        assert ("GET", "/users", None) in client.requests
+        assert len(client.requests) == 4
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_exception_closes_sink(self, tmp_path, concurrency):
+        sink = JsonlResultWriter(tmp_path / "results.jsonl")
+        runner = AsyncTestRunner(http_client=FakeAsyncHttpClient(), concurrency=concurrency, result_sink=sink)
+
+        async def explode(case, scope, row=None):
+            if case.id == "check":
+                raise RuntimeError("boom")
+            return await original(case, scope, row)
+
+        original = runner._run_test_case_async
+        runner._run_test_case_async = explode
+
+        with pytest.raises(RuntimeError, match="boom"):
+            runner.run(_chain_plan())
+
+        assert sink._file.closed
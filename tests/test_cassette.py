@@ -0,0 +1,192 @@
+"""录制/回放"""
+
+import asyncio
+
+import pytest
+from typer.testing import CliRunner
+
+from src import codec
+from src.cli import app
+from src.executor import AsyncCassetteHttpClient, Cassette, CassetteHttpClient, CassetteMissError
+from src.executor import TestRunner as Runner
+from src.executor.cassette import request_key
+
+from .fakes import FakeAsyncHttpClient, FakeHttpClient, make_plan
+
+
+class _Live(FakeHttpClient):
+    base_url = "http://api.test"
+
+
+class _AsyncLive(FakeAsyncHttpClient):
+    base_url = "http://api.test"
+
+
+def _record(path, calls):
+    """依次发送请求并录制，返回录制时的响应体"""
+    client = CassetteHttpClient(Cassette(path, "record"), _Live())
+    bodies = [client.request(method, url, body=body).body for method, url, body in calls]
+    client.close()
+    return bodies
+
+
+# 同一请求（GET /users）在两次 POST 前后各出现一次，响应不同
+_CALLS = [
+    ("GET", "/users", None),
+    ("POST", "/users", {"name": "a", "email": "a@x"}),
+    ("GET", "/users", None),
+    ("POST", "/users", {"email": "b@x", "name": "b"}),
+    ("GET", "/users", None),
+]
+
+
+class TestReplayOrder:
+    def test_repeated_requests_replay_in_recorded_order(self, tmp_path):
+        recorded = _record(tmp_path / "c.db", _CALLS)
+        assert [len(body) for i, body in enumerate(recorded) if _CALLS[i][0] == "GET"] == [1, 2, 3]
+
+        cassette = Cassette(tmp_path / "c.db", "replay")
+        client = CassetteHttpClient(cassette)
+        replayed = [client.request(method, url, body=body).body for method, url, body in _CALLS]
+
+        assert replayed == recorded
+        assert cassette.summary() == {"mode": "replay", "recorded": 0, "hits": 5, "misses": 0}
+        client.close()
+
+    def test_extra_requests_repeat_the_last_response(self, tmp_path):
+        recorded = _record(tmp_path / "c.db", _CALLS)
+        client = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+        lists = [client.request("GET", "/users").body for _ in range(5)]
+
+        assert lists == [recorded[0], recorded[2], recorded[4], recorded[4], recorded[4]]
+        client.close()
+
+    def test_async_replay_order(self, tmp_path):
+        recorded = _record(tmp_path / "c.db", _CALLS)
+
+        async def replay():
+            client = AsyncCassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+            try:
+                return [(await client.request(m, u, body=b)).body for m, u, b in _CALLS]
+            finally:
+                await client.close()
+
+        assert asyncio.run(replay()) == recorded
+
+    def test_async_record(self, tmp_path):
+        async def record():
+            client = AsyncCassetteHttpClient(Cassette(tmp_path / "c.db", "record"), _AsyncLive())
+            try:
+                return [(await client.request(m, u, body=b)).status_code for m, u, b in _CALLS]
+            finally:
+                await client.close()
+
+        assert asyncio.run(record()) == [200, 201, 200, 201, 200]
+        assert Cassette(tmp_path / "c.db", "replay").base_url == "http://api.test"
+
+
+class TestMatching:
+    def test_key_normalizes_params_and_body(self):
+        assert request_key("get", "/u", {"b": 1, "a": 2}, None) == request_key("GET", "/u", {"a": "2", "b": "1"}, None)
+        assert request_key("POST", "/u", None, {"a": 1, "b": [1]})[0] == request_key("POST", "/u", None, {"b": [1], "a": 1})[0]
+        assert request_key("POST", "/u", None, None)[0] != request_key("POST", "/u", None, {})[0]
+
+    def test_headers_do_not_affect_matching(self, tmp_path):
+        client = CassetteHttpClient(Cassette(tmp_path / "c.db", "record"), _Live())
+        client.request("GET", "/users", headers={"Authorization": "Bearer one"})
+        client.close()
+
+        replay = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+        assert replay.request("GET", "/users", headers={"Authorization": "Bearer two"}).status_code == 200
+        replay.close()
+
+    def test_miss_raises_or_falls_back(self, tmp_path):
+        _record(tmp_path / "c.db", _CALLS[:1])
+
+        strict = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+        with pytest.raises(CassetteMissError, match=r"GET /users/1\b"):
+            strict.request("GET", "/users/1")
+        assert strict.cassette.misses == 1
+        strict.close()
+
+        live = _Live()
+        fallback = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"), live)
+        assert fallback.request("GET", "/users/1").status_code == 200
+        assert live.requests == [("GET", "/users/1", None)]
+        fallback.close()
+
+
+class TestCassetteFile:
+    def test_record_requires_live_client(self, tmp_path):
+        with pytest.raises(ValueError):
+            CassetteHttpClient(Cassette(tmp_path / "c.db", "record"))
+
+    def test_replay_requires_existing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            Cassette(tmp_path / "missing.db", "replay")
+
+    def test_interrupted_recording_keeps_previous_cassette(self, tmp_path):
+        recorded = _record(tmp_path / "c.db", _CALLS[:1])
+
+        # 重新录制但未 close（如进程中断），原有内容不丢失
+        interrupted = Cassette(tmp_path / "c.db", "record")
+        interrupted._conn.close()
+
+        client = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+        assert client.request("GET", "/users").body == recorded[0]
+        client.close()
+
+    def test_close_without_commit_keeps_previous_cassette(self, tmp_path):
+        recorded = _record(tmp_path / "c.db", _CALLS[:1])
+
+        aborted = Cassette(tmp_path / "c.db", "record")
+        aborted.close(commit=False)
+        # 已关闭时再次 close 不做任何操作
+        aborted.close()
+
+        client = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+        assert client.request("GET", "/users").body == recorded[0]
+        client.close()
+
+    def test_execute_closes_cassette_on_invalid_arguments(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("API_BASE_URL", raising=False)
+        recorded = _record(tmp_path / "c.db", _CALLS[:1])
+        plan = make_plan([{"id": "list", "name": "list", "endpoint_id": "get_users", "inputs": {}, "assertions": []}])
+        (tmp_path / "plan.json").write_bytes(codec.dumps_bytes(plan))
+
+        # 没有 base_url：cassette 打开后才能发现，重新录制的事务回滚，文件不被锁住也不被清空
+        result = CliRunner().invoke(app, ["execute", "--plan", "plan.json", "--record", "c.db"])
+
+        assert result.exit_code == 1
+        assert "No base URL" in result.output
+        rerecord = Cassette(tmp_path / "c.db", "record")
+        rerecord.close(commit=False)
+        client = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+        assert client.request("GET", "/users").body == recorded[0]
+        client.close()
+
+
+def test_runner_replay_matches_recording(tmp_path):
+    plan = make_plan(
+        [
+            {"id": "create", "name": "create", "endpoint_id": "create_user",
+             "inputs": {"body": {"name": "a", "email": "a@x"}},
+             "assertions": [{"type": "status_code", "expected": 201}], "extract": [{"name": "uid", "from": "$.id"}]},
+            {"id": "get", "name": "get", "endpoint_id": "get_user_by_id", "inputs": {"path_params": {"id": "{{uid}}"}},
+             "assertions": [{"type": "json_path", "path": "$.name", "operator": "equals", "expected": "a"}]},
+            {"id": "list", "name": "list", "endpoint_id": "get_users", "inputs": {},
+             "assertions": [{"type": "json_path", "path": "$[1].name", "operator": "equals", "expected": "a"}]},
+        ],
+        {"get": {"depends_on": "create"}},
+    )
+    recording = CassetteHttpClient(Cassette(tmp_path / "c.db", "record"), _Live())
+    recorded = Runner(http_client=recording).run(plan)
+    recording.close()
+
+    replaying = CassetteHttpClient(Cassette(tmp_path / "c.db", "replay"))
+    replayed = Runner(http_client=replaying, workers=3).run(plan)
+    replaying.close()
+
+    assert recorded.passed == replayed.passed == 3
+    assert replaying.cassette.summary()["hits"] == 3
@@ -0,0 +1,138 @@
+"""JSON 编解码：orjson 与标准库后端"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from src import codec
+from src.executor.cassette import request_key
+from src.executor.http_client import _build_request_kwargs
+
+BACKENDS = ["orjson", "json"] if codec.orjson is not None else ["json"]
+
+DOCUMENT = {
+    "id": 1,
+    "name": "张三",
+    "ratio": 0.25,
+    "tags": ["a", "b"],
+    "nested": {"ok": True, "none": None, "empty": [], "map": {}},
+    "line": "a b\n\"q\"",
+}
+
+# 请求体：包含两个后端写法不同的浮点数
+REQUEST_BODIES = [
+    {"name": "张三", "email": "a@example.com"},
+    {"amount": 1e16, "small": 1e-7, "ratio": 0.1, "neg": -0.0},
+    [1, 2.5, "x", None, True, {"k": [{}]}],
+    {1: "int key", 2: {"deep": [1e300]}},
+    "plain string",
+    2 ** 70,
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """以指定后端运行（json 时模拟未安装 orjson）"""
+    if request.param == "json":
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+class TestRoundTrip:
+    def test_loads_bytes_and_text(self, backend):
+        data = json.dumps(DOCUMENT, ensure_ascii=False)
+
+        assert codec.loads(data) == DOCUMENT
+        assert codec.loads(data.encode("utf-8")) == DOCUMENT
+        assert codec.loads(bytearray(data.encode("utf-8"))) == DOCUMENT
+
+    def test_loads_rejects_invalid(self, backend):
+        for data in (b"", b"{", b"plain text", b'{"a": 1} x'):
+            with pytest.raises(ValueError):
+                codec.loads(data)
+
+    def test_loads_falls_back_for_stdlib_extensions(self, backend):
+        # orjson 不接受 NaN 与超出 64 位的整数，交给标准库
+        assert codec.loads(b"[NaN]")[0] != codec.loads(b"[NaN]")[0]
+        assert codec.loads(b"[1180591620717411303424]") == [2 ** 70]
+
+    def test_dumps_matches_stdlib(self, backend):
+        expected = json.dumps(DOCUMENT, ensure_ascii=False, separators=(",", ":"))
+
+        assert codec.dumps(DOCUMENT) == expected
+        assert codec.dumps_bytes(DOCUMENT) == expected.encode("utf-8")
+
+    def test_indent_matches_stdlib(self, backend):
+        assert codec.dumps(DOCUMENT, indent=True) == json.dumps(DOCUMENT, ensure_ascii=False, indent=2)
+
+    def test_default(self, backend):
+        assert codec.dumps({"v": object}, default=lambda o: "obj") == '{"v":"obj"}'
+        with pytest.raises(TypeError):
+            codec.dumps({"v": object})
+
+    def test_big_integer(self, backend):
+        assert codec.dumps_bytes([2 ** 70]) == b"[1180591620717411303424]"
+
+    def test_file_helpers(self, backend):
+        buffer = io.BytesIO()
+        codec.dump(DOCUMENT, buffer, indent=True)
+
+        buffer.seek(0)
+        assert codec.load(buffer) == DOCUMENT
+        assert codec.load(io.StringIO(buffer.getvalue().decode("utf-8"))) == DOCUMENT
+
+
+class TestRequestBody:
+    @pytest.mark.parametrize("body", REQUEST_BODIES, ids=range(len(REQUEST_BODIES)))
+    def test_same_bytes_as_httpx_json(self, backend, body):
+        kwargs = _build_request_kwargs({}, "post", "/users", None, None, body)
+
+        assert kwargs["content"] == httpx.Request("POST", "http://api.test/users", json=body).content
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    def test_backends_send_identical_bytes(self, monkeypatch):
+        with_orjson = [codec.dumps_request(body) for body in REQUEST_BODIES]
+        monkeypatch.setattr(codec, "orjson", None)
+
+        assert [codec.dumps_request(body) for body in REQUEST_BODIES] == with_orjson
+
+    def test_cassette_key_does_not_depend_on_backend(self, monkeypatch):
+        keys = [request_key("POST", "/users", {"a": 1}, body) for body in REQUEST_BODIES]
+        monkeypatch.setattr(codec, "orjson", None)
+
+        assert [request_key("POST", "/users", {"a": 1}, body) for body in REQUEST_BODIES] == keys
+
+    def test_nan_is_rejected(self, backend):
+        # 同 httpx 的 json=：非法 JSON 不发送
+        with pytest.raises(ValueError):
+            codec.dumps_request({"v": float("nan")})
+
+    def test_explicit_content_type_is_kept(self):
+        kwargs = _build_request_kwargs({"content-type": "application/vnd.api+json"}, "POST", "/users", None, None, {})
+
+        assert kwargs["headers"] == {"content-type": "application/vnd.api+json"}
+        assert kwargs["content"] == b"{}"
+
+
+class TestBackendSelection:
+    def _backend(self, **env):
+        result = subprocess.run(
+            [sys.executable, "-c", "from src import codec; print(codec.BACKEND)"],
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+
+    @pytest.mark.parametrize("value", ["json", "stdlib", "JSON"])
+    def test_env_forces_stdlib(self, value):
+        assert self._backend(APIFLOW_JSON=value) == "json"
+
+    def test_default_backend(self):
+        assert self._backend(APIFLOW_JSON="") == ("orjson" if codec.orjson is not None else "json")
@@ -0,0 +1,85 @@
+"""测试计划编译与编译缓存"""
+
+import os
+
+import pytest
+
+from src import codec
+from src.executor import compiler, load_compiled_plan
+from src.executor.compiler import plan_cache_path
+
+from .fakes import make_plan
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "user-cache"
+    monkeypatch.setenv(compiler.COMPILE_CACHE_ENV, str(path))
+    return path
+
+
+def _write_plan(path, name="plan"):
+    plan = make_plan([{"id": "list", "name": name, "endpoint_id": "get_users", "inputs": {}, "assertions": []}])
+    path.write_bytes(codec.dumps_bytes(plan))
+    return path
+
+
+def _fail_compile(*args, **kwargs):
+    raise AssertionError("compile_plan should not be called on a cache hit")
+
+
+class TestCompileCache:
+    def test_cache_is_written_to_user_dir(self, tmp_path, cache_dir, monkeypatch):
+        plan_path = _write_plan(tmp_path / "plan.json")
+        compiled = load_compiled_plan(plan_path)
+        cache_path = plan_cache_path(plan_path, compiled.plan_hash)
+
+        assert cache_path.parent == cache_dir
+        assert cache_path.exists()
+        assert not (tmp_path / compiler.CACHE_DIR_NAME).exists()
+        if hasattr(os, "getuid"):
+            assert cache_dir.stat().st_mode & 0o777 == 0o700
+            assert cache_path.stat().st_mode & 0o777 == 0o600
+
+        monkeypatch.setattr(compiler, "compile_plan", _fail_compile)
+        cached = load_compiled_plan(plan_path)
+        assert cached.plan_hash == compiled.plan_hash
+        assert cached.base_dir == str(tmp_path)
+
+    def test_same_name_in_different_dirs(self, tmp_path, cache_dir):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        first = _write_plan(tmp_path / "a" / "plan.json", "a")
+        second = _write_plan(tmp_path / "b" / "plan.json", "b")
+
+        assert load_compiled_plan(first).cases["list"].name == "a"
+        assert load_compiled_plan(second).cases["list"].name == "b"
+        assert load_compiled_plan(first).cases["list"].name == "a"
+        assert len(list(cache_dir.glob("*.ir"))) == 2
+
+    def test_stale_entries_are_removed(self, tmp_path, cache_dir):
+        plan_path = _write_plan(tmp_path / "plan.json", "old")
+        load_compiled_plan(plan_path)
+        _write_plan(plan_path, "new")
+        compiled = load_compiled_plan(plan_path)
+
+        assert list(cache_dir.glob("*.ir")) == [plan_cache_path(plan_path, compiled.plan_hash)]
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+    def test_writable_by_others_is_not_loaded(self, tmp_path, cache_dir, monkeypatch):
+        plan_path = _write_plan(tmp_path / "plan.json")
+        compiled = load_compiled_plan(plan_path)
+        cache_path = plan_cache_path(plan_path, compiled.plan_hash)
+        os.chmod(cache_path, 0o666)
+
+        loaded = []
+        monkeypatch.setattr(compiler.pickle, "load", lambda f: loaded.append(f))
+        load_compiled_plan(plan_path)
+
+        assert loaded == []
+        # 重新编译后写入的新缓存可以再次使用
+        assert cache_path.stat().st_mode & 0o777 == 0o600
+
+    def test_use_cache_false(self, tmp_path, cache_dir):
+        load_compiled_plan(_write_plan(tmp_path / "plan.json"), use_cache=False)
+        assert not cache_dir.exists()
@@ -0,0 +1,80 @@
+"""配置文件读取"""
+
+from pathlib import Path
+
+import pytest
+
+from src.config import http_client_options, load_config
+
+
+class TestLoadConfig:
+    def test_mapping(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text("http_client:\n  max_connections: 10\n", encoding="utf-8")
+        assert load_config(str(path)) == {"http_client": {"max_connections": 10}}
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text("", encoding="utf-8")
+        assert load_config(str(path)) == {}
+
+    def test_invalid_yaml_raises_value_error(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text("a: [1,\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="invalid YAML"):
+            load_config(str(path))
+
+    def test_non_mapping_raises_value_error(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text("- 1\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="expected a mapping"):
+            load_config(str(path))
+
+    def test_missing_file_raises_os_error(self, tmp_path):
+        with pytest.raises(OSError):
+            load_config(str(tmp_path / "missing.yaml"))
+
+
+class TestHttpClientOptions:
+    CONFIG = {
+        "http": {
+            "timeout": 10,
+            "http2": True,
+            "pool": {"max_connections": 50, "max_keepalive_connections": 20, "keepalive_expiry": 5.0},
+        }
+    }
+
+    def test_empty_config(self):
+        assert http_client_options({}) == {}
+        assert http_client_options({"http": None}) == {}
+
+    def test_unset_entries_are_omitted(self):
+        # 配置文件中留空的项读取为 None，不传给客户端，使用客户端的默认值
+        config = {"http": {"timeout": 30, "http2": False, "pool": {"max_connections": None, "keepalive_expiry": None}}}
+
+        assert http_client_options(config) == {"timeout": 30, "http2": False}
+
+    def test_pool_limits_and_http2(self):
+        assert http_client_options(self.CONFIG) == {
+            "timeout": 10,
+            "max_connections": 50,
+            "max_keepalive_connections": 20,
+            "keepalive_expiry": 5.0,
+            "http2": True,
+        }
+
+    def test_overrides(self):
+        options = http_client_options(self.CONFIG, max_connections=8, max_keepalive_connections=None, http2=False)
+
+        assert options["max_connections"] == 8
+        assert options["max_keepalive_connections"] == 20
+        # 命令行显式关闭 HTTP/2 时覆盖配置文件
+        assert options["http2"] is False
+
+    def test_overrides_without_config(self):
+        assert http_client_options({}, keepalive_expiry=1.5, http2=None) == {"keepalive_expiry": 1.5}
+
+    def test_default_config_file(self):
+        # 仓库自带的 config/config.yaml 不改变客户端默认值
+        path = Path(__file__).resolve().parent.parent / "config" / "config.yaml"
+        assert http_client_options(load_config(str(path))) == {"timeout": 30, "http2": False}
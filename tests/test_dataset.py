@@ -0,0 +1,200 @@
+"""数据驱动用例"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.executor import AsyncTestRunner, DagScheduler, Dataset, ExecutionGraph, compile_plan
+from src.executor import TestRunner as Runner
+
+from .fakes import FakeAsyncHttpClient, FakeHttpClient, make_plan
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+class TestDatasetSpec:
+    def test_format_from_suffix(self):
+        assert Dataset.from_spec("data/users.csv") == Dataset(path="data/users.csv", format="csv")
+        assert Dataset.from_spec({"path": "rows.ndjson", "limit": 2}) == Dataset("rows.ndjson", "jsonl", 2)
+
+    @pytest.mark.parametrize("spec", [{}, {"path": "rows.txt"}, {"path": "rows.csv", "limit": -1}, 3])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            Dataset.from_spec(spec)
+
+    def test_relative_path_uses_base_dir(self, tmp_path):
+        assert Dataset("rows.csv").resolve(tmp_path) == tmp_path / "rows.csv"
+        assert Dataset(str(tmp_path / "rows.csv")).resolve("/elsewhere") == tmp_path / "rows.csv"
+
+
+class TestCsvReader:
+    def test_rows_with_bom(self, tmp_path):
+        path = tmp_path / "rows.csv"
+        path.write_bytes("﻿name,age\nalice,30\nbob,\n".encode("utf-8"))
+
+        assert list(Dataset(str(path)).rows()) == [{"name": "alice", "age": "30"}, {"name": "bob", "age": ""}]
+
+    def test_extra_values_report_line(self, tmp_path):
+        path = _write(tmp_path / "rows.csv", "name\nalice\nbob,extra\n")
+
+        with pytest.raises(ValueError, match=r"rows\.csv:3: more values than columns"):
+            list(Dataset(str(path)).rows())
+
+    def test_limits(self, tmp_path):
+        path = _write(tmp_path / "rows.csv", "n\n" + "".join(f"{i}\n" for i in range(10)))
+
+        assert len(list(Dataset(str(path)).rows())) == 10
+        assert len(list(Dataset(str(path), limit=3).rows())) == 3
+        assert len(list(Dataset(str(path), limit=3).rows(limit=5))) == 3
+        assert len(list(Dataset(str(path)).rows(limit=5))) == 5
+        assert list(Dataset(str(tmp_path / "missing.csv")).rows(limit=0)) == []
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(OSError):
+            list(Dataset(str(tmp_path / "missing.csv")).rows())
+
+
+class TestJsonlReader:
+    def test_rows_keep_json_types(self, tmp_path):
+        path = _write(tmp_path / "rows.jsonl", '{"id": 1, "tags": ["a"]}\n\n{"id": null}\n')
+
+        assert list(Dataset(str(path), "jsonl").rows()) == [{"id": 1, "tags": ["a"]}, {"id": None}]
+
+    def test_invalid_json_reports_line(self, tmp_path):
+        path = _write(tmp_path / "rows.jsonl", '{"id": 1}\n{"id": \n')
+
+        with pytest.raises(ValueError, match=r"rows\.jsonl:2: invalid JSON"):
+            list(Dataset(str(path), "jsonl").rows())
+
+    def test_non_object_row(self, tmp_path):
+        path = _write(tmp_path / "rows.jsonl", "[1, 2]\n")
+
+        with pytest.raises(ValueError, match=r"rows\.jsonl:1: expected a JSON object, got list"):
+            list(Dataset(str(path), "jsonl").rows())
+
+    def test_rows_are_read_lazily(self, tmp_path):
+        path = _write(tmp_path / "rows.jsonl", '{"id": 1}\nnot json\n')
+        rows = Dataset(str(path), "jsonl").rows()
+
+        # 格式错误的行在读到时才报错
+        assert next(rows) == {"id": 1}
+        with pytest.raises(ValueError):
+            next(rows)
+
+
+class _LazyRows:
+    """记录数据行的读取进度：每读取一行时，已读取但未完成的行数不应超过并发数"""
+
+    def __init__(self, count):
+        self.count = count
+        self.pulled = 0
+        self.finished = 0
+        self.max_outstanding = 0
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        for index in range(self.count):
+            with self.lock:
+                self.pulled += 1
+                self.max_outstanding = max(self.max_outstanding, self.pulled - self.finished)
+            yield index
+
+    def done(self):
+        with self.lock:
+            self.finished += 1
+
+
+@pytest.mark.parametrize("engine", ["sync", "async"])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_rows_are_expanded_lazily(engine, workers):
+    graph = ExecutionGraph(order=["data", "after"], prerequisites={"data": set(), "after": {"data"}})
+    rows = _LazyRows(50)
+
+    def expand(tc_id):
+        return rows if tc_id == "data" else None
+
+    def execute(tc_id, row=None):
+        rows.done()
+        return (tc_id, row)
+
+    async def execute_async(tc_id, row=None):
+        await asyncio.sleep(0)
+        return execute(tc_id, row)
+
+    scheduler = DagScheduler(graph, workers=workers)
+    if engine == "sync":
+        results = list(scheduler.run(execute, expand=expand))
+    else:
+        async def collect():
+            return [item async for item in scheduler.run_async(execute_async, expand=expand)]
+        results = asyncio.run(collect())
+
+    assert [result for _, result in results] == [("data", i) for i in range(50)] + [("after", None)]
+    assert rows.max_outstanding <= workers
+
+
+def _dataset_plan(dataset, extract=None, dependent=False):
+    case = {
+        "id": "create", "name": "create", "endpoint_id": "create_user",
+        "inputs": {"body": {"name": "{{name}}", "email": "{{email}}"}},
+        "assertions": [{"type": "status_code", "expected": 201}],
+        "extract": extract or [],
+        "dataset": dataset,
+    }
+    cases = [case]
+    if dependent:
+        cases.append({
+            "id": "after", "name": "after", "endpoint_id": "get_users", "inputs": {},
+            "assertions": [{"type": "status_code", "expected": 200}],
+        })
+    return make_plan(cases, {"after": {"depends_on": "create"}} if dependent else None)
+
+
+@pytest.mark.parametrize("make_runner", [
+    lambda: Runner(http_client=FakeHttpClient(), workers=2),
+    lambda: AsyncTestRunner(http_client=FakeAsyncHttpClient(), concurrency=2),
+])
+class TestDataDrivenExecution:
+    def test_one_result_per_row(self, tmp_path, make_runner):
+        path = _write(tmp_path / "users.csv", "name,email\nalice,a@example.com\nbob,\ncarol,c@example.com\n")
+        result = make_runner().run(_dataset_plan(str(path), dependent=True))
+
+        assert [(r.test_case_id, r.passed) for r in result.results] == [
+            ("create[0]", True), ("create[1]", True), ("create[2]", True), ("after", True),
+        ]
+        assert result.results[1].request["body"] == {"name": "bob", "email": ""}
+
+    def test_unreadable_dataset_is_an_error(self, tmp_path, make_runner):
+        result = make_runner().run(_dataset_plan(str(tmp_path / "missing.csv"), dependent=True))
+
+        assert [r.test_case_id for r in result.results] == ["create[0]", "after"]
+        assert "No such file" in result.results[0].error
+        assert result.results[1].skipped
+
+    def test_bad_row_after_good_rows(self, tmp_path, make_runner):
+        path = _write(tmp_path / "users.jsonl", '{"name": "a", "email": "a@x"}\n[]\n')
+        result = make_runner().run(_dataset_plan(str(path)))
+
+        assert [(r.test_case_id, r.passed) for r in result.results] == [("create[0]", True), ("create[1]", False)]
+        assert "expected a JSON object" in result.results[1].error
+
+    def test_row_extractions_stay_in_row(self, tmp_path, make_runner):
+        path = _write(tmp_path / "users.csv", "name,email\nalice,a@example.com\nbob,b@example.com\n")
+        runner = make_runner()
+        result = runner.run(_dataset_plan(str(path), extract=[{"name": "uid", "from": "$.id"}]))
+
+        assert [r.extracted_variables for r in result.results] == [{"uid": 2}, {"uid": 3}]
+        assert runner.variable_manager.variables == {}
+
+
+def test_extract_on_dataset_case_with_dependents_warns():
+    extract = [{"name": "uid", "from": "$.id"}]
+    warning = "create: variables extracted by dataset rows are not visible to dependent test cases"
+
+    assert warning in compile_plan(_dataset_plan("users.csv", extract, dependent=True)).warnings
+    assert warning not in compile_plan(_dataset_plan("users.csv", extract)).warnings
+    assert warning not in compile_plan(_dataset_plan("users.csv", dependent=True)).warnings
@@ -0,0 +1,153 @@
+"""HTTP 客户端：连接池参数、HTTP/2 开关与连接复用统计"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from src.config import http_client_options
+from src.executor.async_http_client import AsyncHttpClient
+from src.executor.http_client import ConnectionStats, HttpClient, _build_limits
+
+from .fakes import LocalServer
+
+ROUTES = {"/users": b"[]"}
+
+
+def _concurrent(client, count):
+    """同时发出 count 个请求"""
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(lambda _: client.request("GET", "/users"), range(count)))
+
+
+class TestPoolLimits:
+    def test_build_limits(self):
+        assert _build_limits(None, None, None) == httpx.Limits()
+        assert _build_limits(5, 2, 1.5) == httpx.Limits(max_connections=5, max_keepalive_connections=2, keepalive_expiry=1.5)
+        assert _build_limits(5, None, None).max_keepalive_connections == httpx.Limits().max_keepalive_connections
+
+    def test_max_connections_limits_concurrent_connections(self):
+        options = http_client_options({"http": {"pool": {"max_connections": 1}}})
+
+        with LocalServer(ROUTES, delay=0.05) as server:
+            client = HttpClient(base_url=server.base_url, **options)
+            try:
+                responses = _concurrent(client, 4)
+            finally:
+                client.close()
+
+        assert [r.status_code for r in responses] == [200] * 4
+        assert server.connections == 1
+        assert client.stats.connections_opened == 1
+
+    def test_without_limit_concurrent_requests_open_connections(self):
+        with LocalServer(ROUTES, delay=0.05) as server:
+            client = HttpClient(base_url=server.base_url)
+            try:
+                _concurrent(client, 4)
+            finally:
+                client.close()
+
+        assert server.connections == 4
+        assert client.stats.connections_opened == 4
+
+    def test_no_keepalive_opens_a_connection_per_request(self):
+        options = http_client_options({}, max_keepalive_connections=0)
+
+        with LocalServer(ROUTES) as server:
+            client = HttpClient(base_url=server.base_url, **options)
+            try:
+                for _ in range(3):
+                    client.request("GET", "/users")
+            finally:
+                client.close()
+
+        assert server.connections == 3
+        assert client.stats.to_dict() == {
+            "requests": 3, "connections_opened": 3, "reused": 0, "reuse_rate": 0.0,
+            "tls_handshakes": 0, "http_versions": {"HTTP/1.1": 3},
+        }
+
+
+class TestHttp2:
+    def test_requires_h2(self, monkeypatch):
+        # sys.modules 中为 None 时 import 抛出 ImportError，模拟未安装 h2
+        monkeypatch.setitem(sys.modules, "h2", None)
+
+        with pytest.raises(ImportError, match="httpx\\[http2\\]"):
+            HttpClient(base_url="http://api.test", **http_client_options({"http": {"http2": True}}))
+        with pytest.raises(ImportError, match="httpx\\[http2\\]"):
+            AsyncHttpClient(base_url="http://api.test", http2=True)
+
+    def test_disabled_by_default(self):
+        client = HttpClient(base_url="http://api.test", **http_client_options({"http": {"http2": False}}))
+        client.close()
+
+        assert client.http2 is False
+
+    def test_plain_http_falls_back_to_http1(self):
+        pytest.importorskip("h2")
+
+        with LocalServer(ROUTES) as server:
+            client = HttpClient(base_url=server.base_url, http2=True)
+            try:
+                client.request("GET", "/users")
+            finally:
+                client.close()
+
+        # 未经 TLS 协商时使用 HTTP/1.1
+        assert client.stats.http_versions == {"HTTP/1.1": 1}
+
+
+class TestConnectionStats:
+    def test_keepalive_reuse_matches_server_connections(self):
+        with LocalServer(ROUTES) as server:
+            client = HttpClient(base_url=server.base_url)
+            try:
+                for _ in range(5):
+                    client.request("GET", "/users")
+            finally:
+                client.close()
+
+        stats = client.stats
+        assert server.connections == stats.connections_opened == 1
+        assert len(server.requests) == stats.requests == 5
+        assert stats.reused == 4
+        assert stats.reuse_rate == 80.0
+        assert stats.http_versions == {"HTTP/1.1": 5}
+
+    def test_async_client(self):
+        async def run(base_url):
+            client = AsyncHttpClient(base_url=base_url, max_connections=2)
+            try:
+                await asyncio.gather(*(client.request("GET", "/users") for _ in range(6)))
+            finally:
+                await client.close()
+            return client.stats
+
+        with LocalServer(ROUTES, delay=0.02) as server:
+            stats = asyncio.run(run(server.base_url))
+
+        assert stats.requests == 6
+        assert stats.connections_opened == server.connections == 2
+        assert stats.http_versions == {"HTTP/1.1": 6}
+
+    def test_since(self):
+        with LocalServer(ROUTES) as server:
+            client = HttpClient(base_url=server.base_url)
+            try:
+                client.request("GET", "/users")
+                before = client.stats.snapshot()
+                client.request("GET", "/users")
+                client.request("GET", "/users")
+            finally:
+                client.close()
+
+        assert client.stats.since(before) == ConnectionStats(requests=2, connections_opened=0, http_versions={"HTTP/1.1": 2})
+        assert before.requests == 1
+
+    def test_empty(self):
+        assert ConnectionStats().reuse_rate == 0
+        assert ConnectionStats(requests=1, connections_opened=2).reused == 0
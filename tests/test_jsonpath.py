@@ -0,0 +1,188 @@
+"""JSONPath 解析缓存与简单路径求值"""
+
+import itertools
+
+import pytest
+
+from src.executor.jsonpath import CompiledPath, JsonPathCache, PathTrie
+from src.executor.streaming import MISSING
+
+
+class TestJsonPathCache:
+    def test_hit_returns_same_object(self):
+        cache = JsonPathCache(maxsize=4)
+
+        first = cache.get("$.id")
+        second = cache.get("$.id")
+
+        assert second is first
+        assert cache.stats() == {"maxsize": 4, "size": 1, "hits": 1, "misses": 1, "hit_rate": 50.0}
+
+    def test_evicts_least_recently_used(self):
+        cache = JsonPathCache(maxsize=2)
+        a = cache.get("$.a")
+        cache.get("$.b")
+        # 命中 $.a 使其成为最近使用，随后插入 $.c 淘汰 $.b
+        assert cache.get("$.a") is a
+        cache.get("$.c")
+
+        assert cache.stats()["size"] == 2
+        assert cache.get("$.a") is a
+        hits = cache.hits
+        cache.get("$.b")
+        assert cache.hits == hits
+        assert cache.misses == 4
+
+    def test_size_never_exceeds_maxsize(self):
+        cache = JsonPathCache(maxsize=3)
+        for i in range(10):
+            cache.get(f"$.f{i}")
+
+        stats = cache.stats()
+        assert stats["size"] == 3
+        assert stats["misses"] == 10
+        assert stats["hits"] == 0
+        # 只保留最近的三个路径
+        for i in range(7, 10):
+            cache.get(f"$.f{i}")
+        assert cache.hits == 3
+
+    def test_invalid_path_is_not_cached(self):
+        cache = JsonPathCache(maxsize=4)
+
+        for _ in range(2):
+            with pytest.raises(Exception):
+                cache.get("$[")
+
+        assert cache.stats()["size"] == 0
+        assert cache.misses == 2
+        assert cache.hits == 0
+
+    def test_clear_resets_entries_and_counters(self):
+        cache = JsonPathCache(maxsize=4)
+        cache.get("$.a")
+        cache.get("$.a")
+
+        cache.clear()
+
+        assert cache.stats() == {"maxsize": 4, "size": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+
+    def test_hit_rate(self):
+        cache = JsonPathCache()
+        assert cache.stats()["hit_rate"] == 0.0
+        for _ in range(3):
+            cache.get("$.a")
+        cache.get("$.b")
+
+        assert cache.stats()["hit_rate"] == 50.0
+
+    @pytest.mark.parametrize("maxsize", [0, -1])
+    def test_rejects_invalid_maxsize(self, maxsize):
+        with pytest.raises(ValueError):
+            JsonPathCache(maxsize=maxsize)
+
+
+# 覆盖 dict / list / 字符串 / 数字 / None / 空容器等取值情形
+DOCUMENTS = [
+    {"id": 1, "data": {"token": "t", "items": [{"id": 10}, {"id": 20}], "count": 2, "empty": [], "none": None}},
+    [{"id": 1, "tags": ["a", "b"]}, {"id": 2}, 3],
+    {"0": "zero", "data": "text", "count": 5, "items": [[1, 2], {"id": 3}]},
+    "text",
+    42,
+    None,
+    [],
+    {},
+]
+
+PATHS = ["$", "$.id", "$.data", "$.count", "$.items", "$.tags", "$.none", "$.empty", "$[0]", "$[1]", "$[-1]", "$[5]"]
+PATHS += [
+    f"{a}{b}"
+    for a, b in itertools.product(
+        ["$.data", "$.items", "$.count", "$[0]", "$[-1]", "$.data.items", "$.data.count", "$.data.empty"],
+        [".id", ".token", ".tags", "[0]", "[1]", "[-1]", "[-3]", "[0].id", "[1][0]"],
+    )
+]
+
+
+def _first(compiled, data):
+    """CompiledPath.first 的结果，抛出 TypeError 时返回异常类型"""
+    try:
+        return compiled.first(data)
+    except TypeError:
+        return TypeError
+
+
+class TestCompiledPath:
+    def test_paths_are_simple(self):
+        assert all(CompiledPath(path).steps is not None for path in PATHS)
+
+    @pytest.mark.parametrize("data", DOCUMENTS, ids=lambda d: type(d).__name__)
+    def test_matches_jsonpath_ng(self, data):
+        for path in PATHS:
+            compiled = CompiledPath(path)
+            try:
+                matches = compiled.find(data)
+            except TypeError:
+                assert _first(compiled, data) is TypeError, path
+                continue
+
+            expected = matches[0].value if matches else MISSING
+            assert _first(compiled, data) is expected or _first(compiled, data) == expected, path
+
+    def test_non_simple_paths_use_jsonpath_ng(self):
+        compiled = CompiledPath("$.items[*].id")
+
+        assert compiled.steps is None
+        assert compiled.first({"items": [{"id": 1}, {"id": 2}]}) == 1
+        assert compiled.first({"items": []}) is MISSING
+
+
+class TestPathTrie:
+    @pytest.mark.parametrize("data", DOCUMENTS, ids=lambda d: type(d).__name__)
+    def test_matches_compiled_first(self, data):
+        compiled = [CompiledPath(path) for path in PATHS]
+
+        values = PathTrie(compiled).evaluate(data)
+
+        for path in compiled:
+            expected = _first(path, data)
+            if expected is TypeError:
+                # 出错的路径不在结果中，由调用方单独求值得到同样的异常
+                assert path.path not in values, path.path
+            else:
+                assert values[path.path] is expected or values[path.path] == expected, path.path
+
+    @pytest.mark.parametrize("data", DOCUMENTS, ids=lambda d: type(d).__name__)
+    def test_single_path_tries(self, data):
+        # 共享前缀不影响结果：每个路径单独构造前缀树也应得到相同的值
+        combined = PathTrie([CompiledPath(path) for path in PATHS]).evaluate(data)
+        for path in PATHS:
+            alone = PathTrie([CompiledPath(path)]).evaluate(data)
+            assert alone == {key: value for key, value in combined.items() if key == path}, path
+
+    def test_error_does_not_propagate_to_descendants(self):
+        trie = PathTrie([CompiledPath("$.count[0]"), CompiledPath("$.count[0].id"), CompiledPath("$.count")])
+
+        values = trie.evaluate({"count": 5})
+
+        assert values == {"$.count": 5}
+        with pytest.raises(TypeError):
+            CompiledPath("$.count[0]").first({"count": 5})
+        with pytest.raises(TypeError):
+            CompiledPath("$.count[0].id").first({"count": 5})
+
+    def test_dict_is_not_indexed(self):
+        values = PathTrie([CompiledPath("$[0]"), CompiledPath("$.data[0]")]).evaluate({"0": 1, "data": {"0": 2}})
+
+        assert values == {"$[0]": MISSING, "$.data[0]": MISSING}
+
+    def test_non_simple_paths_are_ignored(self):
+        trie = PathTrie([CompiledPath("$.items[*].id"), CompiledPath("$..id")])
+
+        assert not trie
+        assert trie.evaluate({"items": [{"id": 1}]}) == {}
+
+    def test_root_path(self):
+        data = {"id": 1}
+
+        assert PathTrie([CompiledPath("$")]).evaluate(data) == {"$": data}
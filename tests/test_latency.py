@@ -0,0 +1,178 @@
+"""响应时间预算、Mann-Whitney U 检验与基线对比"""
+
+import pytest
+
+from src.executor import AssertionEngine, LatencyBudgets, compare_latency
+from src.executor import latency as latency_module
+from src.executor.http_client import HttpResponse
+from src.executor.latency import mann_whitney_u
+
+from .fakes import make_result
+
+
+def _response(elapsed_ms):
+    return HttpResponse(status_code=200, headers={}, elapsed_ms=elapsed_ms, content=b"{}")
+
+
+class TestLatencyBudgets:
+    def test_endpoint_budget_overrides_default(self):
+        budgets = LatencyBudgets(default=500, endpoints={"get_users": 100})
+
+        assert budgets.budget("get_users") == 100
+        assert budgets.budget("create_user") == 500
+        assert budgets.apply("get_users", [{"type": "status_code", "expected": 200}]) == [
+            {"type": "status_code", "expected": 200},
+            {"type": "latency", "operator": "less_than", "expected": 100},
+        ]
+        assert budgets.apply("create_user", [])[-1]["expected"] == 500
+
+    def test_without_default_only_listed_endpoints(self):
+        budgets = LatencyBudgets(endpoints={"get_users": 100})
+        assertions = [{"type": "status_code", "expected": 200}]
+
+        assert budgets.apply("create_user", assertions) is assertions
+        assert budgets.budget("create_user") is None
+
+    def test_case_latency_assertion_wins(self):
+        budgets = LatencyBudgets(default=500)
+        assertions = [{"type": "latency", "operator": "less_than", "expected": 50}]
+
+        assert budgets.apply("get_users", assertions) is assertions
+
+    def test_apply_does_not_mutate_case_assertions(self):
+        budgets = LatencyBudgets(default=500)
+        assertions = []
+
+        budgets.apply("get_users", assertions)
+
+        assert assertions == []
+
+    def test_truthiness(self):
+        assert not LatencyBudgets()
+        assert LatencyBudgets(default=0)
+        assert LatencyBudgets(endpoints={"get_users": 100})
+
+
+class TestMannWhitneyU:
+    def test_exact_fully_separated(self):
+        # 3 + 3 个样本完全分离：P(U >= 9) = 1 / C(6, 3)
+        u, p = mann_whitney_u([1, 2, 3], [4, 5, 6])
+
+        assert u == 9
+        assert p == pytest.approx(1 / 20)
+
+    def test_exact_tail(self):
+        # n1 = n2 = 4 时 U 的计数分布 1,1,2,3,5,5,7,7,8,7,7,5,5,3,2,1,1（共 70）
+        u, p = mann_whitney_u([1, 2, 3, 4], [3.5, 5, 6, 7])
+
+        assert u == 15
+        assert p == pytest.approx(2 / 70)
+
+    def test_exact_no_difference_direction(self):
+        # current 更快时单侧 p 值接近 1
+        u, p = mann_whitney_u([4, 5, 6], [1, 2, 3])
+
+        assert u == 0
+        assert p == pytest.approx(1.0)
+
+    def test_normal_approximation_with_ties(self):
+        # 秩：10→1，20×3→3，30×2→5.5，40→7，50→8；U = 23.5 - 10 = 13.5
+        # 方差 = 16 / 12 × (9 - 30 / 56)，z = (13.5 - 8 - 0.5) / sqrt(方差) ≈ 1.4884
+        u, p = mann_whitney_u([10, 20, 20, 30], [20, 30, 40, 50])
+
+        assert u == 13.5
+        assert p == pytest.approx(0.06833, abs=1e-4)
+
+    def test_normal_approximation_for_large_samples(self, monkeypatch):
+        monkeypatch.setattr(latency_module, "EXACT_MAX_PAIRS", 0)
+
+        # 方差 = 9 / 12 × 7，z = (9 - 4.5 - 0.5) / sqrt(5.25) ≈ 1.7457
+        u, p = mann_whitney_u([1, 2, 3], [4, 5, 6])
+
+        assert u == 9
+        assert p == pytest.approx(0.04043, abs=1e-4)
+
+    def test_exact_and_approximation_agree_on_larger_samples(self, monkeypatch):
+        baseline = [float(i) for i in range(0, 80, 2)]
+        current = [float(i) + 7.5 for i in range(0, 80, 2)]
+        _, exact = mann_whitney_u(baseline, current)
+        monkeypatch.setattr(latency_module, "EXACT_MAX_PAIRS", 0)
+        _, approx = mann_whitney_u(baseline, current)
+
+        assert approx == pytest.approx(exact, abs=5e-3)
+
+    def test_identical_samples(self):
+        assert mann_whitney_u([5, 5, 5], [5, 5, 5]) == (4.5, 1.0)
+
+    def test_empty_sample(self):
+        with pytest.raises(ValueError):
+            mann_whitney_u([], [1.0])
+
+
+class TestCompareLatency:
+    def test_regression(self):
+        baseline = [make_result(f"b{i}", elapsed_ms=10 + i) for i in range(8)]
+        current = [make_result(f"c{i}", elapsed_ms=30 + i) for i in range(8)]
+
+        comparison = compare_latency(baseline, current)
+
+        assert comparison["regressions"] == ["get_users"]
+        endpoint = comparison["endpoints"][0]
+        assert endpoint["baseline_median_ms"] == 13.5
+        assert endpoint["median_ms"] == 33.5
+        assert endpoint["p_value"] < 0.05
+        assert endpoint["regressed"]
+
+    def test_same_distribution_is_not_a_regression(self):
+        baseline = [make_result(f"b{i}", elapsed_ms=v) for i, v in enumerate([10, 12, 14, 16, 18, 20])]
+        current = [make_result(f"c{i}", elapsed_ms=v) for i, v in enumerate([11, 13, 15, 17, 19, 21])]
+
+        comparison = compare_latency(baseline, current)
+
+        assert comparison["regressions"] == []
+        assert comparison["endpoints"][0]["p_value"] > 0.05
+
+    def test_small_slowdown_is_not_a_regression(self):
+        # 统计显著但中位数只慢 10%，低于 min_slowdown
+        baseline = [make_result(f"b{i}", elapsed_ms=100 + i * 0.1) for i in range(10)]
+        current = [make_result(f"c{i}", elapsed_ms=110 + i * 0.1) for i in range(10)]
+
+        comparison = compare_latency(baseline, current)
+
+        assert comparison["endpoints"][0]["p_value"] < 0.05
+        assert comparison["regressions"] == []
+
+    def test_excluded_samples(self):
+        baseline = [make_result(f"b{i}", elapsed_ms=10) for i in range(3)]
+        current = [
+            make_result("c0", elapsed_ms=50),
+            make_result("c1", elapsed_ms=50),
+            make_result("skipped", elapsed_ms=50, skipped=True),
+            make_result("cached", elapsed_ms=50, cached=True),
+            make_result("error", elapsed_ms=50, error="timeout"),
+            make_result("other", endpoint_id="create_user", elapsed_ms=50),
+        ]
+
+        # get_users 只剩两个有效样本，create_user 没有基线
+        assert compare_latency(baseline, current)["endpoints"] == []
+        assert compare_latency(baseline, current, min_samples=2)["endpoints"][0]["samples"] == 2
+
+
+class TestLatencyAssertion:
+    def test_under_budget_passes(self):
+        result = AssertionEngine().check(_response(42.4), {"type": "latency", "operator": "less_than", "expected": 100})
+
+        assert result.passed
+        assert result.actual == 42.4
+
+    def test_over_budget_fails(self):
+        result = AssertionEngine().check(_response(150.0), {"type": "latency", "expected": 100})
+
+        assert not result.passed
+        assert result.message == "Latency: expected < 100ms, got 150ms"
+
+    def test_invalid_budget_fails(self):
+        result = AssertionEngine().check(_response(1.0), {"type": "latency", "expected": "fast"})
+
+        assert not result.passed
+        assert result.message == "Latency: invalid budget 'fast'"
@@ -0,0 +1,143 @@
+"""压测：时长解析、延迟直方图与到达统计"""
+
+import math
+import random
+
+import pytest
+
+from src.executor import LoadRunner, parse_duration
+from src.executor.load import LatencyHistogram
+
+from .fakes import FakeHttpClient, make_plan
+
+
+def _case(tc_id, endpoint_id="get_users", inputs=None, extract=None):
+    return {
+        "id": tc_id,
+        "name": tc_id,
+        "endpoint_id": endpoint_id,
+        "inputs": inputs or {},
+        "assertions": [{"type": "status_code", "expected": 201 if endpoint_id == "create_user" else 200}],
+        "extract": extract or [],
+    }
+
+
+def _chain_plan():
+    """依赖链 {create, detail}（2 个请求）与独立用例 list（1 个请求）"""
+    return make_plan([
+        _case("create", "create_user", {"body": {"name": "n", "email": "e@example.com"}},
+              extract=[{"name": "uid", "from": "$.id"}]),
+        _case("detail", "get_user_by_id", {"path_params": {"id": "{{uid}}"}}),
+        _case("list"),
+    ])
+
+
+class TestParseDuration:
+    @pytest.mark.parametrize("text, expected", [
+        ("30", 30.0),
+        ("1.5", 1.5),
+        ("30s", 30.0),
+        ("250ms", 0.25),
+        ("5m", 300.0),
+        ("1h", 3600.0),
+        ("1h30m", 5400.0),
+        ("1m0.5s", 60.5),
+        (" 2s ", 2.0),
+    ])
+    def test_valid(self, text, expected):
+        assert parse_duration(text) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("text", ["", "s", "abc", "5x", "5 m", "1h 30m", "-5s", "5s!", "m5"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError, match="Invalid duration"):
+            parse_duration(text)
+
+
+class TestLatencyHistogram:
+    def _exact(self, values, p):
+        ordered = sorted(values)
+        return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+    @pytest.mark.parametrize("values", [
+        [float(v) for v in range(1, 10001)],
+        [random.Random(7).lognormvariate(3, 1.2) for _ in range(20000)],
+        [0.05 + i * 0.001 for i in range(500)],
+    ], ids=["uniform", "lognormal", "sub-ms"])
+    def test_percentile_within_one_percent(self, values):
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for p in (1, 50, 90, 95, 99, 99.9, 100):
+            assert histogram.percentile(p) == pytest.approx(self._exact(values, p), rel=0.01), p
+        assert histogram.count == len(values)
+        assert histogram.max_ms == max(values)
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(99) == 0.0
+        assert histogram.mean == 0.0
+        assert histogram.buckets() == []
+
+    def test_buckets(self):
+        histogram = LatencyHistogram()
+        for value in (0.001, 10.0, 10.0, 100.0):
+            histogram.record(value)
+
+        buckets = histogram.buckets()
+        assert sum(count for _, count in buckets) == 4
+        assert buckets[0] == [0.01, 1]
+        assert [count for _, count in buckets[1:]] == [2, 1]
+
+
+class TestLoadRunner:
+    def test_sent_matches_arrivals(self):
+        client = FakeHttpClient()
+
+        result = LoadRunner(http_client=client, rps=100, duration_s=0.1).run(_chain_plan())
+
+        # 到达时刻 0/20/30/50/60/80/90ms，依次为 2、1、2、1、2、1、2 个请求
+        assert result.sent == 11
+        assert result.dropped == 0
+        assert result.failed == 0
+        assert len(client.requests) == 11
+        assert {endpoint_id: stats.requests for endpoint_id, stats in result.endpoints.items()} == {
+            "create_user": 4, "get_user_by_id": 4, "get_users": 3,
+        }
+        assert all(stats.errors == 0 for stats in result.endpoints.values())
+
+    def test_arrivals_over_max_in_flight_are_dropped(self):
+        client = FakeHttpClient(delay=lambda method, path, body: 0.3)
+        plan = make_plan([_case("list")])
+
+        result = LoadRunner(http_client=client, rps=100, duration_s=0.1, max_in_flight=1).run(plan)
+
+        # 第一次到达占住唯一的在途名额直到发压结束，其余 9 次到达被丢弃
+        assert (result.sent, result.dropped) == (1, 9)
+        assert result.endpoints["get_users"].requests == 1
+        assert result.to_dict()["dropped"] == 9
+
+    def test_chain_exception_is_counted(self, monkeypatch):
+        runner = LoadRunner(http_client=FakeHttpClient(), rps=100, duration_s=0.1)
+
+        def fail(plan):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(runner._runner, "run", fail)
+        result = runner.run(_chain_plan())
+
+        assert result.sent == 11
+        assert result.failed == 11
+        assert result.first_error == "RuntimeError: boom"
+        assert result.endpoints == {}
+        assert result.to_dict()["failed"] == 11
+
+    def test_empty_plan(self):
+        with pytest.raises(ValueError):
+            LoadRunner(http_client=FakeHttpClient(), duration_s=0.1).run(make_plan([]))
+
+    def test_rps_must_be_positive(self):
+        with pytest.raises(ValueError):
+            LoadRunner(http_client=FakeHttpClient(), rps=0)
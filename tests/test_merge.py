@@ -0,0 +1,147 @@
+"""结果读取与合并"""
+
+import pytest
+
+from src.executor import compare_latency
+from src.executor.runner import TestPlanResult as PlanResult
+from src.reporter import AllureReporter, load_results, merge_results
+
+from .fakes import make_result
+
+
+def _plan_result(results, **extra):
+    passed = sum(1 for r in results if r.passed)
+    skipped = sum(1 for r in results if r.skipped)
+    return PlanResult(
+        plan_name="plan", total=len(results), passed=passed, failed=len(results) - passed - skipped,
+        results=results, elapsed_ms=100.0, skipped=skipped, **extra,
+    )
+
+
+class TestJunitBaseline:
+    def test_latency_regression_testcases_are_not_results(self, tmp_path):
+        baseline = [make_result(f"b{i}", "get_users", elapsed_ms=10) for i in range(5)]
+        current = [make_result(f"c{i}", "get_users", elapsed_ms=100) for i in range(5)]
+        latency = compare_latency(baseline, current)
+        assert latency["regressions"] == ["get_users"]
+
+        path = AllureReporter(str(tmp_path)).save_junit_xml(
+            _plan_result(current + [make_result("broken", passed=False, error="boom")], latency=latency),
+            str(tmp_path / "junit.xml"),
+        )
+        assert "latency regression: get_users" in (tmp_path / "junit.xml").read_text(encoding="utf-8")
+
+        loaded = load_results(path)
+        results = list(loaded.results)
+
+        assert [r.test_case_id for r in results] == [f"c{i}" for i in range(5)] + ["broken"]
+        assert (loaded.total, loaded.passed, loaded.failed) == (6, 5, 1)
+        # 作为基线时，退化 testcase 的中位数耗时不会混入 get_users 的样本
+        again = compare_latency(results, current)
+        assert again["endpoints"][0]["baseline_samples"] == 5
+        assert again["regressions"] == []
+
+
+class TestMergeResults:
+    def test_restores_execution_order_and_counts(self):
+        first = _plan_result([make_result("c"), make_result("a", passed=False, error="boom")])
+        second = _plan_result([make_result("b", skipped=True, passed=False), make_result("d", cached=True)])
+        first.elapsed_ms, second.elapsed_ms = 120.0, 80.0
+        first.timestamp, second.timestamp = "2026-01-01T00:00:02", "2026-01-01T00:00:01"
+
+        merged = merge_results([first, second], execution_order=["a", "b", "c", "d"])
+
+        assert [r.test_case_id for r in merged.results] == ["a", "b", "c", "d"]
+        assert (merged.total, merged.passed, merged.failed, merged.skipped, merged.cached) == (4, 2, 1, 1, 1)
+        # 分片并行执行：耗时取最慢的分片，开始时间取最早的分片
+        assert merged.elapsed_ms == 120.0
+        assert merged.timestamp == "2026-01-01T00:00:01"
+
+    def test_unknown_ids_go_last_in_shard_order(self):
+        merged = merge_results(
+            [_plan_result([make_result("x"), make_result("b")]), _plan_result([make_result("y"), make_result("a")])],
+            execution_order=["a", "b"],
+        )
+
+        assert [r.test_case_id for r in merged.results] == ["a", "b", "x", "y"]
+
+    def test_without_order_keeps_shard_order(self):
+        merged = merge_results([_plan_result([make_result("b")]), _plan_result([make_result("a")])])
+
+        assert [r.test_case_id for r in merged.results] == ["b", "a"]
+
+    def test_empty(self):
+        with pytest.raises(ValueError):
+            merge_results([])
+
+    def test_connection_and_throttle_stats_are_summed(self):
+        first = _plan_result(
+            [make_result("a")],
+            connections={"requests": 3, "connections_opened": 1, "tls_handshakes": 1, "http_versions": {"HTTP/1.1": 3}},
+            throttle={"base_url": "http://x", "rate": 5, "throttled": 2, "retries": 1, "waited_ms": 10, "events": [1]},
+        )
+        second = _plan_result(
+            [make_result("b")],
+            connections={"requests": 2, "connections_opened": 2, "tls_handshakes": 0, "http_versions": {"HTTP/1.1": 1, "HTTP/2": 1}},
+            throttle={"base_url": "http://x", "rate": 5, "throttled": 0, "retries": 0, "waited_ms": 5, "events": [2]},
+        )
+
+        merged = merge_results([first, second, _plan_result([make_result("c")])])
+
+        assert merged.connections["requests"] == 5
+        assert merged.connections["connections_opened"] == 3
+        assert merged.connections["http_versions"] == {"HTTP/1.1": 4, "HTTP/2": 1}
+        assert merged.throttle["rate"] == 10
+        assert merged.throttle["concurrency_limit"] is None
+        assert (merged.throttle["throttled"], merged.throttle["retries"], merged.throttle["waited_ms"]) == (2, 1, 15)
+        assert merged.throttle["events"] == [1, 2]
+
+    def test_shards_without_stats(self):
+        merged = merge_results([_plan_result([make_result("a")])])
+
+        assert merged.connections is None
+        assert merged.throttle is None
+        assert merged.latency is None
+
+
+class TestLoadResults:
+    def _shard(self):
+        return _plan_result([
+            make_result("a", elapsed_ms=12.5),
+            make_result("b", passed=False, error="boom"),
+            make_result("c", passed=False, skipped=True, skip_reason="dependency a failed"),
+        ])
+
+    def test_json_round_trip(self, tmp_path):
+        path = AllureReporter(str(tmp_path)).save_results(self._shard(), str(tmp_path / "shard.json"))
+
+        loaded = load_results(path)
+
+        assert [r.test_case_id for r in loaded.results] == ["a", "b", "c"]
+        assert (loaded.total, loaded.passed, loaded.failed, loaded.skipped) == (3, 1, 1, 1)
+        assert loaded.results[0].elapsed_ms == 12.5
+        assert loaded.results[1].error == "boom"
+        assert loaded.results[2].skip_reason == "dependency a failed"
+
+    def test_junit_round_trip(self, tmp_path):
+        path = AllureReporter(str(tmp_path)).save_junit_xml(self._shard(), str(tmp_path / "shard.xml"))
+
+        loaded = load_results(path)
+
+        assert [r.test_case_id for r in loaded.results] == ["a", "b", "c"]
+        assert [(r.passed, r.skipped) for r in loaded.results] == [(True, False), (False, False), (False, True)]
+        assert (loaded.total, loaded.passed, loaded.failed, loaded.skipped) == (3, 1, 1, 1)
+
+    def test_merge_loaded_shards(self, tmp_path):
+        reporter = AllureReporter(str(tmp_path))
+        first = reporter.save_results(_plan_result([make_result("b")]), str(tmp_path / "1.json"))
+        second = reporter.save_junit_xml(_plan_result([make_result("a", passed=False, error="x")]), str(tmp_path / "2.xml"))
+
+        merged = merge_results([load_results(first), load_results(second)], execution_order=["a", "b"])
+
+        assert [r.test_case_id for r in merged.results] == ["a", "b"]
+        assert (merged.total, merged.passed, merged.failed) == (2, 1, 1)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_results(tmp_path / "missing.json")
@@ -0,0 +1,106 @@
+"""JSONL 结果流"""
+
+import pytest
+
+from src.executor import AsyncTestRunner, JsonlResultReader, JsonlResultWriter
+from src.executor import TestRunner as Runner
+from src.executor.assertion import AssertionResult
+
+from .fakes import FakeAsyncHttpClient, FakeHttpClient, make_plan, make_result
+
+
+class TestJsonlRoundTrip:
+    def test_results_round_trip(self, tmp_path):
+        results = [
+            make_result(
+                "create", "create_user",
+                request={"method": "POST", "path": "/users", "body": {"name": "张三"}},
+                response={"status_code": 201, "body": {"id": 2, "tags": [1.5, None, True]}},
+                assertions=[AssertionResult(True, "status_code", 201, 201, "ok")],
+                extracted_variables={"uid": 2},
+                timings={"send": 0.1, "ttfb": 2.5},
+                started_at=1700000000.25,
+            ),
+            make_result("failed", passed=False, error="boom", assertions=[
+                AssertionResult(False, "json_path", "a", "b", "expected a, got b"),
+            ]),
+            make_result("skipped", passed=False, skipped=True, skip_reason="skipped (upstream failed: failed)"),
+        ]
+        with JsonlResultWriter(tmp_path / "out" / "results.jsonl") as writer:
+            for result in results:
+                writer.write(result)
+
+        reader = writer.results()
+        assert list(reader) == results
+        # 每次迭代都重新从磁盘读取
+        assert [r.test_case_id for r in reader] == ["create", "failed", "skipped"]
+
+    def test_blank_lines_are_ignored(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        with JsonlResultWriter(path) as writer:
+            writer.write(make_result("a"))
+        path.write_bytes(path.read_bytes() + b"\n\n")
+
+        assert [r.test_case_id for r in JsonlResultReader(path)] == ["a"]
+
+    def test_writer_overwrites(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        for tc_id in ("old", "new"):
+            with JsonlResultWriter(path) as writer:
+                writer.write(make_result(tc_id))
+
+        assert [r.test_case_id for r in JsonlResultReader(path)] == ["new"]
+
+    def test_unserializable_values_fall_back_to_str(self, tmp_path):
+        with JsonlResultWriter(tmp_path / "results.jsonl") as writer:
+            writer.write(make_result("a", extracted_variables={"value": object}))
+
+        (loaded,) = list(writer.results())
+        assert loaded.extracted_variables == {"value": str(object)}
+
+
+def _plan():
+    return make_plan([
+        {"id": "list", "name": "list", "endpoint_id": "get_users", "inputs": {},
+         "assertions": [{"type": "status_code", "expected": 200}]},
+        {"id": "missing", "name": "missing", "endpoint_id": "get_user_by_id", "inputs": {"path_params": {"id": 99}},
+         "assertions": [{"type": "status_code", "expected": 200}]},
+        {"id": "after", "name": "after", "endpoint_id": "get_users", "inputs": {}, "assertions": []},
+    ], {"after": {"depends_on": "missing"}})
+
+
+class TestRunnerSink:
+    def test_sync_runner_streams_results(self, tmp_path):
+        sink = JsonlResultWriter(tmp_path / "results.jsonl")
+        result = Runner(http_client=FakeHttpClient(), result_sink=sink).run(_plan())
+
+        assert isinstance(result.results, JsonlResultReader)
+        assert (result.total, result.passed, result.failed, result.skipped) == (3, 1, 1, 1)
+        assert [(r.test_case_id, r.passed, r.skipped) for r in result.results] == [
+            ("list", True, False), ("missing", False, False), ("after", False, True),
+        ]
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_sync_runner_closes_sink_on_error(self, tmp_path, workers):
+        sink = JsonlResultWriter(tmp_path / "results.jsonl")
+        runner = Runner(http_client=FakeHttpClient(), result_sink=sink, workers=workers)
+
+        def explode(case, scope, row=None):
+            raise RuntimeError("boom")
+
+        runner._run_test_case = explode
+        with pytest.raises(RuntimeError, match="boom"):
+            runner.run(_plan())
+
+        assert sink._file.closed
+
+    def test_async_runner_matches_in_memory_results(self, tmp_path):
+        streamed = AsyncTestRunner(
+            http_client=FakeAsyncHttpClient(), result_sink=JsonlResultWriter(tmp_path / "results.jsonl")
+        ).run(_plan())
+        in_memory = AsyncTestRunner(http_client=FakeAsyncHttpClient()).run(_plan())
+
+        def comparable(results):
+            return [(r.test_case_id, r.passed, r.response and r.response["status_code"]) for r in results]
+
+        assert comparable(streamed.results) == comparable(in_memory.results)
@@ -0,0 +1,107 @@
+"""--only-changed 的结果缓存"""
+
+from src.executor import ResultsCache, compile_plan, results_cache_path
+from src.executor import TestRunner as Runner
+
+from .fakes import FakeHttpClient, make_plan
+
+BASE_URL = "http://api.test"
+
+
+def _case(tc_id, endpoint_id="get_users", inputs=None, expected=200, extract=None):
+    return {
+        "id": tc_id, "name": tc_id, "endpoint_id": endpoint_id, "inputs": inputs or {},
+        "assertions": [{"type": "status_code", "expected": expected}], "extract": extract or [],
+    }
+
+
+def _plan():
+    """login → create → check；list 独立；broken 依赖 login 且总是失败"""
+    return make_plan(
+        [
+            _case("login", extract=[{"name": "first", "from": "$[0].id"}]),
+            _case("create", "create_user", {"body": {"name": "a", "email": "a@x"}}, 201, [{"name": "uid", "from": "$.id"}]),
+            _case("check", "get_user_by_id", {"path_params": {"id": "{{uid}}"}}),
+            _case("list"),
+            _case("broken", "get_user_by_id", {"path_params": {"id": 999}}),
+        ],
+        {"create": {"depends_on": "login"}, "broken": {"depends_on": "login"}},
+    )
+
+
+def _run_and_cache(tmp_path, plan, cached=None):
+    """执行计划并把结果写入缓存，返回 (执行的请求, 结果)"""
+    compiled = compile_plan(plan)
+    client = FakeHttpClient()
+    result = Runner(http_client=client).run(compiled, cached)
+    results = list(result.results)
+    cache = ResultsCache.load(tmp_path / "results.json", BASE_URL)
+    cache.update(compiled, results)
+    cache.save()
+    return client.requests, results
+
+
+def _reusable(tmp_path, plan):
+    return ResultsCache.load(tmp_path / "results.json", BASE_URL).reusable(compile_plan(plan))
+
+
+class TestReusable:
+    def test_unchanged_passed_cases_are_reused(self, tmp_path):
+        _run_and_cache(tmp_path, _plan())
+        reusable = _reusable(tmp_path, _plan())
+
+        # broken 上次失败，连同其前置用例 login 都要重跑
+        assert list(reusable) == ["create", "check", "list"]
+        assert all(r.cached and r.passed for r in reusable.values())
+
+    def test_changed_case_reruns_with_prerequisites_and_dependents(self, tmp_path):
+        _run_and_cache(tmp_path, _plan())
+        plan = _plan()
+        plan["test_cases"][1]["inputs"]["body"]["name"] = "b"  # create
+
+        # create 变化：前置 login 重跑以重新提取变量，下游 check 的指纹随之变化
+        assert list(_reusable(tmp_path, plan)) == ["list"]
+
+    def test_changed_endpoint_invalidates_its_cases(self, tmp_path):
+        _run_and_cache(tmp_path, _plan())
+        plan = _plan()
+        plan["endpoints"][2]["path"] = "/users/{id}/"  # get_user_by_id
+
+        assert list(_reusable(tmp_path, plan)) == ["list"]
+
+    def test_second_run_only_executes_stale_cases(self, tmp_path):
+        _run_and_cache(tmp_path, _plan())
+        cached = _reusable(tmp_path, _plan())
+        requests, results = _run_and_cache(tmp_path, _plan(), cached)
+
+        assert [path for _, path, _ in requests] == ["/users", "/users/999"]
+        assert [(r.test_case_id, r.cached) for r in results] == [
+            ("login", False), ("create", True), ("check", True), ("list", True), ("broken", False),
+        ]
+        # 缓存中保存的是结论本身，不带 cached 标记
+        assert _reusable(tmp_path, _plan())["create"].cached
+
+    def test_removed_cases_are_dropped(self, tmp_path):
+        _run_and_cache(tmp_path, _plan())
+        plan = _plan()
+        plan["test_cases"] = [tc for tc in plan["test_cases"] if tc["id"] != "list"]
+        plan["execution_order"].remove("list")
+        _run_and_cache(tmp_path, plan)
+
+        assert "list" not in ResultsCache.load(tmp_path / "results.json", BASE_URL).entries
+
+
+class TestCacheFile:
+    def test_base_url_mismatch_discards_cache(self, tmp_path):
+        _run_and_cache(tmp_path, _plan())
+        assert ResultsCache.load(tmp_path / "results.json", "http://other.test").entries == {}
+
+    def test_missing_or_corrupt_file(self, tmp_path):
+        assert ResultsCache.load(tmp_path / "missing.json", BASE_URL).entries == {}
+        (tmp_path / "bad.json").write_text("{not json", encoding="utf-8")
+        assert ResultsCache.load(tmp_path / "bad.json", BASE_URL).entries == {}
+
+    def test_path_per_shard(self, tmp_path):
+        plan_path = tmp_path / "plan.json"
+        assert results_cache_path(plan_path) == tmp_path / ".apiflow-cache" / "plan.json.results.json"
+        assert results_cache_path(plan_path, "2-of-4").name == "plan.json.shard-2-of-4.results.json"
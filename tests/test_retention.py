@@ -0,0 +1,86 @@
+"""响应保留策略"""
+
+import pytest
+
+from src.executor import JsonlResultWriter, RetentionPolicy
+from src.executor import TestRunner as Runner
+from src.executor.http_client import HttpResponse
+from src.executor.retention import LazyBody
+
+from .fakes import FakeHttpClient, make_plan, make_result
+
+
+def _response(content=b'{"id": 1, "name": "\xe5\xbc\xa0\xe4\xb8\x89"}'):
+    return HttpResponse(status_code=200, headers={"content-type": "application/json"}, elapsed_ms=5.0, content=content)
+
+
+class TestResponseInfo:
+    def test_full_keeps_passed_body_undecoded(self):
+        response = _response()
+        info = RetentionPolicy().response_info(response, passed=True)
+
+        assert isinstance(info["body"], LazyBody)
+        assert not response.decoded
+        assert info["body"].decode() == {"id": 1, "name": "张三"}
+        assert info["body"] == {"id": 1, "name": "张三"}
+
+    def test_full_reuses_decoded_body(self):
+        response = _response()
+        body = response.body
+        assert RetentionPolicy().response_info(response, passed=True)["body"] is body
+
+    def test_failed_body_is_decoded(self):
+        info = RetentionPolicy().response_info(_response(), passed=False)
+        assert info["body"] == {"id": 1, "name": "张三"}
+        assert not isinstance(info["body"], LazyBody)
+
+    def test_non_json_body(self):
+        body = RetentionPolicy().response_info(_response(b"plain text"), passed=True)["body"]
+        assert body.decode() == "plain text"
+        assert RetentionPolicy().response_info(_response(b""), passed=True)["body"].decode() == ""
+
+    def test_other_modes(self):
+        content = b'{"data": "' + b"x" * 100 + b'"}'
+        assert "body" not in RetentionPolicy("failures").response_info(_response(content), passed=True)
+
+        truncated = RetentionPolicy("truncate", max_bytes=10).response_info(_response(content), passed=True)
+        assert truncated["body"] == '{"data": "...[truncated, 112 bytes total]'
+
+        digest = RetentionPolicy("hash").response_info(_response(content), passed=True)["body"]
+        assert digest["size"] == len(content)
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            RetentionPolicy("everything")
+
+
+class TestSerialization:
+    def test_to_dict_decodes_lazy_body(self):
+        lazy = LazyBody(b'{"a": [1, 2]}')
+        result = make_result("tc", response={"status_code": 200, "body": lazy})
+
+        assert result.to_dict()["response"]["body"] == {"a": [1, 2]}
+        # 结果本身仍持有原始字节
+        assert result.response["body"] is lazy
+
+    def test_jsonl_round_trip(self, tmp_path):
+        result = make_result("tc", response={"status_code": 200, "body": LazyBody(b'{"ok": true}')})
+        with JsonlResultWriter(tmp_path / "results.jsonl") as writer:
+            writer.write(result)
+
+        (loaded,) = list(writer.results())
+        assert loaded.response["body"] == {"ok": True}
+
+    def test_runner_defers_decoding_for_status_only_assertions(self):
+        plan = make_plan([
+            {"id": "list", "name": "list", "endpoint_id": "get_users", "inputs": {},
+             "assertions": [{"type": "status_code", "expected": 200}]},
+            {"id": "one", "name": "one", "endpoint_id": "get_user_by_id", "inputs": {"path_params": {"id": 1}},
+             "assertions": [{"type": "json_path", "path": "$.name", "operator": "equals", "expected": "User 1"}]},
+        ])
+        result = Runner(http_client=FakeHttpClient()).run(plan)
+        listed, one = result.results
+
+        assert listed.passed and isinstance(listed.response["body"], LazyBody)
+        assert listed.to_dict()["response"]["body"][0]["id"] == 1
+        assert one.passed and one.response["body"]["name"] == "User 1"
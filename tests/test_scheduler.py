@@ -0,0 +1,249 @@
+"""依赖图与 DAG 调度"""
+
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from src.executor import AsyncTestRunner, DagScheduler, ExecutionGraph, compile_plan
+from src.executor import TestRunner as Runner
+
+from .fakes import FakeAsyncHttpClient, FakeHttpClient, make_plan
+
+
+def _case(tc_id, endpoint_id="get_users", inputs=None, extract=None):
+    return {
+        "id": tc_id,
+        "name": tc_id,
+        "endpoint_id": endpoint_id,
+        "inputs": inputs or {},
+        "assertions": [],
+        "extract": extract or [],
+    }
+
+
+def _graph(prerequisites):
+    """按字典顺序构造依赖图：用例 ID → 前置用例 ID 列表"""
+    return ExecutionGraph(order=list(prerequisites), prerequisites={k: set(v) for k, v in prerequisites.items()})
+
+
+# a → b → d，a → c → d，e 独立，f 依赖 e
+_DIAMOND = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"], "e": [], "f": ["e"]}
+
+
+class TestExecutionGraph:
+    def test_explicit_and_implicit_edges(self):
+        plan = make_plan(
+            [
+                _case("login", extract=[{"name": "token", "from": "$.token"}]),
+                _case("create", "create_user", extract=[{"name": "uid", "from": "$.id"}]),
+                _case("by_path", "get_user_by_id", {"path_params": {"id": "{{uid}}"}}),
+                _case("by_inject"),
+                _case("explicit"),
+                _case("unrelated"),
+            ],
+            {
+                "by_inject": {"inject": {"headers.Authorization": "Bearer {{token}}"}},
+                "explicit": {"depends_on": ["create", "login"]},
+            },
+        )
+        graph = ExecutionGraph.from_plan(plan)
+
+        assert graph.prerequisites == {
+            "login": set(),
+            "create": set(),
+            "by_path": {"create"},
+            "by_inject": {"login"},
+            "explicit": {"create", "login"},
+            "unrelated": set(),
+        }
+
+    def test_implicit_edge_uses_last_extractor(self):
+        plan = make_plan(
+            [
+                _case("first", extract=[{"name": "uid", "from": "$.id"}]),
+                _case("second", extract=[{"name": "uid", "from": "$.id"}]),
+                _case("use", inputs={"query_params": {"id": "{{uid}}"}}),
+                _case("early_use", inputs={"query_params": {"id": "{{later}}"}}),
+                _case("later", extract=[{"name": "later", "from": "$.id"}]),
+            ]
+        )
+        graph = ExecutionGraph.from_plan(plan)
+
+        assert graph.prerequisites["use"] == {"second"}
+        # 提取变量的用例在后面时不构成依赖
+        assert graph.prerequisites["early_use"] == set()
+
+    def test_cycle_is_broken_and_reported(self):
+        plan = make_plan(
+            [_case("a"), _case("b"), _case("c")],
+            {"a": {"depends_on": "b"}, "b": {"depends_on": "a"}, "c": {"depends_on": "c"}},
+        )
+        compiled = compile_plan(plan)
+
+        assert compiled.graph.prerequisites == {"a": set(), "b": {"a"}, "c": set()}
+        assert "a: depends_on b, which runs later in execution_order (ignored)" in compiled.warnings
+        assert "c: depends_on itself (ignored)" in compiled.warnings
+
+    def test_unknown_dependency_is_reported(self):
+        plan = make_plan([_case("a")], {"a": {"depends_on": "missing"}, "ghost": {"depends_on": "a"}})
+        compiled = compile_plan(plan)
+
+        assert compiled.graph.prerequisites == {"a": set()}
+        assert "a: depends_on unknown test case missing" in compiled.warnings
+        assert "dependencies: unknown test case ghost" in compiled.warnings
+
+
+class _Recorder:
+    """记录执行顺序，并检查每个用例开始时其前置用例均已完成"""
+
+    def __init__(self, graph, fail=()):
+        self.graph = graph
+        self.fail = set(fail)
+        self.done = set()
+        self.started = []
+        self.lock = threading.Lock()
+        self.violations = []
+
+    def begin(self, tc_id):
+        with self.lock:
+            missing = self.graph.prerequisites[tc_id] - self.done
+            if missing:
+                self.violations.append((tc_id, missing))
+            self.started.append(tc_id)
+
+    def end(self, tc_id):
+        with self.lock:
+            self.done.add(tc_id)
+        return {"id": tc_id, "passed": tc_id not in self.fail}
+
+    def execute(self, tc_id, row=None):
+        self.begin(tc_id)
+        time.sleep(random.uniform(0, 0.01))
+        return self.end(tc_id)
+
+    async def execute_async(self, tc_id, row=None):
+        self.begin(tc_id)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        return self.end(tc_id)
+
+
+def _is_failure(result):
+    return not result["passed"]
+
+
+def _skip(tc_id, upstream_id):
+    return {"id": tc_id, "passed": False, "skipped_by": upstream_id}
+
+
+def _run(graph, workers, engine, recorder, **kwargs):
+    scheduler = DagScheduler(graph, workers=workers)
+    if engine == "sync":
+        return list(scheduler.run(recorder.execute, **kwargs))
+
+    async def collect():
+        return [item async for item in scheduler.run_async(recorder.execute_async, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("engine", ["sync", "async"])
+@pytest.mark.parametrize("workers", [1, 4])
+class TestDagScheduler:
+    def test_results_follow_graph_order(self, engine, workers):
+        random.seed(workers)
+        prerequisites = {f"n{i}": ([f"n{i - 3}"] if i >= 3 and i % 2 else []) for i in range(30)}
+        graph = _graph(prerequisites)
+
+        for _ in range(3):
+            recorder = _Recorder(graph)
+            results = _run(graph, workers, engine, recorder)
+
+            assert [tc_id for tc_id, _ in results] == graph.order
+            assert [result["id"] for _, result in results] == graph.order
+            assert recorder.violations == []
+
+    def test_failure_skips_all_dependents(self, engine, workers):
+        graph = _graph(_DIAMOND)
+        recorder = _Recorder(graph, fail={"b"})
+        results = dict(_run(graph, workers, engine, recorder, is_failure=_is_failure, skip=_skip))
+
+        assert results["d"] == {"id": "d", "passed": False, "skipped_by": "b"}
+        assert results["c"]["passed"] and results["f"]["passed"]
+        assert "d" not in recorder.started
+
+    def test_transitive_skip_reports_root_failure(self, engine, workers):
+        graph = _graph({"a": [], "b": ["a"], "c": ["b"]})
+        recorder = _Recorder(graph, fail={"a"})
+        results = dict(_run(graph, workers, engine, recorder, is_failure=_is_failure, skip=_skip))
+
+        assert results["b"]["skipped_by"] == "a"
+        assert results["c"]["skipped_by"] == "a"
+        assert recorder.started == ["a"]
+
+    def test_without_skip_dependents_still_run(self, engine, workers):
+        graph = _graph(_DIAMOND)
+        recorder = _Recorder(graph, fail={"a"})
+        results = _run(graph, workers, engine, recorder, is_failure=_is_failure)
+
+        assert sorted(recorder.started) == sorted(graph.order)
+        assert len(results) == len(graph.order)
+
+    def test_known_results_are_not_executed(self, engine, workers):
+        graph = _graph(_DIAMOND)
+        recorder = _Recorder(graph)
+        cached = {"id": "a", "passed": True, "cached": True}
+        results = dict(_run(graph, workers, engine, recorder, known={"a": cached}))
+
+        assert results["a"] is cached
+        assert "a" not in recorder.started
+        assert len(results) == len(graph.order)
+
+    def test_should_stop(self, engine, workers):
+        graph = _graph({"a": [], "b": ["a"], "c": ["b"]})
+        recorder = _Recorder(graph, fail={"b"})
+        results = _run(graph, workers, engine, recorder, should_stop=_is_failure)
+
+        assert [tc_id for tc_id, _ in results] == ["a", "b"]
+
+
+def _sibling_plan(pairs):
+    """base → create_k → check_k，所有分支同属一个连通分量，且都提取同名变量 uid / user_name"""
+    test_cases = [_case("base")]
+    dependencies = {}
+    for k in range(pairs):
+        dependencies[f"create_{k}"] = {"depends_on": "base"}
+        test_cases.append(_case(
+            f"create_{k}",
+            "create_user",
+            {"body": {"name": f"user-{k}", "email": f"user{k}@example.com"}},
+            [{"name": "uid", "from": "$.id"}, {"name": "user_name", "from": "$.name"}],
+        ))
+        check = _case(f"check_{k}", "update_user", {"path_params": {"id": "{{uid}}"}, "body": {"name": "{{user_name}}"}})
+        check["assertions"] = [{"type": "json_path", "path": "$.name", "operator": "equals", "expected": f"user-{k}"}]
+        test_cases.append(check)
+    return make_plan(test_cases, dependencies)
+
+
+def _random_delay(method, path, body):
+    return random.uniform(0, 0.01)
+
+
+class TestSiblingBranches:
+    """并行的兄弟分支提取同名变量时，下游只看到自己分支的值"""
+
+    def test_sync(self):
+        random.seed(1)
+        runner = Runner(http_client=FakeHttpClient(delay=_random_delay), workers=8)
+        result = runner.run(_sibling_plan(20))
+
+        assert [r.test_case_id for r in result.results if not r.passed] == []
+
+    def test_async(self):
+        random.seed(2)
+        runner = AsyncTestRunner(http_client=FakeAsyncHttpClient(delay=_random_delay), concurrency=8)
+        result = runner.run(_sibling_plan(20))
+
+        assert [r.test_case_id for r in result.results if not r.passed] == []
@@ -0,0 +1,158 @@
+"""响应体 Schema 校验"""
+
+import pytest
+
+from src.executor import AssertionEngine, SchemaValidator, compile_response_schemas
+from src.executor.schema import validator_for
+
+from .fakes import make_response
+
+
+def _errors(schema, value):
+    return SchemaValidator(schema).validate(value)
+
+
+class TestTypes:
+    def test_type_list(self):
+        schema = {"type": ["string", "integer"]}
+        assert _errors(schema, "a") == []
+        assert _errors(schema, 3) == []
+        assert _errors(schema, 3.5) == ["$: expected string or integer, got number"]
+
+    def test_bool_is_not_a_number(self):
+        assert _errors({"type": "integer"}, True) == ["$: expected integer, got boolean"]
+        assert _errors({"type": "number"}, False) == ["$: expected number, got boolean"]
+        assert _errors({"type": "integer"}, 2.0) == []
+
+    def test_nullable(self):
+        schema = {"type": "string", "nullable": True}
+        assert _errors(schema, None) == []
+        assert _errors({"type": "string"}, None) == ["$: expected string, got null"]
+
+    def test_unknown_type_is_rejected(self):
+        with pytest.raises(ValueError):
+            SchemaValidator({"type": "date"})
+
+
+class TestObjectsAndArrays:
+    def test_required_and_additional_properties(self):
+        schema = {
+            "type": "object",
+            "required": ["id", "name"],
+            "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+            "additionalProperties": False,
+        }
+        assert _errors(schema, {"id": 1, "name": "a"}) == []
+        assert _errors(schema, {"id": 1, "extra": True}) == [
+            "$: missing required property 'name'",
+            "$: unexpected property 'extra'",
+        ]
+
+    def test_nested_items(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "data": {
+                    "type": "array",
+                    "minItems": 1,
+                    "items": {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer"}}},
+                }
+            },
+        }
+        assert _errors(schema, {"data": [{"id": 1}, {"id": 2}]}) == []
+        assert _errors(schema, {"data": [{"id": 1}, {"id": "2"}, {}]}) == [
+            "$.data[1].id: expected integer, got string",
+            "$.data[2]: missing required property 'id'",
+        ]
+        assert _errors(schema, {"data": []}) == ["$.data: expected at least 1 items, got 0"]
+
+    def test_unique_items_distinguishes_bool_and_number(self):
+        schema = {"type": "array", "uniqueItems": True}
+        assert _errors(schema, [1, True, 0, False]) == []
+        assert _errors(schema, [[1], [True]]) == []
+        assert _errors(schema, [1, 1.0]) == ["$: items are not unique"]
+
+    def test_error_limit(self):
+        schema = {"type": "array", "items": {"type": "integer"}}
+        errors = _errors(schema, ["x"] * 20)
+        assert len(errors) == 5
+
+
+class TestNumbers:
+    @pytest.mark.parametrize("value", [0.3, 0.7, 1.1, 3, 0, -0.2, 12345.6])
+    def test_multiple_of_float(self, value):
+        assert _errors({"multipleOf": 0.1}, value) == []
+
+    @pytest.mark.parametrize("value", [0.35, 0.01, 1.05])
+    def test_not_multiple_of_float(self, value):
+        assert _errors({"multipleOf": 0.1}, value) == [f"$: {value} is not a multiple of 0.1"]
+
+    def test_multiple_of_integer(self):
+        assert _errors({"multipleOf": 3}, 9) == []
+        assert _errors({"multipleOf": 3}, 9.0) == []
+        assert _errors({"multipleOf": 3}, 10) == ["$: 10 is not a multiple of 3"]
+        assert _errors({"multipleOf": 0.1}, 1e30) == []
+
+    def test_ranges(self):
+        assert _errors({"minimum": 1, "exclusiveMaximum": 3}, 3) == ["$: 3 is not less than 3"]
+        # OpenAPI 3.0 的布尔 exclusiveMinimum
+        assert _errors({"minimum": 1, "exclusiveMinimum": True}, 1) == ["$: 1 is not greater than 1"]
+
+
+class TestEnumAndConst:
+    def test_enum_bool_vs_int(self):
+        assert _errors({"enum": [1, 2]}, True) == ["$: True is not one of [1, 2]"]
+        assert _errors({"enum": [True]}, 1) == ["$: 1 is not one of [True]"]
+        assert _errors({"enum": [0, "a"]}, False) == ["$: False is not one of [0, 'a']"]
+        assert _errors({"enum": [1, 2]}, 1.0) == []
+
+    def test_const_bool_vs_int(self):
+        assert _errors({"const": 0}, False) == ["$: expected 0, got False"]
+        assert _errors({"const": {"a": [1]}}, {"a": [True]}) == ["$: expected {'a': [1]}, got {'a': [True]}"]
+        assert _errors({"const": False}, False) == []
+
+
+class TestCombinators:
+    def test_one_of(self):
+        schema = {"oneOf": [{"type": "integer"}, {"type": "number"}]}
+        assert _errors(schema, 1.5) == []
+        assert _errors(schema, 1) == ["$: matches 2 schemas in oneOf, expected exactly 1"]
+
+    def test_any_of_and_not(self):
+        assert _errors({"anyOf": [{"type": "string"}, {"type": "null"}]}, 1) == [
+            "$: does not match any schema in anyOf"
+        ]
+        assert _errors({"not": {"type": "string"}}, "a") == ["$: must not match the schema in not"]
+
+
+class TestResponseSchemas:
+    def test_status_lookup(self):
+        validators, errors = compile_response_schemas({
+            "responses": {
+                "200": {"schema": {"type": "object"}},
+                "4XX": {"schema": {"type": "object", "required": ["error"]}},
+                "default": {"schema": {"type": "string"}},
+                "500": {"schema": {"type": "bogus"}},
+            }
+        })
+
+        assert errors == ["response 500: Unknown schema type: bogus"]
+        assert validator_for(validators, 200) is validators["200"]
+        assert validator_for(validators, "404") is validators["4XX"]
+        assert validator_for(validators, 503) is validators["default"]
+        assert validator_for({}, 200) is None
+
+
+class TestSchemaAssertion:
+    def test_check_uses_response_status(self):
+        validators, _ = compile_response_schemas({
+            "responses": {"200": {"schema": {"type": "object", "required": ["id"]}}}
+        })
+        engine = AssertionEngine()
+
+        passed = engine.check(make_response(200, {"id": 1}), {"type": "schema"}, response_schemas=validators)
+        failed = engine.check(make_response(200, {}), {"type": "schema"}, response_schemas=validators)
+
+        assert passed.passed
+        assert not failed.passed
+        assert failed.actual == ["$: missing required property 'id'"]
@@ -0,0 +1,114 @@
+"""分片"""
+
+import pytest
+
+from src.executor import ExecutionGraph, parse_shard, select_shard, shard_plan
+from src.executor.shard import assign_shards, connected_components
+
+from .fakes import make_plan
+
+
+def _case(tc_id, inputs=None, extract=None):
+    return {
+        "id": tc_id,
+        "name": tc_id,
+        "endpoint_id": "get_users",
+        "inputs": inputs or {},
+        "assertions": [],
+        "extract": extract or [],
+    }
+
+
+def _graph(prerequisites):
+    """按字典顺序构造依赖图：用例 ID → 前置用例 ID 列表"""
+    return ExecutionGraph(order=list(prerequisites), prerequisites={k: set(v) for k, v in prerequisites.items()})
+
+
+# 连通分量 {a, b, d}、{c, e}、{f}、{g}
+_CHAINS = {"a": [], "b": ["a"], "c": [], "d": ["b"], "e": ["c"], "f": [], "g": []}
+
+
+class TestParseShard:
+    @pytest.mark.parametrize("spec, expected", [("1/1", (1, 1)), ("2/4", (2, 4)), ("4/4", (4, 4))])
+    def test_valid(self, spec, expected):
+        assert parse_shard(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["", "2", "a/b", "1/2/3", "0/4", "5/4", "1/0", "-1/2"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+class TestComponents:
+    def test_weakly_connected_in_graph_order(self):
+        assert connected_components(_graph(_CHAINS)) == [["a", "b", "d"], ["c", "e"], ["f"], ["g"]]
+
+    def test_shared_dependent_joins_components(self):
+        graph = _graph({"a": [], "b": [], "c": ["a", "b"], "d": []})
+
+        assert connected_components(graph) == [["a", "b", "c"], ["d"]]
+
+    def test_balanced_assignment(self):
+        shards = assign_shards([["a", "b", "d"], ["c", "e"], ["f"], ["g"]], 2)
+
+        # 大分量先放，之后每个分量放进用例最少的分片，数量相同时取序号小的
+        assert shards == [["a", "b", "d", "g"], ["c", "e", "f"]]
+
+    def test_more_shards_than_components(self):
+        shards = assign_shards([["a", "b"]], 3)
+
+        assert shards == [["a", "b"], [], []]
+
+
+class TestSelectShard:
+    @pytest.mark.parametrize("total", [1, 2, 3, 5, 8])
+    def test_shards_partition_the_plan(self, total):
+        graph = _graph(_CHAINS)
+
+        shards = [select_shard(graph, index, total) for index in range(1, total + 1)]
+
+        assert sorted(tc_id for shard in shards for tc_id in shard) == sorted(graph.order)
+        for shard in shards:
+            assert shard == [tc_id for tc_id in graph.order if tc_id in shard]
+            # 同一条依赖链上的用例在同一个分片中
+            for tc_id in shard:
+                assert graph.prerequisites[tc_id] <= set(shard)
+
+    def test_assignment_is_deterministic(self):
+        assert select_shard(_graph(_CHAINS), 2, 3) == select_shard(_graph(dict(_CHAINS)), 2, 3)
+
+
+class TestShardPlan:
+    def _plan(self):
+        return make_plan(
+            [
+                _case("login", extract=[{"name": "token", "path": "$.token"}]),
+                _case("profile", inputs={"headers": {"Authorization": "{{token}}"}}),
+                _case("list"),
+                _case("detail"),
+                _case("other"),
+            ],
+            {"detail": {"depends_on": "list"}, "other": {"inject": {}}},
+        )
+
+    def test_implicit_and_explicit_edges_stay_together(self):
+        plan = self._plan()
+
+        first = shard_plan(plan, 1, 2)
+        second = shard_plan(plan, 2, 2)
+
+        assert first["execution_order"] == ["login", "profile", "other"]
+        assert second["execution_order"] == ["list", "detail"]
+        assert [tc["id"] for tc in first["test_cases"]] == first["execution_order"]
+        assert first["dependencies"] == {"other": {"inject": {}}}
+        assert second["dependencies"] == {"detail": {"depends_on": "list"}}
+
+    def test_meta_and_original_plan(self):
+        plan = self._plan()
+
+        sharded = shard_plan(plan, 2, 2)
+
+        assert sharded["meta"] == {"name": "test", "shard": "2/2"}
+        assert sharded["endpoints"] is plan["endpoints"]
+        assert "shard" not in plan["meta"]
+        assert len(plan["test_cases"]) == 5
@@ -0,0 +1,232 @@
+"""流式断言：增量求值与完整解析的结果一致"""
+
+import pytest
+
+from src import codec
+from src.executor import RetentionPolicy
+from src.executor import TestRunner as Runner
+from src.executor.http_client import HttpClient, decode_body
+from src.executor.jsonpath import CompiledPath
+from src.executor.streaming import MISSING, PathStreamEvaluator, StreamSpec, parse_simple_path, simple_paths
+
+from .fakes import LocalServer, make_plan
+
+NESTED = {
+    "data": {
+        "user": {"id": 7, "name": "张三", "tags": ["a", "b"], "profile": {"age": 30, "email": None}},
+        "items": [{"id": 1, "price": 9.5}, {"id": 2, "price": 0}, [10, 20]],
+        "total": 3,
+        "code": "X42",
+    },
+    "ok": True,
+    "list": [],
+}
+
+BODIES = {
+    "nested": codec.dumps_bytes(NESTED),
+    "array": codec.dumps_bytes([{"id": 1, "tags": ["x"]}, {"id": 2}, 3, "text"]),
+    "scalar": b'"abc"',
+    "number": b"42",
+    "null": b"null",
+    "empty": b"",
+    "text": b"plain text body",
+    "truncated": b'{"data": {"user": {"id": 7',
+}
+
+PATHS = [
+    "$",
+    "$.ok",
+    "$.data",
+    "$.data.user.id",
+    "$.data.user.name",
+    "$.data.user.tags[1]",
+    "$.data.user.tags[5]",
+    "$.data.user.profile.email",
+    "$.data.user.profile",
+    "$.data.user.missing.deep",
+    "$.data.items[0].price",
+    "$.data.items[1].price",
+    "$.data.items[2][1]",
+    "$.data.items[3]",
+    "$.data.total[0]",
+    "$.data.code[1]",
+    "$.data.code.x",
+    "$['data']['total']",
+    "$.list[0]",
+    "$[0].id",
+    "$[0].tags[0]",
+    "$[2]",
+    "$[3][0]",
+    "$[3].x",
+    "$[0]",
+    "$.id",
+]
+
+
+def _expected(path, body):
+    """完整解析响应体后的取值（CompiledPath.first），出错时返回异常类型"""
+    try:
+        return CompiledPath(path).first(decode_body(body))
+    except TypeError:
+        return TypeError
+
+
+def _stream(body, paths, chunk_size, keep_bytes=None):
+    evaluator = PathStreamEvaluator(simple_paths(paths), keep_bytes=keep_bytes)
+    for start in range(0, len(body), chunk_size):
+        if evaluator.feed(body[start:start + chunk_size]):
+            break
+    return evaluator.close(), bytes(evaluator.head)
+
+
+def _resolve(values, head, path):
+    """同 AssertionEngine：不在 values 中的路径对保留的响应体求值"""
+    if path in values:
+        return values[path]
+    return _expected(path, head)
+
+
+class TestParseSimplePath:
+    def test_simple(self):
+        assert parse_simple_path("$") == ()
+        assert parse_simple_path("$.data[0]['na.me'][\"x\"]") == ("data", 0, "na.me", "x")
+
+    @pytest.mark.parametrize("path", ["", "data", "$.items[*]", "$..id", "$.a[-1]", "$.a[0:2]", "$[?(@.id)]"])
+    def test_not_simple(self, path):
+        assert parse_simple_path(path) is None
+
+    def test_simple_paths_requires_all(self):
+        assert simple_paths(["$.a", "$.b[0]"]) == {"$.a": ("a",), "$.b[0]": ("b", 0)}
+        assert simple_paths(["$.a", "$..b"]) is None
+
+
+class TestMatchesFullParse:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    @pytest.mark.parametrize("name", list(BODIES))
+    def test_values(self, name, chunk_size):
+        body = BODIES[name]
+
+        values, head = _stream(body, PATHS, chunk_size)
+
+        assert head == body
+        for path in PATHS:
+            assert _resolve(values, head, path) == _expected(path, body), path
+
+    @pytest.mark.parametrize("name", ["nested", "array", "scalar", "number", "null"])
+    def test_json_paths_are_evaluated_while_streaming(self, name):
+        body = BODIES[name]
+
+        values, _ = _stream(body, PATHS, 5)
+
+        # 只有求值出错的路径需要调用方单独求值
+        assert {path for path in PATHS if path not in values} == {
+            path for path in PATHS if _expected(path, body) is TypeError
+        }
+
+    def test_missing_vs_null(self):
+        values, _ = _stream(BODIES["nested"], ["$.data.user.profile.email", "$.data.user.phone"], 3)
+
+        assert values["$.data.user.profile.email"] is None
+        assert values["$.data.user.phone"] is MISSING
+
+    def test_containers_are_built(self):
+        values, _ = _stream(BODIES["nested"], ["$.data.user.profile", "$.data.items[2]"], 4)
+
+        assert values == {"$.data.user.profile": {"age": 30, "email": None}, "$.data.items[2]": [10, 20]}
+
+    @pytest.mark.parametrize("name", ["text", "empty", "truncated"])
+    def test_non_json_defers_to_caller(self, name):
+        values, _ = _stream(BODIES[name], ["$", "$.data", "$[0]"], 4)
+
+        assert values == {}
+
+    def test_content_after_resolution_is_not_parsed(self):
+        # 路径都有结论后不再解析，JSON 之后的多余字符不影响结果（完整解析时整个响应体按文本处理）
+        values, _ = _stream(b'{"data": 1} garbage', ["$.data"], 4)
+
+        assert values == {"$.data": 1}
+
+
+class TestEarlyStop:
+    def test_stops_once_paths_and_prefix_are_resolved(self):
+        body = codec.dumps_bytes({"id": 1, "items": list(range(10000))})
+        evaluator = PathStreamEvaluator(simple_paths(["$.id"]), keep_bytes=16)
+
+        chunks = [body[i:i + 64] for i in range(0, len(body), 64)]
+        fed = 0
+        for chunk in chunks:
+            fed += 1
+            if evaluator.feed(chunk):
+                break
+
+        assert fed == 1
+        assert evaluator.close() == {"$.id": 1}
+        assert bytes(evaluator.head) == body[:16]
+
+    def test_full_body_reads_to_end(self):
+        body = codec.dumps_bytes({"id": 1, "items": list(range(1000))})
+        evaluator = PathStreamEvaluator(simple_paths(["$.id"]), keep_bytes=None)
+
+        assert not any(evaluator.feed(body[i:i + 64]) for i in range(0, len(body), 64))
+        assert evaluator.close() == {"$.id": 1}
+        assert bytes(evaluator.head) == body
+
+
+class TestHttpClient:
+    BODY = codec.dumps_bytes({"data": {"id": 5, "items": list(range(2000))}})
+
+    def _chunks(self):
+        return [self.BODY[i:i + 512] for i in range(0, len(self.BODY), 512)]
+
+    @pytest.mark.parametrize("keep_bytes", [None, 32])
+    def test_streamed_request(self, keep_bytes):
+        with LocalServer({"/big": self._chunks()}) as server:
+            client = HttpClient(base_url=server.base_url)
+            try:
+                spec = StreamSpec(simple_paths(["$.data.id", "$.data.items[3]"]), threshold=0, keep_bytes=keep_bytes)
+                response = client.request("GET", "/big", stream=spec)
+            finally:
+                client.close()
+
+        assert response.path_values == {"$.data.id": 5, "$.data.items[3]": 3}
+        assert response.content == (self.BODY if keep_bytes is None else self.BODY[:32])
+
+    def test_small_response_is_read_in_full(self):
+        with LocalServer({"/small": b'{"id": 1}'}) as server:
+            client = HttpClient(base_url=server.base_url)
+            try:
+                spec = StreamSpec(simple_paths(["$.id"]), threshold=1024, keep_bytes=4)
+                response = client.request("GET", "/small", stream=spec)
+            finally:
+                client.close()
+
+        assert response.path_values is None
+        assert response.body == {"id": 1}
+
+    @pytest.mark.parametrize("mode", ["full", "hash", "truncate"])
+    def test_status_only_case_retention(self, mode):
+        plan = make_plan([{
+            "id": "list", "name": "list", "endpoint_id": "get_users", "inputs": {},
+            "assertions": [{"type": "status_code", "expected": 200}],
+        }])
+
+        with LocalServer({"/users": self._chunks()}) as server:
+            runner = Runner(
+                http_client=HttpClient(base_url=server.base_url),
+                retention=RetentionPolicy(mode, max_bytes=64),
+                stream_threshold=0,
+            )
+            try:
+                (result,) = runner.run(plan).results
+            finally:
+                runner.http_client.close()
+
+        assert result.passed
+        body = result.to_dict()["response"]["body"]
+        if mode == "full":
+            assert body == codec.loads(self.BODY)
+        elif mode == "hash":
+            assert body["size"] == len(self.BODY)
+        else:
+            # 只保留前缀：读满 max_bytes 即停止读取
+            assert len(body) == 64
@@ -0,0 +1,161 @@
+"""预编译模板：compile_tree / render_tree 的契约与基线替换结果一致"""
+
+import re
+
+import pytest
+
+from src.executor import VariableManager
+from src.executor.template import LITERAL, SLOT, VARIABLE, Template, TemplateTree, compile_template, compile_tree, render_tree
+
+VARIABLES = {"uid": 42, "name": "张三", "flag": True, "ratio": 0.5, "empty": "", "zero": 0, "nested": "{{uid}}", "变量": "v"}
+
+
+def _baseline(data, variables):
+    """基线 VariableManager.substitute：逐层复制并以正则替换"""
+    if isinstance(data, str):
+        def replacer(match):
+            value = variables.get(match.group(1))
+            return str(value) if value is not None else match.group(0)
+        return re.sub(r"\{\{(\w+)\}\}", replacer, data)
+    if isinstance(data, dict):
+        return {k: _baseline(v, variables) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_baseline(item, variables) for item in data]
+    return data
+
+
+STRINGS = [
+    "",
+    "plain",
+    "{{uid}}",
+    "id={{uid}}&name={{name}}",
+    "{{uid}}{{uid}}",
+    "{{missing}}",
+    "a {{missing}} b {{uid}}",
+    "{{ uid }}",
+    "{uid}",
+    "{{uid}",
+    "{{{uid}}}",
+    "{{{{uid}}}}",
+    "\\{{uid}}",
+    "{{u-id}}",
+    "{{}}",
+    "{{nested}}",
+    "{{flag}}/{{ratio}}/{{zero}}/{{empty}}",
+    "{{变量}}",
+    "/users/{id}/{{uid}}",
+]
+
+
+class TestCompileTree:
+    @pytest.mark.parametrize("data", [
+        "plain",
+        "{{ not a placeholder }}",
+        "{single}",
+        {"a": 1, "b": [1, "x", {"c": None}]},
+        [{"k": "v"}, []],
+        {},
+        [],
+        42,
+        None,
+    ], ids=repr)
+    def test_no_placeholders_returns_original(self, data):
+        assert compile_tree(data) is data
+
+    def test_static_subtrees_are_kept(self):
+        static = {"role": "admin", "tags": ["a", "b"]}
+        data = {"id": "{{uid}}", "meta": static, "items": [static, "{{name}}"]}
+
+        tree = compile_tree(data)
+
+        assert type(tree) is TemplateTree
+        assert not tree.is_list
+        items = {key: (node, dynamic) for key, node, dynamic in tree.items}
+        assert items["meta"] == (static, False) and items["meta"][0] is static
+        assert type(items["id"][0]) is Template and items["id"][1]
+        assert type(items["items"][0]) is TemplateTree and items["items"][0].items[0][1] is static
+
+    def test_templates_are_cached(self):
+        assert compile_template("x={{uid}}") is compile_template("x={{uid}}")
+        assert compile_tree(["x={{uid}}"]).items[0][1] is compile_template("x={{uid}}")
+
+
+class TestRenderTree:
+    def test_shares_static_subtrees(self):
+        static = {"role": "admin"}
+        data = {"id": "{{uid}}", "meta": static, "list": [static]}
+        tree = compile_tree(data)
+
+        first = render_tree(tree, VARIABLES.get)
+        second = render_tree(tree, VARIABLES.get)
+
+        # 不含占位符的子树与编译前是同一对象：调用方修改渲染结果会改动计划本身
+        assert first["meta"] is static and second["meta"] is static
+        # list 含有静态元素但自身不含占位符，同样原样复用
+        assert first["list"] is data["list"]
+        # 含占位符的容器每次渲染都是新对象
+        assert first is not second and first is not data
+        assert first == second == {"id": "42", "meta": static, "list": [static]}
+        assert data["id"] == "{{uid}}"
+
+    def test_plain_values_pass_through(self):
+        for value in ("plain", 3, None, {"a": 1}):
+            assert render_tree(value, VARIABLES.get) is value
+
+    @pytest.mark.parametrize("value", [42, True, 0.5, 0])
+    def test_whole_string_placeholder(self, value):
+        # 与基线一致：整串占位符也按 str(value) 渲染，结果始终是字符串
+        rendered = render_tree(compile_tree({"v": "{{v}}"}), {"v": value}.get)
+
+        assert rendered == {"v": str(value)}
+        assert type(rendered["v"]) is str
+
+    @pytest.mark.parametrize("value", [7, 1.5, True, False, None])
+    def test_non_string_leaves_keep_type(self, value):
+        rendered = render_tree(compile_tree({"id": "{{uid}}", "v": value, "l": [value, "{{uid}}"]}), VARIABLES.get)
+
+        assert rendered["v"] is value
+        assert rendered["l"][0] is value
+
+    def test_unknown_variables_are_left_as_is(self):
+        rendered = render_tree(compile_tree({"a": "{{missing}}", "b": ["x{{missing}}y", "{{none}}"]}), {"none": None}.get)
+
+        assert rendered == {"a": "{{missing}}", "b": ["x{{missing}}y", "{{none}}"]}
+
+
+class TestMatchesBaseline:
+    @pytest.mark.parametrize("text", STRINGS, ids=repr)
+    def test_strings(self, text):
+        expected = _baseline(text, VARIABLES)
+
+        assert compile_template(text).render(VARIABLES.get) == expected
+        assert render_tree(compile_tree(text), VARIABLES.get) == expected
+
+    def test_nested_data(self):
+        data = {"q": {text: [text, {"k": text}] for text in STRINGS}, "n": [1, None, True]}
+
+        assert render_tree(compile_tree(data), VARIABLES.get) == _baseline(data, VARIABLES)
+
+    def test_variable_manager(self):
+        manager = VariableManager()
+        for name, value in VARIABLES.items():
+            manager.set(name, value)
+        data = {"headers": {"X-Id": "{{uid}}"}, "body": STRINGS}
+
+        assert manager.substitute(data) == _baseline(data, VARIABLES)
+
+
+class TestPathSlots:
+    def test_segments(self):
+        template = Template("/users/{id}/{{uid}}/{kind}x", path_slots=True)
+
+        assert template.segments == [
+            (LITERAL, "/users/"), (SLOT, "id"), (LITERAL, "/"), (VARIABLE, "uid"), (LITERAL, "/"), (SLOT, "kind"), (LITERAL, "x"),
+        ]
+        assert template.names == {"uid"}
+
+    def test_render(self):
+        template = Template("/users/{id}/{{uid}}/{kind}", path_slots=True)
+
+        assert template.render(VARIABLES.get, {"id": 5}) == "/users/5/42/{kind}"
+        assert template.render(VARIABLES.get) == "/users/{id}/42/{kind}"
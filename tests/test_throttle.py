@@ -0,0 +1,281 @@
+"""自适应限流"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.executor import AsyncHostLimiter, AsyncThrottledHttpClient, HostLimiter, ThrottledHttpClient
+from src.executor import throttle
+from src.executor.throttle import AimdController, TokenBucket, parse_retry_after
+
+from .fakes import make_response
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(throttle.time, "monotonic", clock)
+    return clock
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self, clock):
+        bucket = TokenBucket(rate=10, burst=3)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        # 令牌不足时预支，等待时间按排队的请求数递增
+        assert bucket.reserve() == pytest.approx(0.1)
+        assert bucket.reserve() == pytest.approx(0.2)
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+
+        clock.now += 0.1
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1)
+
+        clock.now += 60
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.1)]
+
+    def test_default_burst(self):
+        assert TokenBucket(rate=0.5).capacity == 1.0
+        assert TokenBucket(rate=20).capacity == 20.0
+
+    def test_rate_must_be_positive(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+def _respond(aimd, count, latency_ms=10.0, throttled=False):
+    return [aimd.on_response(latency_ms, throttled) for _ in range(count)]
+
+
+class TestAimd:
+    def test_slow_start_doubles_each_round(self):
+        aimd = AimdController(max_limit=16, latency_tolerance=None)
+        limits = []
+        for _ in range(4):
+            _respond(aimd, int(aimd.limit))
+            limits.append(aimd.limit)
+
+        assert limits == [2, 4, 8, 16]
+        _respond(aimd, 10)
+        assert aimd.limit == 16
+
+    def test_throttled_halves_once_per_round(self):
+        aimd = AimdController(max_limit=16, initial=16, latency_tolerance=None)
+
+        assert aimd.on_response(10.0, throttled=True) == "throttled"
+        assert aimd.limit == 8
+        # 同一轮内的其他 429 不再减小
+        assert _respond(aimd, 7, throttled=True) == [None] * 7
+        assert aimd.limit == 8
+        assert aimd.on_response(10.0, throttled=True) == "throttled"
+        assert aimd.limit == 4
+
+    def test_additive_increase_after_decrease(self):
+        aimd = AimdController(max_limit=16, initial=16, latency_tolerance=None)
+        aimd.on_response(10.0, throttled=True)
+        _respond(aimd, 8)
+
+        # 每个响应加 1/limit，约一轮加 1，不再翻倍
+        assert 8.9 < aimd.limit < 9
+        _respond(aimd, 9)
+        assert 9.9 < aimd.limit < 10
+
+    def test_min_limit(self):
+        aimd = AimdController(max_limit=8, min_limit=2, initial=2, latency_tolerance=None)
+        for _ in range(5):
+            _respond(aimd, 8, throttled=True)
+        assert aimd.limit == 2
+
+    def test_failed_requests_do_not_change_limit(self):
+        aimd = AimdController(max_limit=8, initial=4, latency_tolerance=None)
+        assert _respond(aimd, 10, latency_ms=None) == [None] * 10
+        assert aimd.limit == 4
+
+    def test_latency_rise_decreases_gently(self):
+        aimd = AimdController(max_limit=16, initial=16, latency_tolerance=2.0, warmup=20)
+        _respond(aimd, 30, latency_ms=10.0)
+        assert aimd.limit == 16
+
+        # 短期均值超过基线 2 倍后减小，系数为 decrease_factor 的平方根，每轮最多一次
+        assert aimd.on_response(100.0, False) is None
+        assert aimd.on_response(100.0, False) == "latency"
+        assert aimd.limit == pytest.approx(16 * 0.5 ** 0.5)
+        assert _respond(aimd, 11, latency_ms=100.0) == [None] * 11
+        assert aimd.on_response(100.0, False) == "latency"
+        assert aimd.limit == pytest.approx(8)
+
+    def test_latency_ignored_during_warmup(self):
+        aimd = AimdController(max_limit=16, initial=16, latency_tolerance=2.0, warmup=50)
+        _respond(aimd, 5, latency_ms=10.0)
+        assert _respond(aimd, 20, latency_ms=100.0) == [None] * 20
+        assert aimd.limit == 16
+
+
+class TestRetryAfter:
+    def test_seconds_and_cap(self):
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after("3600") == throttle.MAX_RETRY_AFTER
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_http_date_in_the_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class _Scripted:
+    """按脚本依次返回状态码的替身客户端"""
+
+    base_url = "http://api.test"
+
+    def __init__(self, statuses, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _next(self):
+        with self.lock:
+            self.calls += 1
+            status = self.statuses.pop(0) if self.statuses else 200
+        response = make_response(status, {})
+        if status in throttle.THROTTLE_STATUS:
+            response.headers.update(self.headers)
+        return response
+
+    def request(self, method, path, headers=None, params=None, body=None, stream=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.005)
+        with self.lock:
+            self.in_flight -= 1
+        return self._next()
+
+
+class _AsyncScripted(_Scripted):
+    async def request(self, method, path, headers=None, params=None, body=None, stream=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.005)
+        self.in_flight -= 1
+        return self._next()
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(throttle, "BACKOFF_BASE", 0.001)
+
+
+class TestThrottledClient:
+    def test_retries_until_success(self, fast_backoff):
+        client = _Scripted([429, 503, 200])
+        limiter = HostLimiter(client.base_url, max_retries=3)
+        response = ThrottledHttpClient(client, limiter).request("GET", "/users")
+
+        assert response.status_code == 200
+        assert client.calls == 3
+        assert "throttle" in response.timings
+        summary = limiter.summary()
+        assert (summary["throttled"], summary["retries"]) == (2, 2)
+
+    def test_gives_up_after_max_retries(self, fast_backoff):
+        client = _Scripted([429] * 10)
+        response = ThrottledHttpClient(client, HostLimiter(max_retries=2)).request("GET", "/users")
+
+        assert response.status_code == 429
+        assert client.calls == 3
+
+    def test_503_on_post_is_not_resent(self, fast_backoff):
+        client = _Scripted([503, 200])
+        limiter = HostLimiter(max_retries=3)
+
+        response = ThrottledHttpClient(client, limiter).request("POST", "/users", body={"name": "a"})
+
+        assert response.status_code == 503
+        assert client.calls == 1
+        summary = limiter.summary()
+        assert (summary["throttled"], summary["retries"]) == (1, 0)
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH"])
+    def test_429_is_retried_for_any_method(self, fast_backoff, method):
+        client = _Scripted([429, 200])
+
+        response = ThrottledHttpClient(client, HostLimiter(max_retries=3)).request(method, "/users")
+
+        assert response.status_code == 200
+        assert client.calls == 2
+
+    @pytest.mark.parametrize("method", ["GET", "HEAD", "PUT", "DELETE", "OPTIONS", "get"])
+    def test_503_is_retried_for_idempotent_methods(self, fast_backoff, method):
+        client = _Scripted([503, 200])
+
+        response = ThrottledHttpClient(client, HostLimiter(max_retries=3)).request(method, "/users/1")
+
+        assert response.status_code == 200
+        assert client.calls == 2
+
+    def test_async_503_on_post_is_not_resent(self, fast_backoff):
+        client = _AsyncScripted([503, 200])
+        throttled = AsyncThrottledHttpClient(client, AsyncHostLimiter(max_retries=3))
+
+        response = asyncio.run(throttled.request("POST", "/users", body={"name": "a"}))
+
+        assert response.status_code == 503
+        assert client.calls == 1
+
+    def test_retry_after_pauses_the_host(self):
+        client = _Scripted([429], headers={"retry-after": "1"})
+        limiter = HostLimiter(max_retries=1)
+        throttled = ThrottledHttpClient(client, limiter)
+
+        start = time.monotonic()
+        assert throttled.request("GET", "/users").status_code == 200
+        assert time.monotonic() - start >= 0.9
+        assert limiter.summary()["events"][0]["reason"] == "retry-after"
+
+    def test_concurrency_never_exceeds_limit(self):
+        client = _Scripted([])
+        limiter = HostLimiter(max_concurrency=4, latency_tolerance=None)
+        throttled = ThrottledHttpClient(client, limiter)
+
+        threads = [threading.Thread(target=throttled.request, args=("GET", "/users")) for _ in range(32)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert client.max_in_flight <= 4
+        assert limiter.in_flight == 0
+        assert limiter.concurrency_limit == 4
+
+    def test_async_concurrency_and_retries(self, fast_backoff):
+        client = _AsyncScripted([429, 429])
+        limiter = AsyncHostLimiter(max_concurrency=3, latency_tolerance=None)
+        throttled = AsyncThrottledHttpClient(client, limiter)
+
+        async def burst():
+            return await asyncio.gather(*(throttled.request("GET", "/users") for _ in range(20)))
+
+        responses = asyncio.run(burst())
+        assert [r.status_code for r in responses] == [200] * 20
+        assert client.max_in_flight <= 3
+        assert limiter.summary()["throttled"] == 2
+        # 同一个限流器可以在新的事件循环中继续使用
+        assert len(asyncio.run(burst())) == 20
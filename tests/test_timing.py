@@ -0,0 +1,154 @@
+"""请求阶段计时与 Chrome trace 导出"""
+
+import asyncio
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from src import codec
+from src.cli import app
+from src.executor.async_http_client import AsyncHttpClient
+from src.executor.http_client import HttpClient
+from src.executor.timing import HTTP_PHASES, PhaseTimer
+from src.reporter import AllureReporter
+
+from .fakes import LocalServer, make_plan, make_result
+from .test_merge import _plan_result
+
+BODY = codec.dumps_bytes({"data": list(range(2000))})
+
+
+def _check_phases(timings, elapsed_ms):
+    """各阶段非负，且加起来约等于总耗时与 elapsed_ms"""
+    phases = {name: value for name, value in timings.items() if name != "total"}
+    assert set(phases) <= set(HTTP_PHASES)
+    assert all(value >= 0 for value in phases.values()), timings
+
+    total = timings["total"]
+    tolerance = max(2.0, total * 0.1)
+    assert abs(sum(phases.values()) - total) <= tolerance, timings
+    assert abs(elapsed_ms - total) <= tolerance, (elapsed_ms, timings)
+
+
+class TestPhaseTimer:
+    def test_sync_client_phases(self):
+        with LocalServer({"/users": BODY}, delay=0.02) as server:
+            client = HttpClient(base_url=server.base_url)
+            try:
+                first = client.request("GET", "/users")
+                second = client.request("GET", "/users")
+            finally:
+                client.close()
+
+        for response in (first, second):
+            _check_phases(response.timings, response.elapsed_ms)
+            assert {"queue", "send", "ttfb", "download"} <= set(response.timings)
+            # 服务端等待 20ms 才返回响应头
+            assert response.timings["ttfb"] >= 15
+            assert "tls" not in response.timings
+        # 第二个请求复用连接，没有建连阶段
+        assert "connect" in first.timings
+        assert "connect" not in second.timings
+
+    def test_async_client_phases(self):
+        async def requests(base_url):
+            client = AsyncHttpClient(base_url=base_url)
+            try:
+                return [await client.request("GET", "/users") for _ in range(2)]
+            finally:
+                await client.close()
+
+        with LocalServer({"/users": BODY}, delay=0.02) as server:
+            first, second = asyncio.run(requests(server.base_url))
+
+        for response in (first, second):
+            _check_phases(response.timings, response.elapsed_ms)
+            assert response.timings["ttfb"] >= 15
+        assert "connect" in first.timings
+        assert "connect" not in second.timings
+
+    def test_hook_only_fallback(self):
+        # 非 httpcore 传输层没有 trace 事件，由钩子时刻近似 ttfb 与 download
+        timer = PhaseTimer()
+        timer.start = 10.0
+        timer.headers_at = 10.02
+        timer.end = 10.05
+
+        assert timer.phases() == {"ttfb": 20.0, "download": 30.0, "total": 50.0}
+
+    def test_trace_events_accumulate(self, monkeypatch):
+        clock = iter([1.0, 1.001, 1.003, 1.004, 1.006, 1.010])
+        monkeypatch.setattr("src.executor.timing.time.perf_counter", lambda: next(clock))
+        timer = PhaseTimer()
+        timer.start = 0.999
+
+        timer.record("connection.connect_tcp.started")
+        timer.record("connection.connect_tcp.complete")
+        timer.record("http11.send_request_headers.started")
+        timer.record("http11.send_request_headers.complete")
+        timer.record("http11.send_request_body.started")
+        timer.record("http11.send_request_body.complete")
+
+        assert timer.new_connection
+        assert timer.phases() == {"queue": 1.0, "connect": 1.0, "send": 5.0}
+
+
+class TestSaveTrace:
+    def _results(self):
+        timings = {"substitute": 0.5, "queue": 0.1, "connect": 1.0, "send": 0.2, "ttfb": 5.0,
+                   "download": 1.0, "total": 7.3, "assert": 0.3, "extract": 0.2}
+        return [
+            make_result("a", started_at=100.0, timings=dict(timings)),
+            # 与 a 重叠，放到第二行
+            make_result("b", started_at=100.002, timings=dict(timings)),
+            make_result("c", started_at=100.020, timings=dict(timings)),
+            make_result("cached", started_at=90.0, timings=dict(timings), cached=True),
+            make_result("skipped", skipped=True, passed=False),
+        ]
+
+    def test_chrome_trace_format(self, tmp_path):
+        path = AllureReporter(str(tmp_path)).save_trace(_plan_result(self._results()), str(tmp_path / "t" / "trace.json"))
+
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+
+        events = trace["traceEvents"]
+        assert events[0]["ph"] == "M"
+        spans = [e for e in events if e["ph"] == "X"]
+        assert all(isinstance(e["ts"], (int, float)) and e["dur"] >= 0 for e in spans)
+        cases = {e["args"]["id"]: e for e in spans if e["cat"] == "case"}
+        assert set(cases) == {"a", "b", "c"}
+        assert [cases[tc]["tid"] for tc in ("a", "b", "c")] == [1, 2, 1]
+
+        # 用例区间 = 运行器阶段 + HTTP 总耗时，各阶段依次排列在区间内
+        case = cases["a"]
+        assert case["ts"] == 100_000_000
+        assert case["dur"] == pytest.approx((0.5 + 7.3 + 0.3 + 0.2) * 1000)
+        phases = [e for e in spans if e["cat"] == "phase" and e["tid"] == 1 and e["ts"] < cases["c"]["ts"]]
+        assert [e["name"] for e in phases][:2] == ["substitute", "queue"]
+        for before, after in zip(phases, phases[1:]):
+            assert after["ts"] == pytest.approx(before["ts"] + before["dur"])
+        assert phases[-1]["ts"] + phases[-1]["dur"] <= case["ts"] + case["dur"] + 1
+
+    def test_execute_writes_trace(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        plan = make_plan([
+            {"id": f"tc{i}", "name": f"tc{i}", "endpoint_id": "get_users", "inputs": {},
+             "assertions": [{"type": "status_code", "expected": 200}]}
+            for i in range(3)
+        ])
+        (tmp_path / "plan.json").write_bytes(codec.dumps_bytes(plan))
+
+        with LocalServer({"/users": b"[]"}) as server:
+            result = CliRunner().invoke(app, [
+                "execute", "--plan", "plan.json", "--base-url", server.base_url,
+                "--workers", "2", "--trace", "out/trace.json",
+            ])
+
+        assert result.exit_code == 0, result.output
+        trace = json.loads((tmp_path / "out" / "trace.json").read_text(encoding="utf-8"))
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert {e["args"]["id"] for e in spans if e["cat"] == "case"} == {"tc0", "tc1", "tc2"}
+        assert {"ttfb", "assert"} <= {e["name"] for e in spans}
+        assert all({"ph", "ts", "dur", "pid", "tid"} <= set(e) for e in spans)
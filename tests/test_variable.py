@@ -0,0 +1,218 @@
+"""变量作用域与依赖注入"""
+
+import pytest
+
+from src.executor import AsyncTestRunner, VariableManager
+from src.executor import TestRunner as Runner
+from src.executor.variable import variable_providers
+
+from .fakes import FakeAsyncHttpClient, FakeHttpClient, make_plan
+
+
+def _fan_out_plan() -> dict:
+    """base → la → wait_a → ga，base → lb → gb：la 与 lb 都提取 uid"""
+    def create(tc_id, name):
+        return {
+            "id": tc_id, "name": tc_id, "endpoint_id": "create_user",
+            "inputs": {"body": {"name": name, "email": f"{name}@example.com"}},
+            "assertions": [{"type": "status_code", "expected": 201}],
+            "extract": [{"name": "uid", "from": "$.id"}],
+        }
+
+    def get(tc_id, name):
+        return {
+            "id": tc_id, "name": tc_id, "endpoint_id": "get_user_by_id",
+            "inputs": {"path_params": {"id": "{{uid}}"}},
+            "assertions": [{"type": "json_path", "path": "$.name", "operator": "equals", "expected": name}],
+        }
+
+    wait_a = {
+        "id": "wait_a", "name": "wait_a", "endpoint_id": "get_user_by_id",
+        "inputs": {"path_params": {"id": 1}}, "assertions": [{"type": "status_code", "expected": 200}],
+    }
+    base = {"id": "base", "name": "base", "endpoint_id": "get_users", "inputs": {}, "assertions": []}
+    return make_plan(
+        [base, create("la", "A"), wait_a, get("ga", "A"), create("lb", "B"), get("gb", "B")],
+        {
+            "la": {"depends_on": "base"},
+            "wait_a": {"depends_on": "la"},
+            "ga": {"depends_on": "wait_a"},
+            "lb": {"depends_on": "base"},
+            "gb": {"depends_on": "lb"},
+        },
+    )
+
+
+def _fan_out_delay(method, path, body):
+    # lb 在 la 之后完成，ga 在 lb 完成之后才开始渲染请求
+    if method == "POST" and body["name"] == "B":
+        return 0.05
+    if path == "/users/1":
+        return 0.15
+    return 0.0
+
+
+class TestVariableScope:
+    def test_lookup_order(self):
+        manager = VariableManager()
+        manager.set("a", 1)
+        manager.set("b", 1)
+        upstream = {"b": 2, "c": 2}
+        scope = manager.scope({"c": 3}, inherited={"b": [upstream], "c": [upstream]})
+        row = scope.child({"d": 4})
+
+        assert row.get("a") == 1
+        assert row.get("b") == 2
+        assert row.get("c") == 3
+        assert row.get("d") == 4
+        assert row.get("missing", "default") == "default"
+        assert row.flatten() == {"a": 1, "b": 2, "c": 3, "d": 4}
+
+    def test_inherited_name_not_yet_extracted_falls_back(self):
+        manager = VariableManager()
+        manager.set("token", "global")
+        upstream = {}
+        scope = manager.scope(inherited={"token": [upstream]})
+
+        assert scope.get("token") == "global"
+        upstream["token"] = "chain"
+        assert scope.get("token") == "chain"
+
+    def test_inherited_falls_back_to_earlier_provider(self):
+        latest, earlier = {}, {"token": "earlier"}
+        scope = VariableManager().scope(inherited={"token": [latest, earlier]})
+
+        assert scope.get("token") == "earlier"
+        assert scope.flatten() == {"token": "earlier"}
+        latest["token"] = "latest"
+        assert scope.get("token") == "latest"
+        assert scope.flatten() == {"token": "latest"}
+
+    def test_substitute_uses_scope(self):
+        manager = VariableManager()
+        manager.set("name", "global")
+        scope = manager.scope({"name": "local"})
+
+        assert manager.substitute({"a": "{{name}}", "b": ["x"]}) == {"a": "global", "b": ["x"]}
+        assert manager.substitute("hi {{name}} {{other}}", scope) == "hi local {{other}}"
+
+
+class TestVariableProviders:
+    def test_siblings_do_not_see_each_other(self):
+        providers = variable_providers(
+            ["base", "a", "b", "ga", "gb"],
+            {"base": set(), "a": {"base"}, "b": {"base"}, "ga": {"a"}, "gb": {"b"}},
+            {"a": ["uid"], "b": ["uid"]},
+        )
+        assert providers["ga"] == {"uid": ("a",)}
+        assert providers["gb"] == {"uid": ("b",)}
+        assert providers["base"] == {}
+
+    def test_latest_upstream_wins(self):
+        providers = variable_providers(
+            ["a", "b", "c", "d"],
+            {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"c", "b"}},
+            {"a": ["x", "y"], "c": ["x"]},
+        )
+        assert providers["d"] == {"x": ("c", "a"), "y": ("a",)}
+
+    def test_transitive(self):
+        providers = variable_providers(
+            ["a", "b", "c"],
+            {"a": set(), "b": {"a"}, "c": {"b"}},
+            {"a": ["token"]},
+        )
+        assert providers["c"] == {"token": ("a",)}
+
+    def test_earlier_upstream_extractors_are_kept_in_order(self):
+        providers = variable_providers(
+            ["a", "b", "c", "d"],
+            {"a": set(), "b": {"a"}, "c": {"b"}, "d": {"c"}},
+            {"a": ["uid"], "b": ["uid"], "c": ["uid"]},
+        )
+        assert providers["d"] == {"uid": ("c", "b", "a")}
+        assert providers["c"] == {"uid": ("b", "a")}
+
+
+class TestInjectDependencies:
+    def test_copy_on_write(self):
+        manager = VariableManager()
+        manager.set("token", "abc")
+        static = {"nested": [1, 2]}
+        test_case = {"id": "t", "inputs": {"headers": {"X": "1"}, "body": static}}
+        dependencies = {"t": {"inject": {"headers.Authorization": "Bearer {{token}}", "bad": "x"}}}
+
+        injected = manager.inject_dependencies(test_case, dependencies)
+
+        assert injected["inputs"]["headers"] == {"X": "1", "Authorization": "Bearer abc"}
+        assert test_case["inputs"]["headers"] == {"X": "1"}
+        assert injected["inputs"]["body"] is static
+
+    def test_no_rules_returns_same_case(self):
+        test_case = {"id": "t", "inputs": {}}
+        assert VariableManager().inject_dependencies(test_case, {}) is test_case
+
+
+class TestScopedExecution:
+    """并行的兄弟分支提取同名变量时互不覆盖"""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_fan_out_sync(self, workers):
+        runner = Runner(http_client=FakeHttpClient(delay=_fan_out_delay), workers=workers)
+        result = runner.run(_fan_out_plan())
+
+        failures = [
+            (r.test_case_id, [a.message for a in r.assertions if not a.passed])
+            for r in result.results
+            if not r.passed
+        ]
+        assert failures == []
+        assert result.passed == 6
+        # 提取的变量不写入全局作用域
+        assert runner.variable_manager.variables == {}
+
+    def test_fan_out_async(self):
+        runner = AsyncTestRunner(http_client=FakeAsyncHttpClient(delay=_fan_out_delay), concurrency=4)
+        result = runner.run(_fan_out_plan())
+
+        assert [r.test_case_id for r in result.results if not r.passed] == []
+
+    def test_repeated_runs_are_independent(self):
+        runner = Runner(http_client=FakeHttpClient(), workers=4)
+        plan = _fan_out_plan()
+        first = runner.run(plan)
+        second = runner.run(plan)
+
+        assert first.passed == second.passed == 6
+
+    @pytest.mark.parametrize("engine", ["sync", "sync-parallel", "async"])
+    def test_falls_back_when_latest_extractor_misses(self, engine):
+        # refresh 也提取 uid 但路径无结果：check 沿用更早的 create 提取的值（同顺序执行）
+        plan = make_plan(
+            [
+                {
+                    "id": "create", "name": "create", "endpoint_id": "create_user",
+                    "inputs": {"body": {"name": "A", "email": "a@example.com"}},
+                    "assertions": [], "extract": [{"name": "uid", "from": "$.id"}],
+                },
+                {
+                    "id": "refresh", "name": "refresh", "endpoint_id": "get_user_by_id",
+                    "inputs": {"path_params": {"id": 1}},
+                    "assertions": [], "extract": [{"name": "uid", "from": "$.missing"}],
+                },
+                {
+                    "id": "check", "name": "check", "endpoint_id": "get_user_by_id",
+                    "inputs": {"path_params": {"id": "{{uid}}"}},
+                    "assertions": [{"type": "json_path", "path": "$.name", "operator": "equals", "expected": "A"}],
+                },
+            ],
+            {"refresh": {"depends_on": "create"}},
+        )
+        if engine == "async":
+            result = AsyncTestRunner(http_client=FakeAsyncHttpClient(), concurrency=4).run(plan)
+        else:
+            result = Runner(http_client=FakeHttpClient(), workers=4 if engine == "sync-parallel" else 1).run(plan)
+
+        (check,) = [r for r in result.results if r.test_case_id == "check"]
+        assert check.request["path"] == "/users/2"
+        assert check.passed